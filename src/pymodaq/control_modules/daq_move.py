@@ -598,7 +598,7 @@ class DAQ_Move(ParameterControlModule):
 
     def update_plugin_config(self):
         parent_module = utils.find_dict_in_list_from_key_val(DAQ_Move_Actuators, 'name', self.actuator)
-        mod = import_module(parent_module['module'].__package__.split('.')[0])
+        mod = import_module(parent_module['parent_module_name'].split('.')[0])
         if hasattr(mod, 'config'):
             self.plugin_config = mod.config
 
@@ -649,8 +649,7 @@ class DAQ_Move(ParameterControlModule):
             for child in self.settings.child('move_settings').children():
                 child.remove()
             parent_module = utils.find_dict_in_list_from_key_val(DAQ_Move_Actuators, 'name', self._actuator_type)
-            class_ = getattr(getattr(parent_module['module'], 'daq_move_' + self._actuator_type),
-                             'DAQ_Move_' + self._actuator_type)
+            class_ = parent_module.get_class()
             params = getattr(class_, 'params')
             move_params = Parameter.create(name='move_settings', type='group', children=params)
 
@@ -772,8 +771,7 @@ class DAQ_Move_Hardware(QObject):
         status = edict(initialized=False, info="")
         try:
             parent_module = utils.find_dict_in_list_from_key_val(DAQ_Move_Actuators, 'name', self.actuator_type)
-            class_ = getattr(getattr(parent_module['module'], 'daq_move_' + self.actuator_type),
-                             'DAQ_Move_' + self.actuator_type)
+            class_ = parent_module.get_class()
             self.hardware = class_(self, params_state)
             try:
                 infos = self.hardware.ini_stage(controller)  # return edict(info="", controller=, stage=)
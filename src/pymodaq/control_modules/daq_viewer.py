@@ -14,17 +14,17 @@ import os
 from pathlib import Path
 from random import randint
 import sys
-from typing import List, Tuple, Union, Optional
-import time
+from typing import Dict, List, Tuple, Union, Optional
 
 from easydict import EasyDict as edict
 import numpy as np
 from qtpy import QtWidgets
-from qtpy.QtCore import Qt, QObject, Slot, QThread, Signal
+from qtpy.QtCore import Qt, QObject, Slot, QThread, Signal, QTimer
 
 
 from pymodaq_data.data import DataToExport, Axis, DataDistribution
-from pymodaq.utils.data import DataFromPlugins
+from pymodaq.utils.data import DataFromPlugins, take_ownership, set_read_only
+from pymodaq.utils.averaging import Accumulator
 
 from pymodaq_utils.logger import set_logger, get_module_name
 from pymodaq.control_modules.utils import ParameterControlModule
@@ -54,8 +54,9 @@ from pymodaq_gui.plotting.data_viewers.viewer import ViewerBase
 from pymodaq_gui.plotting.data_viewers import ViewersEnum
 from pymodaq_utils.enums import enum_checker
 from pymodaq.control_modules.viewer_utility_classes import DAQ_Viewer_base
+from pymodaq.control_modules.detector_process import DAQ_DetectorProcess
 
-from pymodaq.utils.leco.pymodaq_listener import ViewerActorListener, LECOClientCommands
+from pymodaq.utils.leco.pymodaq_listener import ViewerActorListener, LECOClientCommands, LECOViewerCommands
 
 logger = set_logger(get_module_name(__file__))
 config = Config()
@@ -75,7 +76,13 @@ class DAQ_Viewer(ParameterControlModule):
     ----------
     grab_done_signal: Signal[DataToExport]
         Signal emitted when the data from the plugin (and eventually from the data viewers) has been received. To be
-        used by connected objects.
+        used by connected objects. In live grab, the frames are emitted as soon as received, without the data
+        exported by the viewers
+    viewers_done_signal: Signal[DataToExport]
+        Signal emitted in live grab with the data exported by the data viewers (ROIs...) for each displayed frame
+    exposure_done_signal: Signal[str]
+        Signal emitted with the title of the module when a plugin allowing moves during its readout reported the end
+        of the exposure of the current grab
     custom_sig: Signal[ThreadCommand]
         use this to propagate info/data coming from the hardware plugin to another object
     overshoot_signal: Signal[bool]
@@ -96,6 +103,8 @@ class DAQ_Viewer(ParameterControlModule):
     custom_sig = Signal(ThreadCommand)  # particular case where DAQ_Viewer is used for a custom module
 
     grab_done_signal = Signal(DataToExport)
+    viewers_done_signal = Signal(DataToExport)
+    exposure_done_signal = Signal(str)
 
     overshoot_signal = Signal(bool)
     data_saved = Signal()
@@ -151,6 +160,7 @@ class DAQ_Viewer(ParameterControlModule):
                                           module_saving.DetectorExtendedSaver] = None
         self._h5saver_continuous: Optional[H5Saver] = None
         self._ind_continuous_grab = 0
+        self._live_averager = Accumulator()
         self.setup_continuous_saving()
 
         self.settings.child('main_settings', 'DAQ_type').setValue(self.daq_type.name)
@@ -162,16 +172,26 @@ class DAQ_Viewer(ParameterControlModule):
         self.settings.child('main_settings', 'detector_type').setValue(self._detector)
 
         self._grabing: bool = False
+        self._move_during_readout: bool = False
         self._do_bkg: bool = False
         self._take_bkg: bool = False
 
         self._grab_done: bool = False
-        self._start_grab_time: float = 0.  # used for the refreshing rate
         self._received_data: int = 0
 
+        self._display_timer = QTimer()  # displays the latest live frame at most every refresh_time
+        self._display_timer.timeout.connect(self._display_pending_data)
+        self._pending_display: Optional[DataToExport] = None  # latest live frame, not displayed yet
+        self._displayed_data: Optional[DataToExport] = None  # collecting the data exported by the viewers
+        self._displayed_live = False  # if True, the displayed frame has already been emitted with grab_done
+        self._n_acquired_frames: int = 0
+        self._n_displayed_frames: int = 0
+
         self._lcd: Optional[LCD] = None
+        self._hardware_process: Optional[DAQ_DetectorProcess] = None  # the hardware if run in a subprocess
 
         self._bkg: Optional[DataToExport] = None  # buffer to store background
+        self._bkg_subtracted: Dict[Tuple[str, str], List[np.ndarray]] = dict([])  # reused for each displayed frame
 
         self._save_file_pathname: Optional[Path] = None  # to store last active path, will be an Path object
         
@@ -352,9 +372,15 @@ class DAQ_Viewer(ParameterControlModule):
         if ngrab >= 1:
             self.settings.child('main_settings', 'Naverage').setValue(ngrab)
 
+    @property
+    def move_during_readout(self) -> bool:
+        """bool: True if the initialized plugin reports the end of its exposures so that actuators may move during
+        the readout"""
+        return self._move_during_readout
+
     def update_plugin_config(self):
         parent_module = utils.find_dict_in_list_from_key_val(DET_TYPES[self.daq_type.name], 'name', self.detector)
-        mod = import_module(parent_module['module'].__package__.split('.')[0])
+        mod = import_module(parent_module['parent_module_name'].split('.')[0])
         if hasattr(mod, 'config'):
             self.plugin_config = mod.config
 
@@ -424,6 +450,8 @@ class DAQ_Viewer(ParameterControlModule):
 
         if self._initialized_state:  # means  initialized
             self.init_hardware(False)
+        if self._hardware_process is not None:  # the plugin is closed once its process ended
+            self._hardware_process.wait_ended()
         self.quit_signal.emit()
 
         if self._lcd is not None:
@@ -453,6 +481,7 @@ class DAQ_Viewer(ParameterControlModule):
         do_init: bool
             If True, create a DAQ_Detector instance and move it into a separated thread, connected its signals/slots
             to the DAQ_Viewer object (self)
+            or, if the 'in_process' option is set, a DAQ_DetectorProcess running the plugin in a subprocess
             If False, force the instrument to close and kill the Thread (still not done properly in some cases)
         """
         if not do_init:
@@ -467,10 +496,23 @@ class DAQ_Viewer(ParameterControlModule):
         else:            
             try:
 
-                hardware = DAQ_Detector(self._title, self.settings, self.detector)
-                self._hardware_thread = QThread()
-                if self.config('viewer', 'viewer_in_thread'):
-                    hardware.moveToThread(self._hardware_thread)
+                in_process = self.settings['main_settings', 'process', 'in_process']
+                if in_process:
+                    self.settings.child('main_settings', 'process', 'dropped_frames').setValue(0)
+                    hardware = DAQ_DetectorProcess(
+                        self._title, self.settings, self.detector,
+                        n_slots=self.settings['main_settings', 'process', 'n_slots'],
+                        slot_size=self.settings['main_settings', 'process', 'slot_size'] * 2 ** 20)
+                    # it stays in this thread as it emits views on its shared memory: no hardware thread
+                    self._hardware_process = hardware
+                    self._hardware_thread = None
+                else:
+                    hardware = DAQ_Detector(self._title, self.settings, self.detector)
+                    self._hardware_process = None
+                    self._hardware_thread = QThread()
+                    if self.config('viewer', 'viewer_in_thread'):
+                        hardware.moveToThread(self._hardware_thread)
+                    self._hardware_thread.hardware = hardware
 
                 self.command_hardware[ThreadCommand].connect(hardware.queue_command)
                 hardware.data_detector_sig[DataToExport].connect(self.show_data)
@@ -478,8 +520,7 @@ class DAQ_Viewer(ParameterControlModule):
                 hardware.status_sig[ThreadCommand].connect(self.thread_status)
                 self._update_settings_signal[edict].connect(hardware.update_settings)
 
-                self._hardware_thread.hardware = hardware
-                if self.config('viewer', 'viewer_in_thread'):
+                if self._hardware_thread is not None and self.config('viewer', 'viewer_in_thread'):
                     self._hardware_thread.start()
                 self.command_hardware.emit(ThreadCommand("ini_detector", attribute=[
                     self.settings.child('detector_settings').saveState(), self.controller]))
@@ -541,7 +582,6 @@ class DAQ_Viewer(ParameterControlModule):
         if self.ui is not None:
             self.ui.data_ready = False
 
-        self._start_grab_time = time.perf_counter()
         if snap_state:
             self.update_status(f'{self._title}: Snap')
             self.command_hardware.emit(
@@ -550,7 +590,9 @@ class DAQ_Viewer(ParameterControlModule):
             if not grab_state:
                 self.update_status(f'{self._title}: Stop Grab')
                 self.command_hardware.emit(ThreadCommand("stop_grab", ))
+                self._stop_display()
             else:
+                self._start_display()
                 self.thread_status(ThreadCommand("update_channels", ))
                 self.update_status(f'{self._title}: Continuous Grab')
                 self.command_hardware.emit(
@@ -580,6 +622,7 @@ class DAQ_Viewer(ParameterControlModule):
         self.update_status(f'{self._title}: Stop Grab')
         self.command_hardware.emit(ThreadCommand("stop_all", ))
         self._grabing = False
+        self._stop_display()
 
     @Slot()
     def _raise_timeout(self):
@@ -627,10 +670,12 @@ class DAQ_Viewer(ParameterControlModule):
             self.module_and_data_saver.get_set_node()
 
             self.grab_done_signal.connect(self.append_data)
+            self.viewers_done_signal.connect(self.append_data)
         else:
             self._do_continuous_save = False
             self._h5saver_continuous.settings.child('N_saved').hide()
             self.grab_done_signal.disconnect(self.append_data)
+            self.viewers_done_signal.disconnect(self.append_data)
 
             try:
                 self._h5saver_continuous.close()
@@ -658,7 +703,7 @@ class DAQ_Viewer(ParameterControlModule):
         self._h5saver_continuous.settings.child('N_saved').setValue(self._h5saver_continuous.settings['N_saved'] + 1)
 
     def insert_data(self, indexes: Tuple[int], where: Union[Node, str] = None,
-                    distribution=DataDistribution['uniform']):
+                    distribution=DataDistribution['uniform'], dte: DataToExport = None):
         """Insert DataToExport to a DetectorExtendedSaver at specified indexes
 
         Method to be used when saving into an already initialized array within a h5file (DAQ_Scan for instance)
@@ -669,12 +714,16 @@ class DAQ_Viewer(ParameterControlModule):
             The indexes within the extended array where to place these data
         where: Node or str
         distribution: DataDistribution enum
+        dte: DataToExport
+            The data to be inserted, if None use the last data
 
         See Also
         --------
         DAQ_Scan, DetectorExtendedSaver
         """
-        self._add_data_to_saver(self._data_to_save_export, init_step=np.all(np.array(indexes) == 0), where=where,
+        if dte is None:
+            dte = self._data_to_save_export
+        self._add_data_to_saver(dte, init_step=np.all(np.array(indexes) == 0), where=where,
                                 indexes=indexes, distribution=distribution)
 
     def _add_data_to_saver(self, dte: DataToExport, init_step=False, where=None, **kwargs):
@@ -698,18 +747,45 @@ class DAQ_Viewer(ParameterControlModule):
         """
         if dte is not None:
             detector_node = self.module_and_data_saver.get_set_node(where)
-            dte = dte if not self.module_and_data_saver.h5saver.settings['save_raw_only'] else \
-                dte.get_data_from_source('raw')  # filters depending on the source: raw or calculated
-
-            dte = DataToExport(name=dte.name, data=  # filters depending on the extra argument 'save'
-                               [dwa for dwa in dte if ('do_save' not in dwa.extra_attributes) or
-                                ('do_save' in dwa.extra_attributes and dwa.do_save)])
+            dte = self.get_data_to_save(dte)
 
             self.module_and_data_saver.add_data(detector_node, dte, **kwargs)
 
             if init_step:
-                if self._do_bkg and self._bkg is not None:
-                    self.module_and_data_saver.add_bkg(detector_node, self._bkg)
+                if self.bkg_to_save is not None:
+                    self.module_and_data_saver.add_bkg(detector_node, self.bkg_to_save)
+
+    def get_data_to_save(self, dte: DataToExport = None) -> Optional[DataToExport]:
+        """Filter the data to be saved
+
+        Filters by DataSource as specified in the current H5Saver (see self.module_and_data_saver) and by the
+        extra attribute 'do_save' of the DataWithAxes
+
+        Parameters
+        ----------
+        dte: DataToExport
+            The data to be filtered, if None use the last data
+
+        Returns
+        -------
+        DataToExport: a new DataToExport object sharing the DataWithAxes of dte
+        """
+        if dte is None:
+            dte = self._data_to_save_export
+        if dte is None:
+            return None
+        dte = dte if not self.module_and_data_saver.h5saver.settings['save_raw_only'] else \
+            dte.get_data_from_source('raw')  # filters depending on the source: raw or calculated
+
+        return DataToExport(name=dte.name, data=  # filters depending on the extra argument 'save'
+                            [dwa for dwa in dte if ('do_save' not in dwa.extra_attributes) or
+                             ('do_save' in dwa.extra_attributes and dwa.do_save)])
+
+    @property
+    def bkg_to_save(self) -> Optional[DataToExport]:
+        """The background to be saved along the data if any"""
+        if self._do_bkg:
+            return self._bkg
 
     def _save_data(self, path=None, dte: DataToExport = None):
         """Private. Practical implementation to save data into a h5file altogether with metadata, axes, background...
@@ -762,10 +838,10 @@ class DAQ_Viewer(ParameterControlModule):
     def _get_data_from_viewer(self, data: DataToExport):
         """Get all data emitted by the current viewers
 
-        Each viewer *data_to_export_signal* is connected to this slot. The collected data is stored in another
-        DataToExport `self._data_to_save_export` for further processing. All raw data are also stored in this attribute.
-        When all viewers have emitted this signal, the collected data are emitted  with the
-        `grab_done_signal` signal.
+        Each viewer *data_to_export_signal* is connected to this slot. For a single grab, the collected data is
+        appended to the DataToExport of the displayed frame, already holding its raw data, and when all viewers have
+        emitted this signal, the frame is emitted with the `grab_done_signal` signal. In live grab, the frame having
+        already been emitted, the collected data are emitted with the `viewers_done_signal` signal.
 
         Parameters
         ---------_
@@ -773,16 +849,104 @@ class DAQ_Viewer(ParameterControlModule):
             All data collected from the viewers
 
         """
-        if self._data_to_save_export is not None:  # means that somehow data are not initialized so no further procsessing
+        if self._displayed_data is not None:  # means that no frame is displayed so no further procsessing
             self._received_data += 1
             if len(data) != 0:
                 for dat in data:
                     dat.origin = f'{self.title} - {dat.origin}' if dat.origin is not None else f'{self.title}'
-                self._data_to_save_export.append(data)
+                self._displayed_data.append(data)
 
             if self._received_data == len(self.viewers):
-                self._grab_done = True
-                self.grab_done_signal.emit(self._data_to_save_export)
+                self._release_displayed_data()
+
+    def _release_displayed_data(self):
+        """Stop collecting the data exported by the viewers and emit them, with their frame for a single grab"""
+        if self._displayed_data is None:
+            return
+        dte = self._displayed_data
+        self._displayed_data = None
+        if not self._displayed_live:
+            self._emit_grab_done(dte)
+        elif len(dte) > 0:
+            self.viewers_done_signal.emit(dte)
+
+    def _emit_grab_done(self, dte: DataToExport):
+        self._grab_done = True
+        self.grab_done_signal.emit(dte)
+
+    @property
+    def n_acquired_frames(self) -> int:
+        """The number of frames acquired since the start of the live grab"""
+        return self._n_acquired_frames
+
+    @property
+    def n_displayed_frames(self) -> int:
+        """The number of frames displayed since the start of the live grab, the others being dropped from display"""
+        return self._n_displayed_frames
+
+    def _start_display(self):
+        """Reset the frame counters and display the live frames every refresh_time, see _display_pending_data"""
+        self._n_acquired_frames = 0
+        self._n_displayed_frames = 0
+        self._update_frame_counts()
+        self._display_timer.start(int(self.settings['main_settings', 'refresh_time']))
+
+    def _stop_display(self):
+        """Stop the live display, the last frame being displayed if the viewers are not busy"""
+        if self._display_timer.isActive():
+            self._display_timer.stop()
+            self._display_pending_data()
+            self._pending_display = None
+            self._update_frame_counts()
+
+    def _update_frame_counts(self):
+        self.settings.child('main_settings', 'displayed_frames').setValue(
+            f'{self._n_displayed_frames}/{self._n_acquired_frames}')
+
+    @Slot()
+    def _display_pending_data(self):
+        """Display the latest live frame, unless the viewers are still processing the previous one
+
+        Called by the display timer, so that the display rate is bounded by the refresh time whatever the acquisition
+        rate. All the frames have already been emitted with the `grab_done_signal`
+        """
+        if self._pending_display is None or self._displayed_data is not None:
+            return
+        dte = self._pending_display
+        self._pending_display = None
+        self._display(dte, live=True)
+        self._update_frame_counts()
+
+    def _display(self, dte: DataToExport, live=False):
+        """Send a frame to the viewers, collecting the data they export
+
+        Parameters
+        ----------
+        dte: DataToExport
+        live: bool
+            if False, the frame is emitted with grab_done once the viewers exported their processed data, otherwise
+            it has already been emitted and the exported data are emitted with viewers_done_signal
+
+        See Also
+        --------
+        _get_data_from_viewer
+        """
+        self._received_data = 0  # so that data send back from viewers can be properly counted
+        self._displayed_live = live
+        self._displayed_data = DataToExport(self._title, control_module='DAQ_Viewer') if live else dte
+        try:
+            data_to_plot = dte.get_data_from_attribute('do_plot', True)
+            data_to_plot.append(dte.get_data_from_missing_attribute('do_plot'))
+            # process bkg if needed
+            if self.do_bkg and self._bkg is not None:
+                data_to_plot = self._subtract_bkg(data_to_plot)
+
+            self._init_show_data(data_to_plot)
+            self._n_displayed_frames += 1
+            self.set_data_to_viewers(data_to_plot)
+        except Exception as e:
+            self.logger.exception(str(e))
+            self._release_displayed_data()
 
     @property
     def current_data(self) -> DataToExport:
@@ -813,10 +977,12 @@ class DAQ_Viewer(ParameterControlModule):
             * create a container (OrderedDict `_data_to_save_export`) with info from this DAQ_Viewer (title), a timestamp...
             * call `_process_data`
             * do background subtraction if any
-            * check refresh time (if set in the settings) to send or not data to data viewers
-            * either send to the data viewers (if refresh time is ok and/or show data option in settings is set)
-            * either
-                * send grab_done_signal (to the slot _save_export_data ) to save the data
+            * either send to the data viewers (if show data option in settings is set): directly for a single
+              grab, while in live grab only the latest frame is displayed every refresh time (see
+              _display_pending_data), the other ones being dropped from display
+            * send grab_done_signal (to the slot _save_export_data ) to save the data: once the viewers exported
+              their processed data for a single grab, right away for each frame in live grab (the data exported by
+              the viewers being then emitted with viewers_done_signal)
 
         Parameters
         ----------
@@ -827,7 +993,8 @@ class DAQ_Viewer(ParameterControlModule):
         _init_show_data, _process_data
         """
         try:
-            dte = dte.deepcopy()
+            # the only copy of the frame: it is then shared read-only by the viewers, the savers and TCP/LECO
+            dte = take_ownership(dte)
             if self.settings['main_settings', 'tcpip', 'tcp_connected'] and self._send_to_tcpip:
                 self._command_tcpip.emit(ThreadCommand('data_ready', dte))
             if self.settings['main_settings', 'leco', 'leco_connected'] and self._send_to_tcpip:
@@ -835,47 +1002,73 @@ class DAQ_Viewer(ParameterControlModule):
             if self.ui is not None:
                 self.ui.data_ready = True
 
+            for dwa in dte:
+                dwa.origin = self._title
             if self.settings['main_settings', 'live_averaging']:
                 self.settings.child('main_settings', 'N_live_averaging').setValue(self._ind_continuous_grab)
-                _current_data = dte.deepcopy()
 
                 self._ind_continuous_grab += 1
-                if self._ind_continuous_grab > 1:
-                    self._data_to_save_export = \
-                        _current_data.average(self._data_to_save_export, self._ind_continuous_grab)
+                if self._ind_continuous_grab == 1:
+                    self._live_averager.reset()
+                self._live_averager.add(dte)  # in place, only the average to be displayed and saved is allocated
+                self._data_to_save_export = DataToExport(self._title, control_module='DAQ_Viewer',
+                                                         data=set_read_only(self._live_averager.get_data()).data)
             else:
-                for dwa in dte:
-                    dwa.origin = self._title
                 self._data_to_save_export = DataToExport(self._title, control_module='DAQ_Viewer', data=dte.data)
 
             if self._take_bkg:
-                self._bkg = self._data_to_save_export.deepcopy()
+                # arrays are read-only so they can be shared, only the container is new
+                self._bkg = DataToExport(self._data_to_save_export.name, data=self._data_to_save_export.data)
                 self._take_bkg = False
 
-            if self._grabing:  # if live
-                refresh_time = self.settings['main_settings', 'refresh_time']
-                refresh = time.perf_counter() - self._start_grab_time > refresh_time / 1000
-                if refresh:
-                    self._start_grab_time = time.perf_counter()
-            else:
-                refresh = True  # if single
-            if self.ui is not None and self.settings.child('main_settings', 'show_data').value() and refresh:
-                self._received_data = 0  # so that data send back from viewers can be properly counted
-                data_to_plot = self._data_to_save_export.get_data_from_attribute('do_plot', True, deepcopy=True)
-                data_to_plot.append(self._data_to_save_export.get_data_from_missing_attribute('do_plot', deepcopy=True))
-                # process bkg if needed
-                if self.do_bkg and self._bkg is not None:
-                    data_to_plot -= self._bkg
-
-                self._init_show_data(data_to_plot)
-                self.set_data_to_viewers(data_to_plot)
+            if self._grabing:
+                self._n_acquired_frames += 1
+            if self.ui is not None and self.settings.child('main_settings', 'show_data').value():
+                if self._display_timer.isActive():  # if live
+                    if not self._displayed_live:  # a single grab is still waiting for the viewers
+                        self._release_displayed_data()
+                    self._pending_display = self._data_to_save_export  # superseding the previous one, if any
+                    self._emit_grab_done(self._data_to_save_export)
+                else:  # if single
+                    self._release_displayed_data()  # if the viewers did not export the previous frame
+                    self._display(self._data_to_save_export)
             else:
-                self._grab_done = True
-                self.grab_done_signal.emit(self._data_to_save_export)
+                self._emit_grab_done(self._data_to_save_export)
 
         except Exception as e:
             self.logger.exception(str(e))
 
+    def _subtract_bkg(self, dte: DataToExport) -> DataToExport:
+        """Subtract the background from the data into arrays reused from one displayed frame to the next
+
+        The arrays are only reallocated when the shape or the dtype of a channel changes. They are only referenced by
+        the viewers which process them before the next frame is displayed, see _display_pending_data
+
+        Parameters
+        ----------
+        dte: DataToExport
+            must have the same length as the background
+
+        Returns
+        -------
+        DataToExport: new object holding the subtracted data
+        """
+        if len(dte) != len(self._bkg):
+            raise TypeError(f'Could not substract a background of length {len(self._bkg)} from data of length '
+                            f'{len(dte)}')
+        dwas = []
+        for dwa, dwa_bkg in zip(dte, self._bkg):
+            key = (dwa.origin, dwa.name)
+            dtype = np.result_type(dwa[0], dwa_bkg[0])
+            arrays = self._bkg_subtracted.get(key, [])
+            if len(arrays) != len(dwa) or arrays[0].shape != dwa[0].shape or arrays[0].dtype != dtype:
+                arrays = [np.empty(dwa[0].shape, dtype=dtype) for _ in range(len(dwa))]
+                self._bkg_subtracted[key] = arrays
+            for array, array_bkg, array_sub in zip(dwa.data, dwa_bkg.data, arrays):
+                np.subtract(array, array_bkg, out=array_sub)
+            dwas.append(dwa.deepcopy_with_new_data(list(arrays), source=dwa.source, keep_dim=True))
+        return DataToExport(dte.name, data=dwas)
+
     def _init_show_data(self, dte: DataToExport):
         """Processing before showing data
 
@@ -945,13 +1138,19 @@ class DAQ_Viewer(ParameterControlModule):
         elif param.name() == 'live_averaging':
             self.settings.child('main_settings', 'show_averaging').setValue(False)
             if param.value():
-                self.settings.child('main_settings', 'N_live_averaging').show()
                 self._ind_continuous_grab = 0
                 self.settings.child('main_settings', 'N_live_averaging').setValue(0)
-            else:
-                self.settings.child('main_settings', 'N_live_averaging').hide()
+            for name in ('N_live_averaging', 'live_averaging_mode', 'live_averaging_alpha',
+                         'live_averaging_window'):
+                self.settings.child('main_settings', name).show(param.value())
             #self._update_settings_signal.emit(edict(path=path, param=param, change='value'))
 
+        elif param.name() in ('live_averaging_mode', 'live_averaging_alpha', 'live_averaging_window'):
+            self._live_averager = Accumulator(self.settings['main_settings', 'live_averaging_mode'],
+                                              alpha=self.settings['main_settings', 'live_averaging_alpha'],
+                                              window=self.settings['main_settings', 'live_averaging_window'])
+            self._ind_continuous_grab = 0
+
         elif param.name() in putils.iter_children(self.settings.child('main_settings', 'axes'), []):
             if self.daq_type.name == "DAQ2D":
                 if param.name() == 'use_calib':
@@ -972,6 +1171,10 @@ class DAQ_Viewer(ParameterControlModule):
         elif param.name() == 'wait_time':
             self.command_hardware.emit(ThreadCommand('update_wait_time', [param.value()]))
 
+        elif param.name() == 'refresh_time':
+            if self._display_timer.isActive():
+                self._display_timer.setInterval(int(param.value()))
+
         self._update_settings(param=param)
 
     def child_added(self, param, data):
@@ -1062,6 +1265,7 @@ class DAQ_Viewer(ParameterControlModule):
                 * ini_detector: update the status with "detector initialized" value and init state if attribute not null.
                 * grab : emit grab_status(True)
                 * grab_stopped: emit grab_status(False)
+                * exposure_done: emit exposure_done_signal(title)
                 * init_lcd: display a LCD panel
                 * lcd: display on the LCD panel, the content of the attribute
                 * stop: stop the grab
@@ -1074,6 +1278,7 @@ class DAQ_Viewer(ParameterControlModule):
                 self.ui.detector_init = status.attribute['initialized']
             if status.attribute['initialized']:
                 self.controller = status.attribute['controller']
+                self._move_during_readout = status.attribute.get('move_during_readout', False)
                 self._initialized_state = True
             else:
                 self._initialized_state = False
@@ -1083,6 +1288,9 @@ class DAQ_Viewer(ParameterControlModule):
         elif status.command == "grab":
             self.grab_status.emit(True)
 
+        elif status.command == 'exposure_done':
+            self.exposure_done_signal.emit(self.title)
+
         elif status.command == 'grab_stopped':
             self.grab_status.emit(False)
 
@@ -1118,10 +1326,12 @@ class DAQ_Viewer(ParameterControlModule):
         status: ThreadCommand
             Possible commands are:
             * 'Send Data: to trigger a snapshot
+            * 'start_grab'/'stop_grab': to start/stop a continuous grab, each data being sent
             * 'connected': show that connection is ok
             * 'disconnected': show that connection is not OK
             * 'Update_Status': update a status command
             * 'set_info': receive settings from the server side and update them on this side
+            * 'frames_dropped': the number of data dropped by the TCPClient because the network was too slow
 
         See Also
         --------
@@ -1133,6 +1343,14 @@ class DAQ_Viewer(ParameterControlModule):
         if 'Send Data' in status.command:
             self.snapshot('', send_to_tcpip=True)
 
+        elif status.command == LECOViewerCommands.START_GRAB:
+            if self.ui is not None:
+                self.manage_ui_actions('grab', 'setChecked', True)
+            self.grab_data(grab_state=True, send_to_tcpip=True)
+
+        elif status.command == LECOViewerCommands.STOP_GRAB:
+            self.stop_grab()
+
         elif status.command == LECOClientCommands.LECO_CONNECTED:
             self.settings.child('main_settings', 'leco', 'leco_connected').setValue(True)
 
@@ -1147,6 +1365,9 @@ class DAQ_Viewer(ParameterControlModule):
             param = self.settings.child('detector_settings', *path_in_settings[1:])
             param.restoreState(param_tmp.saveState())
 
+        elif status.command == 'frames_dropped':
+            self.settings.child('main_settings', 'tcpip', 'tcp_dropped').setValue(status.attribute[0])
+
         elif status.command == 'get_axis':
             raise DeprecationWarning('Do not use this, the axis are in the data objects')
             self.command_hardware.emit(
@@ -1181,6 +1402,7 @@ class DAQ_Detector(QObject):
         self.grab_state = False
         self.single_grab = False
         self.datas: DataToExport = None
+        self.accumulator = Accumulator()  # software averaging, in place
         self.ind_average = 0
         self.Naverage = 1
         self.average_done = False
@@ -1321,6 +1543,7 @@ class DAQ_Detector(QObject):
 
             self.hardware_averaging = class_.hardware_averaging  # to check if averaging can be done directly by
             # the hardware or done here software wise
+            status.move_during_readout = class_.move_during_readout
 
             return status
         except Exception as e:
@@ -1336,6 +1559,16 @@ class DAQ_Detector(QObject):
         """
         self.data_detector_temp_sig.emit(data)
 
+    def exposure_done(self):
+        """ Let the DAQ_Viewer know the exposure of the current grab is over (see DAQ_Viewer_base.emit_exposure_done)
+
+        When averaging software wise, the instrument plugin grabs Naverage times, only the end of the exposure of the
+        last grab is relayed so that the actuators don't move while the other ones are exposed
+        """
+        if self.Naverage > 1 and not self.hardware_averaging and self.ind_average < self.Naverage - 1:
+            return
+        self.status_sig.emit(ThreadCommand('exposure_done'))
+
     def data_ready(self, data: DataToExport):
         """ Process the data received from the instrument plugin class
 
@@ -1350,15 +1583,15 @@ class DAQ_Detector(QObject):
         if do_averaging:  # to execute if the averaging has to be done software wise
             self.ind_average += 1
             if self.ind_average == 1:
-                self.datas = data.deepcopy()
-            else:
-                self.datas = data.average(self.datas, self.ind_average)
+                self.accumulator.reset()
+            self.accumulator.add(data)  # in place, the average being allocated only when emitted
 
             if self.show_averaging:
-                self.emit_temp_data(self.datas)
+                self.emit_temp_data(self.accumulator.get_data())
 
             if self.ind_average == self.Naverage:
                 self.average_done = True
+                self.datas = self.accumulator.get_data()
                 self.data_detector_sig.emit(self.datas)
                 self.ind_average = 0
         else:
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Process isolated detectors: the instrument plugin and its DAQ_Detector run in a subprocess, the DAQ_Viewer driving a
+DAQ_DetectorProcess with the same signals and ThreadCommands as a DAQ_Detector. The frames go through a shared memory
+ring buffer so that their arrays are neither serialized nor sent through a pipe
+"""
+import multiprocessing
+from multiprocessing.connection import Connection
+import threading
+import time
+
+from easydict import EasyDict as edict
+from qtpy import QtCore
+from qtpy.QtCore import QObject, Signal, Slot
+
+from pymodaq_data.data import DataToExport
+from pymodaq_utils.logger import set_logger, get_module_name
+from pymodaq_utils.utils import ThreadCommand
+from pymodaq_gui.parameter import Parameter
+
+from pymodaq.utils.data import take_ownership
+from pymodaq.utils.shared_memory import SharedMemoryRing
+
+logger = set_logger(get_module_name(__file__))
+
+
+def _serialize_settings(settings_parameter_dict: edict) -> dict:
+    """ Replace the Parameter of a settings change by its state to send it to another process"""
+    param = settings_parameter_dict['param']
+    return dict(path=list(settings_parameter_dict['path']), change=settings_parameter_dict['change'],
+                state=param.saveState() if isinstance(param, Parameter) else param)
+
+
+def _deserialize_settings(settings_dict: dict) -> edict:
+    state = settings_dict['state']
+    return edict(path=settings_dict['path'], change=settings_dict['change'],
+                 param=Parameter.create(**state) if isinstance(state, dict) else state)
+
+
+class DAQ_DetectorProcess(QObject):
+    """ Stand in for a DAQ_Detector running in a subprocess
+
+    Commands and settings changes are forwarded to the subprocess, while the status ThreadCommands and the data sent
+    back are re-emitted with the same signals as a DAQ_Detector. The emitted data are read-only views on the shared
+    memory, valid only during the emission: the slots connected to data_detector_sig have to be called directly and
+    to copy them, as DAQ_Viewer.show_data does. Temporary data are copied before being emitted.
+
+    The controller of the plugin lives in the subprocess and cannot be shared with other modules
+
+    Parameters
+    ----------
+    title: str
+    settings_parameter: Parameter
+        the settings of the DAQ_Viewer
+    detector_name: str
+    n_slots: int
+        the number of frames that can be in flight, new frames being dropped when they are all in use (live grab) or
+        the subprocess waiting for a free slot (single grab)
+    slot_size: int
+        the maximum size in bytes of a frame, larger frames being pickled through the pipe
+    """
+    status_sig = Signal(ThreadCommand)
+    data_detector_sig = Signal(DataToExport)
+    data_detector_temp_sig = Signal(DataToExport)
+    _message_sig = Signal(object)
+
+    def __init__(self, title: str, settings_parameter: Parameter, detector_name: str, n_slots: int = 4,
+                 slot_size: int = 2 ** 25):
+        super().__init__()
+        self.logger = set_logger(f'{logger.name}.{title}')
+        self._title = title
+        self.n_frames = 0
+        self.n_dropped = 0
+        self._closing = False
+        self._ended = False
+
+        self._ring = SharedMemoryRing(n_slots, slot_size)
+        context = multiprocessing.get_context('spawn')
+        command_reader, self._command_conn = context.Pipe(duplex=False)
+        self._status_conn, status_writer = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=run_detector, name=f'{title} detector', daemon=True,
+            args=(title, settings_parameter['main_settings', 'DAQ_type'], detector_name,
+                  settings_parameter['main_settings', 'wait_time'], self._ring.name, self._ring.n_slots,
+                  self._ring.slot_size, command_reader, status_writer))
+        self._process.start()
+        command_reader.close()
+        status_writer.close()
+
+        self._message_sig.connect(self._process_message)
+        self._receiver = threading.Thread(target=self._receive, daemon=True)
+        self._receiver.start()
+
+    @property
+    def title(self):
+        return self._title
+
+    @property
+    def pid(self) -> int:
+        return self._process.pid
+
+    @property
+    def ended(self) -> bool:
+        """True once the subprocess ended and the shared memory has been released"""
+        return self._ended
+
+    def _send(self, message: tuple):
+        try:
+            self._command_conn.send(message)
+        except (OSError, ValueError) as e:  # the subprocess ended
+            self.logger.warning(f'Could not send {message[0]} to the detector process: {str(e)}')
+        except Exception as e:  # not picklable
+            self.logger.exception(f'Could not send {message} to the detector process: {str(e)}')
+
+    def queue_command(self, command: ThreadCommand):
+        """ Forward a command to the DAQ_Detector of the subprocess, see DAQ_Detector.queue_command"""
+        if command.command == 'ini_detector':
+            params_state, controller = command.attribute
+            if controller is not None:
+                self.logger.warning('A controller cannot be shared with a detector running in its own process')
+            command = ThreadCommand('ini_detector', attribute=[params_state, None])
+        elif command.command == 'close':
+            self._closing = True
+        self._send(('command', command))
+
+    def update_settings(self, settings_parameter_dict: edict):
+        """ Forward a settings change to the DAQ_Detector of the subprocess, see DAQ_Detector.update_settings"""
+        self._send(('settings', _serialize_settings(settings_parameter_dict)))
+
+    def _receive(self):
+        """ Receive the messages of the subprocess from a python thread and re-emit them in the Qt thread of self"""
+        while True:
+            try:
+                message = self._status_conn.recv()
+            except (EOFError, OSError):
+                break
+            self._message_sig.emit(message)
+        self._process.join()
+        self._message_sig.emit(('ended', self._process.exitcode))
+
+    @Slot(object)
+    def _process_message(self, message: tuple):
+        if message[0] == 'status':
+            command: ThreadCommand = message[1]
+            if command.command == 'close':
+                self._send(('quit',))
+            self.status_sig.emit(command)
+
+        elif message[0] in ('data', 'temp'):
+            frame, n_dropped = message[1:]
+            dte = self._ring.get(frame)
+            try:
+                if message[0] == 'data':
+                    self.n_frames += 1
+                    self.data_detector_sig.emit(dte)
+                else:
+                    self.data_detector_temp_sig.emit(take_ownership(dte))
+            finally:
+                del dte
+                self._ring.release(frame)
+            if n_dropped != self.n_dropped:
+                self.n_dropped = n_dropped
+                self.status_sig.emit(ThreadCommand('update_main_settings',
+                                                   [['process', 'dropped_frames'], n_dropped, 'value']))
+
+        elif message[0] == 'ended':
+            self._ended = True
+            self._status_conn.close()
+            self._command_conn.close()
+            self._ring.close()
+            if not self._closing:
+                self.logger.error(f'The detector process ended unexpectedly (exit code {message[1]})')
+                self.status_sig.emit(ThreadCommand('close', [f'The detector process ended unexpectedly '
+                                                             f'(exit code {message[1]})', 'log']))
+
+    def terminate(self):
+        """ Kill the subprocess without closing the plugin"""
+        self._closing = True
+        self._process.terminate()
+
+    def wait_ended(self, timeout: float = 10.) -> bool:
+        """ Process the messages of the subprocess until it ended, asking it to close the plugin if not done yet
+
+        Parameters
+        ----------
+        timeout: float
+            delay in seconds after which the subprocess is terminated
+
+        Returns
+        -------
+        bool: True if the subprocess ended by itself
+        """
+        if not self._ended and not self._closing:
+            self.queue_command(ThreadCommand('close'))
+        start = time.perf_counter()
+        terminated = False
+        while not self._ended:
+            elapsed = time.perf_counter() - start
+            if not terminated and elapsed > timeout:
+                self.logger.warning(f'The detector process did not end within {timeout} s, terminating it')
+                self.terminate()
+                terminated = True
+            elif elapsed > timeout + 5:
+                self.logger.error('The detector process could not be terminated')
+                break
+            QtCore.QCoreApplication.processEvents()
+            time.sleep(0.005)
+        return self._ended and not terminated
+
+
+class _DetectorBridge(QObject):
+    """ Subprocess side: apply the received commands to the DAQ_Detector and send back its status and data"""
+    command_sig = Signal(object)
+
+    def __init__(self, detector, ring: SharedMemoryRing, status_conn: Connection):
+        super().__init__()
+        self.detector = detector
+        self.ring = ring
+        self.n_dropped = 0
+        self._status_conn = status_conn
+        self._stopping = False
+        self.command_sig.connect(self.process_message)
+        detector.status_sig.connect(self.send_status)
+        detector.data_detector_sig.connect(self.send_data)
+        detector.data_detector_temp_sig.connect(self.send_temp_data)
+
+    def receive(self, command_conn: Connection):
+        """ Receive the commands from a python thread, the command_sig signal queuing them in the Qt thread"""
+        while True:
+            try:
+                message = command_conn.recv()
+            except (EOFError, OSError):  # the main process ended
+                message = ('quit',)
+            self.command_sig.emit(message)
+            if message[0] == 'quit':
+                break
+
+    @Slot(object)
+    def process_message(self, message: tuple):
+        if message[0] == 'command':
+            self.detector.queue_command(message[1])
+        elif message[0] == 'settings':
+            self.detector.update_settings(_deserialize_settings(message[1]))
+        elif message[0] == 'quit':
+            self._stopping = True
+            QtCore.QCoreApplication.instance().quit()
+
+    def _send(self, message: tuple):
+        try:
+            self._status_conn.send(message)
+        except (OSError, ValueError):
+            pass  # the main process ended
+        except Exception as e:
+            logger.exception(f'Could not send {message[0]} to the main process: {str(e)}')
+
+    @Slot(ThreadCommand)
+    def send_status(self, command: ThreadCommand):
+        if command.command == 'ini_detector':  # the controller stays in this process
+            command = ThreadCommand('ini_detector', attribute=edict(command.attribute, controller=None))
+        self._send(('status', command))
+
+    @Slot(DataToExport)
+    def send_data(self, dte: DataToExport):
+        frame = self.ring.put(dte)
+        while frame is None and self.detector.single_grab and not self._stopping:
+            time.sleep(0.001)  # a single grab is awaited, its data cannot be dropped
+            frame = self.ring.put(dte)
+        if frame is None:
+            self.n_dropped += 1
+        else:
+            self._send(('data', frame, self.n_dropped))
+
+    @Slot(DataToExport)
+    def send_temp_data(self, dte: DataToExport):
+        frame = self.ring.put(dte)
+        if frame is not None:
+            self._send(('temp', frame, self.n_dropped))
+
+
+def run_detector(title: str, daq_type: str, detector_name: str, wait_time: int, ring_name: str, n_slots: int,
+                 slot_size: int, command_conn: Connection, status_conn: Connection):
+    """ Entry point of the subprocess of a DAQ_DetectorProcess, running a DAQ_Detector until asked to quit"""
+    from pymodaq.control_modules.daq_viewer import DAQ_Detector
+    from pymodaq.control_modules.viewer_utility_classes import params as daq_viewer_params
+
+    app = QtCore.QCoreApplication.instance()
+    if app is None:
+        app = QtCore.QCoreApplication([])
+    settings = Parameter.create(name='settings', type='group', children=daq_viewer_params)
+    settings.child('main_settings', 'DAQ_type').setValue(daq_type)
+    settings.child('main_settings', 'wait_time').setValue(wait_time)
+
+    ring = SharedMemoryRing(n_slots, slot_size, name=ring_name)
+    detector = DAQ_Detector(title, settings, detector_name)
+    bridge = _DetectorBridge(detector, ring, status_conn)
+    receiver = threading.Thread(target=bridge.receive, args=(command_conn,), daemon=True)
+    receiver.start()
+    app.exec_()
+
+    receiver.join(1)
+    ring.close()
+    status_conn.close()
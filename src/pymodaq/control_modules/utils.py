@@ -23,6 +23,7 @@ from pymodaq_gui.managers.parameter_manager import ParameterManager
 from pymodaq_gui.plotting.data_viewers import ViewersEnum
 
 from pymodaq.utils.tcp_ip.tcp_server_client import TCPClient
+from pymodaq.utils.tcp_ip.encoding import format_encoding
 from pymodaq.utils.exceptions import DetectorError
 from pymodaq.utils.leco.pymodaq_listener import ActorListener, LECOClientCommands, LECOCommands
 
@@ -86,11 +87,9 @@ class ViewerError(Exception):
 
 
 def get_viewer_plugins(daq_type, det_name):
+    """ Get the settings and the class of a detector plugin, importing only this plugin module"""
     parent_module = find_dict_in_list_from_key_val(DET_TYPES[daq_type], 'name', det_name)
-    match_name = daq_type.lower()
-    match_name = f'{match_name[0:3]}_{match_name[3:].upper()}viewer_'
-    obj = getattr(getattr(parent_module['module'], match_name + det_name),
-                  f'{match_name[0:7].upper()}{match_name[7:]}{det_name}')
+    obj = parent_module.get_class()
     params = getattr(obj, 'params')
     det_params = Parameter.create(name='Det Settings', type='group', children=params)
     return det_params, obj
@@ -172,15 +171,16 @@ class ControlModule(QObject):
         elif status.command == "close":
             try:
                 self.update_status(status.attribute[0])
-                self._hardware_thread.quit()
-                self._hardware_thread.wait()
-                finished = self._hardware_thread.isFinished()
-                if finished:
-                    pass
-                else:
-                    print('Thread still running')
-                    self._hardware_thread.terminate()
-                    self.update_status('thread is locked?!', 'log')
+                if self._hardware_thread is not None:  # None if the hardware runs in a subprocess
+                    self._hardware_thread.quit()
+                    self._hardware_thread.wait()
+                    finished = self._hardware_thread.isFinished()
+                    if finished:
+                        pass
+                    else:
+                        print('Thread still running')
+                        self._hardware_thread.terminate()
+                        self.update_status('thread is locked?!', 'log')
             except Exception as e:
                 logger.exception(f'Wrong call to the "close" command: \n{str(e)}')
 
@@ -436,7 +436,9 @@ class ParameterControlModule(ParameterManager, ControlModule):
     def connect_tcp_ip(self, params_state=None, client_type: str = "GRABBER") -> None:
         """Init a TCPClient in a separated thread to communicate with a distant TCp/IP Server
 
-        Use the settings: ip_address and port to specify the connection
+        Use the settings: ip_address and port to specify the connection and, for viewers, encoding and delta to
+        negotiate the compression of the data sent to the server, send_policy and send_queue_size to configure the
+        queue of the data waiting to be sent
 
         See Also
         --------
@@ -445,10 +447,21 @@ class ParameterControlModule(ParameterManager, ControlModule):
         if self.settings.child('main_settings', 'tcpip', 'connect_server').value():
             self._tcpclient_thread = QThread()
 
+            tcpip_settings = self.settings.child('main_settings', 'tcpip')
+            encoding = 'none'
+            send_options = dict([])
+            if 'encoding' in tcpip_settings.names:  # the data frames of the viewers can be compressed
+                encoding = format_encoding(tcpip_settings['encoding'], tcpip_settings['delta'])
+            if 'send_policy' in tcpip_settings.names:  # and dropped if the network is too slow
+                send_options = dict(send_policy=tcpip_settings['send_policy'],
+                                    send_queue_size=tcpip_settings['send_queue_size'])
+                tcpip_settings.child('tcp_dropped').setValue(0)
             tcpclient = TCPClient(self.settings.child('main_settings', 'tcpip', 'ip_address').value(),
                                   self.settings.child('main_settings', 'tcpip', 'port').value(),
                                   params_state=params_state,
-                                  client_type=client_type)
+                                  client_type=client_type,
+                                  encoding=encoding,
+                                  **send_options)
             tcpclient.moveToThread(self._tcpclient_thread)
             self._tcpclient_thread.tcpclient = tcpclient
             tcpclient.cmd_signal.connect(self.process_tcpip_cmds)
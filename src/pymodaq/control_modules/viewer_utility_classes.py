@@ -9,10 +9,13 @@ from easydict import EasyDict as edict
 
 import numpy as np
 from pymodaq.utils.math_utils import gauss1D, gauss2D
+from pymodaq.utils.averaging import AVERAGING_MODES
 from pymodaq_utils.utils import ThreadCommand, getLineInfo
 
 from pymodaq_utils.config import Config, get_set_local_dir
 from pymodaq.utils.tcp_ip.tcp_server_client import TCPServer, tcp_parameters
+from pymodaq.utils.tcp_ip.encoding import available_encodings
+from pymodaq.utils.tcp_ip.tcp_server_client import SEND_POLICIES
 from pymodaq_data.data import DataToExport, DataRaw
 from pymodaq_utils.warnings import deprecation_msg
 from pymodaq_utils.serialize.mysocket import Socket
@@ -48,15 +51,37 @@ params = [
         {'title': 'Plugin Config:', 'name': 'plugin_config', 'type': 'bool_push', 'label': 'Show Config', },
 
         {'title': 'Show data and process:', 'name': 'show_data', 'type': 'bool', 'value': True, },
-        {'title': 'Refresh time (ms):', 'name': 'refresh_time', 'type': 'float', 'value': 50., 'min': 0.},
+        {'title': 'Refresh time (ms):', 'name': 'refresh_time', 'type': 'float', 'value': 50., 'min': 0.,
+         'tip': 'Minimum time between two displayed live frames, the frames acquired meanwhile being only saved'},
+        {'title': 'Displayed frames:', 'name': 'displayed_frames', 'type': 'str', 'value': '0/0', 'readonly': True,
+         'tip': 'Number of displayed frames / number of acquired frames during the last live grab'},
         {'title': 'Naverage', 'name': 'Naverage', 'type': 'int', 'default': 1, 'value': 1, 'min': 1},
         {'title': 'Show averaging:', 'name': 'show_averaging', 'type': 'bool', 'default': False, 'value': False},
         {'title': 'Live averaging:', 'name': 'live_averaging', 'type': 'bool', 'default': False, 'value': False},
         {'title': 'N Live aver.:', 'name': 'N_live_averaging', 'type': 'int', 'default': 0, 'value': 0,
          'visible': False},
+        {'title': 'Live aver. mode:', 'name': 'live_averaging_mode', 'type': 'list', 'value': 'mean',
+         'limits': AVERAGING_MODES, 'visible': False,
+         'tip': 'mean: of all the frames, ema: exponential moving average, rolling: mean of the last frames'},
+        {'title': 'EMA weight:', 'name': 'live_averaging_alpha', 'type': 'float', 'value': 0.1, 'min': 0.001,
+         'max': 1., 'visible': False, 'tip': 'Weight of the newest frame in the ema mode'},
+        {'title': 'Rolling window:', 'name': 'live_averaging_window', 'type': 'int', 'value': 10, 'min': 1,
+         'visible': False, 'tip': 'Number of averaged frames in the rolling mode'},
         {'title': 'Wait time (ms):', 'name': 'wait_time', 'type': 'int', 'default': 0, 'value': 00, 'min': 0},
         {'title': 'Continuous saving:', 'name': 'continuous_saving_opt', 'type': 'bool', 'default': False,
          'value': False},
+        {'title': 'Process options:', 'name': 'process', 'type': 'group', 'visible': True, 'expanded': False,
+         'children': [
+             {'title': 'Run in a process:', 'name': 'in_process', 'type': 'bool', 'value': False,
+              'tip': 'Run the plugin in its own process (applied at the next initialization), the frames being passed'
+                     ' through shared memory. The controller of the plugin cannot then be shared with other modules'},
+             {'title': 'Buffer slots:', 'name': 'n_slots', 'type': 'int', 'value': 4, 'min': 2,
+              'tip': 'Number of frames that can be in flight between the process and the viewer'},
+             {'title': 'Slot size (MB):', 'name': 'slot_size', 'type': 'int', 'value': 32, 'min': 1,
+              'tip': 'Maximum size of a frame passed through shared memory, larger ones are pickled'},
+             {'title': 'Dropped frames:', 'name': 'dropped_frames', 'type': 'int', 'value': 0, 'readonly': True,
+              'tip': 'Live frames dropped because the viewer did not keep up with the process'},
+         ]},
         {'title': 'TCP/IP options:', 'name': 'tcpip', 'type': 'group', 'visible': True, 'expanded': False, 'children': [
             {'title': 'Connect to server:', 'name': 'connect_server', 'type': 'bool_push', 'label': 'Connect',
              'value': False},
@@ -64,6 +89,17 @@ params = [
             {'title': 'IP address:', 'name': 'ip_address', 'type': 'str',
              'value': config('network', 'tcp-server', 'ip')},
             {'title': 'Port:', 'name': 'port', 'type': 'int', 'value': config('network', 'tcp-server', 'port')},
+            {'title': 'Encoding:', 'name': 'encoding', 'type': 'list', 'limits': available_encodings(),
+             'value': 'none', 'tip': 'Compression of the data sent to the server, used if the server has it too'},
+            {'title': 'Delta frames:', 'name': 'delta', 'type': 'bool', 'value': False,
+             'tip': 'Send the data as differences with the previous ones, for slowly varying data'},
+            {'title': 'When sending late:', 'name': 'send_policy', 'type': 'list', 'limits': SEND_POLICIES,
+             'value': 'drop_oldest',
+             'tip': 'What to do with new data when the send queue is full: wait for the network or drop data'},
+            {'title': 'Send queue size:', 'name': 'send_queue_size', 'type': 'int', 'value': 4, 'min': 1,
+             'tip': 'Maximum number of data waiting to be sent to the server'},
+            {'title': 'Dropped frames:', 'name': 'tcp_dropped', 'type': 'int', 'value': 0, 'readonly': True,
+             'tip': 'Data dropped because the network did not keep up with the acquisition'},
         ]},
         {'title': 'LECO options:', 'name': 'leco', 'type': 'group', 'visible': True, 'expanded': False,
          'children': [
@@ -152,6 +188,7 @@ class DAQ_Viewer_base(QObject):
     """
     hardware_averaging = False
     live_mode_available = False
+    move_during_readout = False  # set to True if actuators may move once the exposure is over (see emit_exposure_done)
     data_grabed_signal = Signal(list)  # will be deprecated use dte_signal
     data_grabed_signal_temp = Signal(list)  # will be deprecated use dte_signal_temp
     dte_signal = Signal(DataToExport)
@@ -353,6 +390,19 @@ class DAQ_Viewer_base(QObject):
         else:
             print(status)
 
+    def emit_exposure_done(self):
+        """Let the scans know the exposure of the current grab is over and the actuators may move during the readout
+
+        To be called by plugins declaring the class attribute move_during_readout as True, before the (long) readout
+        and the emission of the data. When the averaging is done software wise, only the last of the Naverage grabs
+        is taken into account (see DAQ_Detector.exposure_done)
+        """
+        if self.move_during_readout:
+            if self.parent is not None:
+                self.parent.exposure_done()
+            else:
+                self.emit_status(ThreadCommand('exposure_done'))
+
     def update_scanner(self, scan_parameters):
         # todo check this because ScanParameters has been removed
         self.scan_parameters = scan_parameters
@@ -520,9 +570,9 @@ class DAQ_Viewer_TCP_server(DAQ_Viewer_base, TCPServer):
         sock.check_sended_with_serializer(data)
 
     def read_data(self, sock: Socket) -> DataToExport:
-        """Read data from the socket
+        """Read data from the socket, decoded if the client negotiated an encoding
         """
-        return DeSerializer(sock).dte_deserialization()
+        return self.read_dte(sock)
 
     def data_ready(self, data: DataToExport):
         """
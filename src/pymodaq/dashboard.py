@@ -8,13 +8,12 @@ import logging
 from pathlib import Path
 from importlib import import_module
 from packaging import version as version_mod
-from typing import Tuple, List, Any, TYPE_CHECKING
+from typing import Tuple, List, Dict, Any
 
 
 from qtpy import QtGui, QtWidgets, QtCore
 from qtpy.QtCore import Qt, QObject, Slot, QThread, Signal, QSize
 from qtpy.QtWidgets import QTableWidget, QTableWidgetItem, QCheckBox, QWidget, QLabel, QDialogButtonBox, QDialog
-from time import perf_counter
 import numpy as np
 
 from pymodaq_plugin_manager.manager import PluginManager
@@ -34,7 +33,7 @@ from pymodaq_gui.parameter import utils as putils
 from pymodaq_gui.managers.roi_manager import ROISaver
 from pymodaq_gui.utils.custom_app import CustomApp
 
-from pymodaq.utils.managers.modules_manager import ModulesManager
+from pymodaq.utils.managers.modules_manager import ModulesManager, ModulesInitializer, ModulesDoneWaiter
 from pymodaq.utils.managers.preset_manager import PresetManager
 from pymodaq.utils.managers.overshoot_manager import OvershootManager
 from pymodaq.utils.managers.remote_manager import RemoteManager
@@ -182,6 +181,7 @@ class DashBoard(CustomApp):
         self.log_module = None
         self.pid_module = None
         self.pid_window = None
+        self.modules_init_times: Dict[str, float] = dict([])  # init time of each module of the loaded preset
         self.retriever_module = None
         self.database_module = None
         self.extensions = dict([])
@@ -1059,8 +1059,10 @@ class DashBoard(CustomApp):
             #################################################################
             #######################
 
-            ind_det = -1
+            # first create all modules, then initialize them group by group (see ModulesInitializer)
+            init_groups = []
             for plug_IDs in plugins_sorted:
+                init_group = []
                 for ind_plugin, plugin in enumerate(plug_IDs):
                     plug_name = plugin['value'].child('name').value()
                     plug_init = plugin['value'].child('init').value()
@@ -1070,70 +1072,36 @@ class DashBoard(CustomApp):
 
                     if plugin['type'] == 'move':
                         plug_type = plug_settings.child('main_settings', 'move_type').value()
-                        self.add_move(plug_name, plug_settings, plug_type, move_docks, move_forms,
-                                      actuators_modules)
-
-                        if ind_plugin == 0:  # should be a master type plugin
-                            if plugin['status'] != "Master":
-                                raise MasterSlaveError(f'The instrument {plug_name} should'
-                                                       f' be defined as Master')
-                            if plug_init:
-                                actuators_modules[-1].init_hardware_ui()
-                                QtWidgets.QApplication.processEvents()
-                                self.poll_init(actuators_modules[-1])
-                                QtWidgets.QApplication.processEvents()
-                                master_controller = actuators_modules[-1].controller
-                            elif plugin['status'] == "Master" and len(plug_IDs) > 1:
-                                raise MasterSlaveError(
-                                    f'The instrument {plug_name} defined as Master has to be '
-                                    f'initialized (init checked in the preset) in order to init '
-                                    f'its associated slave instrument'
-                                )
-                        else:
-                            if plugin['status'] != "Slave":
-                                raise MasterSlaveError(f'The instrument {plug_name} should'
-                                                       f' be defined as slave')
-                            if plug_init:
-                                actuators_modules[-1].controller = master_controller
-                                actuators_modules[-1].init_hardware_ui()
-                                QtWidgets.QApplication.processEvents()
-                                self.poll_init(actuators_modules[-1])
-                                QtWidgets.QApplication.processEvents()
+                        module = self.add_move(plug_name, plug_settings, plug_type, move_docks, move_forms,
+                                               actuators_modules)
                     else:
-                        ind_det += 1
-                        self.add_det(plug_name, plug_settings, det_docks_settings, det_docks_viewer,
-                                     detector_modules)
+                        module = self.add_det(plug_name, plug_settings, det_docks_settings, det_docks_viewer,
+                                              detector_modules)
                         QtWidgets.QApplication.processEvents()
-
-                        if ind_plugin == 0:  # should be a master type plugin
-                            if plugin['status'] != "Master":
-                                raise MasterSlaveError(f'The instrument {plug_name} should'
-                                                       f' be defined as Master')
-                            if plug_init:
-                                detector_modules[-1].init_hardware_ui()
-                                QtWidgets.QApplication.processEvents()
-                                self.poll_init(detector_modules[-1])
-                                QtWidgets.QApplication.processEvents()
-                                master_controller = detector_modules[-1].controller
-                            elif plugin['status'] == "Master" and len(plug_IDs) > 1:
-                                raise MasterSlaveError(
-                                    f'The instrument {plug_name} defined as Master has to be '
-                                    f'initialized (init checked in the preset) in order to init '
-                                    f'its associated slave instrument'
-                                )
-                        else:
-                            if plugin['status'] != "Slave":
-                                raise MasterSlaveError(f'The instrument {plug_name} should'
-                                                       f' be defined as Slave')
-                            if plug_init:
-                                detector_modules[-1].controller = master_controller
-                                detector_modules[-1].init_hardware_ui()
-                                QtWidgets.QApplication.processEvents()
-                                self.poll_init(detector_modules[-1])
-                                QtWidgets.QApplication.processEvents()
-
-                        detector_modules[-1].settings.child('main_settings', 'overshoot').show()
-                        detector_modules[-1].overshoot_signal[bool].connect(self.stop_moves)
+                        module.settings.child('main_settings', 'overshoot').show()
+                        module.overshoot_signal[bool].connect(self.stop_moves)
+
+                    if ind_plugin == 0:  # should be a master type plugin
+                        if plugin['status'] != "Master":
+                            raise MasterSlaveError(f'The instrument {plug_name} should'
+                                                   f' be defined as Master')
+                        if not plug_init and len(plug_IDs) > 1:
+                            raise MasterSlaveError(
+                                f'The instrument {plug_name} defined as Master has to be '
+                                f'initialized (init checked in the preset) in order to init '
+                                f'its associated slave instrument'
+                            )
+                    elif plugin['status'] != "Slave":
+                        raise MasterSlaveError(f'The instrument {plug_name} should'
+                                               f' be defined as Slave')
+                    init_group.append((module, plug_init))
+                init_groups.append(init_group)
+
+            self.splash_sc.showMessage('Initializing modules')
+            initializer = ModulesInitializer(init_groups)
+            initializer.run(timeout_ms=60000 * max([len(group) for group in init_groups] + [1]))
+            self.modules_init_times = initializer.init_times
+            logger.info(initializer.report())
 
             QtWidgets.QApplication.processEvents()
             # restore dock state if saved
@@ -1152,15 +1120,17 @@ class DashBoard(CustomApp):
             return actuators_modules, detector_modules
 
     def poll_init(self, module):
-        is_init = False
-        tstart = perf_counter()
-        while not is_init:
-            QThread.msleep(1000)
-            QtWidgets.QApplication.processEvents()
-            is_init = module.initialized_state
-            if perf_counter() - tstart > 60:  # timeout of 60sec
-                break
-        return is_init
+        """Wait (processing events) for the module to report its initialization, with a timeout of 60s"""
+        if not module.initialized_state:
+            waiter = ModulesDoneWaiter()
+            waiter.arm(1)
+            slot = lambda state: waiter.notify()
+            module.init_signal.connect(slot)
+            try:
+                waiter.wait(60000)
+            finally:
+                module.init_signal.disconnect(slot)
+        return module.initialized_state
 
     def set_roi_configuration(self, filename):
         if not isinstance(filename, Path):
@@ -468,12 +468,15 @@ class DAQ_Logging(QObject):
     def connect_detectors(self, connect=True):
         """Connect detectors to DAQ_Logging do_save_continuous method
 
+        The data exported by the viewers in live grab (ROIs...) are logged too
+
         Parameters
         ----------
         connect: bool
             If True make the connection else disconnect
         """
         self.modules_manager.connect_detectors(connect=connect, slot=self.do_save_continuous)
+        self.modules_manager.connect_detectors(connect=connect, slot=self.do_save_continuous, signal='viewers_done')
 
     def update_connect_detectors(self):
         try:
@@ -1,9 +1,10 @@
 from contextlib import contextmanager
 import logging
 import datetime
-from typing import List
+from threading import Thread, Event, Lock
+from typing import List, Dict, Tuple
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy_utils import database_exists, create_database
 
@@ -38,29 +39,201 @@ class DBLogHandler(logging.StreamHandler):
         self.dblogger.add_log(msg)
 
 
+class DbBatchWriter:
+    """Buffer rows to be inserted into the database tables and bulk insert them from a background thread
+
+    Rows are inserted (one executemany per table) when batch_size rows are pending or every flush_period seconds.
+    Stopping the writer inserts all pending rows.
+
+    When a batch cannot be inserted, its rows are inserted one by one so that a single bad row does not block the
+    others. The rows still failing are retried on the next flushes then dropped after max_attempts insertions.
+    Beyond max_pending rows waiting to be inserted, the new rows are dropped.
+
+    Parameters
+    ----------
+    engine: Engine
+        the SQLAlchemy engine connected to the database
+    batch_size: int
+        number of pending rows triggering an insertion
+    flush_period: float
+        maximum time in seconds a row stays pending
+    max_pending: int
+        maximum number of rows waiting to be inserted
+    max_attempts: int
+        number of single row insertions of a failing row before it is dropped
+    """
+
+    def __init__(self, engine, batch_size=500, flush_period=1., max_pending=100000, max_attempts=3):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_period = flush_period
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+
+        self._rows: Dict[type, List[dict]] = dict([])
+        self._failed_rows: List[Tuple[type, dict, int]] = []  # with their number of failed single insertions
+        self._n_pending = 0
+        self._overflow = False
+        self._lock = Lock()
+        self._wake = Event()
+        self._stop = False
+        self._thread: Thread = None
+        self.n_inserted = 0
+        self.n_dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def n_pending(self) -> int:
+        return self._n_pending
+
+    def start(self):
+        if not self.running:
+            self._stop = False
+            self._thread = Thread(target=self._run, name='DbBatchWriter', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the thread after having inserted all pending rows"""
+        if self.running:
+            self._stop = True
+            self._wake.set()
+            self._thread.join()
+        self._thread = None
+        self.flush()
+        if self._n_pending > 0:
+            logger.error(f'{self._n_pending} rows could not be inserted into the database')
+
+    def add_rows(self, model: type, rows: List[dict]):
+        """Add rows to be inserted into the table of a given model
+
+        Parameters
+        ----------
+        model: type
+            the declarative class of the table, for instance Data0D
+        rows: list of dict
+            column names as keys
+        """
+        if len(rows) == 0:
+            return
+        with self._lock:
+            n_room = max(self.max_pending - self._n_pending, 0)
+            if len(rows) > n_room:
+                if not self._overflow:
+                    logger.warning(f'More than {self.max_pending} rows waiting to be inserted into the database,'
+                                   f' the new ones are dropped')
+                self._overflow = True
+                self.n_dropped += len(rows) - n_room
+                rows = rows[:n_room]
+                if len(rows) == 0:
+                    return
+            else:
+                self._overflow = False
+            if model not in self._rows:
+                self._rows[model] = []
+            self._rows[model].extend(rows)
+            self._n_pending += len(rows)
+            if self._n_pending >= self.batch_size:
+                self._wake.set()
+
+    def flush(self):
+        """Insert all pending rows, one bulk insert per table within a single transaction
+
+        The rows that failed to be inserted on previous flushes are inserted one by one
+        """
+        with self._lock:
+            rows, self._rows = self._rows, dict([])
+            failed_rows, self._failed_rows = self._failed_rows, []
+            self._n_pending = 0
+        self._insert_one_by_one(failed_rows)
+        n_rows = sum([len(model_rows) for model_rows in rows.values()])
+        if n_rows == 0:
+            return
+        try:
+            with self.engine.begin() as connection:
+                for model in rows:
+                    connection.execute(insert(model.__table__), rows[model])
+            self.n_inserted += n_rows
+        except Exception as e:
+            logger.error(f'Could not insert {n_rows} rows into the database, inserting them one by one: {str(e)}')
+            self._insert_one_by_one([(model, row, 0) for model in rows for row in rows[model]])
+
+    def _insert_one_by_one(self, rows: List[Tuple[type, dict, int]]):
+        """Insert rows one at a time, the failing ones being retried on next flush or dropped after max_attempts
+
+        Parameters
+        ----------
+        rows: list of tuple
+            the model, the row and its number of failed single insertions
+        """
+        failed_rows = []
+        n_dropped = 0
+        error = ''
+        for model, row, n_attempts in rows:
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(insert(model.__table__), [row])
+                self.n_inserted += 1
+            except Exception as e:
+                error = str(e)
+                if n_attempts + 1 >= self.max_attempts:
+                    n_dropped += 1
+                else:
+                    failed_rows.append((model, row, n_attempts + 1))
+        if n_dropped > 0:
+            self.n_dropped += n_dropped
+            logger.error(f'{n_dropped} rows dropped after {self.max_attempts} failed insertions into the database:'
+                         f' {error}')
+        if len(failed_rows) > 0:
+            with self._lock:
+                self._failed_rows.extend(failed_rows)
+                self._n_pending += len(failed_rows)
+
+    def _run(self):
+        while not self._stop:
+            self._wake.wait(self.flush_period)
+            self._wake.clear()
+            self.flush()
+
+
 class DbLogger:
     user = config('network', 'logging', 'user', 'username')
     user_pwd = config('network', 'logging', 'user', 'pwd')
 
     def __init__(self, database_name, ip_address=config('network', 'logging', 'sql', 'ip'),
-                 port=config('network', 'logging', 'sql', 'port'), save2D=False):
+                 port=config('network', 'logging', 'sql', 'port'), save2D=False, url: str = None,
+                 batch_size=500, flush_period=1.):
         """
 
         Parameters
         ----------
-        models_base
-        ip_address
-        port
-        database_name
+        database_name: str
+        ip_address: str
+        port: int
+        save2D: bool
+        url: str
+            if specified, the database url to be used instead of the postgresql one built from the other
+            parameters, for instance sqlite:///path/to/file.db
+        batch_size: int
+            number of pending rows triggering an insertion into the database
+        flush_period: float
+            maximum time in seconds between the logging of data and their insertion into the database
         """
 
         self.ip_address = ip_address
         self.port = port
         self.database_name = database_name
+        self._url = url
 
         self.engine = None
         self.Session = None
         self._save2D = save2D
+        self._batch_size = batch_size
+        self._flush_period = flush_period
+        self._writer: DbBatchWriter = None
+        self._module_ids: Dict[str, int] = dict([])
 
     @property
     def save2D(self):
@@ -83,13 +256,17 @@ class DbLogger:
         finally:
             session.close()
 
+    @property
+    def url(self) -> str:
+        if self._url is not None:
+            return self._url
+        return f"postgresql://{self.user}:{self.user_pwd}@{self.ip_address}:{self.port}/{self.database_name}"
+
     def connect_db(self):
-        url = f"postgresql://{self.user}:{self.user_pwd}@{self.ip_address}:"\
-              f"{self.port}/{self.database_name}"
+        url = self.url
         logger.debug(f'Connecting database using: {url}')
         try:
-            self.engine = create_engine(f"postgresql://{self.user}:{self.user_pwd}@{self.ip_address}:"
-                                        f"{self.port}/{self.database_name}")
+            self.engine = create_engine(url)
         except ModuleNotFoundError as e:
             messagebox('warning', 'ModuleError',
                        f'The postgresql backend *psycopg2* has not been installed.\n'
@@ -107,10 +284,21 @@ class DbLogger:
 
         self.create_table()
         self.Session = sessionmaker(bind=self.engine)
+        self._module_ids = dict([])
+        self._writer = DbBatchWriter(self.engine, batch_size=self._batch_size, flush_period=self._flush_period)
+        self._writer.start()
         logger.debug(f'Database Connected')
         return True
 
+    def flush(self):
+        """Insert all pending data into the database"""
+        if self._writer is not None:
+            self._writer.flush()
+
     def close(self):
+        if self._writer is not None:
+            self._writer.stop()  # no data loss: pending rows are inserted
+            self._writer = None
         if self.engine is not None:
             self.engine.dispose()
 
@@ -172,44 +360,57 @@ class DbLogger:
             for mod in modules:
                 if mod['name'] not in existing_modules:
                     session.add(ControlModule(name=mod['name'], module_type=module_type,
-                                              settings_xml=mod['xml_settings']))
+                                              settings_xml=mod.get('xml_settings', '')))
+
+    def get_module_id(self, module_name: str, module_type='DAQ_Viewer') -> int:
+        """Get the id of a control module from its name, creating it in the database if needed
+
+        Ids are cached so that the database is only queried once per module
+        """
+        if module_name not in self._module_ids:
+            with self.session_scope() as session:
+                if session.query(ControlModule).filter_by(name=module_name).count() == 0:
+                    session.add(ControlModule(name=module_name, module_type=module_type, settings_xml=''))
+                    session.flush()
+                # detector/actuator names should/are unique
+                self._module_ids[module_name] = session.query(ControlModule).filter_by(name=module_name).one().id
+        return self._module_ids[module_name]
 
     def add_config(self, config_settings):
         with self.session_scope() as session:
             session.add(Configuration(timestamp=datetime.datetime.now().timestamp(), settings_xml=config_settings))
 
     def add_log(self, log):
-        with self.session_scope() as session:
-            session.add(LogInfo(log))
+        if self._writer is not None:
+            self._writer.add_rows(LogInfo, [dict(value=log)])
+        else:
+            with self.session_scope() as session:
+                session.add(LogInfo(value=log))
 
     def add_data(self, data: DataToExport):
-        with self.session_scope() as session:
-            time_stamp = data.timestamp
-            module_name = data.name
+        """Buffer the data to be inserted into the database by the batch writer
 
-            if session.query(ControlModule).filter_by(name=module_name).count() == 0:
-                self.add_control_modules(session, dict(name=module_name), data.control_module)
+        The database is only queried the first time a given control module is logging data
+        """
+        module_id = self.get_module_id(data.name, data.control_module)
 
-            module_id = session.query(ControlModule).filter_by(name=module_name).one().id  # detector/actuator names should/are unique
+        self._writer.add_rows(Data0D, [
+            dict(timestamp=dwa.timestamp, control_module_id=module_id, channel=dwa.labels[ind],
+                 value=float(data_array[0]))
+            for dwa in data.get_data_from_dim('Data0D') for ind, data_array in enumerate(dwa)])
 
-            for dwa in data.get_data_from_dim('Data0D'):
-                for ind, data_array in enumerate(dwa):
-                    session.add(Data0D(timestamp=dwa.timestamp, control_module_id=module_id, channel=dwa.labels[ind],
-                                       value=float(data_array[0])))
+        self._writer.add_rows(Data1D, [
+            dict(timestamp=dwa.timestamp, control_module_id=module_id, channel=dwa.labels[ind],
+                 value=data_array.tolist())
+            for dwa in data.get_data_from_dim('Data1D') for ind, data_array in enumerate(dwa)])
 
-            for dwa in data.get_data_from_dim('Data1D'):
-                for ind, data_array in enumerate(dwa):
-                    session.add(Data1D(timestamp=dwa.timestamp, control_module_id=module_id,
-                                       channel=dwa.labels[ind],
-                                       value=data_array.tolist()))
-            if self.save2D:
-                for dwa in data.get_data_from_dim('Data2D'):
-                    for ind, data_array in enumerate(dwa):
-                        session.add(Data2D(timestamp=dwa.timestamp, control_module_id=module_id,
-                                           channel=dwa.labels[ind],
-                                           value=data_array.tolist()))
+        if self.save2D:
+            self._writer.add_rows(Data2D, [
+                dict(timestamp=dwa.timestamp, control_module_id=module_id, channel=dwa.labels[ind],
+                     value=data_array.tolist())
+                for dwa in data.get_data_from_dim('Data2D') for ind, data_array in enumerate(dwa)])
 
-            # not yet dataND as db should not know where to save these datas
+        # not yet dataND as db should not know where to save these datas
 
 
 class DbLoggerGUI(DbLogger, ParameterManager):
@@ -288,10 +489,10 @@ class DataBaseLogger(AbstractLogger):
             self.settings.child('N_saved').value() + 1)
 
     def stop_logger(self):
-        pass
+        self.dblogger.flush()
 
     def close(self):
-        pass
+        self.dblogger.close()
 
 
 if __name__ == '__main__':
@@ -1,7 +1,7 @@
 import datetime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, JSON
 from sqlalchemy.dialects.postgresql import ARRAY as Array
 
 
@@ -81,7 +81,7 @@ class Data1D(Base):
     timestamp = Column(Integer, nullable=False, index=True)
     control_module_id = Column(Integer, ForeignKey('control_modules.id'), index=True)
     channel = Column(String(128))
-    value = Column(Array(Float, dimensions=1))
+    value = Column(Array(Float, dimensions=1).with_variant(JSON, 'sqlite'))  # sqlite has no ARRAY type
 
     def __repr__(self):
         return f"<Data1D(channel='{self.channel}', timestamp='{self.timestamp}', value='{self.value}')>"
@@ -94,7 +94,7 @@ class Data2D(Base):
     timestamp = Column(Integer, nullable=False, index=True)
     control_module_id = Column(Integer, ForeignKey('control_modules.id'), index=True)
     channel = Column(String(128))
-    value = Column(Array(Float, dimensions=2))
+    value = Column(Array(Float, dimensions=2).with_variant(JSON, 'sqlite'))
 
     def __repr__(self):
         return f"<Data2D(channel='{self.channel}', timestamp='{self.timestamp}', value='{self.value}')>"
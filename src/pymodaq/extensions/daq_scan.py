@@ -7,12 +7,14 @@ Contains all objects related to the DAQScan module, to do automated scans, savin
 """
 from __future__ import annotations
 from collections import OrderedDict
+from contextlib import nullcontext
 import logging
 import os
 from pathlib import Path
 import sys
 import tempfile
-from typing import List, Tuple, TYPE_CHECKING
+from time import perf_counter, time
+from typing import Dict, List, Tuple, Union, TYPE_CHECKING
 
 import numpy as np
 from qtpy import QtWidgets, QtCore, QtGui
@@ -35,12 +37,15 @@ from pymodaq_gui.h5modules.saving import H5Saver
 
 from pymodaq.utils.scanner.scanner import Scanner
 from pymodaq.utils.managers.batchscan_manager import BatchScanner
-from pymodaq.utils.managers.modules_manager import ModulesManager
-from pymodaq.post_treatment.load_and_plot import LoaderPlotter
+from pymodaq.utils.managers.modules_manager import ModulesManager, ModulesDoneWaiter
+from pymodaq.post_treatment.load_and_plot import LoaderPlotter, LiveDataBuffer
 from pymodaq.extensions.daq_scan_ui import DAQScanUI
 from pymodaq.utils.h5modules import module_saving
 from pymodaq.utils.scanner.scan_selector import ScanSelector, SelectorItem
-from pymodaq.utils.data import DataActuator
+from pymodaq.utils.scanner.streaming import StreamBinner, ReadbackInterpolator, get_stream_waypoints
+from pymodaq.utils.scanner.profiler import StepProfiler
+from pymodaq.utils.averaging import RunningStatistics
+from pymodaq.utils.data import DataActuator, DataFromPlugins
 
 
 if TYPE_CHECKING:
@@ -52,6 +57,9 @@ logger = set_logger(get_module_name(__file__))
 
 SHOW_POPUPS = config('scan', 'show_popups')
 
+SCAN_MODES = ['Stop and Go', 'Streaming', 'Pipelined']
+AVERAGE_MODES = ['Repetitions', 'Running mean']
+
 
 class DAQ_ScanException(Exception):
     """Raised when an error occur within the DAQScan"""
@@ -60,10 +68,12 @@ class DAQ_ScanException(Exception):
 
 class ScanDataTemp:
     """Convenience class to hold temporary data to be plotted in the live plots"""
-    def __init__(self, scan_index: int, indexes: Tuple[int], data: data_mod.DataToExport):
+    def __init__(self, scan_index: int, indexes: Tuple[int], data: data_mod.DataToExport,
+                 nav_values: List[float] = None):
         self.scan_index = scan_index
         self.indexes = indexes
         self.data = data
+        self.nav_values = nav_values  # positions of the step when not known in advance (adaptive scans)
 
 
 class DAQScan(QObject, ParameterManager):
@@ -87,6 +97,20 @@ class DAQScan(QObject, ParameterManager):
         ]},
         {'title': 'Scan options', 'name': 'scan_options', 'type': 'group', 'children': [
             {'title': 'Naverage:', 'name': 'scan_average', 'type': 'int', 'value': 1, 'min': 1},
+            {'title': 'Average mode:', 'name': 'average_mode', 'type': 'list', 'limits': AVERAGE_MODES,
+             'value': AVERAGE_MODES[0],
+             'tip': 'Repetitions: each repetition is saved along an extra Average axis. Running mean: only the mean'
+                    ' at each scan position, with its standard error, is accumulated and saved'},
+            {'title': 'Keep repetitions:', 'name': 'keep_repetitions', 'type': 'bool', 'value': False,
+             'tip': 'In Running mean mode, also save the raw repetitions in a Repetitions group of the scan node'},
+            {'title': 'Scan mode:', 'name': 'scan_mode', 'type': 'list', 'limits': SCAN_MODES,
+             'value': SCAN_MODES[0],
+             'tip': 'Stop and Go: move, grab and wait at each step. Streaming: actuators follow the scan trajectory'
+                    ' while detectors grab continuously, each frame being stored at the nearest scan position.'
+                    ' Pipelined: the move to the next step is started as soon as the detectors exposure is over and'
+                    ' overlaps with the readout, saving and plotting of the current step'},
+            {'title': 'Fly along lines:', 'name': 'fly_lines', 'type': 'bool', 'value': True,
+             'tip': 'In Streaming mode, cover aligned scan positions with a single continuous move'},
         ]},
 
         {'title': 'Plotting options', 'name': 'plot_options', 'type': 'group', 'children': [
@@ -99,6 +123,12 @@ class DAQScan(QObject, ParameterManager):
              'value': True},
             {'title': 'Refresh Plots (ms)', 'name': 'refresh_live', 'type': 'int',
              'value': 1000, 'visible': False},
+            {'title': 'Live memory (MB)', 'name': 'live_memory', 'type': 'int', 'value': 1000, 'min': 0,
+             'tip': 'Maximum memory used to hold the live plotted data. Larger scans are buffered into a'
+                    ' temporary file'},
+            {'title': 'Adaptive grid points', 'name': 'adaptive_grid', 'type': 'int', 'value': 100, 'min': 2,
+             'tip': 'Number of points along each axis of the grid on which the live data of adaptive scans are'
+                    ' interpolated'},
             ]},
     ]
 
@@ -150,11 +180,15 @@ class DAQScan(QObject, ParameterManager):
         self.modules_manager.settings.child('actuators_positions').setOpts(expanded=False)
         self.modules_manager.detectors_changed.connect(self.clear_plot_from)
 
-        self.module_and_data_saver = module_saving.ScanSaver(self)
+        self.module_and_data_saver = module_saving.ScanSaver(self, asynchronous=True)
 
         self.extended_saver: data_saving.DataToExportExtendedSaver = None
         self.h5temp: H5Saver = None
         self.temp_path: tempfile.TemporaryDirectory = None
+        self.live_buffer: LiveDataBuffer = None
+        self._live_nav_axes_set = False
+        self.profiler: StepProfiler = None
+        self._timings_shown_at = 0.
 
         self.h5saver.settings.child('do_save').hide()
         self.h5saver.settings.child('custom_name').hide()
@@ -223,6 +257,7 @@ class DAQScan(QObject, ParameterManager):
                 * quit
                 * ini_positions
                 * start
+                * resume
                 * start_batch
                 * stop
                 * move_at
@@ -240,6 +275,8 @@ class DAQScan(QObject, ParameterManager):
             self.set_ini_positions()
         elif cmd.command == 'start':
             self.start_scan()
+        elif cmd.command == 'resume':
+            self.resume_scan()
         elif cmd.command == 'start_batch':
             self.start_scan_batch()
         elif cmd.command == 'stop':
@@ -275,12 +312,8 @@ class DAQScan(QObject, ParameterManager):
             quit_fun
         """
         try:
-            if self.temp_path is not None:
-                try:
-                    self.h5temp.close()
-                    self.temp_path.cleanup()
-                except Exception as e:
-                    logger.exception(str(e))
+            self._close_live_file()
+            self.module_and_data_saver.stop_writer()
 
             self.close_file()
             self.mainwindow.close()
@@ -390,7 +423,8 @@ class DAQScan(QObject, ParameterManager):
 
     def show_file_content(self):
         try:
-            self.h5saver.show_file_content()
+            with module_saving.h5_lock:
+                self.h5saver.show_file_content()
         except Exception as e:
             logger.exception(str(e))
 
@@ -439,7 +473,8 @@ class DAQScan(QObject, ParameterManager):
         if not os.path.isdir(self.h5saver.settings['base_path']):
             os.mkdir(self.h5saver.settings['base_path'])
         filename = gutils.file_io.select_file(self.h5saver.settings['base_path'], save=True, ext='h5')
-        self.h5saver.h5_file.copy_file(str(filename), overwrite=True)
+        with module_saving.h5_lock:
+            self.h5saver.h5_file.copy_file(str(filename), overwrite=True)
 
     def save_metadata(self, node, type_info='dataset_info'):
         """
@@ -549,7 +584,8 @@ class DAQScan(QObject, ParameterManager):
                 self.save_metadata(self.h5saver.raw_group, 'dataset_info')
 
             if self.navigator is not None:
-                self.navigator.update_h5file(self.h5saver.h5_file)
+                with module_saving.h5_lock:
+                    self.navigator.update_h5file(self.h5saver.h5_file)
                 self.navigator.settings.child('settings', 'filepath').setValue(self.h5saver.h5_file.filename)
 
             return res
@@ -564,7 +600,7 @@ class DAQScan(QObject, ParameterManager):
         self.scan_attributes.child('scan_info', 'scan_sub_type').setValue(
             self.scanner.settings.child('scan_sub_type').value())
         scan_node = self.module_and_data_saver.get_set_node(new=False)
-        if scan_node.attrs['scan_done']:
+        if self._is_scan_node_used(scan_node):
             scan_name = self.module_and_data_saver.get_next_node_name()
         else:
             scan_name = scan_node.name
@@ -575,6 +611,11 @@ class DAQScan(QObject, ParameterManager):
         res = self.set_metadata_about_current_scan()
         return res
 
+    def _is_scan_node_used(self, scan_node) -> bool:
+        """A scan node is reused for the next scan unless the scan is done or has been interrupted (it then holds
+        the journal of its written steps)"""
+        return scan_node.attrs['scan_done'] or self.module_and_data_saver.has_progress(scan_node)
+
     #  PROCESS MODIFICATIONS
     def update_actuators(self, actuators: List[str]):
         self.scanner.actuators = self.modules_manager.actuators
@@ -660,6 +701,10 @@ class DAQScan(QObject, ParameterManager):
         * "Update_scan_index"
         * "Scan_done"
         * "Timeout"
+        * "add_data"
+        * "add_nav_axes"
+        * "start_streaming": start the continuous grab of the detectors
+        * "stop_streaming": stop the continuous grab of the detectors
         """
         if status.command == "Update_Status":
             self.update_status(status.attribute, wait_time=self.wait_time)
@@ -670,11 +715,19 @@ class DAQScan(QObject, ParameterManager):
             self.ui.set_scan_step(status.attribute[0] + 1)
             self.ind_average = status.attribute[1]
             self.ui.set_scan_step_average(status.attribute[1] + 1)
+            if self.profiler is not None and perf_counter() - self._timings_shown_at > 0.5:
+                self._timings_shown_at = perf_counter()
+                self.ui.set_timings(self.profiler.stats())
 
         elif status.command == "Scan_done":
             self.modules_manager.reset_signals()
             self.live_timer.stop()
             self.ui.set_scan_done()
+            self.module_and_data_saver.stop_writer()  # all pending data are written before the file is closed
+            if self.profiler is not None:
+                self.ui.set_timings(self.profiler.stats())
+                self.module_and_data_saver.add_timings(self.profiler.to_dte())
+            self.module_and_data_saver.stop_progress()
             scan_node = self.module_and_data_saver.get_last_node()
             scan_node.attrs['scan_done'] = True
             self.module_and_data_saver.flush()
@@ -705,58 +758,94 @@ class DAQScan(QObject, ParameterManager):
         elif status.command == 'add_nav_axes':
             self.module_and_data_saver.add_nav_axes(status.attribute)
 
+        elif status.command == 'start_streaming':
+            for det in self.modules_manager.detectors:
+                det.grab_data(grab_state=True)
+
+        elif status.command == 'stop_streaming':
+            for det in self.modules_manager.detectors:
+                det.stop_grab()
+
     ############
     #  PLOTTING
 
-    def save_temp_live_data(self, scan_data: ScanDataTemp):
-        if scan_data.scan_index == 0:
-            nav_axes = self.scanner.get_nav_axes()
-            Naverage = self.settings['scan_options', 'scan_average']
-            if Naverage > 1:
-                for nav_axis in nav_axes:
-                    nav_axis.index += 1
-                nav_axes.append(data_mod.Axis('Average',
-                                              data=np.linspace(0, Naverage - 1, Naverage),
-                                              index=0))
+    def _profile(self, scan_index: int, event: str):
+        """Record an event of the current step of the scan in the profiler"""
+        if self.profiler is not None:
+            self.profiler.mark(self.ind_average * len(self.scanner.positions) + scan_index, event)
 
-            self.extended_saver.add_nav_axes(self.h5temp.raw_group, nav_axes)
+    def save_temp_live_data(self, scan_data: ScanDataTemp):
+        self._profile(scan_data.scan_index, 'plot_start')
+        self._save_temp_live_data(scan_data)
+        self._profile(scan_data.scan_index, 'plot_done')
+
+    def _live_file_lock(self):
+        """The lock to hold while accessing the live data, only needed when they are spilled over a temporary h5
+        file (PyTables being used at the same time by the writer thread of the scan saver)"""
+        return module_saving.h5_lock if self.live_buffer is None else nullcontext()
+
+    def _save_temp_live_data(self, scan_data: ScanDataTemp):
+        if (self.live_buffer is not None and self.live_buffer.nbytes == 0 and scan_data.nav_values is None and
+                self.live_buffer.estimate_nbytes(scan_data.data) >
+                self.settings['plot_options', 'live_memory'] * 1e6):
+            logger.info('Live data too large to be held in memory, using a temporary file')
+            with module_saving.h5_lock:
+                self._init_live_file(self.live_buffer.extended_shape)
+
+        with self._live_file_lock():
+            if not self._live_nav_axes_set:  # in streaming mode, the first data may not be at scan index 0
+                self._live_nav_axes_set = True
+                nav_axes = self.get_nav_axes()
+                if self.live_buffer is not None:
+                    self.live_buffer.add_nav_axes(nav_axes)
+                else:
+                    self.extended_saver.add_nav_axes(self.h5temp.raw_group, nav_axes)
 
-        self.extended_saver.add_data(self.h5temp.raw_group, scan_data.data, scan_data.indexes,
-                                     distribution=self.scanner.distribution)
+            if self.live_buffer is not None:
+                self.live_buffer.add_data(scan_data.data, scan_data.indexes, nav_values=scan_data.nav_values)
+            else:
+                self.extended_saver.add_data(self.h5temp.raw_group, scan_data.data, scan_data.indexes,
+                                             distribution=self.scanner.distribution)
         if self.settings['plot_options', 'plot_at_each_step']:
             self.update_live_plots()
 
     def update_live_plots(self):
+        if self.live_buffer is not None and not self.live_buffer.new_data:
+            return  # nothing changed since the last refresh
 
-        if self.settings['scan_options', 'scan_average'] > 1:
+        if self.has_average_axis():
             average_axis = 0
         else:
             average_axis = None
         try:
-            self.live_plotter.load_plot_data(group_0D=self.settings['plot_options', 'group0D'],
-                                             average_axis=average_axis,
-                                             average_index=self.ind_average,
-                                             target_at=self.scanner.positions[self.ind_scan],
-                                             last_step=(self.ind_scan ==
-                                                        self.scanner.positions.size - 1 and
-                                                        self.ind_average ==
-                                                        self.settings[
-                                                            'scan_options', 'scan_average'] - 1))
+            with self._live_file_lock():
+                self.live_plotter.load_plot_data(group_0D=self.settings['plot_options', 'group0D'],
+                                                 average_axis=average_axis,
+                                                 average_index=self.ind_average,
+                                                 target_at=self.scanner.positions[self.ind_scan],
+                                                 last_step=(self.ind_scan ==
+                                                            self.scanner.positions.size - 1 and
+                                                            self.ind_average ==
+                                                            self.settings[
+                                                                'scan_options', 'scan_average'] - 1))
         except Exception as e:
             logger.exception(str(e))
     #################
     #  SCAN FLOW
 
-    def set_scan(self, scan=None) -> bool:
+    def set_scan(self, scan=None, resume=False) -> bool:
         """
         Sets the current scan given the selected settings. Makes some checks,
         increments the h5 file scans.
         In case the dialog is cancelled, return False and aborts the scan
+
+        If resume is True, the scan continues in the last scan node and its metadata are kept
         """
         try:
-            res = self.update_scan_info()
-            if not res:
-                return False
+            if not resume:
+                res = self.update_scan_info()
+                if not res:
+                    return False
 
             is_oversteps = self.scanner.set_scan()
             if is_oversteps:
@@ -772,16 +861,27 @@ class DAQScan(QObject, ParameterManager):
                     text="There are not enough or too much selected move modules for this scan")
                 return False
 
-            if self.scanner.scan_sub_type == 'Adaptive':
-                #todo include this in scanners objects for the adaptive scanners
+            if self.scanner.is_adaptive:
                 if len(self.modules_manager.get_selected_probed_data('0D')) == 0:
                     messagebox(
                         text="In adaptive mode, you have to pick a 0D signal from which the "
                              "algorithm will determine the next positions to scan, see 'probe_data'"
                              " in the modules selector panel")
                     return False
+                if self.scanner.scanner.learner is None:
+                    messagebox(text="Invalid adaptive scan settings, check the scan bounds")
+                    return False
+                if self.settings['scan_options', 'scan_average'] > 1:
+                    self.settings.child('scan_options', 'scan_average').setValue(1)
+                    self.update_status('Averaging is not possible in adaptive mode, Naverage set to 1')
+            if self.settings['scan_options', 'scan_mode'] == 'Streaming' and \
+                    self.settings['scan_options', 'average_mode'] == 'Running mean':
+                self.settings.child('scan_options', 'average_mode').setValue('Repetitions')
+                self.update_status('Running mean is not possible in Streaming mode, average mode set to Repetitions')
 
             self.ui.n_scan_steps = self.scanner.n_steps
+            if self.scanner.settings['path_optimization', 'path_method'] != 'None':
+                self.update_status(f'Estimated actuators travel time (s): {self.scanner.travel_time_report}')
 
             # check if the modules are initialized
             for module in self.modules_manager.actuators:
@@ -833,11 +933,16 @@ class DAQScan(QObject, ParameterManager):
         self._metada_dataset_set = True
         return res
 
-    def start_scan(self):
+    def start_scan(self, resume_from: int = None):
         """
             Start an acquisition calling the set_scan function.
             Emit the command_DAQ signal "start_acquisition".
 
+            Parameters
+            ----------
+            resume_from: int
+                if given, the scan of the last scan node is resumed from this step (see resume_scan)
+
             See Also
             --------
             set_scan
@@ -848,22 +953,42 @@ class DAQScan(QObject, ParameterManager):
         if self.ui.is_action_checked('move_at'):
             self.ui.get_action('move_at').trigger()
 
-        res = self.set_scan()
+        resume = resume_from is not None
+        res = self.set_scan(resume=resume)
         if res:
             # deactivate module controls using remote_control
             if hasattr(self.dashboard, 'remote_manager'):
                 remote_manager = getattr(self.dashboard, 'remote_manager')
                 remote_manager.activate_all(False)
 
-            new_scan = self.module_and_data_saver.get_last_node().attrs['scan_done'] # get_last_node
+            new_scan = not resume and self._is_scan_node_used(self.module_and_data_saver.get_last_node())
             scan_node = self.module_and_data_saver.get_set_node(new=new_scan)
-            self.save_metadata(scan_node, 'scan_info')
+            if not resume:
+                self.save_metadata(scan_node, 'scan_info')
 
             self._init_live()
             for det in self.modules_manager.detectors:
-                det.module_and_data_saver = (
-                    module_saving.DetectorExtendedSaver(det, self.scanner.get_scan_shape()))
+                if self.scanner.is_adaptive:  # positions only known when probed: data appended point by point
+                    det.module_and_data_saver = module_saving.DetectorEnlargeableNavSaver(
+                        det, [act.title for act in self.scanner.actuators],
+                        [act.units for act in self.scanner.actuators])
+                else:
+                    det.module_and_data_saver = (
+                        module_saving.DetectorExtendedSaver(det, self.get_extended_shape()))
             self.module_and_data_saver.h5saver = self.h5saver  # force the update as the h5saver ill also be set on each detectors
+            if not self.scanner.is_adaptive:
+                self.module_and_data_saver.init_progress(self.get_extended_shape(), self.scanner.positions)
+            if self.is_running_mean() and self.settings['scan_options', 'keep_repetitions']:
+                Naverage = self.settings['scan_options', 'scan_average']
+                nav_axes = self.scanner.get_nav_axes()
+                for nav_axis in nav_axes:
+                    nav_axis.index += 1
+                nav_axes.append(data_mod.Axis('Average', data=np.linspace(0, Naverage - 1, Naverage), index=0))
+                self.module_and_data_saver.init_repetitions((Naverage,) + tuple(self.scanner.get_scan_shape()),
+                                                            nav_axes)
+            else:
+                self.module_and_data_saver.init_repetitions()
+            self.module_and_data_saver.start_writer()
 
             # mandatory to deal with multithreads
             if self.scan_thread is not None:
@@ -877,7 +1002,8 @@ class DAQScan(QObject, ParameterManager):
             self.scan_thread = QThread()
 
             scan_acquisition = DAQScanAcquisition(self.settings, self.scanner, self.modules_manager,
-                                                  )
+                                                  start_step=resume_from if resume else 0,
+                                                  saver=self.module_and_data_saver)
 
             if config['scan']['scan_in_thread']:
                 scan_acquisition.moveToThread(self.scan_thread)
@@ -886,6 +1012,9 @@ class DAQScan(QObject, ParameterManager):
             scan_acquisition.status_sig[utils.ThreadCommand].connect(self.thread_status)
 
             self.scan_thread.scan_acquisition = scan_acquisition
+            self.profiler = scan_acquisition.profiler
+            self.module_and_data_saver.profiler = self.profiler  # save events marked when actually written
+            self.ui.set_timings(dict([]))
             self.scan_thread.start()
 
             self.ui.set_action_enabled('ini_positions', False)
@@ -897,20 +1026,152 @@ class DAQScan(QObject, ParameterManager):
             self.ui.set_permanent_status('Running acquisition')
             logger.info('Running acquisition')
 
-    def _init_live(self):
+    def resume_scan(self, file_path: Union[str, Path] = None) -> bool:
+        """Resume an interrupted scan from its first missing step
+
+        The file is reopened and the journal of its last scan node (see ScanSaver.init_progress) gives the steps whose
+        data have already been written. The scan is then continued in the same node, the current scan settings
+        having to match the ones of the interrupted scan
+
+        Parameters
+        ----------
+        file_path: Union[str, Path]
+            the h5 file holding the interrupted scan, if None a file dialog is opened
+
+        Returns
+        -------
+        bool: True if the scan has been resumed
+        """
+        if file_path is None:
+            file_path = gutils.file_io.select_file(self.h5saver.settings['base_path'], save=False, ext='h5')
+            if file_path == '':
+                return False
+        self.h5saver.init_file(addhoc_file_path=file_path)
+        self._metada_dataset_set = True
+        self.module_and_data_saver.h5saver = self.h5saver
+
+        scan_node = self.module_and_data_saver.get_last_node()
+        if scan_node is None or scan_node.attrs['scan_done'] or \
+                not self.module_and_data_saver.has_progress(scan_node):
+            messagebox(text='There is no interrupted scan to resume in this file')
+            return False
+        if self.settings['scan_options', 'scan_mode'] == 'Streaming' or self.scanner.is_adaptive:
+            messagebox(text='Only Stop and Go and Pipelined scans can be resumed')
+            return False
+        if self.is_running_mean():
+            messagebox(text='Scans averaged with a running mean cannot be resumed')
+            return False
+        if not self.set_scan(resume=True):
+            return False
+
+        extended_shape, written = self.module_and_data_saver.get_progress(scan_node)
+        if self.get_extended_shape() != extended_shape:
+            messagebox(text=f'The current scan settings (shape {self.get_extended_shape()}) do not match the ones '
+                            f'of the interrupted scan (shape {extended_shape})')
+            return False
+        if not self._is_scan_resumable(scan_node):
+            messagebox(text='The current scan positions do not match the ones of the interrupted scan')
+            return False
+
+        start_step = self.get_first_missing_step(written)
+        self.h5saver.settings.child('current_scan_name').setValue(scan_node.name)
+        self.update_status(f'Resuming {scan_node.name} at step {start_step} out of {written.size}')
+        self.start_scan(resume_from=start_step)
+        return True
+
+    def _is_scan_resumable(self, scan_node) -> bool:
+        """Check the positions and the navigation axes of the current scan against the ones saved in the node of
+        an interrupted scan"""
+        positions = self.module_and_data_saver.get_scan_positions(scan_node)
+        if positions is not None and (positions.shape != self.scanner.positions.shape or
+                                      not np.allclose(positions, self.scanner.positions)):
+            return False
+        nav_axes = {nav_axis.index: nav_axis for nav_axis in self.get_nav_axes()}
+        for saved_axis in self.module_and_data_saver.get_nav_axes(scan_node):
+            nav_axis = nav_axes.get(saved_axis.index, None)
+            if nav_axis is None or nav_axis.label != saved_axis.label or \
+                    nav_axis.get_data().shape != saved_axis.get_data().shape or \
+                    not np.allclose(nav_axis.get_data(), saved_axis.get_data()):
+                return False
+        return True
+
+    def get_nav_axes(self) -> List[data_mod.Axis]:
+        """The navigation axes of the saved data, including the Average axis holding the repetitions if any"""
+        nav_axes = self.scanner.get_nav_axes()
+        if self.has_average_axis():
+            Naverage = self.settings['scan_options', 'scan_average']
+            for nav_axis in nav_axes:
+                nav_axis.index += 1
+            nav_axes.append(data_mod.Axis('Average', data=np.linspace(0, Naverage - 1, Naverage), index=0))
+        return nav_axes
+
+    def is_running_mean(self) -> bool:
+        """True if the repetitions of the scan are accumulated into a running mean rather than saved"""
+        return (self.settings['scan_options', 'scan_average'] > 1 and
+                self.settings['scan_options', 'average_mode'] == 'Running mean')
+
+    def has_average_axis(self) -> bool:
+        """True if the saved data have an extra Average navigation axis holding the repetitions"""
+        return self.settings['scan_options', 'scan_average'] > 1 and not self.is_running_mean()
+
+    def get_extended_shape(self) -> Tuple[int]:
+        """The shape of the scan including the averaging, that is the extra shape of the saved data"""
         Naverage = self.settings['scan_options', 'scan_average']
-        if Naverage > 1:
-            scan_shape = [Naverage]
-            scan_shape.extend(self.scanner.get_scan_shape())
+        if self.has_average_axis():
+            return (Naverage,) + tuple(self.scanner.get_scan_shape())
         else:
-            scan_shape = self.scanner.get_scan_shape()
+            return tuple(self.scanner.get_scan_shape())
+
+    def get_first_missing_step(self, written: np.ndarray) -> int:
+        """Get the first step, in the acquisition order, whose data have not been written
+
+        Parameters
+        ----------
+        written: np.ndarray
+            boolean array of the scan extended shape, True for the written steps (see ScanSaver.get_progress)
+
+        Returns
+        -------
+        int: the step, averaging included, or the total number of steps if all have been written
+        """
+        Naverage = self.settings['scan_options', 'scan_average']
+        indexes = [self.scanner.get_indexes_from_scan_index(ind) for ind in range(len(self.scanner.positions))]
+        for ind_average in range(Naverage):
+            for ind_scan, index in enumerate(indexes):
+                if not written[(ind_average,) + tuple(index) if self.has_average_axis() else tuple(index)]:
+                    return ind_average * len(indexes) + ind_scan
+        return Naverage * len(indexes)
+
+    def _init_live(self):
+        scan_shape = self.get_extended_shape()
+        self._close_live_file()
+        self._live_nav_axes_set = False
+
+        grid_shape = None
+        if self.scanner.is_adaptive and self.scanner.scanner.grid_interpolation:
+            grid_shape = (self.settings['plot_options', 'adaptive_grid'],) * self.scanner.n_axes
+        self.live_buffer = LiveDataBuffer(tuple(scan_shape), distribution=self.scanner.distribution,
+                                          grid_shape=grid_shape)
+        self.live_plotter.live_buffer = self.live_buffer
+
+        self.prepare_viewers()
+        QtWidgets.QApplication.processEvents()
+
+    def _close_live_file(self):
         if self.temp_path is not None:
             try:
-                self.h5temp.close()
+                with module_saving.h5_lock:
+                    self.h5temp.close()
                 self.temp_path.cleanup()
             except Exception as e:
                 logger.exception(str(e))
+            self.temp_path = None
+        self.extended_saver = None
 
+    def _init_live_file(self, scan_shape: Tuple[int]):
+        """Spill the live data over a temporary h5 file when they don't fit in memory"""
+        self._close_live_file()
+        self.live_buffer = None
         self.h5temp = H5Saver()
         self.temp_path = tempfile.TemporaryDirectory(prefix='pymo')
         addhoc_file_path = Path(self.temp_path.name).joinpath('temp_data.h5')
@@ -919,9 +1180,6 @@ class DAQScan(QObject, ParameterManager):
             data_saving.DataToExportExtendedSaver(self.h5temp, extended_shape=scan_shape)
         self.live_plotter.h5saver = self.h5temp
 
-        self.prepare_viewers()
-        QtWidgets.QApplication.processEvents()
-
     def set_ini_positions(self):
         """
             Send the command_DAQ signal with "set_ini_positions" list item as an attribute.
@@ -938,6 +1196,7 @@ class DAQScan(QObject, ParameterManager):
         """
         self.ui.set_permanent_status('Stoping acquisition')
         self.command_daq_signal.emit(utils.ThreadCommand("stop_acquisition"))
+        self.module_and_data_saver.flush()
         scan_node = self.module_and_data_saver.get_last_node()
         scan_node.attrs['scan_done'] = True
 
@@ -975,12 +1234,17 @@ class DAQScanAcquisition(QObject):
     status_sig = Signal(utils.ThreadCommand)
 
     def __init__(self, scan_settings: Parameter = None, scanner: Scanner = None,
-                 modules_manager: ModulesManager = None,):
+                 modules_manager: ModulesManager = None, start_step: int = 0,
+                 saver: module_saving.ScanSaver = None):
 
         """
         DAQScanAcquisition deal with the acquisition part of daq_scan, that is transferring commands to modules,
         getting back data, saviong and letting know th UI about the scan status
 
+        start_step is the first step (averaging included) to be acquired, the previous ones being skipped when
+        resuming an interrupted scan (Stop and Go and Pipelined modes)
+
+        saver is the ScanSaver whose writer thread applies backpressure on the acquisition (see wait_saver)
         """
 
         super().__init__()
@@ -993,8 +1257,13 @@ class DAQScanAcquisition(QObject):
         self.Naverage = self.scan_settings['scan_options', 'scan_average']
         self.ind_average = 0
         self.ind_scan = 0
+        self.start_step = start_step
+        self.saver = saver
 
-        self.isadaptive = self.scanner.scan_sub_type == 'Adaptive'
+        self.isadaptive = self.scanner.is_adaptive
+        self.running_mean = (self.Naverage > 1 and not self.isadaptive and
+                             self.scan_settings['scan_options', 'average_mode'] == 'Running mean')
+        self.keep_repetitions = self.running_mean and self.scan_settings['scan_options', 'keep_repetitions']
 
         self.modules_manager.timeout_signal.connect(self.timeout)
         self.timeout_scan_flag = False
@@ -1005,12 +1274,24 @@ class DAQScanAcquisition(QObject):
 
         self.det_done_datas = data_mod.DataToExport('ScanData')
 
+        self._readbacks: Dict[str, ReadbackInterpolator] = dict([])
+        self._binners: dict = dict([])
+        self._stream_start = 0.
+        self._grab_stopped_waiter = ModulesDoneWaiter()  # the detectors stopped streaming, see drain_streaming
+        if self.isadaptive:  # the maximum number of points
+            self.n_positions = int(np.prod(self.scanner.get_scan_shape()))
+        else:
+            self.n_positions = len(self.scanner.positions) if self.scanner.positions is not None else 0
+        self.profiler = StepProfiler(self.Naverage * self.n_positions)
+
         scan_shape = self.scanner.get_scan_shape()
-        if self.Naverage > 1:
+        if self.Naverage > 1 and not self.running_mean:
             self.scan_shape = [self.Naverage]
             self.scan_shape.extend(scan_shape)
         else:
             self.scan_shape = scan_shape
+        # in running mean mode, the means are accumulated in place at each scan position
+        self.running_statistics = RunningStatistics(scan_shape) if self.running_mean else None
 
     def queue_command(self, command: utils.ThreadCommand):
         """Process the commands sent by the main ui
@@ -1034,24 +1315,25 @@ class DAQScanAcquisition(QObject):
     def set_ini_positions(self):
         """ Set the actuators's positions totheir initial value as defined in the scanner  """
         try:
-            if self.scanner.scan_sub_type != 'Adaptive':
+            if not self.isadaptive:
                 self.modules_manager.move_actuators(self.scanner.positions_at(0))
 
         except Exception as e:
             logger.exception(str(e))
 
     def start_acquisition(self):
+        if self.scan_settings['scan_options', 'scan_mode'] == 'Streaming' and not self.isadaptive:
+            self.start_streaming_acquisition()
+            return
+        if self.scan_settings['scan_options', 'scan_mode'] == 'Pipelined' and not self.isadaptive:
+            self.start_pipelined_acquisition()
+            return
         try:
-            #todo hoaw to apply newlayout to adaptive mode?
-
             self.modules_manager.connect_actuators()
             self.modules_manager.connect_detectors()
 
             self.stop_scan_flag = False
 
-            Naxes = self.scanner.n_axes
-            scan_type = self.scanner.scan_type
-            self.navigation_axes = self.scanner.get_nav_axes()
             self.status_sig.emit(utils.ThreadCommand("Update_Status",
                                                      attribute="Acquisition has started"))
 
@@ -1066,21 +1348,13 @@ class DAQScanAcquisition(QObject):
                             break
                         positions = self.scanner.positions_at(self.ind_scan)  # get positions
                     else:
-                        pass
-                        #todo update for v4
-                        # positions = learner.ask(1)[0][-1]  # next point to probe
-                        # if self.scanner.scan_type == 'Tabular':  # translate normalized curvilinear position to real coordinates
-                        #     self.curvilinear = positions
-                        #     length = 0.
-                        #     for v in self.scanner.vectors:
-                        #         length += v.norm()
-                        #         if length >= self.curvilinear:
-                        #             vec = v
-                        #             frac_curvilinear = (self.curvilinear - (length - v.norm())) / v.norm()
-                        #             break
-                        #
-                        #     position = (vec.vectorize() * frac_curvilinear).translate_to(vec.p1()).p2()
-                        #     positions = [position.x(), position.y()]
+                        if self.ind_scan >= self.n_positions or self.scanner.is_done():
+                            break
+                        positions = self.scanner.ask_positions()  # next point to probe
+
+                    step = self.ind_average * self.n_positions + self.ind_scan
+                    if step < self.start_step:  # already acquired before the scan has been interrupted
+                        continue
 
                     self.status_sig.emit(
                         utils.ThreadCommand("Update_scan_index",
@@ -1090,66 +1364,309 @@ class DAQScanAcquisition(QObject):
                         break
 
                     #move motors of modules and wait for move completion
+                    self.profiler.mark(step, 'move_start')
                     positions = self.modules_manager.order_positions(self.modules_manager.move_actuators(positions))
+                    self.profiler.mark(step, 'move_done')
 
                     QThread.msleep(self.scan_settings['time_flow', 'wait_time_between'])
+                    self.profiler.mark(step, 'wait_done')
 
                     #grab datas and wait for grab completion
-                    self.det_done(self.modules_manager.grab_datas(positions=positions), positions)
-
-                    if self.isadaptive:
-                        #todo update for v4
-                        # det_channel = self.modules_manager.get_selected_probed_data()
-                        # det, channel = det_channel[0].split('/')
-                        # if self.scanner.scan_type == 'Tabular':
-                        #     self.curvilinear_array.append(np.array([self.curvilinear]))
-                        #     new_positions = self.curvilinear
-                        # elif self.scanner.scan_type == 'Scan1D':
-                        #     new_positions = positions[0]
-                        # else:
-                        #     new_positions = positions[:]
-                        # learner.tell(new_positions, self.modules_manager.det_done_datas[det]['data0D'][channel]['data'])
-                        pass
+                    self.profiler.mark(step, 'grab_start')
+                    det_done_datas = self.modules_manager.grab_data(positions=positions)
+                    self.profiler.mark(step, 'grab_done')
+                    if self.isadaptive:  # the reached positions are the ones learned and saved
+                        self.scanner.tell(positions, self.get_probed_value(det_done_datas))
+                    self.det_done(det_done_datas, positions)
 
                     # daq_scan wait time
                     QThread.msleep(self.scan_settings.child('time_flow', 'wait_time').value())
+                    self.profiler.mark(step, 'step_done')
 
             self.modules_manager.connect_actuators(False)
             self.modules_manager.connect_detectors(False)
 
+            self.status_sig.emit(utils.ThreadCommand(
+                "Update_Status", attribute=f"Acquisition has finished, step timings (mean/p95 ms): "
+                                           f"{self.profiler.report()}"))
+            self.status_sig.emit(utils.ThreadCommand("Scan_done"))
+
+        except Exception as e:
+            logger.exception(str(e))
+
+    def start_streaming_acquisition(self):
+        """ Fly scan: the actuators follow the scan trajectory while the detectors grab continuously
+
+        Each frame emitted by a detector is tagged with the last actuators readback and a timestamp (stored as an
+        extra 0D data named *stream_tags*) then saved at the scan position the nearest to the readback. Only the frame
+        closest to a given position is kept. With the *fly_lines* option, aligned positions (the lines of a raster
+        scan for instance) are covered with a single move, the actuators being only stopped at the line ends
+        """
+        try:
+            self.stop_scan_flag = False
+            self.timeout_scan_flag = False
+            self._readbacks = {act.title: ReadbackInterpolator() for act in self.scanner.actuators}
+            self._binners = dict([])
+
+            self.modules_manager.connect_actuators()
+            self.modules_manager.connect_actuators(slot=self._update_readback)
+            self.modules_manager.connect_actuators(slot=self._update_readback, signal='current_value')
+            self.modules_manager.connect_detectors(slot=self._frame_received)
+
+            nav_axes = self.scanner.get_nav_axes()
+            if self.Naverage > 1:
+                for nav_axis in nav_axes:
+                    nav_axis.index += 1
+                nav_axes.append(data_mod.Axis('Average', data=np.linspace(0, self.Naverage - 1, self.Naverage),
+                                              index=0))
+            self.status_sig.emit(utils.ThreadCommand("add_nav_axes", nav_axes))
             self.status_sig.emit(utils.ThreadCommand("Update_Status",
-                                                     attribute="Acquisition has finished"))
+                                                     attribute="Streaming acquisition has started"))
+
+            waypoints = get_stream_waypoints(self.scanner.positions,
+                                             self.scan_settings['scan_options', 'fly_lines'])
+            self._stream_start = time()  # the data and actuators values are timestamped with time.time
+            self.status_sig.emit(utils.ThreadCommand('start_streaming'))
+            for ind_average in range(self.Naverage):
+                self.ind_average = ind_average
+                for binner in self._binners.values():
+                    binner.reset()
+                for ind_scan in waypoints:
+                    self.ind_scan = int(ind_scan)
+                    self.status_sig.emit(
+                        utils.ThreadCommand("Update_scan_index", attribute=[self.ind_scan, ind_average]))
+                    if self.stop_scan_flag or self.timeout_scan_flag:
+                        break
+                    self.modules_manager.move_actuators(self.scanner.positions_at(self.ind_scan))
+                if self.stop_scan_flag or self.timeout_scan_flag:
+                    break
+            self.drain_streaming()
+
+            self.modules_manager.connect_detectors(False, slot=self._frame_received)
+            self.modules_manager.connect_actuators(False, slot=self._update_readback, signal='current_value')
+            self.modules_manager.connect_actuators(False, slot=self._update_readback)
+            self.modules_manager.connect_actuators(False)
+
+            for det_name, binner in self._binners.items():
+                if binner.n_filled < binner.n_steps:
+                    logger.warning(f'Streaming scan: no frame from {det_name} could be assigned to'
+                                   f' {binner.n_steps - binner.n_filled} scan positions, slow down the actuators'
+                                   f' or increase the detector rate')
+            self.status_sig.emit(utils.ThreadCommand(
+                "Update_Status", attribute="Acquisition has finished: " + ', '.join(
+                    [f'{det_name}: {binner.n_filled}/{binner.n_steps} positions from {binner.n_frames} frames'
+                     for det_name, binner in self._binners.items()])))
+            self.status_sig.emit(utils.ThreadCommand("Scan_done"))
+
+        except Exception as e:
+            logger.exception(str(e))
+
+    def start_pipelined_acquisition(self):
+        """ Stop and Go scan whose moves are overlapped with the detectors readout, the saving and the plotting
+
+        The move to step N+1 is sent as soon as all detectors finished the exposure of step N: for detectors whose
+        plugin declares *move_during_readout*, when it reports the end of its exposure otherwise when its data is
+        received. The data of each detector at step N are then given to the saver and plotter while the actuators
+        are moving
+        """
+        try:
+            self.modules_manager.connect_actuators()
+            self.modules_manager.connect_detectors()
+
+            self.stop_scan_flag = False
+            self.timeout_scan_flag = False
+            overlapped = [det.title for det in self.modules_manager.detectors if det.move_during_readout]
+            self.status_sig.emit(utils.ThreadCommand(
+                "Update_Status", attribute="Pipelined acquisition has started" +
+                                           (f", moving during the readout of: {', '.join(overlapped)}"
+                                            if len(overlapped) > 0 else "")))
+
+            steps = [(ind_average, ind_scan) for ind_average in range(self.Naverage)
+                     for ind_scan in range(self.n_positions)]
+            move_pending = False
+            if self.start_step < len(steps):
+                self.profiler.mark(self.start_step, 'move_start')
+                move_pending = self.modules_manager.start_move_actuators(
+                    self.scanner.positions_at(steps[self.start_step][1]))
+            for step in range(self.start_step, len(steps)):
+                ind_average, ind_scan = steps[step]
+                self.ind_average = ind_average
+                self.ind_scan = ind_scan
+                self.status_sig.emit(utils.ThreadCommand("Update_scan_index", attribute=[ind_scan, ind_average]))
+                if self.stop_scan_flag or self.timeout_scan_flag:
+                    break
+
+                move_done_positions = self.modules_manager.wait_move_done()
+                move_pending = False
+                if not self.modules_manager.move_done_flag:  # an actuator did not reach its target in time
+                    self.timeout_scan_flag = True
+                    break
+                positions = self.modules_manager.order_positions(move_done_positions)
+                self.profiler.mark(step, 'move_done')
+
+                QThread.msleep(self.scan_settings['time_flow', 'wait_time_between'])
+                self.profiler.mark(step, 'wait_done')
+
+                self.profiler.mark(step, 'grab_start')
+                self.modules_manager.start_grab(positions=positions)
+                if not self.modules_manager.wait_exposure_done():
+                    # a detector may still be exposing: the next move should not be started
+                    logger.error('Timeout Fired during waiting for the detectors exposure')
+                    self.timeout()
+                    break
+                self.profiler.mark(step, 'exposure_done')
+
+                if step + 1 < len(steps) and not (self.stop_scan_flag or self.timeout_scan_flag):
+                    self.profiler.mark(step + 1, 'move_start')
+                    move_pending = self.modules_manager.start_move_actuators(
+                        self.scanner.positions_at(steps[step + 1][1]))
+
+                det_done_datas = self.modules_manager.wait_grab_done()
+                self.profiler.mark(step, 'grab_done')
+                self.det_done(det_done_datas, positions, dtes=list(self.modules_manager.det_done_dtes.values()))
+
+                QThread.msleep(self.scan_settings['time_flow', 'wait_time'])
+                self.profiler.mark(step, 'step_done')
+
+            if move_pending:
+                self.modules_manager.wait_move_done()
+            self.modules_manager.connect_actuators(False)
+            self.modules_manager.connect_detectors(False)
+
+            self.status_sig.emit(utils.ThreadCommand(
+                "Update_Status", attribute=f"Acquisition has finished, step timings (mean/p95 ms): "
+                                           f"{self.profiler.report()}"))
             self.status_sig.emit(utils.ThreadCommand("Scan_done"))
 
         except Exception as e:
             logger.exception(str(e))
 
-    def det_done(self, det_done_datas: data_mod.DataToExport, positions):
+    def wait_saver(self):
+        """Wait while too many data are waiting to be written on disk so that a slow disk slows down the
+        acquisition rather than piling up the data in memory"""
+        if self.saver is None:
+            return
+        if not self.saver.wait_writer(timeout=0.1):
+            self.status_sig.emit(utils.ThreadCommand("Update_Status",
+                                                     attribute="Waiting for the data to be written on disk"))
+            self.saver.wait_writer()
+
+    def drain_streaming(self):
+        """ Stop the streaming of the detectors and wait for the frames they emitted before stopping
+
+        The frames and the end of the grab of a detector reaching this thread in the order they were emitted, all
+        the frames have been given to _frame_received once all the detectors reported their grab as stopped
+        """
+        detectors = self.modules_manager.detectors
+        self._grab_stopped_waiter.arm(len(detectors))
+        for det in detectors:
+            det.grab_status.connect(self._grab_status_changed)
+        self.status_sig.emit(utils.ThreadCommand('stop_streaming'))
+        if not self._grab_stopped_waiter.wait(self.modules_manager.detector_timeout):
+            logger.warning('Streaming scan: the detectors did not stop their grab in time, the last frames may be '
+                           'missing')
+        for det in detectors:
+            det.grab_status.disconnect(self._grab_status_changed)
+
+    @Slot(bool)
+    def _grab_status_changed(self, grabbing: bool):
+        if not grabbing:
+            self._grab_stopped_waiter.notify()
+
+    def _update_readback(self, data_act: DataActuator):
+        if data_act.name in self._readbacks:
+            self._readbacks[data_act.name].add(data_act.timestamp, data_act.value())
+
+    def _frame_received(self, dte: data_mod.DataToExport):
+        """ Tag a frame streamed by a detector and send it to be saved at the nearest scan position
+
+        The actuators values at the time the frame was acquired are interpolated from their timestamped readbacks
+        (see ReadbackInterpolator) rather than taken as their last readback, lagging by up to a polling period
         """
+        try:
+            frame_time = min([dwa.timestamp for dwa in dte]) if len(dte) > 0 else time()
+            timestamp = frame_time - self._stream_start
+            readback = np.array([self._readbacks[act.title].at(frame_time) for act in self.scanner.actuators])
+            if dte.name not in self._binners:
+                self._binners[dte.name] = StreamBinner(self.scanner.positions)
+            scan_index = self._binners[dte.name].add(readback)
+            if scan_index is None:
+                return
+
+            tags = DataFromPlugins('stream_tags', data=[np.array([timestamp])] +
+                                                       [np.array([value]) for value in readback],
+                                   labels=['timestamp'] + [act.title for act in self.scanner.actuators],
+                                   dim='Data0D', origin=dte.name)
+            frame = data_mod.DataToExport(dte.name, data=dte.data + [tags])
+
+            indexes = self.scanner.get_indexes_from_scan_index(scan_index)
+            if self.Naverage > 1:
+                indexes = [self.ind_average] + list(indexes)
+            indexes = tuple(indexes)
+            self.wait_saver()
+            self.status_sig.emit(
+                utils.ThreadCommand("add_data", dict(dte=frame, indexes=indexes,
+                                                     distribution=self.scanner.distribution,
+                                                     step=self.ind_average * self.n_positions + scan_index)))
 
+            full_names: list = self.scan_settings['plot_options', 'plot_0d']['selected'][:]
+            full_names.extend(self.scan_settings['plot_options', 'plot_1d']['selected'][:])
+            data_temp = dte.get_data_from_full_names(full_names, deepcopy=False)
+            data_temp = data_temp.get_data_with_naxes_lower_than(2 - len(indexes))
+            self.scan_data_tmp.emit(ScanDataTemp(scan_index, indexes, data_temp))
+        except Exception as e:
+            logger.exception(str(e))
+
+    def det_done(self, det_done_datas: data_mod.DataToExport, positions, dtes: List[data_mod.DataToExport] = None):
+        """ Send the data of the current step to be saved and plotted
+
+        Parameters
+        ----------
+        det_done_datas: DataToExport
+            the data of all detectors
+        positions: DataToExport
+            the actuators positions
+        dtes: List[DataToExport]
+            if given, the data of each detector to be saved, otherwise the saver uses the detectors current data
+
+        In running mean mode, the data are accumulated into the means at the current scan position, these means
+        being saved and plotted in place of the data, the latter being saved in the Repetitions group if requested
         """
         try:
+            self.wait_saver()
             indexes = self.scanner.get_indexes_from_scan_index(self.ind_scan)
-            if self.Naverage > 1:
+            if self.running_mean:
+                if dtes is None:
+                    dtes = list(self.modules_manager.det_done_dtes.values())
+                if self.keep_repetitions:
+                    self.status_sig.emit(utils.ThreadCommand(
+                        "add_data", dict(indexes=(self.ind_average,) + tuple(indexes),
+                                         distribution=self.scanner.distribution, dtes=dtes, repetitions=True)))
+                dtes = [self.running_statistics.add(dte, indexes) for dte in dtes]
+                det_done_datas = data_mod.DataToExport(det_done_datas.name,
+                                                       data=[dwa for dte in dtes for dwa in dte])
+            elif self.Naverage > 1:
                 indexes = [self.ind_average] + list(indexes)
             indexes = tuple(indexes)
-            if self.ind_scan == 0:
+            if self.ind_scan == 0 and not self.isadaptive:  # adaptive scans save their axes with each point
                 nav_axes = self.scanner.get_nav_axes()
-                if self.Naverage > 1:
+                if self.Naverage > 1 and not self.running_mean:
                     for nav_axis in nav_axes:
                         nav_axis.index += 1
                     nav_axes.append(data_mod.Axis('Average', data=np.linspace(0, self.Naverage - 1, self.Naverage),
                                                   index=0))
                 self.status_sig.emit(utils.ThreadCommand("add_nav_axes", nav_axes))
 
-            self.status_sig.emit(
-                utils.ThreadCommand("add_data",
-                                    dict(indexes=indexes, distribution=self.scanner.distribution)))
-
-            #todo related to adaptive (solution lies along the Enlargeable data saver)
+            data_to_save = dict(indexes=indexes, distribution=self.scanner.distribution,
+                                step=self.ind_average * self.n_positions + self.ind_scan)
+            if dtes is not None:
+                data_to_save['dtes'] = dtes
+            nav_values = None
             if self.isadaptive:
-                for ind_ax, nav_axis in enumerate(self.navigation_axes):
-                    nav_axis.append(np.array(positions[ind_ax]))
+                nav_values = [float(positions.get_data_from_name(act.title).value())
+                              for act in self.scanner.actuators]
+                data_to_save['axis_values'] = nav_values
+            self.status_sig.emit(utils.ThreadCommand("add_data", data_to_save))
 
             self.det_done_flag = True
 
@@ -1158,11 +1675,17 @@ class DAQScanAcquisition(QObject):
             data_temp = det_done_datas.get_data_from_full_names(full_names, deepcopy=False)
             data_temp = data_temp.get_data_with_naxes_lower_than(2-len(indexes))  # maximum Data2D included nav indexes
 
-            self.scan_data_tmp.emit(ScanDataTemp(self.ind_scan, indexes, data_temp))
+            self.scan_data_tmp.emit(ScanDataTemp(self.ind_scan, indexes, data_temp, nav_values=nav_values))
 
         except Exception as e:
             logger.exception(str(e))
 
+    def get_probed_value(self, det_done_datas: data_mod.DataToExport) -> float:
+        """ The value of the first channel of the first selected probe 0D data, from which the adaptive scans
+        determine their next positions"""
+        full_name = self.modules_manager.get_selected_probed_data('0D')[0]
+        return float(det_done_datas.get_data_from_full_name(full_name)[0][0])
+
     def timeout(self):
         """
             Send the status signal *'Time out during acquisition'*.
@@ -5,7 +5,7 @@ Created the 06/12/2022
 @author: Sebastien Weber
 """
 import sys
-from typing import List, TYPE_CHECKING
+from typing import Dict, List, Tuple, TYPE_CHECKING
 
 from qtpy import QtWidgets, QtCore
 from qtpy.QtCore import Signal
@@ -49,6 +49,8 @@ class DAQScanUI(CustomApp, ViewerDispatcher):
         self.add_action('quit', 'Quit the module', 'close2', menu=self.file_menu)
         self.add_action('ini_positions', 'Init Positions', '', menu=self.action_menu)
         self.add_action('start', 'Start Scan', 'run2', "Start the scan", menu=self.action_menu)
+        self.add_action('resume', 'Resume Scan', 'run2', "Resume an interrupted scan from its first missing step",
+                        menu=self.action_menu, auto_toolbar=False)
         self.add_action('start_batch', 'Start ScanBatches', 'run_all', "Start the batch of scans", menu=self.action_menu)
         self.add_action('stop', 'Stop Scan', 'stop', "Stop the scan", menu=self.action_menu)
         self.add_action('move_at', 'Move at doubleClicked', 'move_contour',
@@ -73,6 +75,7 @@ class DAQScanUI(CustomApp, ViewerDispatcher):
         self.connect_action('quit', lambda: self.command_sig.emit(ThreadCommand('quit')))
         self.connect_action('ini_positions', lambda: self.command_sig.emit(ThreadCommand('ini_positions')))
         self.connect_action('start', lambda: self.command_sig.emit(ThreadCommand('start')))
+        self.connect_action('resume', lambda: self.command_sig.emit(ThreadCommand('resume')))
         self.connect_action('start_batch', lambda: self.command_sig.emit(ThreadCommand('start_batch')))
         self.connect_action('stop', lambda: self.command_sig.emit(ThreadCommand('stop')))
         self.connect_action('move_at', lambda: self.command_sig.emit(ThreadCommand('move_at')))
@@ -174,7 +177,10 @@ class DAQScanUI(CustomApp, ViewerDispatcher):
         self._scan_done_LED.set_as_false()
         self._scan_done_LED.clickable = False
         self._scan_done_LED.setToolTip('Scan done state')
+        self._timings_label = QtWidgets.QLabel('')
+        self._timings_label.setToolTip('Duration of each stage of the scan steps: mean/95th percentile in ms')
         self._statusbar.addPermanentWidget(self._status_message_label)
+        self._statusbar.addPermanentWidget(self._timings_label)
 
         self._statusbar.addPermanentWidget(self._n_scan_steps_sb)
         self._statusbar.addPermanentWidget(self._indice_scan_sb)
@@ -208,6 +214,11 @@ class DAQScanUI(CustomApp, ViewerDispatcher):
     def set_scan_done(self, done=True):
         self._scan_done_LED.set_as(done)
 
+    def set_timings(self, stats: Dict[str, Tuple[float, float]]):
+        """Display the mean and 95th percentile durations (s) of the scan steps stages"""
+        self._timings_label.setText(' | '.join([f'{stage} {1000 * mean:.1f}/{1000 * p95:.1f}'
+                                                for stage, (mean, p95) in stats.items()]))
+
     def update_viewers(self, viewers_type: List[ViewersEnum], viewers_name: List[str] = None, force=False):
         super().update_viewers(viewers_type, viewers_name, force)
         self.command_sig.emit(ThreadCommand('viewers_changed', attribute=dict(viewer_types=self.viewer_types,
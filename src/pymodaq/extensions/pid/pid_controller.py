@@ -606,7 +606,7 @@ class PIDRunner(QObject):
                 # print('input: {}'.format(self.input))
                 # # GRAB DATA FIRST AND WAIT ALL DETECTORS RETURNED
 
-                self.det_done_datas: DataToExport = self.modules_manager.grab_datas()
+                self.det_done_datas: DataToExport = self.modules_manager.grab_data()
 
                 self.inputs_from_dets: DataToExport = self.model_class.convert_input(self.det_done_datas)
 
@@ -6,13 +6,16 @@ Created the 22/01/2023
 """
 import os
 import sys
-from typing import List, Union, Callable, Iterable, Dict
+from typing import List, Union, Callable, Iterable, Dict, Tuple
 
+import numpy as np
 from qtpy import QtWidgets, QtCore
+from scipy.interpolate import griddata, interp1d
 
 from pymodaq_utils.logger import set_logger, get_module_name
 
-from pymodaq_data.data import DataToExport, DataDim, enum_checker
+from pymodaq_data.data import (DataToExport, DataDim, DataWithAxes, DataDistribution, Axis,
+                               enum_checker)
 from pymodaq_data.h5modules.data_saving import DataLoader
 
 from pymodaq_gui.h5modules.saving import H5Saver
@@ -25,6 +28,190 @@ from pymodaq.utils.data import DataFromPlugins
 logger = set_logger(get_module_name(__file__))
 
 
+def interpolate_on_grid(points: np.ndarray, arrays: List[np.ndarray],
+                        grid_shape: Tuple[int]) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+    """Interpolate data spread at given positions on a regular grid covering these positions
+
+    Parameters
+    ----------
+    points: np.ndarray
+        the positions as an array of shape (Npoints, Naxes), Naxes being 1 or 2
+    arrays: List[np.ndarray]
+        the data at each position, arrays of shape (Npoints, ...)
+    grid_shape: Tuple[int]
+        the number of points of the grid along each axis
+
+    Returns
+    -------
+    List[np.ndarray]: the values of the grid along each axis
+    List[np.ndarray]: the interpolated arrays of shape grid_shape + (...)
+    """
+    points = np.asarray(points, dtype=float).reshape((len(points), -1))
+    n_axes = points.shape[1]
+    grid_axes = [np.linspace(np.min(points[:, ind]), np.max(points[:, ind]), grid_shape[ind])
+                 for ind in range(n_axes)]
+    interpolated = []
+    for array in arrays:
+        values = np.reshape(array, (len(points), -1)).astype(float)
+        if n_axes == 1:
+            x, indexes = np.unique(points[:, 0], return_index=True)
+            grid_values = interp1d(x, values[indexes], axis=0, assume_sorted=True)(grid_axes[0])
+        else:
+            grid = np.stack([grid.ravel() for grid in np.meshgrid(*grid_axes, indexing='ij')], axis=1)
+            grid_values = griddata(points, values, grid, method='linear')
+            missing = np.any(np.isnan(grid_values), axis=1)
+            if np.any(missing):  # outside the convex hull of the points
+                grid_values[missing] = griddata(points, values, grid[missing], method='nearest')
+        interpolated.append(grid_values.reshape(tuple(grid_shape) + np.shape(array)[1:]))
+    return grid_axes, interpolated
+
+
+class LiveDataBuffer:
+    """In memory equivalent of a DataToExportExtendedSaver writing into a file read by a DataLoader
+
+    Arrays holding the whole scan (the extended shape followed by the data shape) are preallocated on the
+    first step, then each step is written at its indexes. Data are returned without reading anything
+    back (arrays are shared, not copied) using the same layout as DataLoader.load_all
+
+    Parameters
+    ----------
+    extended_shape: Tuple[int]
+        the extra shape compared to the data, for instance the scan shape
+    distribution: DataDistribution
+    grid_shape: Tuple[int]
+        for spread data whose navigation values are given with each step (adaptive scans), if specified the data
+        are returned interpolated on a regular grid of this shape (one or two navigation axes)
+    """
+
+    def __init__(self, extended_shape: Tuple[int], distribution=DataDistribution['uniform'],
+                 grid_shape: Tuple[int] = None):
+        self.extended_shape = tuple(extended_shape)
+        self.distribution = enum_checker(DataDistribution, distribution)
+        self.grid_shape = grid_shape
+        self._nav_axes: List[Axis] = []
+        self._nav_values: np.ndarray = None
+        self._templates: Dict[str, dict] = dict([])
+        self._arrays: Dict[str, List[np.ndarray]] = dict([])
+        self._new_data = False
+
+    def _get_data_shape(self, array: np.ndarray) -> Tuple[int]:
+        """Shape of a data array within the extended array, scalars (0D data) are not given an extra dim"""
+        return () if array.shape == (1,) else array.shape
+
+    def estimate_nbytes(self, data: DataToExport) -> int:
+        """Number of bytes the buffer would need to store the whole scan of such data"""
+        return int(np.prod(self.extended_shape)) * \
+            sum([sum([array.nbytes for array in dwa.data]) for dwa in data])
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes currently allocated by the buffer"""
+        return sum([sum([array.nbytes for array in arrays]) for arrays in self._arrays.values()])
+
+    @property
+    def new_data(self) -> bool:
+        """True if some data have been added since the last call to load_all"""
+        return self._new_data
+
+    def add_nav_axes(self, axes: List[Axis]):
+        """Store the navigation axes related to the extended shape (for instance the scan axes)"""
+        if len(self._nav_axes) == 0:
+            self._nav_axes = [axis.copy() for axis in axes]
+
+    def _create_arrays(self, key: str, dwa: DataWithAxes):
+        nav_indexes = list(range(len(self.extended_shape))) + \
+            [ind + len(self.extended_shape) for ind in dwa.nav_indexes]
+        axes = [axis.copy() for axis in dwa.axes]
+        for axis in axes:
+            axis.index += len(self.extended_shape)
+        self._templates[key] = dict(name=dwa.name, source=dwa.source, units=dwa.units, labels=dwa.labels[:],
+                                    origin=dwa.origin, nav_indexes=tuple(nav_indexes), axes=axes)
+        self._arrays[key] = [np.zeros(self.extended_shape + self._get_data_shape(array), dtype=array.dtype)
+                             for array in dwa.data]
+
+    def add_data(self, data: DataToExport, indexes: Iterable[int], nav_values: Iterable[float] = None):
+        """Write the data of a given step at its location within the preallocated arrays
+
+        Parameters
+        ----------
+        data: DataToExport
+        indexes: Iterable[int]
+            indexes where to store data in the extended arrays (should have the same length as
+            extended_shape and with values coherent with this shape)
+        nav_values: Iterable[float]
+            for spread data, the values of the navigation axes at this step if not known in advance (adaptive
+            scans), only the steps with such values are then returned by load_all
+        """
+        indexes = tuple(indexes)
+        if len(indexes) != len(self.extended_shape):
+            raise IndexError(f'Cannot put data into the buffer with extended indexes {indexes}')
+        for ind, index in enumerate(indexes):
+            if index >= self.extended_shape[ind]:
+                raise IndexError('Indexes cannot be higher than the buffer shape')
+
+        for dwa in data:
+            key = dwa.get_full_name()
+            if key not in self._arrays:
+                self._create_arrays(key, dwa)
+            for array_buffer, array in zip(self._arrays[key], dwa.data):
+                array_buffer[indexes] = np.reshape(array, self._get_data_shape(array))
+        if nav_values is not None:
+            nav_values = np.asarray(nav_values, dtype=float).reshape((-1,))
+            if self._nav_values is None:
+                self._nav_values = np.full((self.extended_shape[-1], len(nav_values)), np.nan)
+            self._nav_values[indexes[-1]] = nav_values
+        self._new_data = True
+
+    def _get_filled_points(self, key: str) -> Tuple[List[Axis], List[np.ndarray], bool]:
+        """Navigation axes and arrays restricted to the steps whose navigation values were given, interpolated
+        on a grid if grid_shape is specified (the returned boolean)"""
+        filled = np.all(np.isfinite(self._nav_values), axis=1)
+        points = self._nav_values[filled]
+        arrays = [array[filled] for array in self._arrays[key]]
+        labels = [(axis.label, axis.units) for axis in self._nav_axes]
+        labels += [(f'axis_{ind:02d}', '') for ind in range(len(labels), points.shape[1])]
+        if self.grid_shape is not None and points.shape[1] in (1, 2) and len(points) > points.shape[1] + 1:
+            try:
+                grid_axes, arrays = interpolate_on_grid(points, arrays, self.grid_shape)
+                return [Axis(label, units=units, data=grid_axis, index=ind)
+                        for ind, ((label, units), grid_axis) in enumerate(zip(labels, grid_axes))], arrays, True
+            except (ValueError, RuntimeError) as e:  # not enough or aligned points
+                logger.debug(f'Could not interpolate the live data on a grid: {str(e)}')
+        return [Axis(label, units=units, data=points[:, ind], index=0, spread_order=ind)
+                for ind, (label, units) in enumerate(labels)], arrays, False
+
+    def load_all(self, where: str, data: DataToExport, with_bkg=False) -> DataToExport:
+        """Same signature as DataLoader.load_all, appends to data the buffered DataWithAxes
+
+        where and with_bkg are there for compatibility and not used
+        """
+        data_list = []
+        for key, template in self._templates.items():
+            nav_axes, arrays = [axis.copy() for axis in self._nav_axes], self._arrays[key][:]
+            sig_axes = [axis.copy() for axis in template['axes']]
+            distribution, nav_indexes = self.distribution, template['nav_indexes']
+            if self._nav_values is not None:
+                nav_axes, arrays, on_grid = self._get_filled_points(key)
+                if on_grid:  # the single spread dimension is replaced by the grid dimensions
+                    distribution = DataDistribution['uniform']
+                    shift = len(nav_axes) - len(self.extended_shape)
+                    nav_indexes = tuple(range(len(nav_axes))) + \
+                        tuple(ind + shift for ind in nav_indexes[len(self.extended_shape):])
+                    for axis in sig_axes:
+                        axis.index += shift
+            dwa = DataWithAxes(template['name'], source=template['source'], dim='DataND',
+                               units=template['units'], distribution=distribution,
+                               data=arrays, labels=template['labels'][:],
+                               origin=template['origin'], nav_indexes=nav_indexes,
+                               axes=sig_axes + nav_axes)
+            dwa.get_dim_from_data_axes()
+            dwa.create_missing_axes()
+            data_list.append(dwa)
+        data.data = data.data + data_list  # not using append as it would deepcopy the arrays
+        self._new_data = False
+        return data
+
+
 class LoaderPlotter:
 
     grouped_data0D_fullname = 'Grouped/Data0D'
@@ -63,6 +250,17 @@ class LoaderPlotter:
         self._h5saver = h5saver
         self.dataloader = DataLoader(h5saver)
 
+    @property
+    def live_buffer(self) -> LiveDataBuffer:
+        if isinstance(self.dataloader, LiveDataBuffer):
+            return self.dataloader
+
+    @live_buffer.setter
+    def live_buffer(self, live_buffer: LiveDataBuffer):
+        """Load data from an in memory buffer instead of a h5 file"""
+        self._h5saver = None
+        self.dataloader = live_buffer
+
     @property
     def data(self) -> DataToExport:
         return self._data
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Accumulators updating statistics of repeatedly acquired data in place, without keeping the individual acquisitions
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from pymodaq_data.data import DataToExport, DataWithAxes
+
+
+class RunningStatistics:
+    """ Running mean and variance of data acquired several times at each point of a grid (Welford's algorithm)
+
+    For instance the navigation points of an averaged scan. The accumulators are float64 arrays of shape
+    grid_shape + data shape, allocated at the first data of each channel then updated in place, so that the memory
+    does not depend on the number of repetitions
+
+    Parameters
+    ----------
+    grid_shape: Tuple[int]
+        The shape of the grid of points
+    """
+
+    def __init__(self, grid_shape: Tuple[int]):
+        self.grid_shape = tuple(grid_shape)
+        self._counts: Dict[Tuple[str, str], np.ndarray] = dict([])
+        self._means: Dict[Tuple[str, str], List[np.ndarray]] = dict([])
+        self._m2s: Dict[Tuple[str, str], List[np.ndarray]] = dict([])
+        self._buffers: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = dict([])
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the accumulators"""
+        return sum([sum([array.nbytes for array in arrays]) for arrays in self._means.values()]) * 2
+
+    def _allocate(self, key: Tuple[str, str], dwa: DataWithAxes):
+        shape = self.grid_shape + dwa.shape
+        self._counts[key] = np.zeros(self.grid_shape, dtype=np.int64)
+        self._means[key] = [np.zeros(shape) for _ in range(len(dwa))]
+        self._m2s[key] = [np.zeros(shape) for _ in range(len(dwa))]
+        self._buffers[key] = (np.zeros(dwa.shape), np.zeros(dwa.shape))
+
+    def get_count(self, dwa: DataWithAxes, indexes: Tuple[int]) -> int:
+        """The number of data of the same channel as dwa accumulated at a given point"""
+        key = (dwa.origin, dwa.name)
+        return int(self._counts[key][tuple(indexes)]) if key in self._counts else 0
+
+    def add_dwa(self, dwa: DataWithAxes, indexes: Tuple[int]) -> DataWithAxes:
+        """ Accumulate data at a given point
+
+        Parameters
+        ----------
+        dwa: DataWithAxes
+        indexes: Tuple[int]
+            The indexes of the point within the grid
+
+        Returns
+        -------
+        DataWithAxes: the mean of the data accumulated at this point so far, having as errors the standard errors of
+        this mean (0 for a single data)
+        """
+        key = (dwa.origin, dwa.name)
+        indexes = tuple(indexes)
+        if key not in self._means or self._means[key][0].shape[len(self.grid_shape):] != dwa.shape or \
+                len(self._means[key]) != len(dwa):
+            self._allocate(key, dwa)
+        self._counts[key][indexes] += 1
+        count = self._counts[key][indexes]
+        delta, delta_new = self._buffers[key]
+        means = []
+        errors = []
+        for ind, array in enumerate(dwa):
+            mean = self._means[key][ind][indexes]  # views on the accumulators at this point
+            m2 = self._m2s[key][ind][indexes]
+            np.subtract(array, mean, out=delta)
+            np.divide(delta, count, out=delta_new)
+            np.add(mean, delta_new, out=mean)
+            np.subtract(array, mean, out=delta_new)
+            np.multiply(delta, delta_new, out=delta_new)
+            np.add(m2, delta_new, out=m2)
+
+            means.append(mean.copy())
+            if count > 1:
+                errors.append(np.sqrt(m2 / ((count - 1) * count)))
+            else:
+                errors.append(np.zeros(dwa.shape))
+        dwa_mean = dwa.deepcopy_with_new_data(means, source=dwa.source, keep_dim=True)
+        dwa_mean.errors = errors
+        return dwa_mean
+
+    def add(self, dte: DataToExport, indexes: Tuple[int]) -> DataToExport:
+        """ Accumulate all the data of a DataToExport at a given point, see add_dwa
+
+        Returns
+        -------
+        DataToExport: with the same name and holding the means with their standard errors
+        """
+        return DataToExport(dte.name, data=[self.add_dwa(dwa, indexes) for dwa in dte])
+
+
+AVERAGING_MODES = ['mean', 'ema', 'rolling']
+
+
+class _Channel:
+    """ Preallocated accumulators of a channel (a DataWithAxes) of an Accumulator"""
+
+    def __init__(self, dwa: DataWithAxes, mode: str, window: int):
+        self.shape = dwa.shape
+        self.dtype = dwa[0].dtype
+        self.dwa = dwa  # template for the metadata of the averaged data
+        self.count = 0
+        self.sums = [np.zeros(dwa.shape) for _ in range(len(dwa))]  # the sum or the exponential moving average
+        if mode == 'ema':
+            self.buffer = np.zeros(dwa.shape)
+        elif mode == 'rolling':
+            self.frames = [np.zeros((window,) + dwa.shape, dtype=self.dtype) for _ in range(len(dwa))]
+
+    def matches(self, dwa: DataWithAxes) -> bool:
+        return dwa.shape == self.shape and dwa[0].dtype == self.dtype and len(dwa) == len(self.sums)
+
+
+class Accumulator:
+    """ Average of the successive data of the channels of DataToExport objects, updated in place
+
+    The accumulators of each channel are allocated at its first data then updated with numpy out= operations, so that
+    the averaging itself does not allocate memory whatever the number of averaged data. They are only reallocated
+    when the shape or the dtype of the channel changes, the accumulation of this channel starting over.
+
+    Parameters
+    ----------
+    mode: str
+        One of AVERAGING_MODES:
+
+        * mean: the mean of all the data added since the last reset (from their sum and count)
+        * ema: the exponential moving average of the data, the newest one having the weight alpha
+        * rolling: the mean of the last window data (kept in a ring of frames)
+    alpha: float
+        The weight of the newest data in the ema mode
+    window: int
+        The number of averaged data in the rolling mode
+    """
+
+    def __init__(self, mode: str = 'mean', alpha: float = 0.1, window: int = 10):
+        if mode not in AVERAGING_MODES:
+            raise ValueError(f'Unknown averaging mode {mode}, should be one of {AVERAGING_MODES}')
+        if not 0 < alpha <= 1:
+            raise ValueError(f'The weight alpha should be within ]0, 1], not {alpha}')
+        self.mode = mode
+        self.alpha = alpha
+        self.window = max(1, int(window))
+        self._channels: Dict[Tuple[str, str], _Channel] = dict([])
+        self._name: Optional[str] = None
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the accumulators"""
+        return sum([sum([array.nbytes for array in channel.sums]) +
+                    sum([array.nbytes for array in getattr(channel, 'frames', [])])
+                    for channel in self._channels.values()])
+
+    def reset(self):
+        """Start the averaging over, the accumulators being kept allocated"""
+        for channel in self._channels.values():
+            channel.count = 0
+
+    def get_count(self, dwa: DataWithAxes) -> int:
+        """The number of data of the same channel as dwa accumulated since the last reset"""
+        key = (dwa.origin, dwa.name)
+        return self._channels[key].count if key in self._channels else 0
+
+    def add_dwa(self, dwa: DataWithAxes):
+        """ Accumulate in place the data of a channel"""
+        key = (dwa.origin, dwa.name)
+        if key not in self._channels or not self._channels[key].matches(dwa):
+            self._channels[key] = _Channel(dwa, self.mode, self.window)
+        channel = self._channels[key]
+        channel.dwa = dwa
+        for ind, array in enumerate(dwa):
+            acc = channel.sums[ind]
+            if channel.count == 0:
+                np.copyto(acc, array)
+                if self.mode == 'rolling':
+                    np.copyto(channel.frames[ind][0], array)
+            elif self.mode == 'mean':
+                np.add(acc, array, out=acc)
+            elif self.mode == 'ema':
+                np.multiply(array, self.alpha, out=channel.buffer)
+                np.multiply(acc, 1 - self.alpha, out=acc)
+                np.add(acc, channel.buffer, out=acc)
+            else:
+                frames = channel.frames[ind]
+                slot = channel.count % self.window
+                if channel.count >= self.window:
+                    np.subtract(acc, frames[slot], out=acc)
+                np.copyto(frames[slot], array)
+                if slot == self.window - 1:  # the ring is full: sum it again so that rounding errors cannot drift
+                    np.sum(frames, axis=0, out=acc)
+                else:
+                    np.add(acc, array, out=acc)
+        channel.count += 1
+
+    def add(self, dte: DataToExport):
+        """ Accumulate in place all the data of a DataToExport, see add_dwa"""
+        self._name = dte.name
+        for dwa in dte:
+            self.add_dwa(dwa)
+
+    def get_dwa(self, dwa: DataWithAxes) -> DataWithAxes:
+        """ The average of the channel of dwa, as a new DataWithAxes (the only allocation of the averaging)"""
+        channel = self._channels[(dwa.origin, dwa.name)]
+        if self.mode == 'mean':
+            arrays = [np.divide(acc, channel.count) for acc in channel.sums]
+        elif self.mode == 'ema':
+            arrays = [acc.copy() for acc in channel.sums]
+        else:
+            arrays = [np.divide(acc, min(channel.count, self.window)) for acc in channel.sums]
+        return channel.dwa.deepcopy_with_new_data(arrays, source=channel.dwa.source, keep_dim=True)
+
+    def get_data(self) -> DataToExport:
+        """ The averages of all the channels accumulated since the last reset
+
+        Returns
+        -------
+        DataToExport: with the name of the last added DataToExport
+        """
+        return DataToExport(self._name, data=[self.get_dwa(channel.dwa) for channel in self._channels.values()
+                                              if channel.count > 0])
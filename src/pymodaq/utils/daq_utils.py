@@ -1,12 +1,16 @@
 
 import importlib
+import importlib.util
+import json
 from packaging import version as version_mod
 import pkgutil
 import platform
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
-from pymodaq_utils.config import Config
+from pymodaq_utils.config import Config, get_set_local_dir
 from pymodaq_utils.utils import get_entrypoints, ThreadCommand, getLineInfo, find_keys_from_val, is_64bits, timer  # for backcompat
+from pymodaq_utils.utils import get_version
 from pymodaq_utils.logger import set_logger, get_module_name  # for backcompat
 
 from pymodaq.utils.data import DataFromPlugins   # for backcompat
@@ -32,103 +36,213 @@ def copy_preset():                          # pragma: no cover
             path.write_text(file.read())
 
 
-@cache
-def get_instrument_plugins():  # pragma: no cover
-    """
-    Get plugins names as a list
-    Parameters
-    ----------
-    plugin_type: (str) plugin type either 'daq_0Dviewer', 'daq_1Dviewer', 'daq_2Dviewer', 'daq_NDviewer' or 'daq_move'
-    module: (module) parent module of the plugins
+PLUGIN_INDEX_VERSION = 1
+PLUGIN_INDEX_NAME = 'plugin_index.json'
+VIEWER_TYPES = ['0D', '1D', '2D', 'ND']
 
-    Returns
-    -------
 
+class PluginInfo(dict):
+    """ Description of an instrument plugin as stored in the plugin index
+
+    Behaves as the dictionaries historically returned by get_instrument_plugins (keys: name, type, module and
+    parent_module) but the *module* and *parent_module* entries are only imported when accessed, so that the python
+    package of a plugin (and its vendor libraries) is imported only when this plugin is selected.
+
+    Other keys are:
+
+    * module_name: the name of the package containing the plugin module (for instance
+      pymodaq_plugins_mock.daq_move_plugins)
+    * parent_module_name: the name of the plugin package (for instance pymodaq_plugins_mock)
+    * params: a json compatible copy of the class attribute *params* of the plugin
     """
-    plugins_import = []
+
+    def __getitem__(self, key):
+        if key == 'module':
+            self.import_module()
+            return importlib.import_module(self['module_name'])
+        elif key == 'parent_module':
+            return importlib.import_module(self['parent_module_name'])
+        return super().__getitem__(key)
+
+    @property
+    def plugin_module_name(self) -> str:
+        """ The name of the python module defining the plugin, for instance daq_move_Mock"""
+        if self['type'] == 'daq_move':
+            return f'daq_move_{self["name"]}'
+        return f'{self["type"]}_{self["name"]}'
+
+    @property
+    def class_name(self) -> str:
+        """ The name of the plugin class, for instance DAQ_Move_Mock or DAQ_0DViewer_Mock"""
+        if self['type'] == 'daq_move':
+            return f'DAQ_Move_{self["name"]}'
+        return f'DAQ_{self["type"][4:6]}Viewer_{self["name"]}'
+
+    def import_module(self):
+        """ Import and return the python module defining the plugin"""
+        return importlib.import_module(f'{self["module_name"]}.{self.plugin_module_name}')
+
+    def get_class(self) -> type:
+        """ Import the plugin module and return the plugin class"""
+        return getattr(self.import_module(), self.class_name)
+
+
+def get_plugin_index_path() -> Path:
+    return get_set_local_dir().joinpath(PLUGIN_INDEX_NAME)
+
+
+def _get_plugin_entrypoints() -> list:
     discovered_plugins = []
     discovered_plugins_all = list(get_entrypoints(group='pymodaq.plugins'))  # old naming of the instrument plugins
     discovered_plugins_all.extend(list(get_entrypoints(group='pymodaq.instruments')))  # new naming convention
     for entry in discovered_plugins_all:
-        if entry.name not in [ent.name for ent in discovered_plugins]:
+        if entry.value not in [ent.value for ent in discovered_plugins]:
             discovered_plugins.append(entry)
-    discovered_plugins = list(set(discovered_plugins))
+    return discovered_plugins
+
+
+def _get_package_path(package_name: str) -> Optional[Path]:
+    """ Get the folder of a top level package without importing it"""
+    try:
+        spec = importlib.util.find_spec(package_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return Path(list(spec.submodule_search_locations)[0])
+
+
+def _get_plugin_folders(package_name: str) -> Dict[str, Tuple[str, Path]]:
+    """ Get the subpackages (name and folder) containing the instrument plugins of a package, keyed by plugin type"""
+    package_path = _get_package_path(package_name)
+    folders = dict([])
+    if package_path is not None:
+        folders['daq_move'] = (f'{package_name}.daq_move_plugins', package_path.joinpath('daq_move_plugins'))
+        for vtype in VIEWER_TYPES:
+            folders[f'daq_{vtype}viewer'] = (f'{package_name}.daq_viewer_plugins.plugins_{vtype}',
+                                             package_path.joinpath('daq_viewer_plugins', f'plugins_{vtype}'))
+    return {plugin_type: folder for plugin_type, folder in folders.items() if folder[1].is_dir()}
+
+
+def get_plugin_index_key() -> dict:
+    """ Get what identifies the set of installed instrument plugins
+
+    The key contains the version of pymodaq and of each distribution declaring plugins, together with the modification
+    time of their plugin folders (so that adding a plugin file in an editable installation is also detected). It is
+    computed without importing any plugin package.
+    """
+    key = {'index_version': PLUGIN_INDEX_VERSION, 'pymodaq': get_version('pymodaq')}
+    for entrypoint in _get_plugin_entrypoints():
+        dist = getattr(entrypoint, 'dist', None)
+        key[entrypoint.value] = {
+            'version': dist.version if dist is not None else '',
+            'folders': {plugin_type: folder.stat().st_mtime_ns
+                        for plugin_type, (_, folder) in _get_plugin_folders(entrypoint.value).items()}}
+    return key
+
+
+def _get_params_metadata(params) -> list:
+    """ Get a json compatible copy of a plugin params attribute"""
+    return json.loads(json.dumps(params, default=str))
+
+
+def _check_plugin(plugin: PluginInfo) -> bool:
+    """ Import a plugin and store its params metadata, returns False if the import failed"""
+    try:
+        plugin['params'] = _get_params_metadata(getattr(plugin.get_class(), 'params', []))
+        logger.info(f"{plugin['module_name']}/{plugin['name']} available")
+        return True
+    except Exception as e:
+        # If an error is generated at the import, then exclude this plugin
+        logger.debug(f'Impossible to import Instrument plugin {plugin["name"]}'
+                     f' from module: {plugin["parent_module_name"]}: {str(e)}')
+        return False
+
+
+def build_plugin_index() -> List[PluginInfo]:
+    """ Discover the installed instrument plugins
+
+    This imports every plugin to check it can be used and to get its params metadata, see get_instrument_plugins
+    for the cached version
+
+    Returns
+    -------
+    list of PluginInfo
+    """
+    discovered_plugins = _get_plugin_entrypoints()
     logger.debug(f'Found {len(discovered_plugins)} installed plugins, trying to import them')
-    viewer_types = ['0D', '1D', '2D', 'ND']
     plugin_list = []
     for entrypoint in discovered_plugins:
-        #print(f'Looking for valid instrument plugins in package: {module.value}')
-
-        try:
-            try:
-                movemodule = importlib.import_module(f'{entrypoint.value}.daq_move_plugins', entrypoint.value)
-                plugin_list.extend([{'name': mod[len('daq_move') + 1:],
-                                     'module': movemodule,
-                                     'parent_module': importlib.import_module(entrypoint.value),
-                                     'type': 'daq_move'}
-                                    for mod in [mod[1] for mod in pkgutil.iter_modules([str(movemodule.path.parent)])]
-                                    if 'daq_move' in mod])
-                if len(plugin_list) > 0:
-                    logger.debug(f"Found Move Instrument:"
-                                f" {plugin_list[-1]['module'].__name__}/{plugin_list[-1]['name']}")
-            except ModuleNotFoundError:
-                pass
-
-            viewer_modules = {}
-            for vtype in viewer_types:
-                try:
-                    viewer_modules[vtype] = importlib.import_module(f'{entrypoint.value}.daq_viewer_plugins.plugins_{vtype}',
-                                                    entrypoint.value)
-                    plugin_list.extend([{'name': mod[len(f'daq_{vtype}viewer') + 1:],
-                                     'module': viewer_modules[vtype],
-                                     'parent_module': importlib.import_module(entrypoint.value),
-                                     'type': f'daq_{vtype}viewer'}
-                                    for mod in [mod[1] for mod in pkgutil.iter_modules([str(viewer_modules[vtype].path.parent)])]
-                                    if f'daq_{vtype}viewer' in mod])
-                    if len(plugin_list) > 0:
-                        logger.debug(f"Found Viewer Instrument: "
-                                    f"{plugin_list[-1]['module'].__name__}/{plugin_list[-1]['name']}")
-                except ModuleNotFoundError:
-                    pass
-
-        except Exception as e:  # pragma: no cover
-            logger.debug(str(e))
-
-    for mod in plugin_list:
-        try:
-            plugin_type = mod['type']
-            if plugin_type == 'daq_move':
-                submodule = mod['module']
-                importlib.import_module(f'{submodule.__package__}.daq_move_{mod["name"]}')
-            else:
-                submodule = mod['module']
-                importlib.import_module(f'{submodule.__package__}.daq_{plugin_type[4:6]}viewer_{mod["name"]}')
-            plugins_import.append(mod)
-            logger.info(f"{mod['module'].__name__}/{mod['name']} available")
-        except Exception as e:  # pragma: no cover
-            """If an error is generated at the import, then exclude this plugin"""
-            logger.debug(f'Impossible to import Instrument plugin {mod["name"]}'
-                         f' from module: {mod["parent_module"].__package__}')
-
+        for plugin_type, (package, folder) in _get_plugin_folders(entrypoint.value).items():
+            prefix = f'{plugin_type}_'
+            plugin_list.extend([PluginInfo(name=mod.name[len(prefix):], type=plugin_type, module_name=package,
+                                           parent_module_name=entrypoint.value)
+                                for mod in pkgutil.iter_modules([str(folder)]) if mod.name.startswith(prefix)])
 
     # add utility plugin for PID
+    plugin_list.append(PluginInfo(name='PID', type='daq_move', module_name='pymodaq.extensions.pid',
+                                  parent_module_name='pymodaq.extensions.pid'))
+
+    plugins = [plugin for plugin in plugin_list if _check_plugin(plugin)]
+    plugins.sort(key=lambda mod: mod['name'])
+    return plugins
+
+
+def load_plugin_index(key: dict = None) -> Optional[List[PluginInfo]]:
+    """ Load the plugins from the on-disk index if it is still valid for the given key (current one if None)"""
+    if key is None:
+        key = get_plugin_index_key()
     try:
-        pidmodule = importlib.import_module('pymodaq.extensions.pid')
-        mod = [{'name': 'PID',
-               'module': pidmodule,
-               'parent_module': pidmodule,
-               'type': 'daq_move'}]
-        importlib.import_module(f'{pidmodule.__package__}.daq_move_PID')
-        plugins_import.extend(mod)
+        index = json.loads(get_plugin_index_path().read_text())
+        if index['key'] == key:
+            return [PluginInfo(plugin) for plugin in index['plugins']]
+    except Exception as e:
+        logger.debug(f'Invalid instrument plugin index: {str(e)}')
+    return None
+
 
+def save_plugin_index(plugins: List[PluginInfo], key: dict = None):
+    if key is None:
+        key = get_plugin_index_key()
+    try:
+        get_plugin_index_path().write_text(json.dumps(dict(key=key, plugins=plugins), indent=1))
     except Exception as e:
-        logger.debug(f'Impossible to import PID utility plugin: {str(e)}')
+        logger.warning(f'Could not save the instrument plugin index: {str(e)}')
+
+
+@cache
+def get_instrument_plugins() -> List[PluginInfo]:  # pragma: no cover
+    """ Get the installed instrument plugins
+
+    The list is read from an on-disk index stored in the pymodaq local folder. This index is rebuilt (importing all
+    plugins) only when the installed plugin distributions changed, otherwise no plugin is imported before it is
+    selected.
+
+    Returns
+    -------
+    list of PluginInfo: the dict like description of each plugin with keys: name, type, module_name,
+        parent_module_name, params and the lazily imported module and parent_module
+    """
+    key = get_plugin_index_key()
+    plugins = load_plugin_index(key)
+    if plugins is None:
+        logger.info('Building the index of instrument plugins...')
+        plugins = build_plugin_index()
+        save_plugin_index(plugins, key)
+    else:
+        logger.info(f'Loaded {len(plugins)} instrument plugins from the index')
+    return plugins
+
 
-    plugins_import.sort(key=lambda mod: mod['name'])
-    return plugins_import
+def update_plugin_index() -> List[PluginInfo]:
+    """ Force the rebuild of the instrument plugin index"""
+    get_instrument_plugins.cache_clear()
+    plugins = build_plugin_index()
+    save_plugin_index(plugins)
+    return plugins
 
 
-def get_plugins(plugin_type='daq_0Dviewer'):  # pragma: no cover
+def get_plugins(plugin_type='daq_0Dviewer') -> List[PluginInfo]:  # pragma: no cover
     """
     Get plugins names as a list
     Parameters
@@ -91,6 +91,48 @@ class DataFromPlugins(DataRaw):
         super().__init__(*args, **kwargs)
 
 
+def set_read_only(dte: DataToExport) -> DataToExport:
+    """ Flag in place all the arrays of a DataToExport as non writeable
+
+    Used to share a single frame between several consumers (viewers, savers, TCP/IP or LECO clients...) without
+    copying it: any attempt to modify the shared arrays in place raises a ValueError
+
+    Parameters
+    ----------
+    dte: DataToExport
+
+    Returns
+    -------
+    DataToExport: the same object
+    """
+    for dwa in dte:
+        for array in dwa.data:
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+    return dte
+
+
+def take_ownership(dte: DataToExport) -> DataToExport:
+    """ Copy once the data handed over by an instrument plugin and flag the copy as read-only
+
+    After this, the returned object can be freely shared as long as it is used read-only
+
+    Parameters
+    ----------
+    dte: DataToExport
+
+    Returns
+    -------
+    DataToExport: a read-only deep copy of dte (keeping its type, name, timestamp and extra attributes)
+    """
+    return set_read_only(copy.deepcopy(dte))
+
+
+def nbytes(dte: DataToExport) -> int:
+    """ Get the total number of bytes of the arrays contained in a DataToExport"""
+    return sum([sum([array.nbytes for array in dwa.data]) for dwa in dte])
+
+
 @ser_factory.register_decorator()
 class DataScan(DataToExport):
     """Specialized DataToExport.To be used for data to be saved """
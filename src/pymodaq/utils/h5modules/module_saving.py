@@ -6,19 +6,23 @@ Created the 23/11/2022
 """
 from __future__ import annotations
 
-from typing import Union, List, Dict, Tuple, TYPE_CHECKING
+import queue
+from threading import Thread, RLock, Condition
+from typing import Union, List, Dict, Tuple, Callable, Iterable, TYPE_CHECKING
 import xml.etree.ElementTree as ET
 
 
 import numpy as np
 
 from pymodaq_utils.abstract import ABCMeta, abstract_attribute, abstractmethod
+from pymodaq_utils.logger import set_logger, get_module_name
 from pymodaq_utils.utils import capitalize
 from pymodaq_data.data import Axis, DataDim, DataWithAxes, DataToExport, DataDistribution
 from pymodaq_data.h5modules.saving import H5SaverLowLevel
-from pymodaq_data.h5modules.backends import GROUP, CARRAY, Node, GroupType
-from pymodaq_data.h5modules.data_saving import (DataToExportSaver, AxisSaverLoader,
-                                                DataToExportTimedSaver, DataToExportExtendedSaver)
+from pymodaq_data.h5modules.backends import GROUP, CARRAY, EARRAY, Node, GroupType
+from pymodaq_data.h5modules.data_saving import (DataToExportSaver, AxisSaverLoader, DataToExportEnlargeableSaver,
+                                                DataToExportTimedSaver, DataToExportExtendedSaver, DataExtendedSaver,
+                                                DataType)
 from pymodaq_gui.parameter import ioxml
 
 if TYPE_CHECKING:
@@ -26,6 +30,13 @@ if TYPE_CHECKING:
     from pymodaq.control_modules.daq_viewer import DAQ_Viewer
     from pymodaq.control_modules.daq_move import DAQ_Move
     from pymodaq.extensions.daq_logger.h5logging import H5Logger
+    from pymodaq.utils.scanner.profiler import StepProfiler
+
+logger = set_logger(get_module_name(__file__))
+
+# PyTables is not thread-safe, even when different files are accessed: while an H5WriterThread is running, any other
+# access to a h5 file (live data spilled over a temporary file, navigator, ...) should be done holding this lock
+h5_lock = RLock()
 
 
 class ModuleSaver(metaclass=ABCMeta):
@@ -227,6 +238,49 @@ class DetectorEnlargeableSaver(DetectorSaver):
         self._datatoexport_saver = DataToExportTimedSaver(self.h5saver)
 
 
+class DetectorEnlargeableNavSaver(DetectorSaver):
+    """Implementation of the ModuleSaver class dedicated to DAQ_Viewer modules in order to save data appended one
+    point at a time together with the values of their navigation axes
+
+    To be used when the positions are not known in advance (adaptive scans), the data are then spread along the
+    navigation axes
+
+    Parameters
+    ----------
+    module
+    enl_axis_names: Iterable[str]
+        The names of the navigation axes (for instance the actuators names)
+    enl_axis_units: Iterable[str]
+        The units of the navigation axes
+    """
+    group_type = GroupType['detector']
+
+    def __init__(self, module: DAQ_Viewer, enl_axis_names: Iterable[str], enl_axis_units: Iterable[str]):
+        super().__init__(module)
+        self._enl_axis_names = tuple(enl_axis_names)
+        self._enl_axis_units = tuple(enl_axis_units)
+        self._datatoexport_saver: DataToExportEnlargeableSaver = None
+
+    def update_after_h5changed(self, ):
+        self._datatoexport_saver = DataToExportEnlargeableSaver(self.h5saver, enl_axis_names=self._enl_axis_names,
+                                                                enl_axis_units=self._enl_axis_units)
+
+    def add_data(self, where: Union[Node, str], data: DataToExport, axis_values: Iterable[float] = None, **kwargs):
+        self._datatoexport_saver.add_data(where, data, axis_values=axis_values)
+
+
+class ErrorExtendedSaver(DataExtendedSaver):
+    """Save the errors of DataWithAxes within arrays extended with the scan shape, next to the data arrays
+
+    The DataLoader then loads them as the errors attribute of the data
+    """
+    data_type = DataType['error']
+
+    def _create_data_arrays(self, where: Union[Node, str], data: DataWithAxes, save_axes=True,
+                            distribution=DataDistribution['uniform']):
+        super()._create_data_arrays(where, data, save_axes=False, distribution=distribution)
+
+
 class DetectorExtendedSaver(DetectorSaver):
     """Implementation of the ModuleSaver class dedicated to DAQ_Viewer modules in order to save enlargeable data
 
@@ -240,17 +294,65 @@ class DetectorExtendedSaver(DetectorSaver):
         super().__init__(module)
         self._extended_shape = extended_shape
         self._datatoexport_saver: DataToExportExtendedSaver = None
+        self._error_saver: ErrorExtendedSaver = None
 
     def update_after_h5changed(self, ):
         self._datatoexport_saver = DataToExportExtendedSaver(self.h5saver, self._extended_shape)
+        self._error_saver = ErrorExtendedSaver(self.h5saver, self._extended_shape)
 
     def add_data(self, where: Union[Node, str], data: DataToExport, indexes: Tuple[int],
                  distribution=DataDistribution['uniform']):
         self._datatoexport_saver.add_data(where, data, indexes=indexes, distribution=distribution)
+        self._add_errors(where, [data], [indexes], distribution)
+
+    def _get_channel_group(self, where: Union[Node, str], dim: str, ind: int, dwa: DataWithAxes) -> GROUP:
+        dim_group = self._h5saver.get_set_group(where, dim)
+        return self._h5saver.get_set_group(dim_group, DataToExportSaver.channel_formatter(ind), dwa.name,
+                                           origin=dwa.origin)
+
+    def _add_errors(self, where: Union[Node, str], dtes: List[DataToExport], indexes: List[Tuple[int]],
+                    distribution=DataDistribution['uniform']):
+        """Save the errors of the data (if any) at the given indexes"""
+        for dim in dtes[0].get_dim_presents():
+            for ind, dwa in enumerate(dtes[0].get_data_from_dim(dim)):
+                if dwa.errors is None:
+                    continue
+                dwa_group = self._get_channel_group(where, dim, ind, dwa)
+                for dte, index in zip(dtes, indexes):
+                    self._error_saver.add_data(dwa_group, dte.get_data_from_dim(dim)[ind].errors_as_dwa(),
+                                               indexes=index, distribution=distribution)
 
     def add_nav_axes(self, where: Union[Node, str], axes: List[Axis]):
         self._datatoexport_saver.add_nav_axes(where, axes)
 
+    def add_data_block(self, where: Union[Node, str], dtes: List[DataToExport], indexes: List[Tuple[int]],
+                       distribution=DataDistribution['uniform']):
+        """Adds several steps at once, written as a single hyperslab per array
+
+        Parameters
+        ----------
+        where: Union[Node, str]
+            the path of a given node or the node itself
+        dtes: List[DataToExport]
+            the data of each step, all with the same structure
+        indexes: List[Tuple[int]]
+            the indexes of each step, they should only differ by their last index, increasing one by one
+        distribution: DataDistribution
+        """
+        self.add_data(where, dtes[0], indexes[0], distribution=distribution)  # creates the arrays if needed
+        if len(dtes) == 1:
+            return
+        self._add_errors(where, dtes[1:], indexes[1:], distribution)
+        block = tuple(indexes[1][:-1]) + (slice(indexes[1][-1], indexes[-1][-1] + 1),)
+        for dim in dtes[0].get_dim_presents():
+            for ind, dwa in enumerate(dtes[0].get_data_from_dim(dim)):
+                dwa_group = self._get_channel_group(where, dim, ind, dwa)
+                dwas = [dte.get_data_from_dim(dim)[ind] for dte in dtes[1:]]
+                for ind_data in range(len(dwa)):
+                    array: CARRAY = self._datatoexport_saver._data_saver.get_node_from_index(dwa_group, ind_data)
+                    array[block] = np.stack([_dwa[ind_data] for _dwa in dwas]).reshape(
+                        (len(dwas),) + array.array.shape[len(self._extended_shape):])
+
 
 class ActuatorSaver(ModuleSaver):
     """Implementation of the ModuleSaver class dedicated to DAQ_Move modules
@@ -285,6 +387,105 @@ class ActuatorSaver(ModuleSaver):
         self._datatoexport_saver.add_data(where, data)
 
 
+class H5WriterThread:
+    """Thread writing into a h5file the items put in its queue
+
+    Items are processed by batches (all items waiting in the queue up to batch_size) so that a batch can be written
+    in a few large blocks followed by a single flush. Each batch is written holding h5_lock.
+
+    put never blocks (it is called from the GUI thread) so the queue itself is not bounded: the backpressure is
+    applied on the producer of the data (the acquisition thread) that should call wait_room before producing more
+    items, wait_room blocking while maxsize items or more are waiting to be written
+
+    Parameters
+    ----------
+    write_batch: Callable[[list], None]
+        the function doing the actual writing of a batch of items
+    maxsize: int
+        number of items waiting to be written beyond which wait_room blocks
+    batch_size: int
+        maximum number of items written at once
+    """
+
+    def __init__(self, write_batch: Callable[[list], None], maxsize=100, batch_size=20):
+        self._write_batch = write_batch
+        self._queue = queue.Queue()
+        self._room = Condition()  # notified by the thread each time a batch has been written
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self._thread: Thread = None
+        self.n_written = 0
+        self.n_batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self._thread = Thread(target=self._run, name='H5WriterThread', daemon=True)
+            self._thread.start()
+
+    @property
+    def full(self) -> bool:
+        return self._queue.qsize() >= self.maxsize
+
+    def put(self, item):
+        """Queue an item to be written, never blocks (see wait_room)"""
+        self._queue.put_nowait(item)
+
+    def wait_room(self, timeout: float = None) -> bool:
+        """Block until less than maxsize items are waiting to be written
+
+        Parameters
+        ----------
+        timeout: float
+            maximum waiting time in seconds, if None wait as long as the thread is running
+
+        Returns
+        -------
+        bool: False if the queue was still full after timeout
+        """
+        with self._room:
+            return self._room.wait_for(lambda: not (self.running and self.full), timeout)
+
+    def join(self):
+        """Block until all queued items have been written"""
+        self._queue.join()
+
+    def stop(self):
+        """Write all queued items then stop the thread"""
+        if self.running:
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            items = [item for item in batch if item is not None]
+            try:
+                if len(items) > 0:
+                    with h5_lock:
+                        self._write_batch(items)
+                    self.n_written += len(items)
+                    self.n_batches += 1
+            except Exception as e:
+                logger.exception(str(e))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+                with self._room:
+                    self._room.notify_all()
+            if batch[-1] is None:
+                break
+
+
 class ScanSaver(ModuleSaver):
     """Implementation of the ModuleSaver class dedicated to DAQScan module
 
@@ -292,13 +493,62 @@ class ScanSaver(ModuleSaver):
     ----------
     h5saver
     module
+    asynchronous: bool
+        if True, data are written into the file from a dedicated thread (see start_writer)
+
+    Attributes
+    ----------
+    profiler: StepProfiler
+        if set, the save events of the steps given to add_data are marked when their data are actually written
     """
     group_type = GroupType['scan']
 
-    def __init__(self, module):
+    def __init__(self, module, asynchronous=False):
         self._module_group: GROUP = None
         self._module: DAQScan = module
         self._h5saver = None
+        self._writer: H5WriterThread = H5WriterThread(self._write_batch) if asynchronous else None
+        self._progress: EARRAY = None
+        self._repetitions_group: GROUP = None
+        self._repetitions_savers: Dict[str, DetectorExtendedSaver] = dict([])
+        self.profiler: StepProfiler = None
+
+    def start_writer(self):
+        """Start the writer thread if asynchronous, the file should not be accessed by other means until
+        stop_writer is called"""
+        if self._writer is not None:
+            self._writer.start()
+
+    def stop_writer(self):
+        """Write all pending data then stop the writer thread"""
+        if self._writer is not None:
+            self._writer.stop()
+
+    def flush(self):
+        """Wait for all pending data to be written then flush the underlying file"""
+        if self._writer is not None and self._writer.running:
+            self._writer.join()
+        with h5_lock:
+            super().flush()
+
+    def wait_writer(self, timeout: float = None) -> bool:
+        """Block the caller while too many data are waiting to be written by the writer thread
+
+        To be called by the producer of the data (the acquisition thread) before each step so that a slow disk
+        slows down the acquisition rather than the GUI thread queuing the data
+
+        Parameters
+        ----------
+        timeout: float
+            maximum waiting time in seconds
+
+        Returns
+        -------
+        bool: False if data were still waiting to be written after timeout
+        """
+        if self._writer is None:
+            return True
+        return self._writer.wait_room(timeout)
 
     def update_after_h5changed(self):
         for module in self._module.modules_manager.modules_all:
@@ -365,16 +615,275 @@ class ScanSaver(ModuleSaver):
                                             metadata=metadata)
 
     def add_nav_axes(self, axes: List[Axis]):
+        if self._writer is not None and self._writer.running:
+            self._writer.put(('nav_axes', self._module_group, axes))
+        else:
+            self._add_nav_axes(self._module_group, axes)
+
+    def _add_nav_axes(self, where: Union[Node, str], axes: List[Axis]):
         for detector in self._module.modules_manager.detectors:
-            detector.module_and_data_saver.add_nav_axes(self._module_group, axes)
+            detector.module_and_data_saver.add_nav_axes(where, axes)
 
-    def add_data(self, dte: DataToExport = None, indexes: Tuple[int] = None,
-                 distribution=DataDistribution['uniform']):
+    def add_timings(self, timings: DataToExport):
+        """Save the timings of the scan steps in a dedicated group of the current scan node
+
+        To be called once the scan is done (and the writer thread stopped)
+
+        Parameters
+        ----------
+        timings: DataToExport
+            see pymodaq.utils.scanner.profiler.StepProfiler.to_dte
+        """
+        timings_group = self._h5saver.add_group('Timings', 'data', self._module_group, title='Step timings')
+        DataToExportSaver(self._h5saver).add_data(timings_group, timings)
+
+    def init_progress(self, extended_shape: Tuple[int], positions: np.ndarray = None):
+        """Get or create the journal of the steps written in the current scan node
+
+        Once all detectors data of a step have been written, its indexes are appended to the journal so that an
+        interrupted scan can be resumed from its first missing step (see get_progress)
+
+        Parameters
+        ----------
+        extended_shape: Tuple[int]
+            the shape of the scan, averaging included, as used by the DetectorExtendedSaver of the detectors
+        positions: np.ndarray
+            the positions of the scan steps, saved with the journal so that a resumed scan can be checked to be the
+            same (see get_scan_positions)
+        """
+        if self.has_progress(self._module_group):
+            self._progress = self._h5saver.get_node(self._module_group, 'Progress')
+        else:
+            self._progress = self._h5saver.create_earray(self._module_group, 'Progress', dtype=np.int32,
+                                                         data_shape=(len(extended_shape),),
+                                                         title='Indexes of the written steps')
+            self._progress.attrs['extended_shape'] = tuple(extended_shape)
+            if positions is not None:
+                self._h5saver.create_carray(self._module_group, 'ScanPositions', obj=np.asarray(positions),
+                                            title='Positions of the scan steps')
+
+    def get_scan_positions(self, where: Union[Node, str]) -> np.ndarray:
+        """Get the positions of the scan steps saved with the journal of a scan node, None if not saved"""
+        if not self._h5saver.is_node_in_group(where, 'ScanPositions'):
+            return None
+        return self._h5saver.get_node(where, 'ScanPositions').read()
+
+    def get_nav_axes(self, where: Union[Node, str]) -> List[Axis]:
+        """Get the navigation axes saved in a scan node (see add_nav_axes), empty if not saved yet"""
+        if not self._h5saver.is_node_in_group(where, 'NavAxes'):
+            return []
+        return AxisSaverLoader(self._h5saver).get_axes(self._h5saver.get_node(where, 'NavAxes'))
+
+    def has_progress(self, where: Union[Node, str]) -> bool:
+        """Check if a scan node holds a journal of written steps, that is if a scan has been started in it"""
+        return self._h5saver.is_node_in_group(where, 'Progress')
+
+    def stop_progress(self):
+        """Stop journaling the written steps"""
+        self._progress = None
+
+    def _log_progress(self, indexes: List[Tuple[int]]):
+        if self._progress is not None:
+            for index in indexes:  # one by one as the h5py backend only appends a single row at once
+                self._progress.append(np.array(index, dtype=np.int32))
+
+    def get_progress(self, where: Union[Node, str] = None) -> Tuple[Tuple[int], np.ndarray]:
+        """Get the steps written in a scan node from its journal (see init_progress)
+
+        The journal is checked against the detectors nodes: if one of them does not hold data arrays extended with
+        the scan shape, none of the steps is considered as written
+
+        Parameters
+        ----------
+        where: Union[Node, str]
+            the scan node, if None the last one
+
+        Returns
+        -------
+        Tuple[int]: the shape of the scan, averaging included, or None if the node has no journal
+        np.ndarray: boolean array of this shape, True for the written steps
+        """
+        if where is None:
+            where = self.get_last_node()
+        if where is None or not self.has_progress(where):
+            return None, np.zeros((0,), dtype=bool)
+        progress = self._h5saver.get_node(where, 'Progress')
+        extended_shape = tuple([int(size) for size in progress.attrs['extended_shape']])
+        written = np.zeros(extended_shape, dtype=bool)
+        for detector_group in self._h5saver.get_groups(where, 'detector'):
+            arrays = [node for node in self._h5saver.walk_nodes(detector_group)
+                      if 'data_type' in node.attrs and node.attrs['data_type'] == 'data']
+            if not any([tuple(array.attrs['shape'][:len(extended_shape)]) == extended_shape for array in arrays]):
+                return extended_shape, written
+        indexes = progress.read().reshape((-1, len(extended_shape)))
+        indexes = indexes[np.all((indexes >= 0) & (indexes < extended_shape), axis=1)]
+        written[tuple(indexes.T)] = True
+        return extended_shape, written
+
+    def init_repetitions(self, extended_shape: Tuple[int] = None, nav_axes: List[Axis] = None):
+        """Create the group holding the raw repetitions of a scan whose detectors nodes hold running averages
+
+        Within the "Repetitions" group of the current scan node, each detector gets its own node whose data are
+        extended with the given shape, see add_data with repetitions=True
+
+        Parameters
+        ----------
+        extended_shape: Tuple[int]
+            the shape of the scan including the repetitions, if None the repetitions are no more saved
+        nav_axes: List[Axis]
+            the navigation axes of the repetitions
+        """
+        self._repetitions_savers = dict([])
+        self._repetitions_group = None
+        if extended_shape is None:
+            return
+        self._repetitions_group = self._h5saver.add_group('Repetitions', 'data', self._module_group,
+                                                          title='Raw repetitions')
         for detector in self._module.modules_manager.detectors:
+            saver = DetectorExtendedSaver(detector, extended_shape)
+            saver.main_module = False
+            saver.h5saver = self._h5saver
+            self._repetitions_savers[detector.title] = saver
+        if nav_axes is not None and len(self._repetitions_savers) > 0:
+            list(self._repetitions_savers.values())[0].add_nav_axes(self._repetitions_group, nav_axes)
+
+    def add_data(self, dte: DataToExport = None, indexes: Tuple[int] = None,
+                 distribution=DataDistribution['uniform'], dtes: List[DataToExport] = None,
+                 axis_values: List[float] = None, repetitions=False, step: int = None):
+        """Save the current data of the detectors at the given indexes within the scan
+
+        Parameters
+        ----------
+        dte: DataToExport
+            if given, only the detector whose title is the name of dte is saved, using these data rather than its
+            current ones (streaming scans)
+        indexes: Tuple[int]
+        distribution: DataDistribution
+        dtes: List[DataToExport]
+            if given, the data of each detector (named after its title) grabbed at this step, to be saved rather than
+            their current ones that may already belong to the next step (pipelined scans)
+        axis_values: List[float]
+            if given, the data are appended to the enlargeable arrays of the detectors (see
+            DetectorEnlargeableNavSaver) with these values of the navigation axes (adaptive scans)
+        repetitions: bool
+            if True, the data are raw repetitions saved in the Repetitions group (see init_repetitions)
+        step: int
+            the index of the step within the scan (averaging included) whose save events are marked in the profiler
+        """
+        if repetitions and self._repetitions_group is None:
+            return
+        detectors = self._module.modules_manager.detectors
+        if dte is not None:
+            dtes = [dte]
+        dtes = {_dte.name: _dte for _dte in dtes} if dtes is not None else None
+        if dtes is not None:
+            detectors = [detector for detector in detectors if detector.title in dtes]
+        writer_running = self._writer is not None and self._writer.running
+        if writer_running or axis_values is not None or repetitions:
+            # only a snapshot of the detectors data is taken here, the writing may be done by the writer thread
+            init_step = bool(np.all(np.array(indexes) == 0)) and not repetitions
+            where = self._repetitions_group if repetitions else self._module_group
+            snapshots = []
+            for detector in detectors:
+                saver = self._repetitions_savers[detector.title] if repetitions else detector.module_and_data_saver
+                try:
+                    snapshots.append((saver,
+                                      detector.get_data_to_save(dtes[detector.title] if dtes is not None else None),
+                                      detector.bkg_to_save if init_step else None))
+                except Exception as e:
+                    logger.exception(str(e))
+                    snapshots.append((saver, None, None))  # so that the step is not logged as written
+            if axis_values is None:
+                item = ('data', where, tuple(indexes), distribution, snapshots, step)
+            else:
+                item = ('points', where, tuple(axis_values), snapshots, step)
+            if writer_running:
+                self._writer.put(item)
+            else:
+                self._write_batch([item])
+        else:
+            self._mark([step], 'save_start')
+            written = True
+            for detector in detectors:
+                try:
+                    detector.insert_data(indexes, where=self._module_group, distribution=distribution,
+                                         dte=dtes[detector.title] if dtes is not None else None)
+                except Exception as e:
+                    written = False
+                    logger.exception(str(e))
+            if written:
+                self._log_progress([indexes])
+            self._mark([step], 'save_done')
+
+    def _mark(self, steps: List[int], event: str):
+        """Mark an event of the given steps in the profiler, if any"""
+        if self.profiler is not None:
+            for step in steps:
+                if step is not None:
+                    self.profiler.mark(step, event)
+
+    @staticmethod
+    def _is_next_step(item: tuple, next_item: tuple) -> bool:
+        """Check if next_item is a data step directly following item along the last scan index"""
+        return (next_item[0] == 'data' and next_item[1] is item[1] and
+                [snapshot[0] for snapshot in next_item[4]] == [snapshot[0] for snapshot in item[4]] and
+                next_item[2][:-1] == item[2][:-1] and next_item[2][-1] == item[2][-1] + 1)
+
+    def _write_batch(self, items: list):
+        """Write a batch of items queued to the writer thread, consecutive steps are written as blocks"""
+        ind = 0
+        while ind < len(items):
+            item = items[ind]
+            ind += 1
+            if item[0] == 'nav_axes':
+                self._add_nav_axes(item[1], item[2])
+                continue
+            if item[0] == 'points':
+                self._mark([item[4]], 'save_start')
+                self._write_points(*item[1:4])
+                self._mark([item[4]], 'save_done')
+                continue
+            run = [item]
+            while ind < len(items) and self._is_next_step(run[-1], items[ind]):
+                run.append(items[ind])
+                ind += 1
+            self._mark([item[5] for item in run], 'save_start')
+            if self._write_steps(run) and run[0][1] is self._module_group:
+                self._log_progress([item[2] for item in run])
+            self._mark([item[5] for item in run], 'save_done')
+        self._h5saver.flush()
+
+    def _write_steps(self, run: list) -> bool:
+        """Write consecutive steps of all detectors, return False if one of them could not be written"""
+        where, distribution = run[0][1], run[0][3]
+        written = True
+        for ind_det, (saver, _, _) in enumerate(run[0][4]):
+            try:
+                detector_node = saver.get_set_node(where)
+                dtes = [item[4][ind_det][1] for item in run]
+                if any([dte is None for dte in dtes]):
+                    written = False
+                    continue
+                saver.add_data_block(detector_node, dtes, [item[2] for item in run], distribution=distribution)
+                for item in run:
+                    if item[4][ind_det][2] is not None:
+                        saver.add_bkg(detector_node, item[4][ind_det][2])
+            except Exception as e:
+                written = False
+                logger.exception(str(e))
+        return written
+
+    def _write_points(self, where: Union[Node, str], axis_values: Tuple[float], snapshots: list):
+        for saver, dte, bkg in snapshots:
             try:
-                detector.insert_data(indexes, where=self._module_group, distribution=distribution)
+                if dte is None:
+                    continue
+                detector_node = saver.get_set_node(where)
+                saver.add_data(detector_node, dte, axis_values=axis_values)
+                if bkg is not None:
+                    saver.add_bkg(detector_node, bkg)
             except Exception as e:
-                pass
+                logger.exception(str(e))
 
 
 class LoggerSaver(ScanSaver):
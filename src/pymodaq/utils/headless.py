@@ -0,0 +1,589 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Headless acquisition: the actuator and detector plugins are driven directly (without DAQ_Move/DAQ_Viewer nor their
+UI) and scans are saved with the same layout as the DAQScan extension. Only a QCoreApplication is needed, for the
+timers and signals used by the plugins, so that scans can be scripted on acquisition nodes without a display
+
+Examples
+--------
+>>> app = get_headless_app()
+>>> actuator = HeadlessActuator('Mock', 'Xaxis')
+>>> detector = HeadlessDetector('DAQ0D', 'Mock', 'Det0D')
+>>> actuator.init(), detector.init()
+>>> scan = HeadlessScan([actuator], [detector])
+>>> scan.set_scanner('Scan1D', 'Linear', start=0., stop=10., step=1.)
+>>> scan.run('my_scan.h5')
+"""
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from easydict import EasyDict as edict
+from qtpy import QtCore
+from qtpy.QtCore import QObject, QThread, QDateTime, Signal, Slot
+
+from pymodaq_utils.logger import set_logger, get_module_name
+from pymodaq_utils.utils import ThreadCommand
+from pymodaq_utils.config import Config
+from pymodaq_utils import utils
+
+from pymodaq_data.data import DataToExport, DataDistribution, Axis
+from pymodaq_data.h5modules.saving import H5SaverLowLevel
+from pymodaq_data.h5modules.backends import Node
+
+from pymodaq_gui.parameter import Parameter
+from pymodaq_gui.h5modules.saving import H5SaverBase
+
+from pymodaq.control_modules.daq_move import DAQ_Move_Hardware, DAQ_Move_Actuators
+from pymodaq.control_modules.move_utility_classes import params as daq_move_params
+from pymodaq.control_modules.daq_viewer import DAQ_Detector
+from pymodaq.control_modules.viewer_utility_classes import params as daq_viewer_params
+from pymodaq.control_modules.utils import get_viewer_plugins
+from pymodaq.utils.data import DataActuator, take_ownership
+from pymodaq.utils.h5modules import module_saving
+from pymodaq.utils.managers.modules_manager import ModulesDoneWaiter
+from pymodaq.utils.scanner.scanner import scanner_factory
+from pymodaq.utils.scanner.scan_factory import ScannerBase, AdaptiveScanner
+from pymodaq.utils.scanner.profiler import StepProfiler
+
+logger = set_logger(get_module_name(__file__))
+config = Config()
+
+
+def get_headless_app() -> QtCore.QCoreApplication:
+    """ Get the running Qt application or create a QCoreApplication, enough for the plugins and the waits"""
+    app = QtCore.QCoreApplication.instance()
+    if app is None:
+        app = QtCore.QCoreApplication([])
+    return app
+
+
+class HeadlessH5Saver(H5SaverLowLevel):
+    """ H5SaverLowLevel holding the settings of a H5Saver, as written by the savers, but without its widgets
+
+    Parameters
+    ----------
+    save_type: str
+        an element of SaveType, see H5SaverLowLevel
+    backend: str
+    """
+
+    def __init__(self, save_type='scan', backend='tables'):
+        super().__init__(save_type=save_type, backend=backend)
+        self.settings = Parameter.create(name='h5saver_settings', type='group', children=H5SaverBase.params)
+        self.settings.child('save_type').setValue(self.save_type.name)
+        self.settings.child('backend', 'backend_type').setValue(backend)
+
+    def init_file(self, file_name: Union[str, Path], raw_group_name='RawData', new_file=False,
+                  metadata: dict = None):
+        file_name = Path(file_name)
+        self.settings.child('current_h5_file').setValue(str(file_name))
+        super().init_file(file_name, raw_group_name=raw_group_name, new_file=new_file, metadata=metadata)
+
+
+class HeadlessModule(QObject):
+    """ Base class hosting an actuator or detector plugin without UI
+
+    The settings are the ones of the corresponding control module (and are saved as such), the changes of the plugin
+    part being applied to the plugin as from a control module
+
+    Parameters
+    ----------
+    title: str
+    params: list
+        the params of the control module
+    plugin_settings_name: str
+        the name of the settings group of the plugin: move_settings or detector_settings
+    """
+    settings_name = 'settings'
+
+    def __init__(self, title: str, params: list, plugin_settings_name: str):
+        super().__init__()
+        self._title = title
+        self.logger = set_logger(f'{logger.name}.{title}')
+        self._plugin_settings_name = plugin_settings_name
+        self._hardware = None
+        self.controller = None
+        self.initialized_state = False
+        self.settings = Parameter.create(name=self.settings_name, type='group', children=params)
+        self.settings.child('main_settings', 'module_name').setValue(title)
+        self.settings.sigTreeStateChanged.connect(self._settings_changed)
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    def _set_plugin_params(self, params: Parameter):
+        self.settings.child(self._plugin_settings_name).addChildren(params.children())
+
+    def _settings_changed(self, param, changes):
+        for param, change, data in changes:
+            path = self.settings.childPath(param)
+            if change == 'value' and path is not None and path[0] == self._plugin_settings_name and \
+                    self._hardware is not None:
+                self._hardware.update_settings(edict(path=path, param=param, change='value'))
+
+    @Slot(ThreadCommand)
+    def thread_status(self, status: ThreadCommand):
+        """ Process the status sent back by the hardware, the ones related to the UI being only logged"""
+        if status.command == 'Update_Status':
+            self.logger.info(status.attribute[0] if isinstance(status.attribute, list) else status.attribute)
+        elif status.command == 'update_status':
+            self.logger.info(status.attribute)
+        elif status.command == 'update_main_settings':
+            self._update_from_plugin('main_settings', status.attribute)
+        elif status.command == 'update_settings':
+            self._update_from_plugin(self._plugin_settings_name, status.attribute)
+        elif status.command == 'raise_timeout':
+            self.logger.warning('Timeout occurred')
+
+    def _update_from_plugin(self, group: str, attribute: list):
+        """ Reflect in the settings a change of value, limits or options made by the plugin"""
+        self.settings.sigTreeStateChanged.disconnect(self._settings_changed)  # not to send it back to the plugin
+        try:
+            param = self.settings.child(group, *attribute[0])
+            if attribute[2] == 'value':
+                param.setValue(attribute[1])
+            elif attribute[2] == 'limits':
+                param.setLimits(attribute[1])
+            elif attribute[2] == 'options':
+                param.setOpts(**attribute[1])
+        except Exception as e:
+            self.logger.warning(f'Could not update the {group} from the plugin: {str(e)}')
+        finally:
+            self.settings.sigTreeStateChanged.connect(self._settings_changed)
+
+    def _process_init_status(self, status: edict):
+        self.initialized_state = bool(status['initialized'])
+        self.logger.info(f'Initialized: {self.initialized_state} info: {status["info"]}')
+        if self.initialized_state:
+            self.controller = status['controller']
+
+    def init(self, controller: object = None) -> bool:
+        """ Instantiate the plugin and initialize its hardware
+
+        Parameters
+        ----------
+        controller: object
+            the controller of an already initialized module to be shared (its plugin should be a Slave)
+
+        Returns
+        -------
+        bool: True if the hardware has been initialized
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """ Close the hardware of the plugin"""
+        if self._hardware is not None:
+            self._hardware.close()
+            self._hardware = None
+        self.initialized_state = False
+
+
+class HeadlessActuator(HeadlessModule):
+    """ Actuator plugin driven without DAQ_Move, to be used by a HeadlessScan
+
+    Parameters
+    ----------
+    actuator: str
+        the name of the actuator plugin, see DAQ_Move.actuators
+    title: str
+    """
+    settings_name = 'daq_move_settings'
+    move_done_signal = Signal(DataActuator)
+
+    def __init__(self, actuator: str, title='Actuator'):
+        super().__init__(title, daq_move_params, 'move_settings')
+        parent_module = utils.find_dict_in_list_from_key_val(DAQ_Move_Actuators, 'name', actuator)
+        if parent_module is None:
+            raise ValueError(f'{actuator} is an invalid actuator, should be within '
+                             f'{[mov["name"] for mov in DAQ_Move_Actuators]}')
+        self._actuator_type = actuator
+        self.settings.child('main_settings', 'move_type').setValue(actuator)
+        self._set_plugin_params(Parameter.create(name='move_settings', type='group',
+                                                 children=parent_module.get_class().params))
+        self._current_value = DataActuator(title, units=self.units)
+        self._move_waiter = ModulesDoneWaiter()
+        self.module_and_data_saver = module_saving.ActuatorSaver(self)
+
+    @property
+    def actuator(self) -> str:
+        return self._actuator_type
+
+    @property
+    def units(self) -> str:
+        return self.settings['move_settings', 'units']
+
+    @property
+    def current_value(self) -> DataActuator:
+        """The last value sent back by the plugin"""
+        return self._current_value
+
+    def init(self, controller: object = None) -> bool:
+        self._hardware = DAQ_Move_Hardware(self._actuator_type, self._current_value, self._title)
+        self._hardware.status_sig.connect(self.thread_status)
+        self._process_init_status(self._hardware.ini_stage(self.settings.child('move_settings').saveState(),
+                                                           controller))
+        return self.initialized_state
+
+    def _check_data_type(self, data_act: Union[list, np.ndarray, DataActuator]) -> DataActuator:
+        if isinstance(data_act, list):  # backcompatibility
+            data_act = data_act[0]
+        if isinstance(data_act, np.ndarray):
+            data_act = DataActuator(data=[data_act], units=self.units)
+        data_act.name = self._title
+        return data_act
+
+    @Slot(ThreadCommand)
+    def thread_status(self, status: ThreadCommand):
+        super().thread_status(status)
+        if status.command in ('get_actuator_value', 'check_position'):
+            self._current_value = self._check_data_type(status.attribute)
+        elif status.command == 'move_done':
+            self._current_value = self._check_data_type(status.attribute)
+            self.move_done_signal.emit(self._current_value)
+            self._move_waiter.notify()
+        elif status.command == 'units':
+            self.settings.child('move_settings', 'units').setValue(status.attribute)
+
+    def move_abs(self, value: Union[float, DataActuator]):
+        """ Start a move to an absolute value, see wait_move_done"""
+        if not isinstance(value, DataActuator):
+            value = DataActuator(self._title, data=float(value), units=self.units)
+        self._move_waiter.arm(1)
+        self._hardware.move_abs(value)
+
+    def wait_move_done(self, timeout: int = None) -> DataActuator:
+        """ Block, while processing the Qt events, until the actuator reached its target
+
+        Parameters
+        ----------
+        timeout: int
+            in ms, if None the actuator timeout of the configuration is used
+
+        Returns
+        -------
+        DataActuator: the reached value
+        """
+        if timeout is None:
+            timeout = config('actuator', 'timeout')
+        if not self._move_waiter.wait(timeout):
+            raise TimeoutError(f'{self._title} did not reach its target within {timeout} ms')
+        return self._current_value
+
+    def move(self, value: Union[float, DataActuator], timeout: int = None) -> DataActuator:
+        """ Move to an absolute value and wait for the move to be done"""
+        self.move_abs(value)
+        return self.wait_move_done(timeout)
+
+
+class HeadlessDetector(HeadlessModule):
+    """ Detector plugin driven without DAQ_Viewer, to be used by a HeadlessScan
+
+    The data are named after the title of the detector as done by DAQ_Viewer, so that they are saved the same way
+
+    Parameters
+    ----------
+    daq_type: str
+        the dimensionality of the detector: DAQ0D, DAQ1D, DAQ2D or DAQND
+    detector: str
+        the name of the detector plugin
+    title: str
+    """
+    settings_name = 'daq_viewer_settings'
+    grab_done_signal = Signal(DataToExport)
+
+    def __init__(self, daq_type: str, detector: str, title='Detector'):
+        super().__init__(title, daq_viewer_params, 'detector_settings')
+        self.settings.child('main_settings', 'DAQ_type').setValue(daq_type)
+        self.settings.child('main_settings', 'detector_type').setValue(detector)
+        det_params, _ = get_viewer_plugins(daq_type, detector)
+        self._set_plugin_params(det_params)
+        self._detector = detector
+        self._data_to_save_export: Optional[DataToExport] = None
+        self._grab_waiter = ModulesDoneWaiter()
+        self.ui = None
+        self.module_and_data_saver = module_saving.DetectorSaver(self)
+
+    @property
+    def detector(self) -> str:
+        return self._detector
+
+    @property
+    def Naverage(self) -> int:
+        return self.settings['main_settings', 'Naverage']
+
+    @property
+    def bkg_to_save(self) -> Optional[DataToExport]:
+        """No background can be taken without the DAQ_Viewer UI"""
+        return None
+
+    def init(self, controller: object = None) -> bool:
+        self._hardware = DAQ_Detector(self._title, self.settings, self._detector)
+        self._hardware.status_sig.connect(self.thread_status)
+        self._hardware.data_detector_sig.connect(self.show_data)
+        self._process_init_status(self._hardware.ini_detector(self.settings.child('detector_settings').saveState(),
+                                                              controller))
+        return self.initialized_state
+
+    @Slot(DataToExport)
+    def show_data(self, dte: DataToExport):
+        """ Name the data grabbed by the plugin after this detector, as done by DAQ_Viewer.show_data"""
+        dte = take_ownership(dte)
+        for dwa in dte:
+            dwa.origin = self._title
+        self._data_to_save_export = DataToExport(self._title, control_module='DAQ_Viewer', data=dte.data)
+        self.grab_done_signal.emit(self._data_to_save_export)
+        self._grab_waiter.notify()
+
+    def start_grab(self, **kwargs):
+        """ Trigger the grab of a single (eventually averaged) data, see wait_grab_done"""
+        self._grab_waiter.arm(1)
+        self._hardware.queue_command(ThreadCommand('single', dict(Naverage=self.Naverage, **kwargs)))
+
+    def wait_grab_done(self, timeout: int = None) -> DataToExport:
+        """ Block, while processing the Qt events, until the grabbed data are received
+
+        Parameters
+        ----------
+        timeout: int
+            in ms, if None the viewer timeout of the configuration is used
+
+        Returns
+        -------
+        DataToExport: named after the title of the detector
+        """
+        if timeout is None:
+            timeout = config('viewer', 'timeout')
+        if not self._grab_waiter.wait(timeout):
+            raise TimeoutError(f'{self._title} did not send its data within {timeout} ms')
+        return self._data_to_save_export
+
+    def grab(self, timeout: int = None, **kwargs) -> DataToExport:
+        """ Grab a single data and wait for it"""
+        self.start_grab(**kwargs)
+        return self.wait_grab_done(timeout)
+
+    def get_data_to_save(self, dte: DataToExport = None) -> Optional[DataToExport]:
+        """ Filter the data to be saved, see DAQ_Viewer.get_data_to_save"""
+        if dte is None:
+            dte = self._data_to_save_export
+        if dte is None:
+            return None
+        if self.module_and_data_saver.h5saver.settings['save_raw_only']:
+            dte = dte.get_data_from_source('raw')
+        return DataToExport(name=dte.name, data=[dwa for dwa in dte if ('do_save' not in dwa.extra_attributes) or
+                                                 dwa.do_save])
+
+    def insert_data(self, indexes: Tuple[int], where: Union[Node, str] = None,
+                    distribution=DataDistribution['uniform'], dte: DataToExport = None):
+        """ Insert the data at the given indexes of the extended arrays of a scan, see DAQ_Viewer.insert_data"""
+        dte = self.get_data_to_save(dte)
+        if dte is not None:
+            detector_node = self.module_and_data_saver.get_set_node(where)
+            self.module_and_data_saver.add_data(detector_node, dte, indexes=indexes, distribution=distribution)
+
+
+class HeadlessModulesManager:
+    """ The modules of a HeadlessScan, with the interface of ModulesManager used by the savers"""
+
+    def __init__(self, actuators: List[HeadlessActuator], detectors: List[HeadlessDetector]):
+        self.actuators = actuators
+        self.detectors = detectors
+
+    @property
+    def modules(self) -> List[HeadlessModule]:
+        return self.actuators + self.detectors
+
+    @property
+    def modules_all(self) -> List[HeadlessModule]:
+        return self.modules
+
+    def move_actuators(self, dte_act: DataToExport, timeout: int = None) -> DataToExport:
+        """ Move all actuators at once to their positions in dte_act (named after their title) and wait for them"""
+        for act in self.actuators:
+            act.move_abs(dte_act.get_data_from_name(act.title))
+        return DataToExport('HeadlessModulesManager', control_module='DAQ_Move',
+                            data=[act.wait_move_done(timeout) for act in self.actuators])
+
+    def grab_data(self, timeout: int = None) -> DataToExport:
+        """ Trigger a single grab of all detectors at once and wait for their data"""
+        for det in self.detectors:
+            det.start_grab()
+        return DataToExport('HeadlessModulesManager', control_module='DAQ_Viewer',
+                            data=[dwa for det in self.detectors for dwa in det.wait_grab_done(timeout)])
+
+
+class HeadlessScan:
+    """ Stop and Go scan of headless modules, saved with the layout of the DAQScan extension
+
+    The scanners of the ScannerFactory define the positions, the actuators being moved then the detectors grabbed at
+    each step without any Qt event loop running but the local ones of the waits. The scan node holds the actuators
+    and detectors nodes, the navigation axes, the journal of the written steps (Progress) and the step timings
+
+    Parameters
+    ----------
+    actuators: List[HeadlessActuator]
+    detectors: List[HeadlessDetector]
+    """
+    params = [
+        {'title': 'Time Flow:', 'name': 'time_flow', 'type': 'group', 'children': [
+            {'title': 'Wait time step (ms)', 'name': 'wait_time', 'type': 'int', 'value': 0,
+             'tip': 'Wait time in ms after each step of acquisition (move and grab)'},
+            {'title': 'Wait time between (ms)', 'name': 'wait_time_between', 'type': 'int', 'value': 0,
+             'tip': 'Wait time in ms between move and grab processes'},
+            {'title': 'Timeout (ms)', 'name': 'timeout', 'type': 'int', 'value': 10000},
+        ]},
+        {'title': 'Scan options', 'name': 'scan_options', 'type': 'group', 'children': [
+            {'title': 'Naverage:', 'name': 'scan_average', 'type': 'int', 'value': 1, 'min': 1},
+        ]},
+    ]
+
+    def __init__(self, actuators: List[HeadlessActuator], detectors: List[HeadlessDetector]):
+        self.title = 'DAQScan'
+        self.settings = Parameter.create(name='daq_scan_settings', type='group', children=self.params)
+        self.modules_manager = HeadlessModulesManager(actuators, detectors)
+        self.scanner: Optional[ScannerBase] = None
+        self.profiler: Optional[StepProfiler] = None
+        self.module_and_data_saver = module_saving.ScanSaver(self)
+        self.ui = None
+        self._stop_flag = False
+
+    def set_scanner(self, scan_type: str, scan_subtype: str, **values) -> ScannerBase:
+        """ Create the scanner of the given type and compute its positions
+
+        Parameters
+        ----------
+        scan_type: str
+            see ScannerFactory.scan_types
+        scan_subtype: str
+            see ScannerFactory.scan_sub_types
+        values: dict
+            values of the scanner settings, for instance start, stop and step for a Scan1D Linear
+        """
+        scanner = scanner_factory.get(scan_type, scan_subtype, actuators=self.modules_manager.actuators)
+        if isinstance(scanner, AdaptiveScanner):
+            raise ValueError('Adaptive scans are not supported by the headless scans')
+        for name, value in values.items():
+            scanner.settings.child(name).setValue(value)
+        if scanner.evaluate_steps() > config('scan', 'steps_limit'):
+            raise ValueError(f'The scan has more than {config("scan", "steps_limit")} steps')
+        scanner.set_scan()
+        self.scanner = scanner
+        return scanner
+
+    @property
+    def n_steps(self) -> int:
+        return len(self.scanner.positions)
+
+    def positions_at(self, index: int) -> DataToExport:
+        """ The actuators positions at a given index of the scan as a DataToExport of DataActuators"""
+        return DataToExport('scanner', data=[DataActuator(act.title, data=float(pos), units=act.units) for act, pos
+                                             in zip(self.modules_manager.actuators, self.scanner.positions[index])])
+
+    def get_extended_shape(self) -> Tuple[int]:
+        """The shape of the scan including the averaging, that is the extra shape of the saved data"""
+        Naverage = self.settings['scan_options', 'scan_average']
+        if Naverage > 1:
+            return (Naverage,) + tuple(self.scanner.get_scan_shape())
+        return tuple(self.scanner.get_scan_shape())
+
+    def get_nav_axes(self) -> List[Axis]:
+        """The navigation axes of the scan, including the Average one if any"""
+        nav_axes = self.scanner.get_nav_axes()
+        Naverage = self.settings['scan_options', 'scan_average']
+        if Naverage > 1:
+            for nav_axis in nav_axes:
+                nav_axis.index += 1
+            nav_axes.append(Axis('Average', data=np.linspace(0, Naverage - 1, Naverage), index=0))
+        return nav_axes
+
+    def stop(self):
+        """ Stop the scan after the current step"""
+        self._stop_flag = True
+
+    def _save_metadata(self, scan_node: Node, description: str):
+        attr = scan_node.attrs
+        attr['type'] = 'scan'
+        attr['author'] = config('user', 'name')
+        attr['date_time'] = QDateTime.currentDateTime().toString('dd/mm/yyyy HH:MM:ss')
+        attr['scan_type'] = self.scanner.scan_type
+        attr['scan_sub_type'] = self.scanner.scan_subtype
+        attr['scan_name'] = scan_node.name
+        attr['description'] = description
+
+    def run(self, file_path: Union[str, Path], new_file=True, description='') -> Node:
+        """ Acquire the scan and save it into a h5 file
+
+        Parameters
+        ----------
+        file_path: str or Path
+        new_file: bool
+            if False, the scan is appended as a new scan node of an existing file
+        description: str
+            saved as metadata of the scan node
+
+        Returns
+        -------
+        Node: the scan node, closed with the file. Its scan_done attribute is True if all steps were acquired
+
+        Raises
+        ------
+        TimeoutError: if a module did not respond in time, the steps already acquired being saved
+        """
+        if self.scanner is None:
+            raise ValueError('The scanner has to be set before running the scan, see set_scanner')
+        get_headless_app()
+        self._stop_flag = False
+        timeout = self.settings['time_flow', 'timeout']
+        Naverage = self.settings['scan_options', 'scan_average']
+        distribution = self.scanner.distribution
+        self.profiler = StepProfiler(Naverage * self.n_steps)
+
+        h5saver = HeadlessH5Saver(save_type='scan')
+        h5saver.init_file(file_path, new_file=new_file)
+        saver = self.module_and_data_saver
+        saver.profiler = self.profiler
+        for det in self.modules_manager.detectors:
+            det.module_and_data_saver = module_saving.DetectorExtendedSaver(det, self.get_extended_shape())
+        saver.h5saver = h5saver
+        scan_node = saver.get_set_node(new=True)
+        try:
+            self._save_metadata(scan_node, description)
+            saver.init_progress(self.get_extended_shape(), self.scanner.positions)
+            saver.add_nav_axes(self.get_nav_axes())
+            for ind_average in range(Naverage):
+                for ind_scan in range(self.n_steps):
+                    if self._stop_flag:
+                        break
+                    step = ind_average * self.n_steps + ind_scan
+                    self.profiler.mark(step, 'move_start')
+                    self.modules_manager.move_actuators(self.positions_at(ind_scan), timeout)
+                    self.profiler.mark(step, 'move_done')
+                    QThread.msleep(self.settings['time_flow', 'wait_time_between'])
+                    self.profiler.mark(step, 'wait_done')
+
+                    self.profiler.mark(step, 'grab_start')
+                    self.modules_manager.grab_data(timeout)
+                    self.profiler.mark(step, 'grab_done')
+
+                    indexes = tuple(self.scanner.get_indexes_from_scan_index(ind_scan))
+                    if Naverage > 1:
+                        indexes = (ind_average,) + indexes
+                    saver.add_data(indexes=indexes, distribution=distribution, step=step)
+
+                    QThread.msleep(self.settings['time_flow', 'wait_time'])
+                    self.profiler.mark(step, 'step_done')
+            scan_node.attrs['scan_done'] = not self._stop_flag
+            logger.info(f'Headless scan done, step timings (mean/p95 ms): {self.profiler.report()}')
+        finally:
+            saver.add_timings(self.profiler.to_dte())
+            saver.stop_progress()
+            saver.flush()
+            h5saver.close_file()
+        return scan_node
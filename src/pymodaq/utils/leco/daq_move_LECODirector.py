@@ -9,6 +9,8 @@ running: `python -m pyleco.coordinators.coordinator`
 
 from typing import Union
 
+from qtpy.QtCore import QTimer
+
 from pymodaq.control_modules.move_utility_classes import (DAQ_Move_base, comon_parameters_fun, main,
                                                           DataActuatorType, DataActuator)
 
@@ -59,6 +61,12 @@ class DAQ_Move_LECODirector(LECODirector, DAQ_Move_base):
             self.set_y_axis,
         ):
             self.listener.register_binary_rpc_method(method, accept_binary_input=True)
+            self.listener.register_data_method(method)
+
+        self._moving = False  # the actor pushes its positions until its move is done
+        self._move_timer = QTimer()  # in case the move done of the actor is lost
+        self._move_timer.setSingleShot(True)
+        self._move_timer.timeout.connect(self._move_timed_out)
 
         # copied, I think it is good:
         self.settings.child('bounds').hide()
@@ -86,10 +94,12 @@ class DAQ_Move_LECODirector(LECODirector, DAQ_Move_base):
         actor_name = self.settings.child("actor_name").value()
         self.controller = self.ini_stage_init(  # type: ignore
             old_controller=controller,
-            new_controller=ActuatorDirector(actor=actor_name, communicator=self.communicator),
+            new_controller=ActuatorDirector(actor=actor_name, communicator=self.communicator,
+                                            request_tracker=self.listener.request_tracker, pipelined=True),
             )
         try:
             self.controller.set_remote_name(self.communicator.full_name)  # type: ignore
+            self.update_streaming()
         except TimeoutError:
             print("Timeout setting remote name.")  # TODO change to real logging
         # self.settings.child('infos').addChildren(self.params_client)
@@ -106,6 +116,7 @@ class DAQ_Move_LECODirector(LECODirector, DAQ_Move_base):
         position = self.check_bound(position)
         position = self.set_position_with_scaling(position)
 
+        self._start_moving()
         self.controller.move_abs(position=position)
 
         self.target_value = position
@@ -115,22 +126,39 @@ class DAQ_Move_LECODirector(LECODirector, DAQ_Move_base):
         self.target_value = position + self.current_value
 
         position = self.set_position_relative_with_scaling(position)
+        self._start_moving()
         self.controller.move_rel(position=position)
 
     def move_home(self):
+        self._start_moving()
         self.controller.move_home()
 
+    def _start_moving(self):
+        self._moving = True
+        self._move_timer.start(int(self.settings['timeout'] * 1000))
+
+    def _move_timed_out(self):
+        """No move done received from the actor in time: its positions are requested again"""
+        if self._moving:
+            self._moving = False
+            self.emit_status(ThreadCommand('raise_timeout'))
+
     def get_actuator_value(self) -> DataActuator:
         """
         Get the current hardware position with scaling conversion given by
         `get_position_with_scaling`.
 
+        The requests are pipelined: the value returned is the last one received, the actor sending the new one
+        later on (see set_position). While moving, the actor pushes its positions by itself and is not requested.
+
         See Also
         --------
             daq_move_base.get_position_with_scaling, daq_utils.ThreadCommand
         """
-        self.controller.set_remote_name(self.communicator.full_name)  # to ensure communication
-        self.controller.get_actuator_value()
+        if not self._moving and 'get_actuator_value' not in self.listener.request_tracker.pending_methods(
+                self.controller.request_timeout):  # a lost reply should not stop the polling
+            self.controller.set_remote_name(self.communicator.full_name)  # to ensure communication
+            self.controller.get_actuator_value()
         return self._current_value
 
     def stop_motion(self) -> None:
@@ -139,6 +167,8 @@ class DAQ_Move_LECODirector(LECODirector, DAQ_Move_base):
             --------
             daq_move_base.move_done
         """
+        self._moving = False
+        self._move_timer.stop()
         self.controller.stop_motion()
 
     # Methods accessible via remote calls
@@ -165,6 +195,7 @@ class DAQ_Move_LECODirector(LECODirector, DAQ_Move_base):
 
     def set_move_done(self, position: Union[str, float, None], additional_payload=None) -> None:
         pos = self._set_position_value(position=position, additional_payload=additional_payload)
+        self._moving = False  # called from the listener thread: the move timer just ends up doing nothing
         self.emit_status(ThreadCommand('move_done', [pos]))
 
     def set_x_axis(self, data, label: str = "", units: str = "") -> None:
@@ -42,6 +42,7 @@ class DAQ_xDViewer_LECODirector(LECODirector, DAQ_Viewer_base):
             self.set_data,
         ):
             self.listener.register_binary_rpc_method(method, accept_binary_input=True)
+            self.listener.register_data_method(method)
 
         self.client_type = "GRABBER"
         self.x_axis = None
@@ -50,6 +51,15 @@ class DAQ_xDViewer_LECODirector(LECODirector, DAQ_Viewer_base):
         self.grabber_type = grabber_type
         self.ind_data = 0
         self.data_mock = None
+        self._stream_grabbing = False
+
+    @property
+    def live_mode_available(self) -> bool:
+        """In streaming mode the remote viewer grabs continuously by itself, see grab_data"""
+        return self.settings['streaming']
+
+    def commit_settings(self, param) -> None:
+        self.commit_leco_settings(param=param)
 
     def ini_detector(self, controller=None):
         """
@@ -79,6 +89,7 @@ class DAQ_xDViewer_LECODirector(LECODirector, DAQ_Viewer_base):
             self.y_axis = self.get_yaxis()
             self.status.x_axis = self.x_axis
             self.status.y_axis = self.y_axis
+            self.update_streaming()
             self.status.initialized = True
             return self.status
 
@@ -130,16 +141,22 @@ class DAQ_xDViewer_LECODirector(LECODirector, DAQ_Viewer_base):
             self.ind_grabbed = 0  # to keep track of the current image in the average
             self.Naverage = Naverage
             self.controller.set_remote_name(self.communicator.full_name)
-            self.controller.send_data(grabber_type=self.grabber_type)
+            if self.settings['streaming'] and kwargs.get('live', False):
+                # a single request, the data being then published as they come until stop is called
+                if not self._stream_grabbing:
+                    self.controller.start_grab(grabber_type=self.grabber_type)
+                    self._stream_grabbing = True
+            else:
+                self.controller.send_data(grabber_type=self.grabber_type)
 
         except Exception as e:
             self.emit_status(ThreadCommand('Update_Status', [getLineInfo() + str(e), "log"]))
 
     def stop(self):
-        """
-            not implemented.
-        """
-        pass
+        """Stop the continuous grab of the remote viewer if streaming"""
+        if self._stream_grabbing:
+            self._stream_grabbing = False
+            self.controller.stop_grab()
         return ""
 
     # Methods for RPC calls
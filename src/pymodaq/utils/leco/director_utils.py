@@ -4,22 +4,70 @@ Utils for the Director Modules
 These directors correspond to the PymodaqListener
 """
 
-from typing import Optional, Union, List
+from typing import Any, Optional, Union, List
 
+from pyleco.core.serialization import MessageTypes, generate_conversation_id
 from pyleco.directors.director import Director
 
+from pymodaq_utils.logger import set_logger, get_module_name
 import pymodaq_gui.parameter.utils as putils
 from pymodaq_gui.parameter import Parameter, ioxml
 from pymodaq.control_modules.move_utility_classes import DataActuator
-from pymodaq.utils.leco.utils import serialize_object
+from pymodaq.utils.leco.utils import serialize_object, RequestTracker
+
+logger = set_logger(get_module_name(__file__))
 
 
 class GenericDirector(Director):
-    """Director helper to control some Module remotely."""
+    """Director helper to control some Module remotely.
+
+    :param request_tracker: Tracker of the requests sent with `send_rpc`, it has to be the one of the listener
+        whose communicator is used for their replies to be delivered (see PymodaqPipeHandler.handle_json_result).
+    :param pipelined: If True, the commands to the Module are sent without waiting for their answer.
+    :param request_timeout: Duration (in s) after which an unanswered request sent with `send_rpc` is not tracked
+        anymore.
+    """
+
+    def __init__(self, actor: Optional[Union[bytes, str]] = None,
+                 request_tracker: Optional[RequestTracker] = None,
+                 pipelined: bool = False, request_timeout: float = 10,
+                 **kwargs) -> None:
+        super().__init__(actor=actor, **kwargs)
+        self.request_tracker = request_tracker if request_tracker is not None else RequestTracker()
+        self.pipelined = pipelined
+        self.request_timeout = request_timeout
+
+    def send_rpc(self, method: str, actor: Optional[Union[bytes, str]] = None, **kwargs) -> bytes:
+        """Send a request without waiting for its answer and return its conversation id.
+
+        The reply is emitted by the listener signals, see PymodaqPipeHandler.handle_json_result.
+        """
+        for expired in self.request_tracker.discard_older(self.request_timeout):
+            logger.warning(f"No answer to the request {expired} within {self.request_timeout} s.")
+        cid = generate_conversation_id()
+        self.request_tracker.add(cid, method)  # before sending, the reply may come at once
+        self.communicator.send(self._actor_check(actor), conversation_id=cid,
+                               data=self.generator.build_request_str(method=method, **kwargs),
+                               message_type=MessageTypes.JSON)
+        return cid
+
+    def request(self, method: str, **kwargs) -> Any:
+        """Send a command, waiting for its answer or not depending on the pipelined attribute."""
+        if self.pipelined:
+            return self.send_rpc(method, **kwargs)
+        else:
+            return self.ask_rpc(method, **kwargs)
 
     def set_remote_name(self, name: Optional[str] = None):
         """Set the remote name of the Module (i.e. where it should send responses to)."""
-        self.ask_rpc(method="set_remote_name", name=name or self.communicator.name)
+        self.request(method="set_remote_name", name=name or self.communicator.name)
+
+    def set_streaming(self, streaming: bool = True) -> str:
+        """Ask the Module to publish its data on the data protocol (or to send them with RPC).
+
+        :return: the full name of the remote listener, the topic of its published data.
+        """
+        return self.ask_rpc(method="set_streaming", streaming=streaming)
 
     def set_info(self, param: Parameter):
         # It removes the first two parts (main_settings and detector_settings?)
@@ -34,16 +82,23 @@ class DetectorDirector(GenericDirector):
     def send_data(self, grabber_type: str = "") -> None:
         self.ask_rpc("send_data", grabber_type=grabber_type)
 
+    def start_grab(self, grabber_type: str = "") -> None:
+        """Start a continuous grab of the remote Module, its data being sent as they come."""
+        self.ask_rpc("start_grab", grabber_type=grabber_type)
+
+    def stop_grab(self) -> None:
+        self.ask_rpc("stop_grab")
+
 
 class ActuatorDirector(GenericDirector):
     def move_abs(self, position: Union[float, DataActuator]) -> None:
-        self.ask_rpc("move_abs", position=serialize_object(position))
+        self.request("move_abs", position=serialize_object(position))
 
     def move_rel(self, position: Union[float, DataActuator]) -> None:
-        self.ask_rpc("move_rel", position=serialize_object(position))
+        self.request("move_rel", position=serialize_object(position))
 
     def move_home(self) -> None:
-        self.ask_rpc("move_home")
+        self.request("move_home")
 
     def get_actuator_value(self) -> None:
         """Request that the actuator value is sent later on.
@@ -51,8 +106,8 @@ class ActuatorDirector(GenericDirector):
         Later the `set_data` method will be called.
         """
         # according to DAQ_Move, this supersedes "check_position"
-        self.ask_rpc("get_actuator_value")
+        self.request("get_actuator_value")
 
     def stop_motion(self,) -> None:
         # not implemented in DAQ_Move!
-        self.ask_rpc("stop_motion")
+        self.request("stop_motion")
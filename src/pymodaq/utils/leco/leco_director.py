@@ -10,12 +10,19 @@ from pymodaq_utils.utils import ThreadCommand
 from pymodaq_gui.parameter import Parameter
 
 from pymodaq.utils.leco.director_utils import GenericDirector
-from pymodaq.utils.leco.pymodaq_listener import PymodaqListener
+from pymodaq.utils.leco.pymodaq_listener import PymodaqListener, LECOClientCommands
 
 
 leco_parameters = [
     {'title': 'Actor name:', 'name': 'actor_name', 'type': 'str', 'value': "actor_name",
      'tip': 'Name of the actor plugin to communicate with.'},
+    {'title': 'Streaming:', 'name': 'streaming', 'type': 'bool', 'value': False,
+     'tip': 'The actor publishes its data on the LECO data protocol instead of sending each of them with a '
+            'request, some of them may then be dropped if they come too fast'},
+    {'title': 'Dropped frames:', 'name': 'frames_dropped', 'type': 'int', 'value': 0, 'readonly': True,
+     'tip': 'Number of published data missed since the streaming started'},
+    {'title': 'Latency (ms):', 'name': 'rpc_latency', 'type': 'float', 'value': 0., 'readonly': True,
+     'tip': 'Mean round trip time of the last requests sent without waiting for their answer'},
 ]
 
 
@@ -52,6 +59,7 @@ class LECODirector:
         self.listener = PymodaqListener(name=name)
         self.listener.start_listen()
         self.communicator = self.listener.get_communicator()
+        self.listener.cmd_signal.connect(self.process_listener_cmds)
         self.register_rpc_methods((
             self.set_info,
         ))
@@ -66,9 +74,42 @@ class LECODirector:
     def commit_leco_settings(self, param: Parameter) -> None:
         if param.name() == "actor_name":
             self.controller.actor = param.value()
+            if self.settings['streaming']:
+                self.update_streaming()
+        elif param.name() == "streaming":
+            self.update_streaming()
         elif param.name() in putils.iter_children(self.settings.child('settings_client'), []):
             self.controller.set_info(param=param)
 
+    def update_streaming(self) -> None:
+        """Ask the actor to publish its data or to send them with requests, depending on the streaming setting
+
+        In streaming mode, this director subscribes to the data of the actor, each data message calling the method
+        it names (among the ones registered with the listener register_data_method)
+        """
+        streaming = self.settings['streaming']
+        topic = self.controller.set_streaming(streaming)
+        self.communicator.unsubscribe_all()
+        self.listener.frame_counter.reset()
+        self.emit_status(ThreadCommand('update_settings', [['frames_dropped'], 0, 'value']))
+        if streaming:
+            self.communicator.subscribe(topic)
+
+    def process_listener_cmds(self, status: ThreadCommand) -> None:
+        """Process the commands emitted by the listener (from its thread)"""
+        if status.command == LECOClientCommands.FRAMES_DROPPED:
+            dropped, total = status.attribute
+            self.emit_status(ThreadCommand('Update_Status', [f'{dropped} frames of {self.controller.actor} '
+                                                             f'dropped from the stream', 'log']))
+            self.emit_status(ThreadCommand('update_settings', [['frames_dropped'], total, 'value']))
+        elif status.command == LECOClientCommands.RPC_REPLY:
+            latency = self.listener.request_tracker.get_latency()
+            self.emit_status(ThreadCommand('update_settings', [['rpc_latency'], latency * 1000, 'value']))
+        elif status.command == LECOClientCommands.RPC_ERROR:
+            method, error, _ = status.attribute
+            self.emit_status(ThreadCommand('Update_Status', [f'The request {method} to {self.controller.actor} '
+                                                             f'failed: {error}', 'log']))
+
     def close(self) -> None:
         self.listener.stop_listen()
 
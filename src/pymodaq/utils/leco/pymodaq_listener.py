@@ -3,9 +3,13 @@ from pymodaq_utils.enums import StrEnum
 
 import logging
 from threading import Event
-from typing import Optional, Union, List, Type
+from typing import Any, Callable, Dict, Optional, Union, List, Type
 
-from pyleco.core import COORDINATOR_PORT
+from pyleco.core import COORDINATOR_PORT, PROXY_RECEIVING_PORT
+from pyleco.core.data_message import DataMessage
+from pyleco.core.message import Message
+from pyleco.core.serialization import MessageTypes
+from pyleco.utils.data_publisher import DataPublisher
 from pyleco.utils.listener import Listener, PipeHandler
 from qtpy.QtCore import QObject, Signal  # type: ignore
 
@@ -13,12 +17,16 @@ from pymodaq_utils.utils import ThreadCommand
 from pymodaq_gui.parameter import ioxml
 from pymodaq_data.data import DataWithAxes
 from pymodaq_utils.serialize.serializer_legacy import SERIALIZABLE, DeSerializer
-from pymodaq.utils.leco.utils import binary_serialization_to_kwargs
+from pymodaq.utils.leco.utils import (binary_serialization, binary_serialization_to_kwargs, FrameCounter,
+                                     RequestTracker)
 
 
 class LECOClientCommands(StrEnum):
     LECO_CONNECTED = "leco_connected"
     LECO_DISCONNECTED = "leco_disconnected"
+    FRAMES_DROPPED = "frames_dropped"
+    RPC_REPLY = "rpc_reply"
+    RPC_ERROR = "rpc_error"
 
 
 class LECOCommands(StrEnum):
@@ -33,6 +41,8 @@ class LECOMoveCommands(StrEnum):
 
 class LECOViewerCommands(StrEnum):
     DATA_READY = 'data_ready'
+    START_GRAB = 'start_grab'
+    STOP_GRAB = 'stop_grab'
 
 
 class ListenerSignals(QObject):
@@ -50,9 +60,54 @@ class ListenerSignals(QObject):
 
 class PymodaqPipeHandler(PipeHandler):
 
-    def __init__(self, name: str, signals: ListenerSignals, **kwargs) -> None:
+    def __init__(self, name: str, signals: ListenerSignals,
+                 data_methods: Optional[Dict[str, Callable]] = None,
+                 frame_counter: Optional[FrameCounter] = None,
+                 request_tracker: Optional[RequestTracker] = None, **kwargs) -> None:
         super().__init__(name, **kwargs)
         self.signals = signals
+        self.data_methods = data_methods if data_methods is not None else {}
+        self.frame_counter = frame_counter if frame_counter is not None else FrameCounter()
+        self.request_tracker = request_tracker if request_tracker is not None else RequestTracker()
+
+    def handle_json_result(self, message: Message) -> None:
+        """Emit the reply to a request sent without waiting for it (see GenericDirector.send_rpc)
+
+        The cmd_signal emits a RPC_REPLY ThreadCommand with as attribute the method, its result and the latency
+        """
+        request = self.request_tracker.resolve(message.conversation_id)
+        if request is None:
+            super().handle_json_result(message)
+        else:
+            method, latency = request
+            self.signals.cmd_signal.emit(ThreadCommand(LECOClientCommands.RPC_REPLY,
+                                                       attribute=[method, message.data.get("result"), latency]))
+
+    def handle_json_error(self, message: Message) -> None:
+        """Emit the error returned by a request sent without waiting for it, as a RPC_ERROR ThreadCommand"""
+        request = self.request_tracker.resolve(message.conversation_id)
+        if request is None:
+            super().handle_json_error(message)
+        else:
+            method, latency = request
+            self.signals.cmd_signal.emit(ThreadCommand(LECOClientCommands.RPC_ERROR,
+                                                       attribute=[method, message.data.get("error"), latency]))
+
+    def handle_subscription_message(self, message: DataMessage) -> None:
+        """Call the data method named in a message published by an ActorListener in streaming mode"""
+        try:
+            content: dict = message.data  # type: ignore
+            method = self.data_methods[content.pop("method")]
+        except Exception as e:
+            self.log.warning(f"Invalid data message from {message.topic!r}: {str(e)}")
+            return
+        index = content.pop("index", None)
+        if index is not None:
+            dropped = self.frame_counter.count(index)
+            if dropped > 0:
+                self.signals.cmd_signal.emit(ThreadCommand(LECOClientCommands.FRAMES_DROPPED,
+                                                           attribute=[dropped, self.frame_counter.dropped]))
+        method(**content, additional_payload=message.payload[1:] or None)
 
 
 class ActorHandler(PymodaqPipeHandler):
@@ -61,6 +116,8 @@ class ActorHandler(PymodaqPipeHandler):
         super().register_rpc_methods()
         self.register_rpc_method(self.set_info)
         self.register_rpc_method(self.send_data)
+        self.register_rpc_method(self.start_grab)
+        self.register_rpc_method(self.stop_grab)
         self.register_rpc_method(self.move_abs)
         self.register_rpc_method(self.move_rel)
         self.register_rpc_method(self.move_home)
@@ -81,6 +138,13 @@ class ActorHandler(PymodaqPipeHandler):
     def send_data(self, grabber_type: str = "") -> None:
         self.signals.cmd_signal.emit(ThreadCommand(f"Send Data {grabber_type}"))
 
+    def start_grab(self, grabber_type: str = "") -> None:
+        """Start a continuous grab, the data being sent as they come"""
+        self.signals.cmd_signal.emit(ThreadCommand(LECOViewerCommands.START_GRAB, attribute=[grabber_type]))
+
+    def stop_grab(self) -> None:
+        self.signals.cmd_signal.emit(ThreadCommand(LECOViewerCommands.STOP_GRAB))
+
     # actuator commands
     def move_abs(self, position: Union[float, str]) -> None:
         pos = self.extract_dwa_object(position) if isinstance(position, str) else position
@@ -133,6 +197,9 @@ class PymodaqListener(Listener):
         # self.signals.message.connect(self.handle_message)
         self.cmd_signal = self.signals.cmd_signal
         self._handler_class = handler_class
+        self.data_methods: Dict[str, Callable] = {}
+        self.frame_counter = FrameCounter()
+        self.request_tracker = RequestTracker()
 
     def _listen(self, name: str, stop_event: Event, coordinator_host: str, coordinator_port: int,
                 data_host: str, data_port: int) -> None:
@@ -140,10 +207,21 @@ class PymodaqListener(Listener):
                                                    host=coordinator_host, port=coordinator_port,
                                                    data_host=data_host, data_port=data_port,
                                                    signals=self.signals,
+                                                   data_methods=self.data_methods,
+                                                   frame_counter=self.frame_counter,
+                                                   request_tracker=self.request_tracker,
                                                    )
         self.message_handler.register_on_name_change_method(self.indicate_sign_in_out)
         self.message_handler.listen(stop_event=stop_event)
 
+    def register_data_method(self, method: Callable[..., Any]) -> None:
+        """Make a method callable by the data messages published by an ActorListener in streaming mode
+
+        The method is called from the listening thread, with the keyword arguments of the message and its
+        additional_payload
+        """
+        self.data_methods[method.__name__] = method
+
     def stop_listen(self) -> None:
         super().stop_listen()
         try:
@@ -160,7 +238,17 @@ class PymodaqListener(Listener):
 
 
 class ActorListener(PymodaqListener):
-    """Listener for modules being an Actor (being remote controlled)."""
+    """Listener for modules being an Actor (being remote controlled).
+
+    The data and positions are sent to the remote either with a RPC each, waiting for its answer, or in streaming
+    mode (see set_streaming) published on the data protocol, with the full name of this listener as topic and
+    numbered so that the subscribers can count the dropped ones. As published messages may be dropped, the end of
+    a move is always sent with a RPC.
+
+    :param publisher_port: Port number of the proxy server receiving the published data.
+    """
+    streaming: bool = False
+    publisher: Optional[DataPublisher] = None
 
     def __init__(self,
                  name: str,
@@ -169,19 +257,58 @@ class ActorListener(PymodaqListener):
                  port: int = COORDINATOR_PORT,
                  logger: Optional[logging.Logger] = None,
                  timeout: float = 1,
+                 publisher_port: int = PROXY_RECEIVING_PORT,
                  **kwargs) -> None:
         super().__init__(name, handler_class=handler_class, host=host, port=port,
                          logger=logger, timeout=timeout,
                          **kwargs)
+        self.publisher_port = publisher_port
+        self._published = 0
 
     def start_listen(self) -> None:
         super().start_listen()
         self.message_handler.register_rpc_method(self.set_remote_name)
+        self.message_handler.register_rpc_method(self.set_streaming)
+
+    def stop_listen(self) -> None:
+        super().stop_listen()
+        if self.publisher is not None:
+            self.publisher.close()
+            self.publisher = None
 
     def set_remote_name(self, name: str) -> None:
         """Define what the name of the remote for answers is."""
         self.remote_name = name
 
+    def set_streaming(self, streaming: bool = True) -> str:
+        """Publish the data on the data protocol instead of sending them with RPC.
+
+        :return: the full name of this listener, the topic of its published data.
+        """
+        self.streaming = streaming
+        self._published = 0
+        return self.message_handler.full_name
+
+    def send_value(self, method: str, value: Any, data_key: str = "data") -> None:
+        """Send a value to the remote, to be passed to its `method`, either with a RPC or published."""
+        if self.streaming:
+            self.publish_value(method=method, value=value, data_key=data_key)
+        else:
+            self.communicator.ask_rpc(receiver=self.remote_name, method=method,
+                                      **binary_serialization_to_kwargs(value, data_key=data_key))
+
+    def publish_value(self, method: str, value: Any, data_key: str = "data") -> None:
+        """Publish a value on the data protocol without waiting for any answer."""
+        if self.publisher is None:  # created in the calling thread, as any zmq socket it is not thread safe
+            self.publisher = DataPublisher(full_name=self.name, host=self.data_address[0],
+                                           port=self.publisher_port)
+        d, b = binary_serialization(value)
+        self.publisher.send_data(data={"method": method, "index": self._published, data_key: d},
+                                 topic=self.communicator.full_name,
+                                 message_type=MessageTypes.JSON,
+                                 additional_payload=b)
+        self._published += 1
+
     # @Slot(ThreadCommand)
     def queue_command(self, command: ThreadCommand) -> None:
         """Queue a command to send it via LECO to the server."""
@@ -213,11 +340,7 @@ class ActorListener(PymodaqListener):
             # self.data_ready(data=command.attribute)
             # def data_ready(data): self.send_data(datas[0]['data'])
             value = command.attribute  # type: ignore
-            self.communicator.ask_rpc(
-                receiver=self.remote_name,
-                method="set_data",
-                **binary_serialization_to_kwargs(value),
-            )
+            self.send_value(method="set_data", value=value)
 
         elif command.command == 'send_info':
             path = command.attribute['path']  # type: ignore
@@ -230,17 +353,12 @@ class ActorListener(PymodaqListener):
 
         elif command.command == LECOMoveCommands.POSITION:
             value = command.attribute[0]  # type: ignore
-            self.communicator.ask_rpc(receiver=self.remote_name,
-                                      method="set_position",
-                                      **binary_serialization_to_kwargs(value, data_key="position"),
-                                      )
+            self.send_value(method="set_position", value=value, data_key="position")
 
         elif command.command == LECOMoveCommands.MOVE_DONE:
             value = command.attribute[0]  # type: ignore
-            self.communicator.ask_rpc(receiver=self.remote_name,
-                                      method="set_move_done",
-                                      **binary_serialization_to_kwargs(value, data_key="position"),
-                                      )
+            self.communicator.ask_rpc(receiver=self.remote_name, method="set_move_done",  # never dropped
+                                      **binary_serialization_to_kwargs(value, data_key="position"))
 
         elif command.command == 'x_axis':
             value = command.attribute[0]  # type: ignore
@@ -1,7 +1,11 @@
 from __future__ import annotations
+from collections import deque
+import socket
 import subprocess
 import sys
-from typing import Any, Optional, Union, get_args, TypeVar
+from threading import Lock
+from time import perf_counter
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union, get_args, TypeVar
 
 from pymodaq.utils import data
 # import also the DeSerializer for easier imports in dependents
@@ -56,19 +60,155 @@ def binary_serialization_to_kwargs(
     return {data_key: d, "additional_payload": b}
 
 
-def run_coordinator():
+class FrameCounter:
+    """Count the frames received from a data stream whose messages are numbered by the publisher
+
+    The messages of the data protocol are dropped by the publisher or the proxy instead of blocking them when the
+    subscriber is too slow: the gaps in their numbers give the number of dropped frames
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.received = 0
+        self.dropped = 0
+        self._last_index: Optional[int] = None
+
+    def count(self, index: int) -> int:
+        """Count a received frame from its number and return the number of frames dropped just before it"""
+        if self._last_index is None or index <= self._last_index:  # first frame or restarted publisher
+            dropped = 0
+        else:
+            dropped = index - self._last_index - 1
+        self._last_index = index
+        self.received += 1
+        self.dropped += dropped
+        return dropped
+
+
+class RequestTracker:
+    """Requests sent without waiting for their answer, matched with their reply by conversation id
+
+    The requests are added from the thread sending them and resolved from the listening thread receiving the
+    replies. The round trip times (latencies in s) of the last replies of each method are kept for diagnostics
+
+    Parameters
+    ----------
+    n_latencies: int
+        The number of latencies kept per method
+    """
+
+    def __init__(self, n_latencies: int = 100):
+        self.n_latencies = n_latencies
+        self._lock = Lock()
+        self._pending: Dict[bytes, Tuple[str, float]] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    @property
+    def n_pending(self) -> int:
+        """The number of requests still waiting for their reply"""
+        return len(self._pending)
+
+    def pending_methods(self, timeout: Optional[float] = None) -> List[str]:
+        """The methods of the requests still waiting for their reply
+
+        Parameters
+        ----------
+        timeout: float
+            if given, the requests sent more than timeout seconds ago are first discarded, their reply being
+            considered lost (see discard_older)
+        """
+        if timeout is not None:
+            self.discard_older(timeout)
+        with self._lock:
+            return [method for method, _ in self._pending.values()]
+
+    def add(self, conversation_id: bytes, method: str) -> None:
+        """Track a request, to be called before sending it"""
+        with self._lock:
+            self._pending[conversation_id] = (method, perf_counter())
+
+    def resolve(self, conversation_id: bytes) -> Optional[Tuple[str, float]]:
+        """Stop tracking a request whose reply arrived
+
+        Returns
+        -------
+        tuple of str and float: the method of the request and its latency, None if the request is not tracked
+        """
+        with self._lock:
+            request = self._pending.pop(conversation_id, None)
+            if request is None:
+                return None
+            method, start = request
+            latency = perf_counter() - start
+            self._latencies.setdefault(method, deque(maxlen=self.n_latencies)).append(latency)
+        return method, latency
+
+    def discard_older(self, timeout: float) -> List[str]:
+        """Stop tracking the requests sent more than timeout seconds ago and return their methods"""
+        now = perf_counter()
+        with self._lock:
+            expired = [cid for cid, (_, start) in self._pending.items() if now - start > timeout]
+            return [self._pending.pop(cid)[0] for cid in expired]
+
+    def get_latency(self, method: Optional[str] = None) -> Optional[float]:
+        """The mean latency of the last replies to a method (or to all methods if None), None if no reply yet"""
+        with self._lock:
+            if method is None:
+                latencies = [latency for method_latencies in self._latencies.values()
+                             for latency in method_latencies]
+            else:
+                latencies = list(self._latencies.get(method, []))
+        return sum(latencies) / len(latencies) if len(latencies) > 0 else None
+
+    def get_statistics(self) -> Dict[str, Dict[str, float]]:
+        """The count, mean, min and max of the last latencies of each method"""
+        with self._lock:
+            return {method: dict(count=len(latencies), mean=sum(latencies) / len(latencies),
+                                 min=min(latencies), max=max(latencies))
+                    for method, latencies in self._latencies.items() if len(latencies) > 0}
+
+
+def run_coordinator() -> subprocess.Popen:
     command = [sys.executable, '-m', 'pyleco.coordinators.coordinator']
-    subprocess.Popen(command)
+    return subprocess.Popen(command)
+
+
+def run_proxy() -> subprocess.Popen:
+    """Run the proxy server of the data protocol (publish/subscribe)"""
+    command = [sys.executable, '-m', 'pyleco.coordinators.proxy_server']
+    return subprocess.Popen(command)
 
 
-def start_coordinator():
+def is_proxy_running(host: str = 'localhost') -> bool:
+    from pyleco.core import PROXY_RECEIVING_PORT
+    try:
+        with socket.create_connection((host, PROXY_RECEIVING_PORT), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def start_coordinator() -> list[subprocess.Popen]:
+    """Start the coordinator and the proxy server of the data protocol, if they are not running yet
+
+    Returns
+    -------
+    list of subprocess.Popen: the processes started
+    """
     from pyleco.directors.director import Director
+    processes = []
     try:
         with Director(actor="COORDINATOR") as director:
             if director.communicator.namespace is None:
-                run_coordinator()
+                processes.append(run_coordinator())
             else:
                 logger.info('Coordinator already running')
     except ConnectionRefusedError as e:
-        run_coordinator()
-
+        processes.append(run_coordinator())
+    if not is_proxy_running():
+        processes.append(run_proxy())
+    else:
+        logger.info('Proxy server already running')
+    return processes
@@ -1,9 +1,9 @@
-from typing import List, Union, TYPE_CHECKING
+from typing import List, Union, Tuple, Dict, TYPE_CHECKING
 
 from collections import OrderedDict
-from qtpy.QtCore import QObject, Signal, Slot, QThread
+from time import perf_counter
+from qtpy.QtCore import QObject, Signal, Slot, QThread, QEventLoop, QTimer, QMutex, QMutexLocker, Qt
 from qtpy import QtWidgets
-import time
 
 from pymodaq_utils.logger import set_logger, get_module_name
 from pymodaq_utils import utils
@@ -20,11 +20,206 @@ from pymodaq.utils.data import DataActuator
 if TYPE_CHECKING:
     from pymodaq.control_modules.daq_viewer import DAQ_Viewer
     from pymodaq.control_modules.daq_move import DAQ_Move
+    from pymodaq.control_modules.utils import ControlModule
 
 logger = set_logger(get_module_name(__file__))
 config = Config()
 
 
+class ModulesDoneWaiter(QObject):
+    """Completion primitive blocking the calling thread until a given number of modules reported back
+
+    The waiting is done within a local QEventLoop so that signals coming from the control modules are still
+    processed (whatever the calling thread) but without busy polling: the thread sleeps until an event is
+    posted and is woken up as soon as the last expected module calls :meth:`notify` or when the timeout fires.
+
+    Examples
+    --------
+    >>> waiter = ModulesDoneWaiter()
+    >>> waiter.arm(2)  # expects two notifications
+    >>> ...  # trigger the modules, their done slots calling waiter.notify()
+    >>> done = waiter.wait(timeout_ms=10000)
+    """
+    done_signal = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self._mutex = QMutex()
+        self._expected = 0
+        self._received = 0
+        self._done = True
+
+    @property
+    def done(self) -> bool:
+        """bool: True if all expected notifications have been received (or if released)"""
+        with QMutexLocker(self._mutex):
+            return self._done
+
+    def arm(self, expected: int):
+        """Reset the waiter so that it expects a given number of notifications
+
+        Parameters
+        ----------
+        expected: int
+            the number of calls to notify before the waiter is considered done
+        """
+        with QMutexLocker(self._mutex):
+            self._expected = expected
+            self._received = 0
+            self._done = expected <= 0
+
+    def notify(self) -> bool:
+        """Let the waiter know one more module reported back
+
+        Returns
+        -------
+        bool: True if this was the last expected notification
+        """
+        with QMutexLocker(self._mutex):
+            if self._done:
+                return False
+            self._received += 1
+            self._done = self._received >= self._expected
+            done = self._done
+        if done:
+            self.done_signal.emit()
+        return done
+
+    def release(self):
+        """Force the waiter to be done, unblocking any thread waiting on it"""
+        with QMutexLocker(self._mutex):
+            was_done = self._done
+            self._done = True
+        if not was_done:
+            self.done_signal.emit()
+
+    def wait(self, timeout_ms: int = None) -> bool:
+        """Block until all expected notifications are received or the timeout expired
+
+        Parameters
+        ----------
+        timeout_ms: int
+            The maximum waiting time in milliseconds, if None wait forever
+
+        Returns
+        -------
+        bool: True if done, False if the timeout expired
+        """
+        loop = QEventLoop()
+        # queued: the loop has to be quit from its own thread whatever the thread calling notify
+        self.done_signal.connect(loop.quit, Qt.QueuedConnection)
+        timer = None
+        try:
+            if self.done:
+                return True
+            if timeout_ms is not None:
+                timer = QTimer()
+                timer.setSingleShot(True)
+                timer.timeout.connect(loop.quit)
+                timer.start(int(timeout_ms))
+            while not self.done:
+                loop.exec()
+                if timer is not None and not timer.isActive():
+                    break
+            return self.done
+        finally:
+            if timer is not None:
+                timer.stop()
+            self.done_signal.disconnect(loop.quit)
+
+
+class ModulesInitializer(QObject):
+    """Initialize groups of control modules, each group sharing the same controller
+
+    Each group is a list of (module, do_init) tuples, the first module being the Master and the others the Slaves
+    using the Master's controller. Groups are independent, so they are initialized concurrently (the hardware of each
+    module lives in its own thread), while within a group the Master then each Slave are initialized one after the
+    other. The end of each initialization is given by the modules init_signal (no polling).
+
+    Parameters
+    ----------
+    groups: List[List[Tuple[ControlModule, bool]]]
+
+    Attributes
+    ----------
+    init_times: Dict[str, float]
+        the time (in s) each module took to initialize, keys are the modules title
+    init_states: Dict[str, bool]
+        the initialization status of each module that should have been initialized
+    """
+
+    def __init__(self, groups: List[List[Tuple['ControlModule', bool]]]):
+        super().__init__()
+        self._groups = groups
+        self._waiter = ModulesDoneWaiter()
+        self._slots = dict([])
+        self._tstart = dict([])
+        self.init_times: Dict[str, float] = OrderedDict()
+        self.init_states: Dict[str, bool] = OrderedDict()
+
+    def run(self, timeout_ms: int = None) -> bool:
+        """Start the initialization of all groups and wait for their completion
+
+        Parameters
+        ----------
+        timeout_ms: int
+            The maximum waiting time in milliseconds, if None wait forever
+
+        Returns
+        -------
+        bool: False if the timeout expired before all modules reported back
+        """
+        self._waiter.arm(sum([sum([do_init for _, do_init in group]) for group in self._groups]))
+        for group in self._groups:
+            self._init_next(group, 0)
+        done = self._waiter.wait(timeout_ms)
+        for module in list(self._slots.keys()):
+            module.init_signal.disconnect(self._slots.pop(module))
+            self.init_states[module.title] = False
+            logger.warning(f'Timeout while initializing {module.title}')
+        return done
+
+    def _init_next(self, group: List[Tuple['ControlModule', bool]], index: int):
+        while index < len(group) and not group[index][1]:
+            index += 1
+        if index >= len(group):
+            return
+        module = group[index][0]
+        if index > 0:
+            module.controller = group[0][0].controller
+        self._slots[module] = lambda state, group=group, index=index: self._module_initialized(group, index, state)
+        module.init_signal.connect(self._slots[module])
+        self._tstart[module.title] = perf_counter()
+        module.init_hardware_ui()
+
+    def _module_initialized(self, group: List[Tuple['ControlModule', bool]], index: int, state: bool):
+        module = group[index][0]
+        if module not in self._slots:
+            return
+        module.init_signal.disconnect(self._slots.pop(module))
+        self.init_times[module.title] = perf_counter() - self._tstart[module.title]
+        self.init_states[module.title] = state
+        self._waiter.notify()
+        if index == 0 and not state:  # slaves cannot be initialized without their master controller
+            for slave, do_init in group[1:]:
+                if do_init:
+                    logger.warning(f'{slave.title} not initialized as its master {module.title} failed')
+                    self.init_states[slave.title] = False
+                    self._waiter.notify()
+        else:
+            self._init_next(group, index + 1)
+
+    def report(self) -> str:
+        """Human readable summary of the initialization of each module"""
+        lines = ['Modules initialization:']
+        for title, state in self.init_states.items():
+            if title in self.init_times:
+                lines.append(f'{title}: {"initialized" if state else "failed"} in {self.init_times[title]:.2f} s')
+            else:
+                lines.append(f'{title}: not initialized')
+        return '\n'.join(lines)
+
+
 class ModulesManager(QObject, ParameterManager):
     """Class to manage DAQ_Viewers and DAQ_Moves with UI to select some
 
@@ -81,9 +276,13 @@ class ModulesManager(QObject, ParameterManager):
         self.detector_timeout = config('viewer', 'timeout')
 
         self.det_done_datas: DataToExport = None
-        self.det_done_flag = False
+        self.det_done_dtes: Dict[str, DataToExport] = dict([])
         self.move_done_positions: DataToExport = None
-        self.move_done_flag = False
+
+        self._det_waiter = ModulesDoneWaiter()
+        self._move_waiter = ModulesDoneWaiter()
+        self._exposure_waiter = ModulesDoneWaiter()
+        self._exposed: set = set()
 
         self.settings.child('data_dimensions', 'probe_data').sigActivated.connect(self.get_det_data_list)
         self.settings.child('actuators_positions', 'test_actuator').sigActivated.connect(self.test_move_actuators)
@@ -100,6 +299,30 @@ class ModulesManager(QObject, ParameterManager):
         self.set_actuators(actuators, selected_actuators)
         self.set_detectors(detectors, selected_detectors)
 
+    @property
+    def det_done_flag(self) -> bool:
+        """bool: True if all selected detectors returned their data after a call to grab_data"""
+        return self._det_waiter.done
+
+    @det_done_flag.setter
+    def det_done_flag(self, done: bool):
+        if done:
+            self._det_waiter.release()
+        else:
+            self._det_waiter.arm(len(self.detectors))
+
+    @property
+    def move_done_flag(self) -> bool:
+        """bool: True if all selected actuators reached their target after a call to move_actuators"""
+        return self._move_waiter.done
+
+    @move_done_flag.setter
+    def move_done_flag(self, done: bool):
+        if done:
+            self._move_waiter.release()
+        else:
+            self._move_waiter.arm(len(self.actuators))
+
     def show_only_control_modules(self, show: True):
         self.settings.child('move_done').show(not show)
         self.settings.child('det_done').show(not show)
@@ -288,25 +511,50 @@ class ModulesManager(QObject, ParameterManager):
         return self.settings.child('data_dimensions', f'det_data_list{dim.upper()}').value()['selected']
 
     def grab_data(self, **kwargs):
-        """Do a single grab of connected and selected detectors"""
+        """Do a single grab of connected and selected detectors
+
+        Block (without busy polling) until all selected detectors returned their data or the detector
+        timeout (in ms) expired
+        """
+        self.start_grab(**kwargs)
+        return self.wait_grab_done()
+
+    def start_grab(self, **kwargs):
+        """Trigger a single grab of connected and selected detectors without waiting for their data
+
+        See Also
+        --------
+        wait_exposure_done, wait_grab_done
+        """
         self.det_done_datas = DataToExport(name=__class__.__name__, control_module='DAQ_Viewer')
-        self._received_data = 0
-        self.det_done_flag = False
+        self.det_done_dtes = dict([])
+        detectors = self.detectors
+        self._exposed = set()
+        self._exposure_waiter.arm(len(detectors))
+        self._det_waiter.arm(len(detectors))
         self.settings.child('det_done').setValue(self.det_done_flag)
-        tzero = time.perf_counter()
 
-        for mod in self.detectors:
+        for mod in detectors:
             kwargs.update(dict(Naverage=mod.Naverage))
             mod.command_hardware.emit(utils.ThreadCommand("single", kwargs))
 
-        while not self.det_done_flag:
-            # wait for grab done signals to end
+    def wait_exposure_done(self) -> bool:
+        """Block until all detectors triggered by start_grab finished their exposure
+
+        Detectors whose plugin does not report the end of its exposure (see DAQ_Viewer_base.move_during_readout) are
+        considered exposed once their data is received
+
+        Returns
+        -------
+        bool: False if the detector timeout expired
+        """
+        return self._exposure_waiter.wait(self.detector_timeout)
 
-            QtWidgets.QApplication.processEvents()
-            if time.perf_counter() - tzero > self.detector_timeout:
-                self.timeout_signal.emit(True)
-                logger.error('Timeout Fired during waiting for data to be acquired')
-                break
+    def wait_grab_done(self) -> DataToExport:
+        """Block until all detectors triggered by start_grab returned their data or the detector timeout expired"""
+        if not self._det_waiter.wait(self.detector_timeout):
+            self.timeout_signal.emit(True)
+            logger.error('Timeout Fired during waiting for data to be acquired')
 
         self.det_done_signal.emit(self.det_done_datas)
         return self.det_done_datas
@@ -351,7 +599,7 @@ class ModulesManager(QObject, ParameterManager):
 
         self.actuators_connected = connect
 
-    def connect_detectors(self, connect=True, slot=None):
+    def connect_detectors(self, connect=True, slot=None, signal='grab_done'):
         """
         Connect selected DAQ_Viewers's grab_done_signal to the given slot
 
@@ -364,19 +612,30 @@ class ModulesManager(QObject, ParameterManager):
             the previously connected ones will stay connected)
         slot: method
             A method that should be connected, if None self.det_done is connected by default
+        signal: str
+            What kind of signal is to be used:
+
+            * 'grab_done' will connect the `grab_done_signal` to the slot
+            * 'viewers_done' will connect the `viewers_done_signal` to the slot (data exported by the viewers in live
+              grab)
         """
 
-        if slot is None:
+        default_slot = slot is None
+        if default_slot:
             slot = self.det_done
 
         if connect:
-            for sig in [mod.grab_done_signal for mod in self.detectors]:
-                sig.connect(slot)
+            for mod in self.detectors:
+                (mod.grab_done_signal if signal == 'grab_done' else mod.viewers_done_signal).connect(slot)
+                if default_slot:
+                    mod.exposure_done_signal.connect(self.exposure_done)
         else:
 
-            for sig in [mod.grab_done_signal for mod in self.detectors_all]:
+            for mod in self.detectors_all:
                 try:
-                    sig.disconnect(slot)
+                    (mod.grab_done_signal if signal == 'grab_done' else mod.viewers_done_signal).disconnect(slot)
+                    if default_slot:
+                        mod.exposure_done_signal.disconnect(self.exposure_done)
                 except TypeError as e:
                     # means the slot was not previously connected
                     logger.info(str(e))
@@ -422,8 +681,30 @@ class ModulesManager(QObject, ParameterManager):
         -------
         DataToExport with the selected actuators's name as key and current actuators's value as value
         """
+        if not self.start_move_actuators(dte_act, mode=mode, polling=polling):
+            return self.move_done_positions
+        if polling:
+            return self.wait_move_done()
+        self.move_done_signal.emit(self.move_done_positions)
+        return self.move_done_positions
+
+    def start_move_actuators(self, dte_act: DataToExport, mode='abs', polling=True) -> bool:
+        """Send the positions to each currently selected actuators without waiting for the end of the moves
+
+        Parameters are the same as for move_actuators, polling being only given to the actuators: if True they poll
+        their value until reaching their target before emitting their move_done signal, otherwise they emit it at once
+        (this method never waits, see wait_move_done)
+
+        Returns
+        -------
+        bool: True if the move commands have been sent
+
+        See Also
+        --------
+        move_actuators, wait_move_done
+        """
         self.move_done_positions = DataToExport(name=__class__.__name__, control_module='DAQ_Move')
-        self.move_done_flag = False
+        self._move_waiter.arm(self.Nactuators)
         self.settings.child('move_done').setValue(self.move_done_flag)
 
         if mode == 'abs':
@@ -432,7 +713,7 @@ class ModulesManager(QObject, ParameterManager):
             command = 'move_rel'
         else:
             logger.error(f'Invalid positioning mode: {mode}')
-            return self.move_done_positions
+            return False
 
         if len(dte_act) == self.Nactuators:
             for dact in dte_act:
@@ -447,25 +728,29 @@ class ModulesManager(QObject, ParameterManager):
 
         else:
             logger.error('Invalid number of positions compared to selected actuators')
-            return self.move_done_positions
+            return False
+        return True
 
-        tzero = time.perf_counter()
-        if polling:
-            while not self.move_done_flag:  # polling move done
+    def wait_move_done(self) -> DataToExport:
+        """Block until the actuators moved by start_move_actuators reached their target or the actuator timeout
+        expired
 
-                QtWidgets.QApplication.processEvents()
-                if time.perf_counter() - tzero > self.actuator_timeout / 1000:  # timeout in seconds
-                    self.timeout_signal.emit(True)
-                    logger.error('Timeout Fired during waiting for actuators to be moved')
-                    break
-                QThread.msleep(20)
+        Returns
+        -------
+        DataToExport with the selected actuators's name as key and current actuators's value as value
+        """
+        if not self._move_waiter.wait(self.actuator_timeout):
+            self.timeout_signal.emit(True)
+            logger.error('Timeout Fired during waiting for actuators to be moved')
 
         self.move_done_signal.emit(self.move_done_positions)
         return self.move_done_positions
 
     def reset_signals(self):
-        self.move_done_flag = True
-        self.det_done_flag = True
+        """Release any thread waiting for the detectors or the actuators"""
+        self._move_waiter.release()
+        self._det_waiter.release()
+        self._exposure_waiter.release()
 
     def order_positions(self, positions: DataToExport):
         """ Reorder the content of the DataToExport given the order of the selected actuators"""
@@ -480,23 +765,30 @@ class ModulesManager(QObject, ParameterManager):
         try:
             if data_act.name not in self.move_done_positions.get_names():
                 self.move_done_positions.append(data_act)
-
-            if len(self.move_done_positions) == len(self.actuators):
-                self.move_done_flag = True
-                self.settings.child('move_done').setValue(self.move_done_flag)
+                if self._move_waiter.notify():
+                    self.settings.child('move_done').setValue(self.move_done_flag)
         except Exception as e:
             logger.exception(str(e))
 
     def det_done(self, data: DataToExport):
         if self.det_done_datas is not None:  # means that somehow data are not initialized so no further processing
-            self._received_data += 1
             if len(data) != 0:
                 self.det_done_datas.append(data)
+                self.det_done_dtes[data.name] = data
+            self._exposure_done_from(data.name)
 
-            if self._received_data == len(self.detectors):
-                self.det_done_flag = True
+            if self._det_waiter.notify():
                 self.settings.child('det_done').setValue(self.det_done_flag)
 
+    @Slot(str)
+    def exposure_done(self, title: str):
+        self._exposure_done_from(title)
+
+    def _exposure_done_from(self, title: str):
+        if title not in self._exposed:
+            self._exposed.add(title)
+            self._exposure_waiter.notify()
+
 
 if __name__ == '__main__':
     import sys
@@ -69,8 +69,7 @@ class PresetScalableGroupMove(GroupParameter):
         iterative_show_pb(params)
 
         parent_module = utils.find_dict_in_list_from_key_val(DAQ_Move_Stage_type, 'name', typ)
-        class_ = getattr(getattr(parent_module['module'], 'daq_move_' + typ),
-                         'DAQ_Move_' + typ)
+        class_ = parent_module.get_class()
         params_hardware = getattr(class_, 'params')
         iterative_show_pb(params_hardware)
 
@@ -162,16 +161,16 @@ class PresetScalableGroupDet(GroupParameter):
 
             if '0D' in typ:
                 parent_module = utils.find_dict_in_list_from_key_val(DAQ_0DViewer_Det_types, 'name', typ[6:])
-                class_ = getattr(getattr(parent_module['module'], 'daq_0Dviewer_' + typ[6:]), 'DAQ_0DViewer_' + typ[6:])
+                class_ = parent_module.get_class()
             elif '1D' in typ:
                 parent_module = utils.find_dict_in_list_from_key_val(DAQ_1DViewer_Det_types, 'name', typ[6:])
-                class_ = getattr(getattr(parent_module['module'], 'daq_1Dviewer_' + typ[6:]), 'DAQ_1DViewer_' + typ[6:])
+                class_ = parent_module.get_class()
             elif '2D' in typ:
                 parent_module = utils.find_dict_in_list_from_key_val(DAQ_2DViewer_Det_types, 'name', typ[6:])
-                class_ = getattr(getattr(parent_module['module'], 'daq_2Dviewer_' + typ[6:]), 'DAQ_2DViewer_' + typ[6:])
+                class_ = parent_module.get_class()
             elif 'ND' in typ:
                 parent_module = utils.find_dict_in_list_from_key_val(DAQ_NDViewer_Det_types, 'name', typ[6:])
-                class_ = getattr(getattr(parent_module['module'], 'daq_NDviewer_' + typ[6:]), 'DAQ_NDViewer_' + typ[6:])
+                class_ = parent_module.get_class()
             for main_child in params:
                 if main_child['name'] == 'main_settings':
                     for child in main_child['children']:
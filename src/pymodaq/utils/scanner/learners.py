@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Learners used by the adaptive scans: the next position to be probed is chosen from the values already measured so
+that the points concentrate where the probed signal varies the most (edges, narrow peaks...).
+Each learner splits its domain in regions (intervals in 1D, triangles in 2D) having a loss, the next point being
+the middle of the region of highest loss. Positions and values are normalized by the scan extent and the measured
+range so that the losses do not depend on the units
+"""
+from abc import ABCMeta, abstractmethod
+from typing import Iterable
+
+import numpy as np
+from scipy.spatial import Delaunay
+
+from pymodaq_utils.logger import set_logger, get_module_name
+from pymodaq_utils.enums import BaseEnum
+
+
+logger = set_logger(get_module_name(__file__))
+
+
+class LossType(BaseEnum):
+    """ How the loss of a region is computed
+
+    * UNIFORM: the size of the region, the points are evenly distributed
+    * GRADIENT: the size of the region in the (positions, value) space, refining where the signal varies
+    * CURVATURE: GRADIENT plus the variation of the slope with the neighbouring regions, refining peaks and edges
+    """
+    UNIFORM = 'uniform'
+    GRADIENT = 'gradient'
+    CURVATURE = 'curvature'
+
+
+class LearnerBase(metaclass=ABCMeta):
+    """ Base class of the learners used by the adaptive scans
+
+    The positions are asked one by one (ask), moved to and probed, then the measured value is given back (tell).
+    Positions asked but not yet told are pending and taken into account so that a region is not asked twice
+
+    Parameters
+    ----------
+    n_axes: int
+        The number of scanned axes
+    loss: LossType
+        How the loss of a region is computed
+    resolution: float
+        The smallest size of a region (relative to the scan extent) that can be split
+    """
+
+    def __init__(self, n_axes: int, loss: LossType = LossType.GRADIENT, resolution: float = 1e-3):
+        self.n_axes = n_axes
+        self.loss_type = LossType(loss)
+        self.resolution = resolution
+        self._points = np.zeros((0, n_axes))
+        self._values = np.zeros((0,))
+        self._pending = np.zeros((0, n_axes))
+
+    @property
+    def points(self) -> np.ndarray:
+        """ The positions already probed as an array of shape (Npoints, Naxes)"""
+        return self._points
+
+    @property
+    def values(self) -> np.ndarray:
+        """ The values measured at each probed position"""
+        return self._values
+
+    @property
+    def n_points(self) -> int:
+        return len(self._points)
+
+    def ask(self) -> np.ndarray:
+        """ Get the next position to be probed as an array of length Naxes"""
+        point = np.asarray(self._next_point(), dtype=float).reshape((self.n_axes,))
+        self._pending = np.concatenate((self._pending, point[None, :]))
+        return point
+
+    def tell(self, point: Iterable[float], value: float):
+        """ Give the value measured at a given position
+
+        The position may slightly differ from the asked one (actuators readback), the nearest pending position is
+        then considered as probed. Non finite values are ignored
+
+        Parameters
+        ----------
+        point: Iterable[float]
+            The position where the value has been measured
+        value: float
+        """
+        point = np.asarray(point, dtype=float).reshape((self.n_axes,))
+        if len(self._pending) > 0:
+            ind_pending = int(np.argmin(np.sum((self._pending - point) ** 2, axis=1)))
+            self._pending = np.delete(self._pending, ind_pending, axis=0)
+        if not np.isfinite(value):
+            logger.warning(f'Non finite value {value} at {point} is ignored by the adaptive learner')
+            return
+        self._points = np.concatenate((self._points, point[None, :]))
+        self._values = np.append(self._values, float(value))
+
+    def _scaled_values(self) -> np.ndarray:
+        """ The values normalized by their range"""
+        span = np.ptp(self._values) if len(self._values) > 0 else 0.
+        return (self._values - np.min(self._values)) / span if span > 0 else np.zeros_like(self._values)
+
+    @abstractmethod
+    def _next_point(self) -> np.ndarray:
+        """ To be reimplemented. The position the most worth probing"""
+        ...
+
+    @abstractmethod
+    def loss(self) -> float:
+        """ To be reimplemented. The highest loss of the regions, infinite until the initial points are probed"""
+        ...
+
+    def done(self, n_max: int, loss_goal: float = 0.) -> bool:
+        """ Check if the learning should stop
+
+        Parameters
+        ----------
+        n_max: int
+            The maximum number of probed positions
+        loss_goal: float
+            Stop when the loss of all regions is lower or equal to this value
+        """
+        return self.n_points >= n_max or self.loss() <= loss_goal
+
+
+class Learner1D(LearnerBase):
+    """ Learner splitting the intervals between the probed positions of a single axis
+
+    Parameters
+    ----------
+    bounds: Iterable[float]
+        The (start, stop) positions of the scan
+    loss: LossType
+    resolution: float
+    """
+
+    def __init__(self, bounds: Iterable[float], loss: LossType = LossType.GRADIENT, resolution: float = 1e-3):
+        super().__init__(1, loss, resolution)
+        self.bounds = np.asarray(bounds, dtype=float).reshape((2,))
+        if self.bounds[0] == self.bounds[1]:
+            raise ValueError(f'The bounds of an adaptive scan should be different, got {self.bounds}')
+
+    def _scaled(self, positions: np.ndarray) -> np.ndarray:
+        return (np.asarray(positions).reshape((-1,)) - self.bounds[0]) / (self.bounds[1] - self.bounds[0])
+
+    def _get_intervals_ends(self) -> np.ndarray:
+        """ The sorted normalized probed and pending positions, the latter splitting the intervals they lie in"""
+        return np.sort(np.concatenate((self._scaled(self._points), self._scaled(self._pending))))
+
+    def losses(self) -> np.ndarray:
+        """ The loss of each interval between consecutive (sorted) probed or pending positions
+
+        The values at the pending positions are linearly interpolated from the probed ones
+        """
+        x_probed = self._scaled(self._points)
+        order = np.argsort(x_probed)
+        x = self._get_intervals_ends()
+        y = np.interp(x, x_probed[order], self._scaled_values()[order])
+        dx = np.diff(x)
+        dy = np.diff(y)
+        if self.loss_type == LossType.UNIFORM:
+            losses = np.abs(dx)
+        else:
+            losses = np.hypot(dx, dy)
+            if self.loss_type == LossType.CURVATURE and len(x) > 2:
+                # area of the triangles made by each point with its neighbours, shared by the two adjacent intervals
+                areas = 0.5 * np.abs(dx[:-1] * dy[1:] - dx[1:] * dy[:-1])
+                losses += np.sqrt(np.concatenate(([0.], areas)) + np.concatenate((areas, [0.])))
+        losses[np.abs(dx) <= self.resolution] = 0.
+        return losses
+
+    def loss(self) -> float:
+        if self.n_points < 2:
+            return np.inf
+        losses = self.losses()
+        return float(np.max(losses)) if len(losses) > 0 else 0.
+
+    def _next_point(self) -> np.ndarray:
+        n_known = self.n_points + len(self._pending)
+        if n_known < 2:
+            return self.bounds[n_known:n_known + 1]
+        if self.n_points < 2:  # the initial points are still pending
+            return self.bounds[:1] + np.random.rand() * (self.bounds[1] - self.bounds[0])
+        x = self._get_intervals_ends()
+        ind = int(np.argmax(self.losses()))
+        return self.bounds[:1] + (x[ind] + x[ind + 1]) / 2 * (self.bounds[1] - self.bounds[0])
+
+
+class Learner2D(LearnerBase):
+    """ Learner splitting the triangles of the Delaunay triangulation of the probed positions of two axes
+
+    The first probed positions are the corners and the center of the scan area
+
+    Parameters
+    ----------
+    bounds: Iterable[Iterable[float]]
+        The (start, stop) positions of each axis
+    loss: LossType
+    resolution: float
+    """
+
+    def __init__(self, bounds: Iterable[Iterable[float]], loss: LossType = LossType.GRADIENT,
+                 resolution: float = 1e-3):
+        super().__init__(2, loss, resolution)
+        self.bounds = np.asarray(bounds, dtype=float).reshape((2, 2))
+        if np.any(self.bounds[:, 0] == self.bounds[:, 1]):
+            raise ValueError(f'The bounds of an adaptive scan should be different, got {self.bounds}')
+        self._initial_points = np.array([[self.bounds[0, ind_1], self.bounds[1, ind_2]]
+                                         for ind_1 in range(2) for ind_2 in range(2)] +
+                                        [np.mean(self.bounds, axis=1)])
+
+    def _scaled(self, positions: np.ndarray) -> np.ndarray:
+        return (np.asarray(positions).reshape((-1, 2)) - self.bounds[:, 0]) / (self.bounds[:, 1] - self.bounds[:, 0])
+
+    def triangulate(self) -> Delaunay:
+        """ The Delaunay triangulation of the (normalized) probed positions"""
+        return Delaunay(self._scaled(self._points))
+
+    def losses(self, triangulation: Delaunay = None) -> np.ndarray:
+        """ The loss of each triangle of the triangulation of the probed positions"""
+        if triangulation is None:
+            triangulation = self.triangulate()
+        simplices = triangulation.simplices
+        xy = triangulation.points[simplices]
+        z = self._scaled_values()[simplices]
+        d_xy = xy[:, 1:] - xy[:, :1]
+        d_z = z[:, 1:] - z[:, :1]
+        cross_z = d_xy[:, 0, 0] * d_xy[:, 1, 1] - d_xy[:, 0, 1] * d_xy[:, 1, 0]
+        areas = 0.5 * np.abs(cross_z)
+        if self.loss_type == LossType.UNIFORM:
+            losses = areas.copy()
+        else:
+            # area of the triangles in the (positions, value) space
+            cross_x = d_xy[:, 0, 1] * d_z[:, 1] - d_z[:, 0] * d_xy[:, 1, 1]
+            cross_y = d_z[:, 0] * d_xy[:, 1, 0] - d_xy[:, 0, 0] * d_z[:, 1]
+            losses = 0.5 * np.sqrt(cross_x ** 2 + cross_y ** 2 + cross_z ** 2)
+            if self.loss_type == LossType.CURVATURE:
+                # slope of the plane through each triangle compared with the one of its neighbours
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    slopes = np.stack((d_z[:, 0] * d_xy[:, 1, 1] - d_z[:, 1] * d_xy[:, 0, 1],
+                                       d_z[:, 1] * d_xy[:, 0, 0] - d_z[:, 0] * d_xy[:, 1, 0]), axis=1) / \
+                        cross_z[:, None]
+                slopes[~np.isfinite(slopes)] = 0.
+                neighbours = triangulation.neighbors
+                slope_changes = np.linalg.norm(slopes[:, None, :] - slopes[neighbours], axis=2)
+                slope_changes[neighbours == -1] = 0.
+                losses += areas * np.max(slope_changes, axis=1)
+        losses[areas <= self.resolution ** 2] = 0.
+        if len(self._pending) > 0:
+            containing = triangulation.find_simplex(self._scaled(self._pending))
+            losses[containing[containing >= 0]] = 0.
+        return losses
+
+    def loss(self) -> float:
+        if self.n_points < len(self._initial_points):
+            return np.inf
+        return float(np.max(self.losses()))
+
+    def _next_point(self) -> np.ndarray:
+        n_known = self.n_points + len(self._pending)
+        if n_known < len(self._initial_points):
+            return self._initial_points[n_known]
+        if self.n_points < len(self._initial_points):  # the initial points are still pending
+            return self.bounds[:, 0] + np.random.rand(2) * (self.bounds[:, 1] - self.bounds[:, 0])
+        triangulation = self.triangulate()
+        ind = int(np.argmax(self.losses(triangulation)))
+        centroid = np.mean(triangulation.points[triangulation.simplices[ind]], axis=0)
+        return self.bounds[:, 0] + centroid * (self.bounds[:, 1] - self.bounds[:, 0])
+
+
+class LearnerCurvilinear(LearnerBase):
+    """ Learner along a polyline going through several vertices
+
+    The polyline is parametrized by its curvilinear abscissa on which a Learner1D is used
+
+    Parameters
+    ----------
+    vertices: np.ndarray
+        The positions of the vertices of the polyline as an array of shape (Nvertices, Naxes)
+    loss: LossType
+    resolution: float
+    """
+
+    def __init__(self, vertices: np.ndarray, loss: LossType = LossType.GRADIENT, resolution: float = 1e-3):
+        vertices = np.asarray(vertices, dtype=float)
+        vertices = vertices.reshape((len(vertices), -1))
+        super().__init__(vertices.shape[1], loss, resolution)
+        self.vertices = vertices
+        self._segments = np.diff(vertices, axis=0)
+        self._lengths = np.linalg.norm(self._segments, axis=1)
+        self._abscissa = np.concatenate(([0.], np.cumsum(self._lengths)))
+        if len(vertices) < 2 or self.length == 0:
+            raise ValueError('An adaptive scan along a polyline needs at least two distinct vertices')
+        self._learner = Learner1D((0., self.length), loss, resolution)
+
+    @property
+    def length(self) -> float:
+        """ The total length of the polyline"""
+        return float(self._abscissa[-1])
+
+    def get_position(self, abscissa: float) -> np.ndarray:
+        """ Get the position on the polyline at a given curvilinear abscissa"""
+        ind = int(np.clip(np.searchsorted(self._abscissa, abscissa, side='right') - 1, 0, len(self._lengths) - 1))
+        fraction = (abscissa - self._abscissa[ind]) / self._lengths[ind] if self._lengths[ind] > 0 else 0.
+        return self.vertices[ind] + fraction * self._segments[ind]
+
+    def get_abscissa(self, point: Iterable[float]) -> float:
+        """ Get the curvilinear abscissa of the point of the polyline the closest to a given position"""
+        point = np.asarray(point, dtype=float).reshape((self.n_axes,))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fractions = np.sum((point - self.vertices[:-1]) * self._segments, axis=1) / self._lengths ** 2
+        fractions = np.clip(np.nan_to_num(fractions), 0., 1.)
+        distances = np.linalg.norm(self.vertices[:-1] + fractions[:, None] * self._segments - point, axis=1)
+        ind = int(np.argmin(distances))
+        return float(self._abscissa[ind] + fractions[ind] * self._lengths[ind])
+
+    def tell(self, point: Iterable[float], value: float):
+        self._learner.tell([self.get_abscissa(point)], value)
+        super().tell(point, value)
+
+    def loss(self) -> float:
+        return self._learner.loss()
+
+    def _next_point(self) -> np.ndarray:
+        return self.get_position(self._learner.ask()[0])
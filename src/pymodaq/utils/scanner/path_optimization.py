@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Reordering of the scan positions to minimize the time spent by the actuators travelling from one position to the
+next. Actuators are supposed to move concurrently at a constant velocity, so that the duration of a move is the
+longest of the per axis durations.
+Only the order of the steps is modified: each position keeps its navigation indexes so that the saved data is unchanged
+"""
+from typing import List
+
+import numpy as np
+
+from pymodaq_utils.logger import set_logger, get_module_name
+from pymodaq_utils.enums import BaseEnum
+
+
+logger = set_logger(get_module_name(__file__))
+
+NEAREST_NEIGHBOUR_MAX_STEPS = 10000
+TWO_OPT_MAX_STEPS = 2000
+
+
+class PathMethod(BaseEnum):
+    NONE = 'None'
+    AUTO = 'Auto'
+    SERPENTINE = 'Serpentine'
+    NEAREST = 'Nearest neighbour + 2-opt'
+
+
+def _scale(positions: np.ndarray, velocities: np.ndarray = None) -> np.ndarray:
+    """ Express the positions in units of travel time along each axis"""
+    positions = np.asarray(positions, dtype=float).reshape((len(positions), -1))
+    if velocities is None:
+        return positions
+    velocities = np.asarray(velocities, dtype=float).reshape((-1,))
+    if np.any(velocities <= 0):
+        raise ValueError(f'Actuators velocities should be strictly positive, got {velocities}')
+    return positions / velocities
+
+
+def get_travel_time(positions: np.ndarray, velocities: np.ndarray = None) -> float:
+    """ Estimate the time spent by the actuators to go through the positions in the given order
+
+    Parameters
+    ----------
+    positions: np.ndarray
+        The scan positions as an array of shape (Nsteps, Naxes)
+    velocities: np.ndarray
+        The velocity of each actuator (units/s), unit velocities if None
+
+    Returns
+    -------
+    float: the sum of the moves duration
+    """
+    scaled = _scale(positions, velocities)
+    if len(scaled) < 2:
+        return 0.
+    return float(np.sum(np.max(np.abs(np.diff(scaled, axis=0)), axis=1)))
+
+
+def is_grid(axes_indexes: np.ndarray, axes_unique: List[np.ndarray]) -> bool:
+    """ Check if the scan positions are all the points of the grid defined by the unique values of each axis"""
+    axes_indexes = np.asarray(axes_indexes).reshape((len(axes_indexes), -1))
+    shape = tuple(len(axis) for axis in axes_unique)
+    if len(axes_indexes) != np.prod(shape):
+        return False
+    flat_indexes = np.ravel_multi_index(tuple(axes_indexes.T), shape)
+    return len(np.unique(flat_indexes)) == len(flat_indexes)
+
+
+def get_serpentine_order(axes_indexes: np.ndarray) -> np.ndarray:
+    """ Get the order of the steps going through a grid as a serpentine (boustrophedon)
+
+    The first axis is the slowest one, the direction of each faster axis is reversed every time it reaches an end of
+    the grid
+
+    Parameters
+    ----------
+    axes_indexes: np.ndarray
+        The navigation indexes of each step as an array of shape (Nsteps, Naxes)
+
+    Returns
+    -------
+    np.ndarray: the steps indexes in the serpentine order
+    """
+    axes_indexes = np.asarray(axes_indexes, dtype=np.int64).reshape((len(axes_indexes), -1))
+    keys = np.empty_like(axes_indexes)
+    rank = np.zeros((len(axes_indexes),), dtype=np.int64)
+    for ind_ax in range(axes_indexes.shape[1]):
+        indexes = axes_indexes[:, ind_ax]
+        n_values = indexes.max() + 1 if len(indexes) > 0 else 0
+        keys[:, ind_ax] = np.where(rank % 2 == 1, n_values - 1 - indexes, indexes)
+        rank = rank * n_values + keys[:, ind_ax]
+    return np.argsort(rank, kind='stable')
+
+
+def get_nearest_neighbour_order(positions: np.ndarray, velocities: np.ndarray = None) -> np.ndarray:
+    """ Get the order of the steps obtained by going each time to the closest not yet visited position
+
+    The path starts at the first position
+
+    Parameters
+    ----------
+    positions: np.ndarray
+        The scan positions as an array of shape (Nsteps, Naxes)
+    velocities: np.ndarray
+        The velocity of each actuator (units/s), unit velocities if None
+
+    Returns
+    -------
+    np.ndarray: the steps indexes in the visiting order
+    """
+    scaled = _scale(positions, velocities)
+    n_steps = len(scaled)
+    order = np.zeros((n_steps,), dtype=int)
+    visited = np.zeros((n_steps,), dtype=bool)
+    current = 0
+    for ind in range(n_steps):
+        order[ind] = current
+        visited[current] = True
+        if ind == n_steps - 1:
+            break
+        durations = np.max(np.abs(scaled - scaled[current]), axis=1)
+        durations[visited] = np.inf
+        current = int(np.argmin(durations))
+    return order
+
+
+def improve_order_2opt(positions: np.ndarray, order: np.ndarray, velocities: np.ndarray = None,
+                       max_passes: int = 20) -> np.ndarray:
+    """ Improve an (open) path by reversing the segments whose reversal reduces the travel time (2-opt)
+
+    The first position of the path is kept
+
+    Parameters
+    ----------
+    positions: np.ndarray
+        The scan positions as an array of shape (Nsteps, Naxes)
+    order: np.ndarray
+        The initial steps indexes in the visiting order
+    velocities: np.ndarray
+        The velocity of each actuator (units/s), unit velocities if None
+    max_passes: int
+        The maximum number of passes over the whole path
+
+    Returns
+    -------
+    np.ndarray: the improved visiting order
+    """
+    order = np.array(order, dtype=int)
+    path = _scale(positions, velocities)[order]
+    n_steps = len(order)
+    for _ in range(max_passes):
+        improved = False
+        for ind in range(1, n_steps - 1):
+            # reversing the segment [ind, j] replaces the moves (ind-1 -> ind) and (j -> j+1)
+            # by (ind-1 -> j) and (ind -> j+1), there is no move after the last step
+            ends = path[ind + 1:]
+            nexts = path[ind + 2:]
+            old = np.max(np.abs(path[ind] - path[ind - 1])) + \
+                np.append(np.max(np.abs(nexts - ends[:-1]), axis=1), 0.)
+            new = np.max(np.abs(ends - path[ind - 1]), axis=1) + \
+                np.append(np.max(np.abs(nexts - path[ind]), axis=1), 0.)
+            gains = old - new
+            best = int(np.argmax(gains))
+            if gains[best] > 1e-12 * (1 + old[best]):
+                end = ind + 1 + best
+                order[ind:end + 1] = order[ind:end + 1][::-1]
+                path[ind:end + 1] = path[ind:end + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return order
+
+
+def get_optimized_order(positions: np.ndarray, axes_indexes: np.ndarray, axes_unique: List[np.ndarray],
+                        velocities: np.ndarray = None, method: PathMethod = PathMethod.AUTO) -> np.ndarray:
+    """ Get an order of the scan steps reducing the actuators travel time
+
+    Parameters
+    ----------
+    positions: np.ndarray
+        The scan positions as an array of shape (Nsteps, Naxes)
+    axes_indexes: np.ndarray
+        The navigation indexes of each step as an array of shape (Nsteps, Naxes)
+    axes_unique: List[np.ndarray]
+        The unique values of each axis
+    velocities: np.ndarray
+        The velocity of each actuator (units/s), unit velocities if None
+    method: PathMethod
+        AUTO uses a serpentine on grid like scans and the nearest neighbour + 2-opt heuristic otherwise
+
+    Returns
+    -------
+    np.ndarray: the steps indexes in the optimized order, the initial order if it is already the fastest one
+    """
+    method = PathMethod(method)
+    positions = np.asarray(positions, dtype=float).reshape((len(positions), -1))
+    n_steps = len(positions)
+    initial_order = np.arange(n_steps)
+    if method == PathMethod.NONE or n_steps < 3:
+        return initial_order
+
+    if method == PathMethod.AUTO:
+        method = PathMethod.SERPENTINE if is_grid(axes_indexes, axes_unique) else PathMethod.NEAREST
+
+    if method == PathMethod.SERPENTINE:
+        order = get_serpentine_order(axes_indexes)
+    elif n_steps > NEAREST_NEIGHBOUR_MAX_STEPS:
+        logger.warning(f'Too many steps ({n_steps}) for a nearest neighbour path optimization, '
+                       f'the order of the scan is not modified')
+        return initial_order
+    else:
+        order = get_nearest_neighbour_order(positions, velocities)
+        if n_steps <= TWO_OPT_MAX_STEPS:
+            order = improve_order_2opt(positions, order, velocities)
+
+    if get_travel_time(positions[order], velocities) < get_travel_time(positions, velocities):
+        return order
+    return initial_order
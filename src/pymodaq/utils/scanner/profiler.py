@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Timing of each step of a scan: timestamps of the step events (move, wait, grab, save, plot) are recorded from the
+acquisition thread and from the GUI thread, the durations of each stage being derived from them
+"""
+from time import perf_counter
+from typing import Dict, Tuple
+
+import numpy as np
+
+from pymodaq_data.data import DataToExport, DataWithAxes, DataSource, Axis
+
+
+STEP_EVENTS = ['move_start', 'move_done', 'wait_done', 'grab_start', 'exposure_done', 'grab_done',
+               'save_start', 'save_done', 'plot_start', 'plot_done', 'step_done']
+
+STEP_STAGES: Dict[str, Tuple[str, str]] = {
+    'move': ('move_start', 'move_done'),
+    'wait': ('move_done', 'wait_done'),
+    'exposure': ('grab_start', 'exposure_done'),
+    'grab': ('grab_start', 'grab_done'),
+    'save': ('save_start', 'save_done'),
+    'plot': ('plot_start', 'plot_done'),
+    'step': ('move_start', 'step_done'),
+}
+
+
+class StepProfiler:
+    """ Store high resolution timestamps of the events of each step of a scan
+
+    Timestamps are in seconds from the creation of the profiler. Each event can be marked from any thread as each
+    one writes its own cells of the timestamps array. Events not marked for a given step (for instance the exposure
+    when the detectors do not report it) are NaN and ignored in the statistics
+
+    Parameters
+    ----------
+    n_steps: int
+        The total number of steps of the scan (including the averaging)
+    """
+
+    def __init__(self, n_steps: int):
+        self.timestamps = np.full((n_steps, len(STEP_EVENTS)), np.nan)
+        self._tstart = perf_counter()
+
+    @property
+    def n_steps(self) -> int:
+        return len(self.timestamps)
+
+    def mark(self, step: int, event: str):
+        """ Record the current time as the given event of a step, steps out of range are ignored"""
+        if 0 <= step < self.n_steps:
+            self.timestamps[step, STEP_EVENTS.index(event)] = perf_counter() - self._tstart
+
+    def durations(self, stage: str) -> np.ndarray:
+        """ Get the durations (s) of a given stage (see STEP_STAGES) for the steps where both its events were
+        marked"""
+        start, stop = STEP_STAGES[stage]
+        durations = self.timestamps[:, STEP_EVENTS.index(stop)] - self.timestamps[:, STEP_EVENTS.index(start)]
+        return durations[np.isfinite(durations)]
+
+    def stats(self) -> Dict[str, Tuple[float, float]]:
+        """ Get the mean and 95th percentile durations (s) of each stage marked at least once"""
+        stats = dict([])
+        for stage in STEP_STAGES:
+            durations = self.durations(stage)
+            if len(durations) > 0:
+                stats[stage] = (float(np.mean(durations)), float(np.percentile(durations, 95)))
+        return stats
+
+    def report(self) -> str:
+        """ Summary of the stages durations as mean/p95 in ms"""
+        return ', '.join([f'{stage}: {1000 * mean:.1f}/{1000 * p95:.1f}'
+                          for stage, (mean, p95) in self.stats().items()])
+
+    def to_dte(self) -> DataToExport:
+        """ Export the events timestamps as a Data1D along the scan steps (one channel per event)"""
+        return DataToExport('step_timings', data=[
+            DataWithAxes('step_timings', source=DataSource.raw, units='s',
+                         data=[self.timestamps[:, ind] for ind in range(len(STEP_EVENTS))],
+                         labels=STEP_EVENTS,
+                         axes=[Axis('step', data=np.arange(self.n_steps, dtype=float), index=0)])])
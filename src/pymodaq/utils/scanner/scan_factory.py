@@ -16,7 +16,6 @@ from qtpy import QtWidgets
 from pymodaq_utils.factory import ObjectFactory
 from pymodaq_utils.logger import set_logger, get_module_name
 from pymodaq_utils.abstract import abstract_attribute
-from pymodaq_utils import math_utils as mutils
 from pymodaq_utils import config as configmod
 
 from pymodaq_gui.managers.parameter_manager import ParameterManager, Parameter
@@ -24,6 +23,7 @@ from pymodaq_gui.managers.parameter_manager import ParameterManager, Parameter
 from pymodaq_data.data import Axis, DataDistribution
 
 from pymodaq.utils.scanner.scan_config import ScanConfig
+from pymodaq.utils.scanner.learners import LearnerBase, LossType
 from pymodaq_gui.config import ConfigSaverLoader
 
 
@@ -40,6 +40,13 @@ class ScanParameterManager(ParameterManager):
     settings_name = 'scanner_settings'
 
     def __init__(self):
+        if not isinstance(QtWidgets.QApplication.instance(), QtWidgets.QApplication):
+            # headless (see pymodaq.utils.headless): no widget can be created, the settings are kept without tree
+            self._settings_tree = None
+            self._settings = Parameter.create(name=self.settings_name, type='group', children=self.params,
+                                              showTop=False)
+            self._settings.sigTreeStateChanged.connect(self.parameter_tree_changed)
+            return
         super().__init__()
         self.settings_tree.header().setVisible(True)
         self.settings_tree.header().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Interactive)
@@ -149,18 +156,29 @@ class ScannerBase(ScanParameterManager, metaclass=ABCMeta):
         """To be reimplemented. Calculations of indexes within the scan"""
         ...
 
-    def get_info_from_positions(self, positions: np.ndarray):
-        """Set mandatory attributes from a ndarray of positions"""
+    def get_info_from_positions(self, positions: np.ndarray, axes_unique: List[np.ndarray] = None):
+        """Set mandatory attributes from a ndarray of positions
+
+        Parameters
+        ----------
+        positions: np.ndarray
+            the scan positions, one row per step and one column per actuator
+        axes_unique: list of np.ndarray
+            if the sorted values of each axis are already known (regular grids), the indexes of the positions are
+            obtained from a binary search in these rather than from np.unique
+        """
         if positions is not None:
             if len(positions.shape) == 1:
                 positions = np.expand_dims(positions, 1)
-            axes_unique = []
-            for ax in positions.T:
-                axes_unique.append(np.unique(ax))
-            axes_indexes = np.zeros_like(positions, dtype=int)
-            for ind in range(positions.shape[0]):
-                for ind_pos, pos in enumerate(positions[ind]):
-                    axes_indexes[ind, ind_pos] = mutils.find_index(axes_unique[ind_pos], pos)[0][0]
+            axes_indexes = np.zeros(positions.shape, dtype=int)
+            if axes_unique is None:
+                axes_unique = []
+                for ind_ax, ax in enumerate(positions.T):
+                    ax_unique, axes_indexes[:, ind_ax] = np.unique(ax, return_inverse=True)
+                    axes_unique.append(ax_unique)
+            else:
+                for ind_ax, ax in enumerate(positions.T):
+                    axes_indexes[:, ind_ax] = np.searchsorted(axes_unique[ind_ax], ax)
 
             self.n_axes = len(axes_unique)
             self.axes_unique = axes_unique
@@ -168,6 +186,17 @@ class ScannerBase(ScanParameterManager, metaclass=ABCMeta):
             self.positions = positions
             self.n_steps = positions.shape[0]
 
+    def set_order(self, order: np.ndarray):
+        """Reorder the scan steps keeping the navigation indexes of each position
+
+        Parameters
+        ----------
+        order: np.ndarray
+            the indexes of the current steps in the new order
+        """
+        self.positions = self.positions[order]
+        self.axes_indexes = self.axes_indexes[order]
+
     @abstractmethod
     def evaluate_steps(self):
         """To be reimplemented. Quick evaluation of the number of steps to stop the calculation if the evaluation os above the
@@ -200,6 +229,75 @@ class ScannerBase(ScanParameterManager, metaclass=ABCMeta):
         ...
 
 
+class AdaptiveScanner:
+    """Mixin for the scanners whose positions are chosen one by one by a learner from the values of a probed signal
+
+    To be used as the first parent of a ScannerBase subclass implementing create_learner. The positions attribute
+    holds the positions probed so far and grows as the scan goes on while the scan shape is the maximum number of
+    points
+
+    See Also
+    --------
+    pymodaq.utils.scanner.learners
+    """
+    adaptive_params = [
+        {'title': 'Loss type:', 'name': 'scan_loss', 'type': 'list', 'limits': LossType.values(),
+         'value': LossType.GRADIENT.value,
+         'tip': 'Type of loss used by the algo. to determine next points'},
+        {'title': 'Max. points:', 'name': 'n_points', 'type': 'int', 'value': 100, 'min': 2},
+        {'title': 'Loss goal:', 'name': 'loss_goal', 'type': 'float', 'value': 0., 'min': 0.,
+         'tip': 'The scan stops before the maximum number of points if the loss of all regions is below this value'},
+        {'title': 'Resolution:', 'name': 'resolution', 'type': 'float', 'value': 0.001, 'min': 0.,
+         'tip': 'Size (relative to the scan extent) below which a region is not refined anymore'},
+    ]
+    distribution = DataDistribution['spread']
+    grid_interpolation = True  # if the live data can be interpolated on a grid of the scan axes
+
+    learner: LearnerBase = None
+
+    @abstractmethod
+    def create_learner(self) -> LearnerBase:
+        """To be reimplemented. Create the learner from the settings"""
+        ...
+
+    def set_scan(self):
+        try:
+            self.learner = self.create_learner()
+        except ValueError as e:
+            logger.warning(f'Invalid adaptive scan settings: {str(e)}')
+            self.learner = None
+        self.get_info_from_positions(np.zeros((0, self.n_axes)))
+
+    def evaluate_steps(self) -> int:
+        return self.settings['n_points']
+
+    def get_scan_shape(self) -> Tuple[int]:
+        return self.settings['n_points'],
+
+    def get_indexes_from_scan_index(self, scan_index: int) -> Tuple[int]:
+        return scan_index,
+
+    def get_nav_axes(self) -> List[Axis]:
+        return [Axis(label=f'{act.title}', units=f'{act.units}', data=self.positions[:, ind], index=0,
+                     spread_order=ind)
+                for ind, act in enumerate(self.actuators)]
+
+    def ask(self) -> np.ndarray:
+        """Get the next position to be probed"""
+        return self.learner.ask()
+
+    def tell(self, position: np.ndarray, value: float):
+        """Give the value probed at a given position, the position is appended to the scan positions"""
+        self.learner.tell(position, value)
+        self.get_info_from_positions(np.concatenate((self.positions, np.reshape(position, (1, self.n_axes)))))
+
+    def is_done(self) -> bool:
+        """Check if the maximum number of points or the loss goal is reached"""
+        if self.learner is None:
+            return True
+        return self.learner.done(self.settings['n_points'], self.settings['loss_goal'])
+
+
 class ScannerFactory(ObjectFactory):
     """Factory class registering and storing Scanners"""
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import Tuple, List, TYPE_CHECKING
 from collections import OrderedDict
 
+import numpy as np
 from qtpy.QtCore import QObject, Signal
 from qtpy import QtWidgets
 
@@ -11,7 +12,8 @@ import pymodaq_utils.utils as utils
 
 from pymodaq_gui.managers.parameter_manager import ParameterManager, Parameter
 
-from pymodaq.utils.scanner.scan_factory import ScannerFactory, ScannerBase
+from pymodaq.utils.scanner.scan_factory import ScannerFactory, ScannerBase, AdaptiveScanner
+from pymodaq.utils.scanner.path_optimization import PathMethod, get_optimized_order, get_travel_time
 from pymodaq.utils.scanner.utils import ScanInfo
 from pymodaq.utils.scanner.scan_selector import Selector
 from pymodaq.utils.data import DataToExport, DataActuator
@@ -50,6 +52,14 @@ class Scanner(QObject, ParameterManager):
          'limits': scanner_factory.scan_types()},
         {'title': 'Scan subtype:', 'name': 'scan_sub_type', 'type': 'list',
          'limits': scanner_factory.scan_sub_types(scanner_factory.scan_types()[0])},
+        {'title': 'Path optimization:', 'name': 'path_optimization', 'type': 'group', 'expanded': False,
+         'children': [
+             {'title': 'Method:', 'name': 'path_method', 'type': 'list', 'limits': PathMethod.values(),
+              'tip': 'Reorder the scan steps to reduce the actuators travel time, the saved data is unchanged'},
+             {'title': 'Velocities (units/s):', 'name': 'velocities', 'type': 'group', 'children': []},
+             {'title': 'Travel time (s):', 'name': 'travel_time', 'type': 'str', 'value': '',
+              'readonly': True},
+         ]},
     ]
 
     def __init__(self, parent_widget: QtWidgets.QWidget = None, scanner_items=OrderedDict([]),
@@ -63,6 +73,7 @@ class Scanner(QObject, ParameterManager):
 
         self.connect_things()
         self._scanner: ScannerBase = None
+        self.travel_times: Tuple[float, float] = None
 
         self.setup_ui()
         self.actuators = actuators
@@ -126,8 +137,23 @@ class Scanner(QObject, ParameterManager):
     @actuators.setter
     def actuators(self, act_list):
         self._actuators = act_list
+        self.set_velocities_settings()
         self.set_scanner()
 
+    def set_velocities_settings(self):
+        """Create one velocity setting per actuator to estimate the travel time of the scan"""
+        velocities = self.settings.child('path_optimization', 'velocities')
+        velocities.clearChildren()
+        velocities.addChildren([{'title': f'{act.title}:', 'name': f'velocity_{ind}', 'type': 'float',
+                                 'value': 1., 'min': 1e-12}
+                                for ind, act in enumerate(self._actuators)])
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """The velocity of each actuator as set in the path optimization settings"""
+        return np.array([child.value() for child in
+                         self.settings.child('path_optimization', 'velocities').children()])
+
     def set_scan_type_and_subtypes(self, scan_type: str, scan_subtype: str):
         """Convenience function to set the main scan type
 
@@ -209,6 +235,27 @@ class Scanner(QObject, ParameterManager):
             dte.append(DataActuator(self.actuators[ind].title, data=float(pos)))
         return dte
 
+    @property
+    def is_adaptive(self) -> bool:
+        """True if the positions are determined during the scan by a learner, see AdaptiveScanner"""
+        return isinstance(self._scanner, AdaptiveScanner)
+
+    def ask_positions(self) -> DataToExport:
+        """ Get the next positions to be probed by an adaptive scan as a DataToExport of DataActuators"""
+        dte = DataToExport('scanner')
+        for ind, pos in enumerate(self._scanner.ask()):
+            dte.append(DataActuator(self.actuators[ind].title, data=float(pos)))
+        return dte
+
+    def tell(self, positions: DataToExport, value: float):
+        """ Give to an adaptive scan the value probed at the given actuators positions"""
+        self._scanner.tell(np.array([positions.get_data_from_name(act.title).value() for act in self.actuators]),
+                           value)
+
+    def is_done(self) -> bool:
+        """ Check if an adaptive scan reached its maximum number of points or its loss goal"""
+        return self._scanner.is_done()
+
     @property
     def axes_indexes(self):
         return self._scanner.axes_indexes
@@ -232,10 +279,38 @@ class Scanner(QObject, ParameterManager):
         if self._scanner.evaluate_steps() > oversteps:
             return True
         self._scanner.set_scan()
+        self.optimize_path()
         self.settings.child('n_steps').setValue(self.n_steps)
         self.scanner_updated_signal.emit()
         return False
 
+    def optimize_path(self):
+        """Reorder the scan steps to reduce the actuators travel time using the selected method
+
+        The travel times before and after the optimization are stored in the travel_times attribute
+        """
+        if self._scanner.positions is None or self.is_adaptive:
+            return
+        velocities = self.velocities
+        if len(velocities) != self._scanner.n_axes:
+            velocities = None
+        travel_time = get_travel_time(self._scanner.positions, velocities)
+        order = get_optimized_order(self._scanner.positions, self._scanner.axes_indexes,
+                                    self._scanner.axes_unique, velocities,
+                                    self.settings['path_optimization', 'path_method'])
+        self._scanner.set_order(order)
+        self.travel_times = (travel_time, get_travel_time(self._scanner.positions, velocities))
+        self.settings.child('path_optimization', 'travel_time').setValue(self.travel_time_report)
+
+    @property
+    def travel_time_report(self) -> str:
+        """Summary of the estimated travel time gained by the path optimization"""
+        if self.travel_times is None:
+            return ''
+        before, after = self.travel_times
+        gain = 100 * (before - after) / before if before > 0 else 0.
+        return f'{before:.4g} -> {after:.4g} (-{gain:.1f}%)'
+
     def update_from_scan_selector(self, scan_selector: Selector):
         self._scanner.update_from_scan_selector(scan_selector)
 
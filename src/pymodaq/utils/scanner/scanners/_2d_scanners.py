@@ -13,7 +13,8 @@ from pymodaq_utils import math_utils as mutils
 from pymodaq_utils import config as configmod
 from pymodaq.utils.scanner.scan_selector import Selector
 
-from ..scan_factory import ScannerFactory, ScannerBase, ScanParameterManager
+from ..scan_factory import ScannerFactory, ScannerBase, ScanParameterManager, AdaptiveScanner
+from ..learners import Learner2D
 
 logger = set_logger(get_module_name(__file__))
 config = configmod.Config()
@@ -22,6 +23,56 @@ if TYPE_CHECKING:
     from pymodaq.control_modules.daq_move import DAQ_Move
 
 
+def get_grid_positions(axis_1: np.ndarray, axis_2: np.ndarray, back_and_forth=False) -> np.ndarray:
+    """Get the positions of a 2D raster scan, the second axis being the fastest one
+
+    Parameters
+    ----------
+    axis_1: np.ndarray
+        the values of the slow axis
+    axis_2: np.ndarray
+        the values of the fast axis
+    back_and_forth: bool
+        if True, the fast axis is scanned backward on every other line
+
+    Returns
+    -------
+    np.ndarray of shape (len(axis_1) * len(axis_2), 2)
+    """
+    positions_1, positions_2 = np.meshgrid(axis_1, axis_2, indexing='ij')
+    if back_and_forth:
+        positions_2[1::2] = positions_2[1::2, ::-1]
+    return np.stack((positions_1.ravel(), positions_2.ravel()), axis=1)
+
+
+def get_spiral_indexes(n_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the indexes along both axes of a square spiral starting at (0, 0)
+
+    The spiral is made of segments of increasing length alternatively along the first and the second axis, the
+    direction of motion being reversed every two segments
+
+    Parameters
+    ----------
+    n_points: int
+        the number of points of the spiral
+
+    Returns
+    -------
+    tuple of two ndarrays of integers of length n_points
+    """
+    n_segments = 2
+    while n_segments * (n_segments - 1) < n_points:  # 2 segments of each length 0, 1, 2...
+        n_segments += 1
+    lengths = np.repeat(np.arange(n_segments), 2)
+    directions = np.where(np.repeat(np.arange(n_segments), 2) % 2 == 1, 1, -1)
+    axis = np.tile([0, 1], n_segments)
+    steps_axis = np.repeat(axis, lengths)[:n_points - 1]
+    steps = np.repeat(directions, lengths)[:n_points - 1]
+    axis_1_indexes = np.concatenate(([0], np.cumsum(np.where(steps_axis == 0, steps, 0))))
+    axis_2_indexes = np.concatenate(([0], np.cumsum(np.where(steps_axis == 1, steps, 0))))
+    return axis_1_indexes, axis_2_indexes
+
+
 class Scan2DBase(ScannerBase):    
     params = [{'title': 'Ax1:', 'name': 'axis1', 'type': 'group',
                 'children':[]
@@ -92,12 +143,9 @@ class Scan2DLinear(Scan2DBase):
             axis_1_unique = mutils.linspace_step(starts[0], stops[0], steps[0])
             axis_2_unique = mutils.linspace_step(starts[1], stops[1], steps[1])
 
-            positions = []
-            for ind_x, pos1 in enumerate(axis_1_unique):
-                for ind_y, pos2 in enumerate(axis_2_unique):
-                    positions.append([pos1, pos2])
+            positions = get_grid_positions(axis_1_unique, axis_2_unique)
 
-        self.get_info_from_positions(np.array(positions))
+        self.get_info_from_positions(positions, axes_unique=[np.sort(axis_1_unique), np.sort(axis_2_unique)])
 
     def set_settings_titles(self):
         if len(self.actuators) == 2:
@@ -148,15 +196,9 @@ class Scan2DLinearBF(Scan2DLinear):
             axis_1_unique = mutils.linspace_step(starts[0], stops[0], steps[0])
             axis_2_unique = mutils.linspace_step(starts[1], stops[1], steps[1])
 
-            positions = []
-            for ind_x, pos1 in enumerate(axis_1_unique):
-                for ind_y, pos2 in enumerate(axis_2_unique):
-                    if not mutils.odd_even(ind_x):
-                        positions.append([pos1, pos2])
-                    else:
-                        positions.append([pos1, axis_2_unique[len(axis_2_unique) - ind_y - 1]])
+            positions = get_grid_positions(axis_1_unique, axis_2_unique, back_and_forth=True)
 
-        self.get_info_from_positions(np.array(positions))
+        self.get_info_from_positions(positions, axes_unique=[np.sort(axis_1_unique), np.sort(axis_2_unique)])
 
 
 @ScannerFactory.register()
@@ -168,8 +210,8 @@ class Scan2DRandom(Scan2DLinear):
 
     def set_scan(self):
         super().set_scan()
-        np.random.shuffle(self.positions)
-        self.get_info_from_positions(self.positions)
+        self.get_info_from_positions(self.positions[np.random.permutation(len(self.positions))],
+                                     axes_unique=self.axes_unique)
 
 
 @ScannerFactory.register()
@@ -240,42 +282,17 @@ class Scan2DSpiral(Scan2DLinear):
 
         if np.any(np.array(rmaxs) == 0) or np.any(np.abs(rmaxs) < 1e-12) or np.any(np.abs(rsteps) < 1e-12):
             positions = np.array([starts])
+            axes_unique = None
 
         else:
-            Nlin = self.settings['npts_by_axis'] / 2
-            axis_1_indexes = [0]
-            axis_2_indexes = [0]
-            ind = 0
-            flag = True
-
-            while flag:
-                if mutils.odd_even(ind):
-                    step = 1
-                else:
-                    step = -1
-                if flag:
-
-                    for ind_step in range(ind):
-                        axis_1_indexes.append(axis_1_indexes[-1] + step)
-                        axis_2_indexes.append(axis_2_indexes[-1])
-                        if len(axis_1_indexes) >= (2 * Nlin + 1) ** 2:
-                            flag = False
-                            break
-                if flag:
-                    for ind_step in range(ind):
-                        axis_1_indexes.append(axis_1_indexes[-1])
-                        axis_2_indexes.append(axis_2_indexes[-1] + step)
-                        if len(axis_1_indexes) >= (2 * Nlin + 1) ** 2:
-                            flag = False
-                            break
-                ind += 1
-
-            positions = []
-            for ind in range(len(axis_1_indexes)):
-                positions.append(np.array([axis_1_indexes[ind] * rsteps[0] + starts[0],
-                                           axis_2_indexes[ind] * rsteps[1] + starts[1]]))
-
-        self.get_info_from_positions(np.array(positions))
+            axis_1_indexes, axis_2_indexes = get_spiral_indexes((self.settings['npts_by_axis'] + 1) ** 2)
+            positions = np.stack((axis_1_indexes * rsteps[0] + starts[0], axis_2_indexes * rsteps[1] + starts[1]),
+                                 axis=1)
+            # the spiral covers all the indexes between its extrema along each axis
+            axes_unique = [np.sort(np.arange(np.min(indexes), np.max(indexes) + 1) * rstep + start)
+                           for indexes, rstep, start in zip((axis_1_indexes, axis_2_indexes), rsteps, starts)]
+
+        self.get_info_from_positions(positions, axes_unique=axes_unique)
 
     def update_from_scan_selector(self, scan_selector: Selector):
         coordinates = scan_selector.get_coordinates()
@@ -287,60 +304,41 @@ class Scan2DSpiral(Scan2DLinear):
                     (coordinates[0, i] - coordinates[1, i]) / 2)
 
 
-try:
-    import adaptive
-
-    @ScannerFactory.register()
-    class Scan2DAdaptive(Scan2DLinear):
-        scan_subtype = 'Adaptive'
-
-        params = [
-            {'title': 'Loss type', 'name': 'scan_loss', 'type': 'list',
-             'limits': ['default', 'curvature', 'uniform'],
-             'tip': 'Type of loss used by the algo. to determine next points'},
-
-            {'title': 'Ax1:', 'name': 'axis1', 'type': 'group',
-               'children':[
-              {'title': 'Start Ax1:', 'name': 'start_axis1', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'start1')},
-              {'title': 'Stop Ax1:', 'name': 'stop_axis1', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'stop1')},              
-              {'title': 'Step Ax1:', 'name': 'step_axis1', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'step1')},
-              ]}, 
-              {'title': 'Ax2:', 'name': 'axis2', 'type': 'group',
-               'children':[
-              {'title': 'Start Ax2:', 'name': 'start_axis2', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'start2')},
-              {'title': 'Stop Ax2:', 'name': 'stop_axis2', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'stop2')},              
-              {'title': 'Step Ax2:', 'name': 'step_axis2', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'step2')},              
-               ]},
-            ]
-        distribution = DataDistribution['spread']
-
-        def __init__(self, actuators: List['DAQ_Move'] = None, **_ignored):
-            super().__init__(actuators=actuators)
-
-        def set_scan(self):
-
-            self.axes_unique = [np.array([]), np.array([])]
-            self.axes_indexes = np.array([], dtype=int)
-            self.positions = np.zeros((0, 2))
-
-        def evaluate_steps(self) -> int:
-            return 1
-
-        def get_nav_axes(self) -> List[Axis]:
-            return [Axis(label=f'{act.mod_name} axis',
-                         units=f'{act.units}',
-                         data=self.positions[:, ind],
-                         index=ind) for ind, act in enumerate(self.actuators)]
+@ScannerFactory.register()
+class Scan2DAdaptive(AdaptiveScanner, Scan2DLinear):
+    """ Adaptive scan within a rectangular area: each new position is chosen from the already probed values
+    (the selected probe 0D data) so that the points concentrate where the signal varies the most"""
+    scan_subtype = 'Adaptive'
+
+    params = AdaptiveScanner.adaptive_params + [
+        {'title': 'Ax1:', 'name': 'axis1', 'type': 'group',
+         'children': [
+             {'title': 'Start Ax1:', 'name': 'start_axis1', 'type': 'float',
+              'value': 0.},
+             {'title': 'Stop Ax1:', 'name': 'stop_axis1', 'type': 'float',
+              'value': 1.},
+         ]},
+        {'title': 'Ax2:', 'name': 'axis2', 'type': 'group',
+         'children': [
+             {'title': 'Start Ax2:', 'name': 'start_axis2', 'type': 'float',
+              'value': 0.},
+             {'title': 'Stop Ax2:', 'name': 'stop_axis2', 'type': 'float',
+              'value': 1.},
+         ]},
+    ]
+    distribution = DataDistribution['spread']
 
-        def get_scan_shape(self) -> Tuple[int]:
-            return ()  # unknown shape
+    def __init__(self, actuators: List['DAQ_Move'] = None, **_ignored):
+        super().__init__(actuators=actuators)
 
-except ModuleNotFoundError:
-    logger.info('adaptive module is not present, no adaptive scan possible')
+    def create_learner(self) -> Learner2D:
+        return Learner2D([(self.settings[ax, f'start_{ax}'], self.settings[ax, f'stop_{ax}']) for ax in self.axes],
+                         loss=self.settings['scan_loss'], resolution=self.settings['resolution'])
 
+    def set_settings_titles(self):
+        if len(self.actuators) == 2:
+            for i, ax in enumerate(self.axes):
+                title = self.actuators[i].title
+                self.settings.child(ax).setOpts(title=title)
+                self.settings.child(ax, f'start_{ax}').setOpts(title=f'{title} start:')
+                self.settings.child(ax, f'stop_{ax}').setOpts(title=f'{title} stop:')
@@ -137,10 +137,17 @@ class SequentialScanner(ScannerBase):
     def evaluate_steps(self) -> int:
         starts, stops, steps = self.get_pos()
         n_steps = 1
-        for ind in range(starts.size):
-            n_steps *= np.abs((stops[ind] - starts[ind]) / steps[ind]) + 1
+        for start, stop, step in zip(starts, stops, steps):
+            n_steps *= self.get_n_values(start, stop, step)
         return int(n_steps)
 
+    @staticmethod
+    def get_n_values(start: float, stop: float, step: float) -> int:
+        """ Number of positions of an actuator going from start to stop (included) by step"""
+        if step == 0:
+            return 1
+        return max(0, int(np.floor((stop - start) / step + 1e-9)) + 1)
+
     @staticmethod
     def pos_above_stops(positions, steps, stops):
         state = []
@@ -170,24 +177,20 @@ class SequentialScanner(ScannerBase):
 
     def set_scan(self):
         starts, stops, steps = self.get_pos()
-        all_positions = [starts.copy()]
-        positions = starts.copy()
-        state = self.pos_above_stops(positions, steps, stops)
-        if len(state) != 0:
-            while not state[0]:
-                if not np.any(np.array(state)):
-                    positions[-1] += steps[-1]
-
-                else:
-                    indexes_true = np.where(np.array(state))
-                    positions[indexes_true[-1][0]] = starts[indexes_true[-1][0]]
-                    positions[indexes_true[-1][0] - 1] += steps[indexes_true[-1][0] - 1]
-
-                state = self.pos_above_stops(positions, steps, stops)
-                if not np.any(np.array(state)):
-                    all_positions.append(positions.copy())
-
-        self.get_info_from_positions(np.array(all_positions))
+        axes_values = []
+        for start, stop, step in zip(starts, stops, steps):
+            if self.pos_above_stops([start], [step], [stop])[0]:
+                axes_values = []  # invalid settings, the scan is reduced to the start positions
+                break
+            axes_values.append(start + np.arange(self.get_n_values(start, stop, step)) * step)
+
+        if len(axes_values) == 0:
+            self.get_info_from_positions(np.array([starts]))
+        else:
+            # the last actuator is the fastest one
+            grids = np.meshgrid(*axes_values, indexing='ij')
+            self.get_info_from_positions(np.stack([grid.ravel() for grid in grids], axis=1),
+                                         axes_unique=[np.sort(values) for values in axes_values])
 
     def get_nav_axes(self) -> List[Axis]:
         return [Axis(label=f'{act.title}', units=act.units, data=self.axes_unique[ind], index=ind)
@@ -14,7 +14,8 @@ from pymodaq_utils.logger import set_logger, get_module_name
 
 from pymodaq_utils import config as configmod
 from pymodaq_gui import utils as gutils
-from ..scan_factory import ScannerFactory, ScannerBase, ScanParameterManager
+from ..scan_factory import ScannerFactory, ScannerBase, ScanParameterManager, AdaptiveScanner
+from ..learners import LearnerCurvilinear
 from pymodaq_gui.parameter import utils as putils
 from pymodaq_gui.parameter.pymodaq_ptypes import TableViewCustom
 from pymodaq.utils.scanner.scan_selector import Selector
@@ -300,3 +301,28 @@ class TabularScannerSubSegmented(TabularScanner):
         coordinates = scan_selector.get_coordinates()
         self.update_model_points(init_data=coordinates)
         self.set_scan()
+
+
+@ScannerFactory.register()
+class TabularScannerAdaptive(AdaptiveScanner, TabularScanner):
+    """ Adaptive scan along the polyline going through the positions of the table: each new position is chosen
+    along the polyline from the already probed values (the selected probe 0D data) so that the points concentrate
+    where the signal varies the most"""
+
+    scan_subtype = 'Adaptive'
+    save_settings = False
+    params = AdaptiveScanner.adaptive_params + TabularScanner.params
+    distribution = DataDistribution['spread']
+    grid_interpolation = False  # the positions lie on a line
+
+    def __init__(self, actuators: List['DAQ_Move']):
+        super().__init__(actuators=actuators)
+
+    def update_model(self, init_data=None):
+        if init_data is None:  # a polyline needs at least two vertices
+            init_data = [[0. for _ in self._actuators], [1. for _ in self._actuators]]
+        super().update_model(init_data=init_data)
+
+    def create_learner(self) -> LearnerCurvilinear:
+        return LearnerCurvilinear(np.array(self.table_model.get_data_all()), loss=self.settings['scan_loss'],
+                                  resolution=self.settings['resolution'])
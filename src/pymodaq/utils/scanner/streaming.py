@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Utilities for streaming (fly) scans: actuators follow a trajectory through the scan positions while detectors acquire
+continuously, each acquired frame is then stored at the scan position nearest to the actuators position at the time
+it was acquired
+"""
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+
+def get_stream_waypoints(positions: np.ndarray, fly_lines=True) -> np.ndarray:
+    """ Get the indexes of the scan positions the actuators should be sent to during a streaming scan
+
+    Parameters
+    ----------
+    positions: np.ndarray
+        The scan positions as an array of shape (Nsteps, Naxes)
+    fly_lines: bool
+        If True, consecutive positions along a straight line (for instance the fast axis of a 2D raster scan) are
+        covered with a single continuous move from the first to the last one. If False, each position is a waypoint
+
+    Returns
+    -------
+    np.ndarray: the increasing indexes of the waypoints within positions
+    """
+    positions = np.asarray(positions, dtype=float).reshape((len(positions), -1))
+    if not fly_lines or len(positions) < 3:
+        return np.arange(len(positions))
+    steps = np.diff(positions, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        directions = steps / np.linalg.norm(steps, axis=1)[:, None]
+    # a position is a waypoint when the direction of motion changes there (or is undefined for repeated positions)
+    corners = np.any(~np.isclose(directions[1:], directions[:-1], atol=1e-9), axis=1)
+    return np.flatnonzero(np.concatenate(([True], corners, [True])))
+
+
+class StreamBinner:
+    """ Assign frames acquired on the fly to the nearest position of a scan
+
+    For each scan position, only the frame acquired the closest to it is kept. Distances are computed on the
+    positions normalized by the scan extent along each axis so that axes with different units are comparable
+
+    Parameters
+    ----------
+    positions: np.ndarray
+        The scan positions as an array of shape (Nsteps, Naxes)
+    """
+
+    def __init__(self, positions: np.ndarray):
+        self._positions = np.asarray(positions, dtype=float).reshape((len(positions), -1))
+        span = np.ptp(self._positions, axis=0)
+        span[span == 0] = 1.
+        self._span = span
+        self._normalized = self._positions / span
+        self.distances = np.full((len(self._positions),), np.inf)
+        self.n_frames = 0
+
+    def reset(self):
+        """ Forget about the assigned frames, for instance before a new averaging pass"""
+        self.distances[:] = np.inf
+        self.n_frames = 0
+
+    @property
+    def n_steps(self) -> int:
+        return len(self._positions)
+
+    @property
+    def n_filled(self) -> int:
+        """ The number of scan positions with an assigned frame"""
+        return int(np.count_nonzero(np.isfinite(self.distances)))
+
+    @property
+    def missing(self) -> np.ndarray:
+        """ The scan indexes without any assigned frame"""
+        return np.flatnonzero(~np.isfinite(self.distances))
+
+    def add(self, readback: np.ndarray) -> Optional[int]:
+        """ Assign a frame acquired at the given actuators readback
+
+        Parameters
+        ----------
+        readback: np.ndarray
+            The actuators values when the frame was acquired, in the order of the scan axes
+
+        Returns
+        -------
+        int or None: the scan index at which the frame should be stored, None if a closer frame is already stored there
+        """
+        self.n_frames += 1
+        readback = np.asarray(readback, dtype=float).reshape((-1,))
+        if np.any(np.isnan(readback)):
+            return None
+        distances = np.sum((self._normalized - readback / self._span) ** 2, axis=1)
+        scan_index = int(np.argmin(distances))
+        if distances[scan_index] < self.distances[scan_index]:
+            self.distances[scan_index] = distances[scan_index]
+            return scan_index
+
+
+class ReadbackInterpolator:
+    """ Estimate the value of a moving actuator at a given time from its last timestamped readbacks
+
+    The readbacks of an actuator are only known at its polling period, the value at the time a frame was acquired is
+    then linearly interpolated between the readbacks around it. A frame more recent than the last readback gets a
+    value extrapolated from the last two readbacks, over one readback interval at most: the error is then bounded by
+    the distance travelled within a polling period at the velocity change between two readbacks, rather than at the
+    full velocity when the last readback is used as is
+
+    Parameters
+    ----------
+    maxlen: int
+        The number of readbacks kept
+    """
+
+    def __init__(self, maxlen: int = 32):
+        self._times = deque(maxlen=maxlen)
+        self._values = deque(maxlen=maxlen)
+
+    def reset(self):
+        self._times.clear()
+        self._values.clear()
+
+    def add(self, timestamp: float, value: float):
+        """ Add a readback of the actuator, the ones older than the last one are ignored"""
+        if len(self._times) > 0 and timestamp <= self._times[-1]:
+            return
+        self._times.append(timestamp)
+        self._values.append(float(value))
+
+    def at(self, timestamp: float) -> float:
+        """ The value of the actuator at the given time, NaN if no readback is known"""
+        if len(self._times) == 0:
+            return np.nan
+        if timestamp <= self._times[0]:
+            return self._values[0]
+        if timestamp >= self._times[-1]:
+            if len(self._times) < 2:
+                return self._values[-1]
+            interval = self._times[-1] - self._times[-2]
+            velocity = (self._values[-1] - self._values[-2]) / interval
+            return self._values[-1] + velocity * min(timestamp - self._times[-1], interval)
+        return float(np.interp(timestamp, self._times, self._values))
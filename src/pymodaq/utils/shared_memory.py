@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Ring buffer of fixed size slots in a shared memory block, used to pass frames from one process to another without
+serializing their arrays: the arrays are copied once into a slot by the producer and read back as numpy views by the
+consumer
+"""
+import gc
+from multiprocessing.shared_memory import SharedMemory
+import pickle
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from pymodaq_utils.logger import set_logger, get_module_name
+
+logger = set_logger(get_module_name(__file__))
+
+ALIGNMENT = 64  # bytes, each buffer within a slot starts on a cache line
+HEADER_SIZE = ALIGNMENT
+
+Frame = Tuple[bytes, Optional[int], List[Tuple[int, int]]]
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+class SharedMemoryRing:
+    """ Single producer, single consumer ring of frames in a shared memory block
+
+    Objects are pickled with the protocol 5: their large contiguous buffers (numpy arrays) are taken out of band and
+    copied into the next free slot, only the remaining small pickle and the location of the buffers (see Frame)
+    having to be sent to the consumer by another mean (a Pipe for instance). The consumer rebuilds the objects with
+    read-only numpy views on the slot and has to release each slot, in order, once done with it.
+
+    The block starts with two int64 counters: the number of frames written by the producer and the number of frames
+    released by the consumer, each one being modified only by one side. An object too large for a slot is pickled
+    in band (its Frame has no slot)
+
+    Parameters
+    ----------
+    n_slots: int
+        The number of frames that can be in flight between the producer and the consumer
+    slot_size: int
+        The maximum size in bytes of the buffers of a frame
+    name: str
+        The name of an existing ring to attach to from a child process of its creator (on the producer side for
+        instance), if None a new shared memory block is created
+    """
+
+    def __init__(self, n_slots: int = 4, slot_size: int = 2 ** 25, name: str = None):
+        self.n_slots = n_slots
+        self.slot_size = _aligned(slot_size)
+        size = HEADER_SIZE + self.n_slots * self.slot_size
+        self._owner = name is None
+        if self._owner:
+            self._shm = SharedMemory(create=True, size=size)
+        else:
+            self._shm = SharedMemory(name=name)
+        self._counters = np.ndarray((2,), dtype=np.int64, buffer=self._shm.buf)
+        if self._owner:
+            self._counters[:] = 0
+        self._views: List[List[memoryview]] = [[] for _ in range(self.n_slots)]  # exported by get, per slot
+        self._unreleased: List[memoryview] = []  # views of released slots still used by living objects
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def n_written(self) -> int:
+        return int(self._counters[0])
+
+    @property
+    def n_released(self) -> int:
+        return int(self._counters[1])
+
+    @property
+    def n_free(self) -> int:
+        """The number of slots available to the producer"""
+        return self.n_slots - (self.n_written - self.n_released)
+
+    def _slot_offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * self.slot_size
+
+    def put(self, obj: Any) -> Optional[Frame]:
+        """ Copy the buffers of an object into the next free slot (producer side)
+
+        Returns
+        -------
+        Frame: the pickled object without its buffers, the slot used and the (offset, size) of each buffer within the
+        slot. None if there is no free slot, the object being then dropped
+        """
+        buffers: List[pickle.PickleBuffer] = []
+        meta = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+        raws = [buffer.raw() for buffer in buffers]
+        if sum([_aligned(raw.nbytes) for raw in raws]) > self.slot_size:
+            logger.warning(f'An object of {sum([raw.nbytes for raw in raws])} bytes does not fit in the '
+                           f'{self.slot_size} bytes slots of the ring, it is pickled in band')
+            return pickle.dumps(obj, protocol=5), None, []
+        if self.n_free <= 0:
+            return None
+        written = self.n_written
+        slot = written % self.n_slots
+        offset = 0
+        spans = []
+        start = self._slot_offset(slot)
+        for raw in raws:
+            self._shm.buf[start + offset: start + offset + raw.nbytes] = raw
+            spans.append((offset, raw.nbytes))
+            offset += _aligned(raw.nbytes)
+        self._counters[0] = written + 1  # published once the slot is filled
+        return meta, slot, spans
+
+    def get(self, frame: Frame) -> Any:
+        """ Rebuild an object from a Frame (consumer side)
+
+        The numpy arrays of the returned object are read-only views on the slot, only valid until the slot is
+        released, see release
+        """
+        meta, slot, spans = frame
+        if slot is None:
+            return pickle.loads(meta)
+        start = self._slot_offset(slot)
+        views = []
+        for offset, size in spans:
+            with self._shm.buf[start + offset: start + offset + size] as view:
+                views.append(view.toreadonly())
+        self._views[slot].extend(views)
+        return pickle.loads(meta, buffers=views)
+
+    @staticmethod
+    def _release_views(views: List[memoryview]) -> List[memoryview]:
+        """Release the views no more used by any object, returns the others"""
+        unreleased = []
+        for view in views:
+            try:
+                view.release()
+            except BufferError:
+                unreleased.append(view)
+        return unreleased
+
+    def release(self, frame: Frame):
+        """ Give the slot of a Frame back to the producer, to be called in the order the frames were received"""
+        slot = frame[1]
+        if slot is not None:
+            self._unreleased = self._release_views(self._unreleased) + self._release_views(self._views[slot])
+            self._views[slot] = []
+            self._counters[1] += 1
+
+    def close(self):
+        """ Detach from the shared memory block, which is freed if this ring is its owner
+
+        The block can only be unmapped once all the objects obtained from get are deleted, the ones in reference
+        cycles being collected first. If some are still alive, it stays mapped until the process ends (a warning is
+        logged), its name being unlinked anyway
+        """
+        self._counters = None
+        views = self._unreleased + [view for views in self._views for view in views]
+        self._views = [[] for _ in range(self.n_slots)]
+        self._unreleased = self._release_views(views)
+        try:
+            self._shm.close()
+        except BufferError:
+            gc.collect()  # the arrays obtained from get may be referenced by collectable cycles only
+            self._unreleased = self._release_views(self._unreleased)
+            try:
+                self._shm.close()
+            except BufferError as e:
+                logger.warning(f'The shared memory {self._shm.name} stays mapped, arrays obtained from it being still'
+                               f' in use: {str(e)}')
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError as e:
+                logger.warning(f'Could not free the shared memory {self._shm.name}: {str(e)}')
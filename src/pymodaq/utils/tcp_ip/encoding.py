@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Encoding (compression and delta with the previous frame) of the serialized data frames exchanged between a TCPClient
+and a TCPServer, see pymodaq.utils.tcp_ip.tcp_server_client for the negotiation of the encoding of a connection
+"""
+import struct
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from pymodaq_utils.serialize.mysocket import Socket
+
+
+ENCODINGS = ['none', 'zlib', 'lz4', 'zstd']
+DELTA_SUFFIX = '+delta'
+
+_HEADER = struct.Struct('<Bf')  # delta flag of the frame and its encoding time in ms
+
+
+def _get_lz4() -> Optional[Tuple[Callable, Callable]]:
+    try:
+        import lz4.frame
+        return lz4.frame.compress, lz4.frame.decompress
+    except ImportError:
+        return None
+
+
+def _get_zstd() -> Optional[Tuple[Callable, Callable]]:
+    for module_name in ('compression.zstd', 'backports.zstd'):  # the standard library one from python 3.14
+        try:
+            module = __import__(module_name, fromlist=['zstd'])
+            return lambda data: module.compress(data, level=1), module.decompress
+        except ImportError:
+            pass
+    try:
+        import zstandard
+        return (lambda data: zstandard.ZstdCompressor(level=1).compress(data),
+                lambda data: zstandard.ZstdDecompressor().decompress(data))
+    except ImportError:
+        return None
+
+
+def _get_codecs() -> Dict[str, Tuple[Callable, Callable]]:
+    codecs = dict(none=(bytes, bytes),
+                  zlib=(lambda data: zlib.compress(data, 1), zlib.decompress))
+    for name, getter in (('lz4', _get_lz4), ('zstd', _get_zstd)):
+        codec = getter()
+        if codec is not None:
+            codecs[name] = codec
+    return codecs
+
+
+_CODECS = _get_codecs()
+
+
+def available_encodings() -> List[str]:
+    """The names of the encodings whose package is installed, in the ENCODINGS order"""
+    return [name for name in ENCODINGS if name in _CODECS]
+
+
+def format_encoding(name: str, delta: bool = False) -> str:
+    """The string identifying an encoding, for instance 'zlib' or 'zstd+delta'"""
+    return f'{name}{DELTA_SUFFIX}' if delta else name
+
+
+def parse_encoding(encoding: str) -> Tuple[str, bool]:
+    """Get the name and the delta flag from an encoding string, see format_encoding"""
+    delta = encoding.endswith(DELTA_SUFFIX)
+    name = encoding[:-len(DELTA_SUFFIX)] if delta else encoding
+    if name not in ENCODINGS:
+        raise ValueError(f'Unknown encoding {name}, should be one of {ENCODINGS}')
+    return name, delta
+
+
+def choose_encoding(requested: List[str]) -> str:
+    """The first of the requested encodings available here, 'none' if there is none"""
+    for encoding in requested:
+        try:
+            name, delta = parse_encoding(encoding)
+        except ValueError:
+            continue
+        if name in _CODECS:
+            return format_encoding(name, delta)
+    return 'none'
+
+
+def receive_bytes(sock: Socket, length: int) -> bytes:
+    """Read length bytes from a socket directly into a preallocated buffer (no concatenation of the chunks)"""
+    buffer = bytearray(length)
+    view = memoryview(buffer)
+    received = 0
+    while received < length:
+        n_bytes = sock.socket.recv_into(view[received:], length - received)
+        if n_bytes == 0:
+            raise ConnectionError('socket closed while receiving a frame')
+        received += n_bytes
+    return bytes(buffer)
+
+
+class FrameCodec:
+    """ Encode or decode the successive serialized frames of a connection
+
+    Each encoded frame is made of a header (the delta flag and the encoding time) followed by the compressed bytes.
+    With delta, a frame having the same length as the previous one is replaced by its bytewise XOR with it before
+    compression: the bytes that did not change become zeros, which compress very well for slowly varying frames.
+    The frames must then be decoded in the order they were encoded, which a TCP connection ensures.
+
+    Parameters
+    ----------
+    encoding: str
+        One of the available_encodings, optionally with the delta suffix, see format_encoding
+
+    Attributes
+    ----------
+    n_frames: int
+        The number of frames encoded or decoded
+    raw_bytes: int
+        The total size of these frames before encoding
+    encoded_bytes: int
+        The total size of these frames once encoded
+    encode_time: float
+        The total time (in ms) spent encoding these frames (by the peer for decoded frames)
+    decode_time: float
+        The total time (in ms) spent decoding these frames
+    """
+
+    def __init__(self, encoding: str = 'none'):
+        self.name, self.delta = parse_encoding(encoding)
+        if self.name not in _CODECS:
+            raise ValueError(f'The {self.name} encoding is not installed, available ones are'
+                             f' {available_encodings()}')
+        self._compress, self._decompress = _CODECS[self.name]
+        self._previous: Optional[np.ndarray] = None
+        self._buffer: Optional[np.ndarray] = None
+        self.n_frames = 0
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self.encode_time = 0.
+        self.decode_time = 0.
+
+    @property
+    def encoding(self) -> str:
+        return format_encoding(self.name, self.delta)
+
+    @property
+    def compression_ratio(self) -> float:
+        """The ratio between the sizes of the frames before and after encoding"""
+        return self.raw_bytes / self.encoded_bytes if self.encoded_bytes > 0 else 1.
+
+    @property
+    def mean_encode_time(self) -> float:
+        """The mean encoding time of a frame in ms"""
+        return self.encode_time / self.n_frames if self.n_frames > 0 else 0.
+
+    @property
+    def mean_decode_time(self) -> float:
+        """The mean decoding time of a frame in ms"""
+        return self.decode_time / self.n_frames if self.n_frames > 0 else 0.
+
+    def _keep(self, frame: np.ndarray):
+        """Keep a frame as the reference of the next delta, reusing the arrays if the length did not change"""
+        if self._previous is None or len(self._previous) != len(frame):
+            self._previous = frame.copy()
+            self._buffer = np.empty_like(frame)
+        else:
+            np.copyto(self._previous, frame)
+
+    def encode(self, raw: bytes) -> bytes:
+        """Encode a serialized frame"""
+        tstart = time.perf_counter()
+        is_delta = False
+        data = raw
+        if self.delta:
+            frame = np.frombuffer(raw, dtype=np.uint8)
+            if self._previous is not None and len(self._previous) == len(frame):
+                np.bitwise_xor(frame, self._previous, out=self._buffer)
+                data = self._buffer
+                is_delta = True
+            self._keep(frame)
+        payload = self._compress(data)
+        encode_time = (time.perf_counter() - tstart) * 1000
+        self.n_frames += 1
+        self.raw_bytes += len(raw)
+        self.encoded_bytes += len(payload) + _HEADER.size
+        self.encode_time += encode_time
+        return _HEADER.pack(is_delta, encode_time) + payload
+
+    def decode(self, encoded: bytes) -> bytes:
+        """Decode a frame encoded by the FrameCodec of the peer, returns the serialized frame"""
+        tstart = time.perf_counter()
+        is_delta, encode_time = _HEADER.unpack_from(encoded)
+        data = self._decompress(memoryview(encoded)[_HEADER.size:])
+        if is_delta:
+            if self._previous is None or len(self._previous) != len(data):
+                raise ValueError('Delta frame received without the frame it refers to')
+            np.bitwise_xor(np.frombuffer(data, dtype=np.uint8), self._previous, out=self._previous)
+            raw = self._previous.tobytes()
+        else:
+            raw = bytes(data)
+            if self.delta:
+                self._keep(np.frombuffer(raw, dtype=np.uint8))
+        self.n_frames += 1
+        self.raw_bytes += len(raw)
+        self.encoded_bytes += len(encoded)
+        self.encode_time += encode_time
+        self.decode_time += (time.perf_counter() - tstart) * 1000
+        return raw
@@ -4,18 +4,20 @@ Created on Fri Aug 30 12:21:56 2019
 
 @author: Weber
 """
-from collections import OrderedDict
+from collections import OrderedDict, deque
 import select
-from typing import List
+from typing import Any, Callable, Deque, List
 import socket
-from threading import Timer
+from threading import Condition, Event, Lock, Thread, Timer
+from time import perf_counter
 
 import numpy as np
-from qtpy.QtCore import QObject, Signal, Slot, QThread
+from qtpy.QtCore import QObject, Signal, Slot, QThread, QSocketNotifier
 from qtpy import QtWidgets
 
 
 from pymodaq_utils.utils import getLineInfo, ThreadCommand
+from pymodaq_utils.logger import set_logger, get_module_name
 from pymodaq_utils import math_utils as mutils
 from pymodaq_utils.config import Config
 from pymodaq_gui.parameter import utils as putils
@@ -26,19 +28,199 @@ from pymodaq_data.data import DataToExport
 from pymodaq.utils.data import DataFromPlugins, DataActuator
 from pymodaq_utils.serialize.mysocket import Socket
 from pymodaq_utils.serialize.serializer_legacy import Serializer, DeSerializer
+from pymodaq_utils.serialize.utils import int_to_bytes
 from pymodaq_gui.managers.parameter_manager import ParameterManager
 
+from pymodaq.utils.tcp_ip.encoding import (ENCODINGS, FrameCodec, available_encodings, choose_encoding,
+                                           format_encoding, parse_encoding, receive_bytes)
+
+logger = set_logger(get_module_name(__file__))
 config = Config()
 
+# Negotiation of the encoding of the data frames sent by a client, each message being a single string so that a peer
+# not knowing them ignores it: the client requests '<ENCODING_MESSAGE>:<encoding>,<fallback encoding>,...', the
+# server replies '<ENCODING_MESSAGE>:<chosen encoding>' and the client then sends its data frames as
+# ENCODED_DATA_MESSAGE followed by the length and the bytes of the encoded frame. Without reply (server not knowing
+# the negotiation), the frames are sent as before with the 'Done' message
+ENCODING_MESSAGE = 'Encoding'
+ENCODED_DATA_MESSAGE = 'Done_encoded'
+
 tcp_parameters = [
     {'title': 'Port:', 'name': 'port_id', 'type': 'int', 'value': config('network', 'tcp-server', 'port'), },
     {'title': 'IP:', 'name': 'socket_ip', 'type': 'str', 'value': config('network', 'tcp-server', 'ip'), },
     {'title': 'Settings PyMoDAQ Client:', 'name': 'settings_client', 'type': 'group', 'children': []},
     {'title': 'Infos Client:', 'name': 'infos', 'type': 'group', 'children': []},
+    {'title': 'Data encoding:', 'name': 'encoding', 'type': 'group', 'expanded': False, 'children': [
+        {'title': 'Available:', 'name': 'available', 'type': 'str', 'value': ', '.join(available_encodings()),
+         'readonly': True, 'tip': 'Encodings a client can negotiate, with or without delta'},
+        {'title': 'Negotiated:', 'name': 'negotiated', 'type': 'str', 'value': 'none', 'readonly': True},
+        {'title': 'Compression ratio:', 'name': 'compression_ratio', 'type': 'float', 'value': 1.,
+         'readonly': True},
+        {'title': 'Encode time (ms):', 'name': 'encode_time', 'type': 'float', 'value': 0., 'readonly': True,
+         'tip': 'Mean time spent by the client encoding a frame'},
+        {'title': 'Decode time (ms):', 'name': 'decode_time', 'type': 'float', 'value': 0., 'readonly': True,
+         'tip': 'Mean time spent by the server decoding a frame'},
+    ]},
     {'title': 'Connected clients:', 'name': 'conn_clients', 'type': 'table',
      'value': dict(), 'header': ['Type', 'adress']}, ]
 
 
+SEND_POLICIES = ['block', 'drop_oldest', 'drop_newest']
+
+
+class SendQueue:
+    """ Bounded queue of items (the data frames of a TCPClient) sent by a dedicated thread
+
+    So that the producer of the items does not wait for the network. When the queue is full, a new item is handled
+    according to the policy:
+
+    * block: the caller waits for a free slot (backpressure, no item is lost)
+    * drop_oldest: the oldest waiting item is dropped to make room, the freshest items are sent
+    * drop_newest: the new item is dropped, the waiting ones are sent
+
+    Parameters
+    ----------
+    send: Callable[[Any], None]
+        the function actually sending an item
+    maxsize: int
+        maximum number of items waiting to be sent
+    policy: str
+        one of SEND_POLICIES
+    on_dropped: Callable[[int], None]
+        if given, called from the thread of the queue with n_dropped whenever items were dropped (queue full, failed
+        send or cleared by stop), at most once every report_period
+    report_period: float
+        minimum time in seconds between two calls of on_dropped
+
+    Attributes
+    ----------
+    n_queued: int
+        the number of items put in the queue
+    n_sent: int
+        the number of items sent
+    n_dropped: int
+        the number of items dropped because the queue was full or their sending failed
+    """
+
+    def __init__(self, send: Callable[[Any], None], maxsize: int = 4, policy: str = 'block',
+                 on_dropped: Callable[[int], None] = None, report_period: float = 0.5):
+        if policy not in SEND_POLICIES:
+            raise ValueError(f'Unknown send policy {policy}, should be one of {SEND_POLICIES}')
+        self._send = send
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self._on_dropped = on_dropped
+        self.report_period = report_period
+        self._n_reported = 0
+        self._reported_at = 0.
+        self._items: Deque[Any] = deque([])
+        self._condition = Condition()
+        self._sending = False
+        self._stop_event = Event()  # one per started thread, a stopped thread may still be finishing its send
+        self._thread: Thread = None
+        self.n_queued = 0
+        self.n_sent = 0
+        self.n_dropped = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self._stop_event = Event()
+            self._thread = Thread(target=self._run, args=(self._stop_event,), name='TCPSendQueue', daemon=True)
+            self._thread.start()
+
+    def put(self, item) -> int:
+        """Queue an item to be sent, returns the number of items dropped to do so (0 or 1)"""
+        dropped = 0
+        with self._condition:
+            if len(self._items) >= self.maxsize:
+                if self.policy == 'block':
+                    self._condition.wait_for(lambda: len(self._items) < self.maxsize or self._stop_event.is_set())
+                elif self.policy == 'drop_oldest':
+                    self._items.popleft()
+                    dropped = 1
+                else:
+                    self.n_dropped += 1
+                    return 1
+            if self._stop_event.is_set():
+                self.n_dropped += 1
+                return 1
+            self.n_dropped += dropped
+            self._items.append(item)
+            self.n_queued += 1
+            self._condition.notify_all()
+        return dropped
+
+    def join(self, timeout: float = None) -> bool:
+        """Wait until all the queued items have been sent, returns False if the timeout expired before"""
+        with self._condition:
+            return self._condition.wait_for(lambda: len(self._items) == 0 and not self._sending, timeout)
+
+    def stop(self, timeout: float = 1.):
+        """Stop the thread once the items being queued are sent (or the timeout expired), the others are dropped"""
+        if self.running:
+            self.join(timeout)
+            with self._condition:
+                self._stop_event.set()
+                self.n_dropped += len(self._items)
+                self._items.clear()
+                self._condition.notify_all()
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _report_dropped(self, n_dropped: int, force=False):
+        """Call on_dropped if items were dropped since the last call, not more often than report_period"""
+        if self._on_dropped is None or n_dropped == self._n_reported:
+            return
+        if not force and perf_counter() - self._reported_at < self.report_period:
+            return
+        self._n_reported = n_dropped
+        self._reported_at = perf_counter()
+        try:
+            self._on_dropped(n_dropped)
+        except Exception as e:
+            logger.exception(str(e))
+
+    def _run(self, stop_event: Event):
+        while True:
+            with self._condition:
+                # wake up at the report period while dropped items have not been reported
+                self._condition.wait_for(lambda: len(self._items) > 0 or stop_event.is_set(),
+                                         self.report_period if self.n_dropped != self._n_reported else None)
+                n_dropped = self.n_dropped
+                stopped = stop_event.is_set()
+                has_item = not stopped and len(self._items) > 0
+                if has_item:
+                    item = self._items.popleft()
+                    self._sending = True
+                    self._condition.notify_all()  # a slot is free for a blocked put
+            self._report_dropped(n_dropped, force=stopped)
+            if stopped:
+                break
+            if not has_item:
+                continue
+            sent = False
+            try:
+                self._send(item)
+                sent = True
+            except Exception as e:
+                logger.exception(str(e))
+            finally:
+                with self._condition:
+                    if sent:
+                        self.n_sent += 1
+                    else:
+                        self.n_dropped += 1
+                    self._sending = False
+                    self._condition.notify_all()
+
+
 class TCPClientTemplate:
     def __init__(self, ipaddress="192.168.1.62", port=6341, client_type=""):
         """Create a socket client
@@ -161,7 +343,7 @@ class TCPClient(TCPClientTemplate, QObject):
     params = []
 
     def __init__(self, ipaddress="192.168.1.62", port=6341, params_state=None,
-                 client_type="GRABBER"):
+                 client_type="GRABBER", encoding='none', send_policy='block', send_queue_size=4):
         """Create a socket client particularly fit to be used with PyMoDAQ's TCPServer
 
         Parameters
@@ -173,9 +355,18 @@ class TCPClient(TCPClientTemplate, QObject):
                             instance of Parameter object, see pyqtgraph.parametertree::Parameter
         client_type: (str) should be one of the accepted client_type by the TCPServer instance (within pymodaq it is
                             either 'GRABBER' or 'ACTUATOR'
+        encoding: (str) the encoding of the data frames to negotiate with the server at connection, one of
+                            ENCODINGS optionally with the delta suffix, for instance 'zstd+delta'
+        send_policy: (str) what to do with a new data frame when the send queue is full, one of SEND_POLICIES
+        send_queue_size: (int) the maximum number of data frames waiting to be sent
         """
         QObject.__init__(self)
         TCPClientTemplate.__init__(self, ipaddress, port, client_type)
+        self.encoding = encoding
+        self._codec: FrameCodec = None
+        self._send_lock = Lock()  # the frames are sent from the thread of the send queue
+        self._send_queue = SendQueue(self._send_frame, send_queue_size, send_policy,
+                                     on_dropped=self._frames_dropped)
 
         self.settings = Parameter.create(name='Settings', type='group', children=self.params)
         if params_state is not None:
@@ -184,26 +375,88 @@ class TCPClient(TCPClientTemplate, QObject):
             elif isinstance(params_state, Parameter):
                 self.settings.restoreState(params_state.saveState())
 
+    def _send(self, *objects):
+        """Serialize and send objects as one message, not interleaved with a data frame being sent"""
+        with self._send_lock:
+            for obj in objects:
+                self.socket.check_sended_with_serializer(obj)
+
+    def _send_frame(self, data: DataToExport):
+        """Send a data frame (serialized and encoded before taking the lock)"""
+        if self.socket is None:
+            return
+        if self._codec is None:
+            frame = Serializer(data).to_bytes()
+            with self._send_lock:
+                self.socket.check_sended_with_serializer('Done')
+                self.socket.check_sended(frame)
+        else:
+            frame = self._codec.encode(Serializer(data).to_bytes())
+            with self._send_lock:
+                self.socket.check_sended_with_serializer(ENCODED_DATA_MESSAGE)
+                self.socket.check_sended(int_to_bytes(len(frame)))
+                self.socket.check_sended(frame)
+
     def send_data(self, data: DataToExport):
-        # first send 'Done' and then send the length of the list
+        """Send a data frame, through the send queue once connected so that the caller does not wait for the
+        network"""
+        # first send 'Done' and then send the serialized DataToExport
         if not isinstance(data, DataToExport):
             raise TypeError(f'should send a DataToExport object')
         if self.socket is not None:
-            self.socket.check_sended_with_serializer('Done')
-            self.socket.check_sended_with_serializer(data)
+            if self._send_queue.running:
+                self._send_queue.put(data)
+            else:
+                self._send_frame(data)
+
+    def _frames_dropped(self, n_dropped: int):
+        """Called from the thread of the send queue with the number of frames it dropped"""
+        self.cmd_signal.emit(ThreadCommand('frames_dropped', [n_dropped]))
+
+    @property
+    def send_queue(self) -> SendQueue:
+        """The queue of the data frames to be sent, with the counters of the queued, sent and dropped frames"""
+        return self._send_queue
+
+    def close(self):
+        self._send_queue.stop()
+        super().close()
+
+    @property
+    def codec(self) -> FrameCodec:
+        """The codec of the data frames negotiated with the server, None if they are sent as is"""
+        return self._codec
+
+    def get_requested_encodings(self) -> List[str]:
+        """The encoding of this client then the other installed compressions (best first) as fallbacks"""
+        name, delta = parse_encoding(self.encoding)
+        if name == 'none' and not delta:
+            return []
+        fallbacks = [other for other in reversed(ENCODINGS) if other != name]
+        return [format_encoding(other, delta) for other in [name] + fallbacks if other in available_encodings()]
+
+    def request_encoding(self):
+        """Ask the server to negotiate the encoding of the data frames, these are sent as is until it replies"""
+        self._codec = None
+        requested = self.get_requested_encodings()
+        if self.socket is not None and len(requested) > 0:
+            self._send(f'{ENCODING_MESSAGE}:{",".join(requested)}')
+
+    def set_encoding(self, encoding: str):
+        """Encode the next data frames as negotiated with the server"""
+        self._codec = None if encoding == 'none' else FrameCodec(encoding)
+        self.cmd_signal.emit(ThreadCommand('Update_Status', [f'Data frames sent encoded with: {encoding}', 'log']))
 
     def send_infos_xml(self, infos: str):
         if self.socket is not None:
-            self.socket.check_sended_with_serializer('Infos')
-            self.socket.check_sended_with_serializer(infos)
+            self._send('Infos', infos)
 
     def send_info_string(self, info_to_display, value_as_string):
         if self.socket is not None:
-            self.socket.check_sended_with_serializer('Info')
-            self.socket.check_sended_with_serializer(info_to_display)  # the actual info to display as a string
             if not isinstance(value_as_string, str):
                 value_as_string = str(value_as_string)
-            self.socket.check_sended_with_serializer(value_as_string)
+            # the actual info to display as a string then its value
+            self._send('Info', info_to_display, value_as_string)
 
     @Slot(ThreadCommand)
     def queue_command(self, command=ThreadCommand):
@@ -217,7 +470,7 @@ class TCPClient(TCPClientTemplate, QObject):
 
         elif command.command == "quit":
             try:
-                self.socket.close()
+                self.close()
             except Exception as e:
                 pass
             finally:
@@ -235,22 +488,17 @@ class TCPClient(TCPClientTemplate, QObject):
                 path = command.attribute['path']
                 param = command.attribute['param']
 
-                self.socket.check_sended_with_serializer('Info_xml')
-                self.socket.check_sended_with_serializer(path)
-
-                # send value
+                # send the path then the value
                 data = ioxml.parameter_to_xml_string(param)
-                self.socket.check_sended_with_serializer(data)
+                self._send('Info_xml', path, data)
 
         elif command.command == 'position_is':
             if self.socket is not None:
-                self.socket.check_sended_with_serializer('position_is')
-                self.socket.check_sended_with_serializer(command.attribute)
+                self._send('position_is', command.attribute)
 
         elif command.command == 'move_done':
             if self.socket is not None:
-                self.socket.check_sended_with_serializer('move_done')
-                self.socket.check_sended_with_serializer(command.attribute)
+                self._send('move_done', command.attribute)
 
         elif command.command == 'x_axis':
             raise DeprecationWarning('Getting axis though TCPIP is deprecated use the data objects directly')
@@ -274,12 +522,14 @@ class TCPClient(TCPClientTemplate, QObject):
 
     def ready_with_error(self):
         self.connected = False
+        self._send_queue.stop(timeout=0)
         self.cmd_signal.emit(ThreadCommand('disconnected'))
 
     def process_error_in_polling(self, e: Exception):
         try:
             self.cmd_signal.emit(ThreadCommand('Update_Status', [getLineInfo() + str(e), 'log']))
-            self.socket.check_sended_with_serializer('Quit')
+            self._send_queue.stop(timeout=0)
+            self._send('Quit')
             self.socket.close()
         except Exception:  # pragma: no cover
             pass
@@ -287,9 +537,11 @@ class TCPClient(TCPClientTemplate, QObject):
     def post_init(self, extra_commands=[]):
 
         self.cmd_signal.emit(ThreadCommand('connected'))
-        self.socket.check_sended_with_serializer(self.client_type)
+        self._send(self.client_type)
 
         self.send_infos_xml(ioxml.parameter_to_xml_string(self.settings))
+        self.request_encoding()
+        self._send_queue.start()
         for command in extra_commands:
             if isinstance(command, ThreadCommand):
                 self.cmd_signal.emit(command)
@@ -306,6 +558,9 @@ class TCPClient(TCPClientTemplate, QObject):
 
         """
         if self.socket is not None:
+            if message.startswith(f'{ENCODING_MESSAGE}:'):  # reply of the server to request_encoding
+                self.set_encoding(message.split(':', 1)[1])
+                return
             messg = ThreadCommand(message)
 
             if message == 'set_info':
@@ -326,6 +581,10 @@ class TCPClient(TCPClientTemplate, QObject):
 class TCPServer(QObject):
     """
     Abstract class to be used as inherited by DAQ_Viewer_TCP or DAQ_Move_TCP
+
+    Incoming connections and messages are handled as soon as they arrive: each socket (the server one and the
+    connected clients) is watched by a QSocketNotifier living in the thread of this object, so there is no polling
+    timer and no per message latency.
     """
 
     def __init__(self, client_type='GRABBER'):
@@ -335,6 +594,9 @@ class TCPServer(QObject):
         self.listening = True
         self.processing = False
         self.client_type = client_type
+        self._socket_notifiers = dict([])
+        self._client_codecs = dict([])  # the FrameCodec of the clients having negotiated an encoding
+        self._encoded_frame = False  # if the data being read have been sent encoded
 
     def close_server(self):
         """
@@ -369,27 +631,37 @@ class TCPServer(QObject):
         self.serversocket.listen(1)
         self.connected_clients.append(dict(socket=self.serversocket, type='server'))
         self.settings.child('conn_clients').setValue(self.set_connected_clients_table())
-
-        self.timer = self.startTimer(100)  # Timer event fired every 100ms
-        # self.listen_client()
-
-    def timerEvent(self, event):
-        """
-            Called by set timers.
-            If the process is free, start the listen_client function.
-
-            =============== ==================== ==============================================
-            **Parameters**   **Type**              **Description**
-
-            *event*          QTimerEvent object    Containing id from timer issuing this event
-            =============== ==================== ==============================================
-
-            See Also
-            --------
-            listen_client
-        """
-        if not self.processing:
-            self.listen_client()
+        self.add_socket_notifier(self.serversocket)
+
+    def add_socket_notifier(self, sock: Socket):
+        """Watch a socket so that it is processed as soon as it is readable (new connection or incoming message)"""
+        notifier = QSocketNotifier(sock.socket.fileno(), QSocketNotifier.Read)  # no parent, see remove_socket_notifier
+        notifier.activated.connect(lambda *args, sock=sock: self.socket_activated(sock))
+        self._socket_notifiers[sock.socket] = notifier
+
+    def remove_socket_notifier(self, sock: Socket):
+        notifier: QSocketNotifier = self._socket_notifiers.pop(sock.socket, None)
+        if notifier is not None:
+            notifier.setEnabled(False)
+            # deleted later as it may be the one being activated, the server itself could be destroyed before
+            notifier.deleteLater()
+
+    def socket_activated(self, sock: Socket):
+        """Slot called by the QSocketNotifier of a given socket when it is readable"""
+        if self.processing:
+            return
+        notifier = self._socket_notifiers.get(sock.socket, None)
+        if notifier is not None:
+            notifier.setEnabled(False)  # no reentrance while the message is read
+        try:
+            self.processing = True
+            self.process_socket(sock)
+        except Exception as e:
+            self.emit_status(ThreadCommand("Update_Status", [str(e), 'log']))
+        finally:
+            self.processing = False
+            if sock.socket in self._socket_notifiers:
+                self._socket_notifiers[sock.socket].setEnabled(True)
 
     def find_socket_within_connected_clients(self, client_type) -> Socket:
         """
@@ -459,6 +731,9 @@ class TCPServer(QObject):
     def remove_client(self, sock):
         sock_type = self.find_socket_type_within_connected_clients(sock)
         if sock_type is not None:
+            self.remove_socket_notifier(sock)
+            if self._client_codecs.pop(sock.socket, None) is not None and len(self._client_codecs) == 0:
+                self.settings.child('encoding', 'negotiated').setValue('none')
             self.connected_clients.remove(dict(socket=sock, type=sock_type))
             self.settings.child('conn_clients').setValue(self.set_connected_clients_table())
             try:
@@ -498,10 +773,12 @@ class TCPServer(QObject):
         """
             Server function.
             Used to connect or listen incoming message from a client.
+
+            Process once all the sockets readable at the time of the call. Not needed in normal operation as
+            sockets are processed as soon as they are readable, see socket_activated
         """
         try:
             self.processing = True
-            # QtWidgets.QApplication.processEvents() #to let external commands in
             read_sockets, write_sockets, error_sockets = self.select(
                 [client['socket'] for client in self.connected_clients], [],
                 [client['socket'] for client in self.connected_clients],
@@ -510,42 +787,79 @@ class TCPServer(QObject):
                 self.remove_client(sock)
 
             for sock in read_sockets:
-                QThread.msleep(100)
-                if sock == self.serversocket:  # New connection
-                    # means a new socket (client) try to reach the server
-                    (client_socket, address) = self.serversocket.accept()
-                    DAQ_type = DeSerializer(client_socket).string_deserialization()
-                    if DAQ_type not in self.socket_types:
-                        self.emit_status(ThreadCommand("Update_Status", [DAQ_type + ' is not a valid type', 'log']))
-                        client_socket.close()
-                        break
-
-                    self.connected_clients.append(dict(socket=client_socket, type=DAQ_type))
-                    self.settings.child('conn_clients').setValue(self.set_connected_clients_table())
-                    self.emit_status(ThreadCommand("Update_Status",
-                                                   [DAQ_type + ' connected with ' + address[0] + ':' + str(address[1]),
-                                                    'log']))
-                    QtWidgets.QApplication.processEvents()
-
-                else:  # Some incoming message from a client
-                    # Data received from client, process it
-                    try:
-                        message = DeSerializer(sock).string_deserialization()
-                        if message in ['Done', 'Info', 'Infos', 'Info_xml', 'position_is', 'move_done']:
-                            self.process_cmds(message, command_sock=None)
-                        elif message == 'Quit':
-                            raise Exception("socket disconnect by user")
-                        else:
-                            self.process_cmds(message, command_sock=sock)
-
-                    # client disconnected, so remove from socket list
-                    except Exception as e:
-                        self.remove_client(sock)
-
-            self.processing = False
+                self.process_socket(sock)
 
         except Exception as e:
             self.emit_status(ThreadCommand("Update_Status", [str(e), 'log']))
+        finally:
+            self.processing = False
+
+    def process_socket(self, sock: Socket):
+        """Accept a new connection if sock is the server socket, else read and process the incoming message"""
+        if sock == self.serversocket:  # New connection
+            # means a new socket (client) try to reach the server
+            (client_socket, address) = self.serversocket.accept()
+            client_socket = Socket(client_socket.socket)  # accept returns the base Socket, without serializer
+            DAQ_type = DeSerializer(client_socket).string_deserialization()
+            if DAQ_type not in self.socket_types:
+                self.emit_status(ThreadCommand("Update_Status", [DAQ_type + ' is not a valid type', 'log']))
+                client_socket.close()
+                return
+
+            self.connected_clients.append(dict(socket=client_socket, type=DAQ_type))
+            self.add_socket_notifier(client_socket)
+            self.settings.child('conn_clients').setValue(self.set_connected_clients_table())
+            self.emit_status(ThreadCommand("Update_Status",
+                                           [DAQ_type + ' connected with ' + address[0] + ':' + str(address[1]),
+                                            'log']))
+
+        else:  # Some incoming message from a client
+            # Data received from client, process it
+            try:
+                if len(sock.socket.recv(1, socket.MSG_PEEK)) == 0:
+                    raise ConnectionError('socket closed by the client')
+                message = DeSerializer(sock).string_deserialization()
+                if message in ['Done', 'Info', 'Infos', 'Info_xml', 'position_is', 'move_done']:
+                    self.process_cmds(message, command_sock=None)
+                elif message == ENCODED_DATA_MESSAGE:
+                    self._encoded_frame = True
+                    try:
+                        self.process_cmds('Done', command_sock=None)
+                    finally:
+                        self._encoded_frame = False
+                elif message.startswith(f'{ENCODING_MESSAGE}:'):
+                    self.negotiate_encoding(sock, message.split(':', 1)[1].split(','))
+                elif message == 'Quit':
+                    raise Exception("socket disconnect by user")
+                else:
+                    self.process_cmds(message, command_sock=sock)
+
+            # client disconnected, so remove from socket list
+            except Exception as e:
+                self.remove_client(sock)
+
+    def negotiate_encoding(self, sock: Socket, requested: List[str]):
+        """Choose the first of the encodings requested by a client that is installed here and reply it"""
+        encoding = choose_encoding(requested)
+        if encoding == 'none':
+            self._client_codecs.pop(sock.socket, None)
+        else:
+            self._client_codecs[sock.socket] = FrameCodec(encoding)
+        sock.check_sended_with_serializer(f'{ENCODING_MESSAGE}:{encoding}')
+        self.settings.child('encoding', 'negotiated').setValue(encoding)
+        self.emit_status(ThreadCommand("Update_Status", [f'Data frames received encoded with: {encoding}', 'log']))
+
+    def read_dte(self, sock: Socket) -> DataToExport:
+        """Read a DataToExport sent by a client, decoding it if sent encoded (see TCPClient.send_data)"""
+        if not self._encoded_frame:
+            return DeSerializer(sock).dte_deserialization()
+        codec: FrameCodec = self._client_codecs[sock.socket]
+        frame = receive_bytes(sock, DeSerializer(sock).get_message_length())
+        dte = DeSerializer(codec.decode(frame)).dte_deserialization()
+        self.settings.child('encoding', 'compression_ratio').setValue(codec.compression_ratio)
+        self.settings.child('encoding', 'encode_time').setValue(codec.mean_encode_time)
+        self.settings.child('encoding', 'decode_time').setValue(codec.mean_decode_time)
+        return dte
 
     def send_command(self, sock: Socket, command="move_at"):
         """
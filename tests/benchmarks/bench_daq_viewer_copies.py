@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the memory allocated (mostly copies) by the DAQ_Viewer data path per acquired frame
+
+Not collected by pytest, to be run as a script:
+
+    python tests/benchmarks/bench_daq_viewer_copies.py
+"""
+import tracemalloc
+
+import numpy as np
+from qtpy import QtWidgets
+
+from pymodaq_gui.utils.dock import DockArea
+
+from pymodaq.control_modules.daq_viewer import DAQ_Viewer
+from pymodaq.utils.data import DataFromPlugins, DataToExport, nbytes
+
+SHAPE = (1024, 1024)
+NFRAMES = 20
+
+
+def bench_show_data(viewer: DAQ_Viewer, do_bkg=False, live_averaging=False) -> float:
+    """ Return the mean peak of memory allocated per call to show_data relative to the frame size"""
+    viewer.do_bkg = do_bkg
+    viewer._take_bkg = do_bkg
+    viewer._ind_continuous_grab = 0
+    viewer.settings.child('main_settings', 'live_averaging').setValue(live_averaging)
+    dte = DataToExport('frame', data=[DataFromPlugins('mydata', data=[np.random.rand(*SHAPE)])])
+    peaks = []
+    for ind in range(NFRAMES):
+        tracemalloc.start()
+        viewer.show_data(dte)
+        QtWidgets.QApplication.processEvents()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return float(np.mean(peaks[1:])) / nbytes(dte)
+
+
+def main():
+    app = QtWidgets.QApplication([])
+    dockarea = DockArea()
+    viewer = DAQ_Viewer(dockarea, title='bench')
+    viewer.daq_type = 'DAQ2D'
+
+    print(f'Frame of {SHAPE} float64: {np.prod(SHAPE) * 8 / 1e6:.1f} MB')
+    for do_bkg in (False, True):
+        for live_averaging in (False, True):
+            ratio = bench_show_data(viewer, do_bkg=do_bkg, live_averaging=live_averaging)
+            print(f'bkg: {do_bkg}, live averaging: {live_averaging} -> '
+                  f'{ratio:.2f} frame size allocated per frame')
+    viewer.quit_fun()
+    QtWidgets.QApplication.processEvents()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the import time of pymodaq when instrument plugins are listed from the on-disk plugin index compared
+with their full (importing) discovery
+
+Not collected by pytest, to be run as a script:
+
+    python tests/benchmarks/bench_plugin_discovery.py
+"""
+import subprocess
+import sys
+
+import numpy as np
+
+NREPEAT = 5
+
+IMPORT_SCRIPT = """
+import sys
+import time
+tstart = time.perf_counter()
+import {module}
+print(time.perf_counter() - tstart)
+print(len([mod for mod in sys.modules if mod.startswith('pymodaq_plugins')]))
+"""
+
+BUILD_SCRIPT = """
+import time
+from pymodaq.utils import daq_utils
+tstart = time.perf_counter()
+daq_utils.update_plugin_index()
+print(time.perf_counter() - tstart)
+"""
+
+
+def run(script: str) -> list:
+    """ Run a script in a fresh interpreter and return the numbers it printed"""
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+    return [float(line) for line in output.strip().splitlines()[-2:]]
+
+
+def bench_import(module: str):
+    times = []
+    for ind in range(NREPEAT):
+        duration, n_plugin_modules = run(IMPORT_SCRIPT.format(module=module))
+        times.append(duration)
+    print(f'import {module}: {np.mean(times):.2f} s +- {np.std(times):.2f} s,'
+          f' {int(n_plugin_modules)} plugin modules imported')
+
+
+def main():
+    build_time = run(BUILD_SCRIPT)[-1]
+    print(f'Full plugin discovery (index rebuild, imports every plugin): {build_time:.2f} s')
+    for module in ['pymodaq', 'pymodaq.control_modules.daq_viewer', 'pymodaq.control_modules.daq_move']:
+        bench_import(module)
+
+
+if __name__ == '__main__':
+    main()
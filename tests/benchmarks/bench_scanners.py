@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the construction of the scan positions (set_scan) of every scanner registered in the ScannerFactory
+for an increasing number of scan steps
+
+Not collected by pytest, to be run as a script (optionally with the largest number of steps as argument):
+
+    python tests/benchmarks/bench_scanners.py 10000000
+"""
+import sys
+import time
+
+import numpy as np
+from qtpy import QtWidgets
+
+from pymodaq.utils.scanner.scan_factory import ScannerFactory, ScannerBase
+from pymodaq.control_modules.mocks import MockDAQMove
+
+NREPEAT = 3
+
+
+def configure_1D(scanner: ScannerBase, n_steps: int):
+    scanner.settings.child('start').setValue(0.)
+    scanner.settings.child('stop').setValue(1.)
+    scanner.settings.child('step').setValue(1. / (n_steps - 1))
+
+
+def configure_1D_sparse(scanner: ScannerBase, n_steps: int):
+    scanner.settings.child('parsed_string').setValue(f'0:{1. / (n_steps - 1)}:1')
+
+
+def configure_2D(scanner: ScannerBase, n_steps: int):
+    n_by_axis = int(np.sqrt(n_steps))
+    for ax in ['axis1', 'axis2']:
+        scanner.settings.child(ax, f'start_{ax}').setValue(0.)
+        scanner.settings.child(ax, f'stop_{ax}').setValue(1.)
+        scanner.settings.child(ax, f'step_{ax}').setValue(1. / (n_by_axis - 1))
+
+
+def configure_2D_spiral(scanner: ScannerBase, n_steps: int):
+    scanner.settings.child('npts_by_axis').setValue(int(np.sqrt(n_steps)) - 1)
+
+
+def configure_sequential(scanner: ScannerBase, n_steps: int):
+    n_by_axis = int(np.round(n_steps ** (1 / 3)))
+    scanner.update_model(init_data=[[act.title, 0., 1., 1. / (n_by_axis - 1)] for act in scanner.actuators])
+
+
+def configure_tabular(scanner: ScannerBase, n_steps: int):
+    scanner.update_model(init_data=np.random.rand(n_steps, len(scanner.actuators)))
+
+
+CONFIGURATORS = {('Scan1D', 'Linear'): (1, configure_1D),
+                 ('Scan1D', 'Random'): (1, configure_1D),
+                 ('Scan1D', 'Sparse'): (1, configure_1D_sparse),
+                 ('Scan2D', 'Linear'): (2, configure_2D),
+                 ('Scan2D', 'LinearBackForce'): (2, configure_2D),
+                 ('Scan2D', 'Random'): (2, configure_2D),
+                 ('Scan2D', 'Spiral'): (2, configure_2D_spiral),
+                 ('Sequential', 'Linear'): (3, configure_sequential),
+                 ('Tabular', 'Linear'): (2, configure_tabular),
+                 }
+
+
+def bench_scanner(scan_type: str, scan_sub_type: str, n_steps_list: list):
+    n_axes, configurator = CONFIGURATORS[(scan_type, scan_sub_type)]
+    scanner = ScannerFactory().get(scan_type, scan_sub_type,
+                                   actuators=[MockDAQMove(title=f'act{ind}') for ind in range(n_axes)])
+    for n_steps in n_steps_list:
+        configurator(scanner, n_steps)
+        times = []
+        for ind in range(NREPEAT):
+            tstart = time.perf_counter()
+            scanner.set_scan()
+            times.append(time.perf_counter() - tstart)
+        print(f'{scan_type:>10} {scan_sub_type:>16} {scanner.n_steps:>10} steps: '
+              f'{1000 * np.min(times):10.2f} ms')
+
+
+def main(n_steps_max: int = 10 ** 7):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    factory = ScannerFactory()
+    n_steps_list = [10 ** exp for exp in range(4, int(np.log10(n_steps_max)) + 1)]
+    for scan_type in factory.scan_types():
+        for scan_sub_type in factory.scan_sub_types(scan_type):
+            if (scan_type, scan_sub_type) not in CONFIGURATORS:
+                print(f'{scan_type:>10} {scan_sub_type:>16}: not benchmarked')
+                continue
+            bench_scanner(scan_type, scan_sub_type, n_steps_list)
+
+
+if __name__ == '__main__':
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 7)
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the throughput, latency and CPU cost of the transports of the data of remote modules: a TCPServer fed
+by TCPClient(s) and a LECO director subscribed to the data published by actor(s) in streaming mode, all on the
+loopback interface (the coordinator and the proxy server of LECO being started if needed).
+
+The producers (clients or actors) run in their own process and send as fast as they can frames of a given payload,
+stamped with their sending time, which gives the latency of each frame when received. The payloads, number of
+producers, number of frames and encodings (for TCP, see pymodaq.utils.tcp_ip.encoding) are swept, each configuration
+giving one JSON line on stdout so that the runs can be stored and compared over time.
+
+Not collected by pytest, to be run as a script:
+
+    python tests/benchmarks/bench_transports.py --payloads 0D 2D_1024 --clients 1 4 --encodings none zstd+delta
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from qtpy import QtCore
+
+from pymodaq_utils import math_utils as mutils
+from pymodaq_utils.utils import ThreadCommand
+from pymodaq_utils.serialize.serializer_legacy import DeSerializer
+from pymodaq_data.data import DataToExport, DataRaw
+
+from pymodaq import __version__
+from pymodaq.utils.data import DataFromPlugins
+from pymodaq.utils.tcp_ip.tcp_server_client import MockServer, TCPClient
+
+PAYLOADS: Dict[str, Tuple[int, ...]] = {'0D': (1,),
+                                        '1D_1k': (1024,),
+                                        '1D_64k': (65536,),
+                                        '2D_256': (256, 256),
+                                        '2D_1024': (1024, 1024),
+                                        '2D_2048': (2048, 2048),
+                                        }
+NFRAMES = 200
+TIMEOUT = 60.  # maximum duration of a configuration in s
+HOST = '127.0.0.1'
+
+
+class Producer:
+    """ MockDataGrabber-like source of camera-like frames (uint16 gaussian spot with noise)
+
+    A few frames are computed in advance and cycled through so that the producer CPU is spent in the transport
+    """
+    n_frames = 4
+
+    def __init__(self, payload: str):
+        shape = PAYLOADS[payload]
+        rng = np.random.default_rng(0)
+        if len(shape) == 1:
+            x = np.linspace(-1, 1, shape[0])
+            spot = mutils.gauss1D(x, 0, 0.3)
+        else:
+            x = np.linspace(-1, 1, shape[1])
+            y = np.linspace(-1, 1, shape[0])
+            spot = mutils.gauss2D(x, 0, 0.3, y, 0, 0.3)
+        self.frames = [(1000 * spot + rng.integers(0, 50, shape)).astype(np.uint16) for _ in range(self.n_frames)]
+        self.ind_frame = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.frames[0].nbytes
+
+    def grab(self) -> DataToExport:
+        frame = self.frames[self.ind_frame % self.n_frames]
+        self.ind_frame += 1
+        return DataToExport('bench', data=[DataFromPlugins('frame', data=[frame]),
+                                           DataRaw('timestamp', data=[np.array([time.time()])])])
+
+
+class Receiver:
+    """Record the reception time and the latency of the frames"""
+
+    def __init__(self):
+        self.arrivals: List[float] = []
+        self.latencies: List[float] = []
+
+    def receive(self, dte: DataToExport):
+        now = time.time()
+        self.arrivals.append(now)
+        self.latencies.append(now - float(dte.get_data_from_name('timestamp')[0][0]))
+
+
+def summarize(receiver: Receiver, cpu: float, producers: List[dict], n_expected: int, nbytes: int) -> dict:
+    """ The measures of a configuration
+
+    Parameters
+    ----------
+    receiver: Receiver
+    cpu: float
+        The CPU time (s) of the receiving process
+    producers: list of dict
+        What each producer printed: its CPU time (s), number of sent frames and start time
+    n_expected: int
+        The number of frames that should have been received
+    nbytes: int
+        The size of the data of a frame
+    """
+    n_received = len(receiver.arrivals)
+    n_sent = sum([producer['frames'] for producer in producers])
+    result = dict(frames_expected=n_expected, frames_received=n_received, frames_dropped=n_expected - n_received)
+    if n_received > 0:
+        duration = max(receiver.arrivals) - min([producer['start'] for producer in producers])
+        latencies = 1000 * np.array(receiver.latencies)
+        result.update(throughput_fps=n_received / duration,
+                      throughput_MBps=n_received * nbytes / duration / 1e6,
+                      latency_p50_ms=float(np.percentile(latencies, 50)),
+                      latency_p99_ms=float(np.percentile(latencies, 99)),
+                      receiver_cpu_per_frame_ms=1000 * cpu / n_received)
+    if n_sent > 0:
+        result['producer_cpu_per_frame_ms'] = 1000 * sum([producer['cpu'] for producer in producers]) / n_sent
+    return result
+
+
+def start_producers(role: str, names: List[str], *args) -> List[subprocess.Popen]:
+    return [subprocess.Popen([sys.executable, __file__, role, name] + [str(arg) for arg in args],
+                             stdout=subprocess.PIPE, text=True) for name in names]
+
+
+def collect_producers(processes: List[subprocess.Popen]) -> List[dict]:
+    outputs = []
+    for process in processes:
+        try:
+            stdout, _ = process.communicate(timeout=TIMEOUT)
+            outputs.append(json.loads(stdout.strip().splitlines()[-1]))
+        except Exception:
+            process.kill()
+            outputs.append(dict(cpu=0., frames=0, start=time.time()))
+    return outputs
+
+
+# TCP/IP
+
+class BenchServer(MockServer):
+    """TCPServer reading the frames of any number of clients (a TCPServer has usually a single one per type)"""
+    message_list = ['Quit', 'Done']
+    socket_types = ['GRABBER']
+
+    def __init__(self, receiver: Receiver, n_expected: int, loop: QtCore.QEventLoop):
+        super().__init__()
+        self.receiver = receiver
+        self.n_expected = n_expected
+        self.loop = loop
+        self._reading_socket = None
+
+    def emit_status(self, status):
+        pass
+
+    def process_socket(self, sock):
+        self._reading_socket = sock
+        super().process_socket(sock)
+
+    def command_done(self, command_sock):
+        self.receiver.receive(self.read_dte(self._reading_socket))
+        if len(self.receiver.arrivals) == self.n_expected:
+            self.loop.quit()
+
+
+def run_tcp_client(name: str, port: str, payload: str, n_frames: str, encoding: str):
+    producer = Producer(payload)
+    client = TCPClient(HOST, int(port), encoding=encoding)
+    client._connect_socket()
+    client.socket.check_sended_with_serializer(client.client_type)
+    client.request_encoding()
+    if len(client.get_requested_encodings()) > 0:
+        client.ready_to_read()  # the encoding chosen by the server
+    cpu = time.process_time()
+    start = time.time()
+    for ind in range(int(n_frames)):
+        client.send_data(producer.grab())
+    print(json.dumps(dict(cpu=time.process_time() - cpu, frames=int(n_frames), start=start)))
+    client.close()
+
+
+def bench_tcp(payload: str, n_clients: int, n_frames: int, encoding: str) -> dict:
+    receiver = Receiver()
+    loop = QtCore.QEventLoop()
+    server = BenchServer(receiver, n_clients * n_frames, loop)
+    server.settings.child('socket_ip').setValue(HOST)
+    server.settings.child('port_id').setValue(0)
+    server.init_server()
+    port = server.serversocket.getsockname()[1]
+
+    cpu = time.process_time()
+    processes = start_producers('tcp_client', [f'client{ind}' for ind in range(n_clients)],
+                                port, payload, n_frames, encoding)
+    QtCore.QTimer.singleShot(int(TIMEOUT * 1000), loop.quit)
+    loop.exec()
+    cpu = time.process_time() - cpu
+
+    for client in [client['socket'] for client in server.connected_clients if client['type'] != 'server']:
+        server.remove_client(client)
+    server.close_server()
+    result = summarize(receiver, cpu, collect_producers(processes), n_clients * n_frames,
+                       Producer(payload).nbytes)
+    result['compression_ratio'] = server.settings['encoding', 'compression_ratio']
+    return result
+
+
+# LECO
+
+def run_leco_actor(name: str, payload: str, n_frames: str):
+    from pymodaq.utils.leco.pymodaq_listener import ActorListener, LECOViewerCommands
+
+    app = QtCore.QCoreApplication([])
+    producer = Producer(payload)
+    commands = []
+    actor = ActorListener(name=name)
+    actor.cmd_signal.connect(lambda command: commands.append(command.command))
+    actor.start_listen()
+    tstart = time.perf_counter()
+    while LECOViewerCommands.START_GRAB not in commands and time.perf_counter() - tstart < TIMEOUT:
+        app.processEvents()
+        time.sleep(0.01)
+
+    cpu = time.process_time()
+    start = time.time()
+    for ind in range(int(n_frames)):
+        actor.queue_command(ThreadCommand(LECOViewerCommands.DATA_READY, producer.grab()))
+    print(json.dumps(dict(cpu=time.process_time() - cpu, frames=int(n_frames), start=start)))
+    time.sleep(1.)  # the published messages are sent asynchronously
+    actor.stop_listen()
+
+
+def get_streaming_director(name: str, communicator, timeout: float = TIMEOUT):
+    """Wait for an actor to sign in and ask it to stream its data, return its director and the data topic"""
+    from pymodaq.utils.leco.director_utils import DetectorDirector
+
+    director = DetectorDirector(actor=name, communicator=communicator)
+    tstart = time.perf_counter()
+    while True:
+        try:
+            return director, director.set_streaming(True)
+        except Exception:
+            if time.perf_counter() - tstart > timeout:
+                raise
+            time.sleep(0.1)
+
+
+def bench_leco(payload: str, n_actors: int, n_frames: int) -> dict:
+    from pymodaq.utils.leco.pymodaq_listener import PymodaqListener
+
+    receiver = Receiver()
+
+    def set_data(data, additional_payload=None):
+        receiver.receive(DeSerializer(additional_payload[0]).dte_deserialization())
+
+    listener = PymodaqListener(name='bench_director')
+    listener.register_data_method(set_data)
+    listener.start_listen()
+    names = [f'bench_actor{ind}' for ind in range(n_actors)]
+    processes = start_producers('leco_actor', names, payload, n_frames)
+    try:
+        communicator = listener.get_communicator()
+        directors = []
+        for name in names:
+            director, topic = get_streaming_director(name, communicator)
+            communicator.subscribe(topic)
+            directors.append(director)
+        time.sleep(0.5)  # for the subscriptions to reach the proxy server
+
+        cpu = time.process_time()
+        for director in directors:
+            director.start_grab()
+        tstart = time.time()
+        while len(receiver.arrivals) < n_actors * n_frames and time.time() - tstart < TIMEOUT:
+            if len(receiver.arrivals) > 0 and time.time() - receiver.arrivals[-1] > 2.:
+                break  # nothing received for a while, the missing frames have been dropped
+            time.sleep(0.05)
+        cpu = time.process_time() - cpu
+        communicator.unsubscribe_all()
+    finally:
+        producers = collect_producers(processes)
+        listener.stop_listen()
+    return summarize(receiver, cpu, producers, n_actors * n_frames, Producer(payload).nbytes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Loopback benchmark of the TCP/IP and LECO transports')
+    parser.add_argument('--transports', nargs='+', default=['tcp', 'leco'], choices=['tcp', 'leco'])
+    parser.add_argument('--payloads', nargs='+', default=['0D', '1D_1k', '1D_64k', '2D_256', '2D_1024'],
+                        choices=list(PAYLOADS.keys()))
+    parser.add_argument('--clients', nargs='+', type=int, default=[1, 2, 4],
+                        help='numbers of simultaneous producers')
+    parser.add_argument('--frames', type=int, default=NFRAMES, help='number of frames sent by each producer')
+    parser.add_argument('--encodings', nargs='+', default=['none'],
+                        help='encodings of the TCP frames, for instance none zlib zstd+delta')
+    parser.add_argument('--output', help='file to which the JSON lines are also appended')
+    args = parser.parse_args()
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(sys.argv)
+    meta = dict(date=datetime.datetime.now().isoformat(timespec='seconds'), pymodaq=__version__,
+                python=platform.python_version(), platform=platform.platform(), cpu_count=os.cpu_count())
+
+    coordinator_processes = []
+    if 'leco' in args.transports:
+        from pymodaq.utils.leco.utils import start_coordinator
+        coordinator_processes = start_coordinator()
+        time.sleep(1.)
+    try:
+        for transport in args.transports:
+            for payload in args.payloads:
+                for n_clients in args.clients:
+                    for encoding in (args.encodings if transport == 'tcp' else ['none']):
+                        if transport == 'tcp':
+                            result = bench_tcp(payload, n_clients, args.frames, encoding)
+                        else:
+                            result = bench_leco(payload, n_clients, args.frames)
+                        record = dict(meta, transport=transport, payload=payload, shape=list(PAYLOADS[payload]),
+                                      frame_bytes=Producer(payload).nbytes, clients=n_clients, encoding=encoding,
+                                      **result)
+                        line = json.dumps(record)
+                        print(line, flush=True)
+                        if args.output is not None:
+                            with open(args.output, 'a') as f:
+                                f.write(line + '\n')
+    finally:
+        for process in coordinator_processes:
+            process.terminate()
+            process.wait()
+
+
+ROLES = dict(tcp_client=run_tcp_client, leco_actor=run_leco_actor)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] in ROLES:
+        ROLES[sys.argv[1]](*sys.argv[2:])
+    else:
+        main()
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+# the Qt binding has to be imported before the collection of the test modules: when first imported during it,
+# PySide6 (6.12 with python 3.11) loses a reference to True at each signal emission until python aborts with a
+# "bool_dealloc" fatal error
+import qtpy.QtCore  # noqa: F401
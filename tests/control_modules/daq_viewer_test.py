@@ -11,12 +11,15 @@ from pymodaq_gui.utils.dock import DockArea
 from pymodaq.control_modules import daq_viewer as daqvm
 from pymodaq.control_modules.daq_viewer import DAQ_Viewer
 from pymodaq.control_modules.utils import ControlModule
+from pymodaq.control_modules.viewer_utility_classes import DAQ_Viewer_base
 from pymodaq.control_modules.utils import DET_TYPES, get_viewer_plugins, DAQTypesEnum
 from pymodaq.utils.conftests import qtbotskip, main_modules_skip
 from pymodaq.utils.config import Config
 from pymodaq_gui.parameter import utils as putils
 from pymodaq_gui.parameter import Parameter
 from pymodaq_data.h5modules.browsing import H5BrowserUtil
+from pymodaq.utils.data import DataFromPlugins, DataToExport, DataCalculated
+from pymodaq_utils.utils import ThreadCommand
 
 config = Config()
 config_viewer = daqvm.config
@@ -107,3 +110,140 @@ class TestWithUI:
             prog.ui.get_action('stop').trigger()
         assert blocker.args[0].command == 'stop'
 
+
+
+class TestDataPath:
+    def test_show_data_shares_arrays(self, ini_daq_viewer_without_ui):
+        prog, qtbot = ini_daq_viewer_without_ui
+        dwa = DataFromPlugins('mydata', data=[np.random.rand(10, 12)])
+        dte = DataToExport('frame', data=[dwa])
+        prog._take_bkg = True
+        with qtbot.waitSignal(prog.grab_done_signal) as blocker:
+            prog.show_data(dte)
+        dte_emitted = blocker.args[0]
+
+        assert not np.shares_memory(dte_emitted[0].data[0], dwa.data[0])
+        assert not dte_emitted[0].data[0].flags.writeable
+        assert np.shares_memory(prog._bkg[0].data[0], dte_emitted[0].data[0])
+
+    def test_subtract_bkg(self, ini_daq_viewer_without_ui):
+        prog, qtbot = ini_daq_viewer_without_ui
+        prog._bkg = DataToExport('bkg', data=[DataFromPlugins('mydata', data=[np.ones((10, 12))])])
+        dte = DataToExport('frame', data=[DataFromPlugins('mydata', data=[3 * np.ones((10, 12))])])
+        dte_sub = prog._subtract_bkg(dte)
+        assert np.allclose(dte_sub[0].data[0], 2)
+        assert np.allclose(dte[0].data[0], 3)
+
+    def test_live_display_drops_frames(self, ini_daq_viewer_ui):
+        prog, qtbot, dockarea = ini_daq_viewer_ui
+        prog.settings.child('main_settings', 'refresh_time').setValue(100)
+        frames = []
+        prog.grab_done_signal.connect(frames.append)
+        prog.grab_data(True)
+        for ind in range(20):
+            prog.show_data(DataToExport('frame', data=[DataFromPlugins('mydata', data=[np.full((10, 12), ind)])]))
+        # all frames are emitted right away, only the latest one is waiting for the display
+        assert [int(frame[0][0][0, 0]) for frame in frames] == list(range(20))
+        assert prog.n_displayed_frames == 0
+
+        qtbot.waitUntil(lambda: prog.n_displayed_frames == 1, timeout=5000)
+        assert prog.n_acquired_frames == 20
+        assert len(frames) == 20
+
+        prog.stop_grab()
+        assert prog.settings['main_settings', 'displayed_frames'] == '1/20'
+
+    def test_viewers_exports(self, ini_daq_viewer_ui, monkeypatch):
+        prog, qtbot, dockarea = ini_daq_viewer_ui
+        monkeypatch.setattr(prog, 'set_data_to_viewers', lambda *args, **kwargs: None)  # exports done below
+        frames = []
+        exports = []
+        prog.grab_done_signal.connect(frames.append)
+        prog.viewers_done_signal.connect(exports.append)
+
+        def viewers_export():
+            for _ in prog.viewers:
+                prog._get_data_from_viewer(DataToExport('roi', data=[DataCalculated('roi', data=[np.array([1.])])]))
+
+        frame = DataToExport('frame', data=[DataFromPlugins('mydata', data=[np.zeros((10, 12))])])
+        prog._display(frame)  # single grab: the frame is emitted with the exports of the viewers
+        assert len(frames) == 0
+        viewers_export()
+        assert frames == [frame]
+        assert len([dwa for dwa in frame if dwa.name == 'roi']) == len(prog.viewers) and len(exports) == 0
+
+        frame = DataToExport('frame', data=[DataFromPlugins('mydata', data=[np.zeros((10, 12))])])
+        prog._display(frame, live=True)  # live grab: the frame has already been emitted
+        viewers_export()
+        assert len(frames) == 1 and len(frame) == 1
+        assert len(exports) == 1
+        assert exports[0].name == prog.title
+        assert len(exports[0]) == len(prog.viewers)
+
+    def test_live_averaging_modes(self, ini_daq_viewer_without_ui):
+        prog, qtbot = ini_daq_viewer_without_ui
+        prog.settings.child('main_settings', 'live_averaging').setValue(True)
+        prog.settings.child('main_settings', 'live_averaging_mode').setValue('rolling')
+        prog.settings.child('main_settings', 'live_averaging_window').setValue(2)
+        frames = []
+        prog.grab_done_signal.connect(frames.append)
+        for ind in range(4):
+            prog.show_data(DataToExport('frame', data=[DataFromPlugins('mydata', data=[np.full((10, 12), ind)])]))
+        assert [float(frame[0][0][0, 0]) for frame in frames] == [0., 0.5, 1.5, 2.5]
+        assert not frames[-1][0][0].flags.writeable
+        assert frames[-1][0].origin == prog.title
+
+    def test_live_averaging_keeps_the_shared_frame(self, ini_daq_viewer_without_ui):
+        prog, qtbot = ini_daq_viewer_without_ui
+        prog.settings.child('main_settings', 'live_averaging').setValue(True)
+        prog.settings.child('main_settings', 'tcpip', 'tcp_connected').setValue(True)
+        prog._send_to_tcpip = True
+        sent = []
+        prog._command_tcpip.connect(lambda command: sent.append(command.attribute))
+        for value in (1., 3.):
+            prog.show_data(DataToExport('frame', data=[DataFromPlugins('mydata', data=[value * np.ones((10, 12))])]))
+        assert np.allclose(prog._data_to_save_export[0].data[0], 2)
+        assert [float(dte[0].data[0][0, 0]) for dte in sent] == [1., 3.]
+
+    def test_subtract_bkg_reuses_arrays(self, ini_daq_viewer_without_ui):
+        prog, qtbot = ini_daq_viewer_without_ui
+        prog._bkg = DataToExport('bkg', data=[DataFromPlugins('mydata', data=[np.ones((10, 12))])])
+        dte_sub = prog._subtract_bkg(
+            DataToExport('frame', data=[DataFromPlugins('mydata', data=[3 * np.ones((10, 12))])]))
+        array = dte_sub[0][0]
+        dte_sub = prog._subtract_bkg(
+            DataToExport('frame', data=[DataFromPlugins('mydata', data=[5 * np.ones((10, 12))])]))
+        assert dte_sub[0][0] is array
+        assert np.allclose(array, 4)
+
+
+class ExposingPlugin(DAQ_Viewer_base):
+    """Instrument plugin letting the actuators move once its exposure is over"""
+    move_during_readout = True
+
+    def grab_data(self, Naverage=1, **kwargs):
+        self.emit_exposure_done()
+        self.dte_signal.emit(DataToExport('Exposing', data=[DataFromPlugins('mydata', data=[np.array([1.])])]))
+
+    def stop(self):
+        pass
+
+
+class TestExposureDone:
+    @pytest.mark.parametrize('Naverage, hardware_averaging', [(1, False), (3, False), (3, True)])
+    def test_relayed_once_per_grab(self, qtbot, Naverage, hardware_averaging):
+        settings = Parameter.create(name='settings', type='group', children=[
+            {'name': 'main_settings', 'type': 'group', 'children': [
+                {'name': 'wait_time', 'type': 'int', 'value': 0},
+                {'name': 'DAQ_type', 'type': 'str', 'value': 'DAQ0D'}]}])
+        detector = daqvm.DAQ_Detector('Exposing', settings, 'Exposing')
+        detector.detector = ExposingPlugin(detector)
+        detector.detector.dte_signal.connect(detector.data_ready)
+        detector.hardware_averaging = hardware_averaging
+        events = []
+        detector.status_sig.connect(lambda status: events.append(status.command))
+        detector.data_detector_sig.connect(lambda dte: events.append('data'))
+
+        detector.queue_command(ThreadCommand('single', dict(Naverage=Naverage)))
+        # with software averaging, the actuators may only move once the last of the Naverage grabs is exposed
+        assert [event for event in events if event in ('exposure_done', 'data')] == ['exposure_done', 'data']
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import os
+
+import numpy as np
+import pytest
+
+from pymodaq.control_modules.daq_viewer import DAQ_Viewer
+from pymodaq.control_modules.detector_process import DAQ_DetectorProcess
+
+
+@pytest.fixture
+def process_viewer(qtbot):
+    viewer = DAQ_Viewer(title='det', daq_type='DAQ2D')
+    viewer.detector = 'Mock'
+    viewer.settings.child('main_settings', 'process', 'in_process').setValue(True)
+    viewer.settings.child('main_settings', 'process', 'slot_size').setValue(1)
+    with qtbot.waitSignal(viewer.init_signal, timeout=60000) as blocker:
+        viewer.init_hardware()
+    assert blocker.args == [True]
+    yield viewer
+    hardware = viewer._hardware_process
+    if viewer.initialized_state:
+        with qtbot.waitSignal(viewer.init_signal, timeout=20000):
+            viewer.quit_fun()
+    else:
+        viewer.quit_fun()
+    assert hardware.ended
+    assert not hardware._process.is_alive()
+
+
+def test_snap(qtbot, process_viewer):
+    viewer = process_viewer
+    hardware = viewer._hardware_process
+    assert isinstance(hardware, DAQ_DetectorProcess)
+    assert viewer._hardware_thread is None
+    assert hardware.pid != os.getpid()
+
+    viewer.settings.child('detector_settings', 'Nx').setValue(50)
+    with qtbot.waitSignal(viewer.grab_done_signal, timeout=10000) as blocker:
+        viewer.snap()
+    dte = blocker.args[0]
+    assert dte.name == 'det'
+    assert len(dte) == 2
+    assert dte[0].shape == (200, 50)  # the settings change has been applied in the process
+    # the frame has been copied out of the shared memory
+    assert dte[0][0].flags.owndata
+    assert not dte[0][0].flags.writeable
+    assert hardware.n_frames == 1
+
+    # frames larger than the slots go through the pipe
+    viewer.settings.child('detector_settings', 'Nx').setValue(1000)
+    viewer.settings.child('detector_settings', 'Ny').setValue(1000)
+    with qtbot.waitSignal(viewer.grab_done_signal, timeout=10000) as blocker:
+        viewer.snap()
+    assert blocker.args[0][0].shape == (1000, 1000)
+
+
+def test_grab(qtbot, process_viewer):
+    viewer = process_viewer
+    frames = []
+    viewer.grab_done_signal.connect(frames.append)
+    viewer.settings.child('main_settings', 'show_data').setValue(False)
+    viewer.grab_data(True)
+    qtbot.waitUntil(lambda: len(frames) >= 5, timeout=20000)
+    viewer.stop_grab()
+    hardware = viewer._hardware_process
+    assert hardware.n_frames >= 5
+    assert viewer.settings['main_settings', 'process', 'dropped_frames'] == hardware.n_dropped
+    assert all([np.all(np.isfinite(frame[0][0])) for frame in frames])
+
+
+def test_crash(qtbot, process_viewer):
+    viewer = process_viewer
+    with qtbot.waitSignal(viewer.init_signal, timeout=20000) as blocker:
+        viewer._hardware_process._process.kill()
+    assert blocker.args == [False]
+    assert not viewer.initialized_state
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import pytest
+
+from pymodaq_gui.parameter import Parameter
+
+from pymodaq.control_modules.daq_move import DAQ_Move
+from pymodaq.control_modules.daq_viewer import DAQ_Viewer
+from pymodaq.extensions.daq_scan import DAQScan, DAQScanAcquisition
+from pymodaq.utils.managers.modules_manager import ModulesManager
+from pymodaq.utils.scanner.scanner import Scanner
+
+
+@pytest.fixture
+def mock_modules(qtbot):
+    """A Mock actuator and a Mock 0D detector, initialized"""
+    actuator = DAQ_Move(title='Xaxis')
+    actuator.actuator = 'Mock'
+    with qtbot.waitSignal(actuator.init_signal, timeout=10000):
+        actuator.init_hardware()
+
+    detector = DAQ_Viewer(title='det')
+    detector.detector = 'Mock'
+    with qtbot.waitSignal(detector.init_signal, timeout=10000):
+        detector.init_hardware()
+
+    yield actuator, detector
+    for module in (actuator, detector):  # their hardware thread is stopped once they are closed
+        with qtbot.waitSignal(module.init_signal, timeout=10000):
+            module.quit_fun()
+
+
+@pytest.fixture
+def scan_acquisition(mock_modules):
+    """Factory of DAQScanAcquisition scanning the mock actuator along a 1D scan, recording the mock detector
+
+    The returned function takes the scan subtype, the settings of the scanner and the scan_options of the DAQScan
+    as dictionaries, the other named arguments being passed to DAQScanAcquisition
+    """
+    actuator, detector = mock_modules
+
+    def get_acquisition(scan_subtype='Linear', scanner_settings: dict = None, scan_options: dict = None,
+                        **kwargs) -> DAQScanAcquisition:
+        modules_manager = ModulesManager([detector], [actuator], selected_detectors=[detector],
+                                         selected_actuators=[actuator])
+        scanner = Scanner(actuators=[actuator])
+        scanner.set_scan_type_and_subtypes('Scan1D', scan_subtype)
+        for name, value in (scanner_settings if scanner_settings is not None else {}).items():
+            scanner._scanner.settings.child(name).setValue(value)
+        scanner.set_scan()
+
+        settings = Parameter.create(name='settings', type='group', children=DAQScan.params)
+        for name, value in (scan_options if scan_options is not None else {}).items():
+            settings.child('scan_options', name).setValue(value)
+        for plot in ['plot_0d', 'plot_1d']:
+            settings.child('plot_options', plot).setValue(dict(all_items=[], selected=[]))
+        return DAQScanAcquisition(settings, scanner, modules_manager, **kwargs)
+
+    return get_acquisition
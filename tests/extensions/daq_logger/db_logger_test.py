@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip('sqlalchemy')
+pytest.importorskip('sqlalchemy_utils')
+
+from pymodaq_data.data import DataToExport
+
+from pymodaq.utils.data import DataFromPlugins
+from pymodaq.extensions.daq_logger.db.db_logger import DbLogger, DbBatchWriter
+from pymodaq.extensions.daq_logger.db.db_logger_models import ControlModule, Data0D, Data1D, Data2D
+
+
+def get_data(ind: int) -> DataToExport:
+    return DataToExport('MyDet', control_module='DAQ_Viewer', data=[
+        DataFromPlugins('data0D', data=[np.array([float(ind)]), np.array([2. * ind])], labels=['ch0', 'ch1']),
+        DataFromPlugins('data1D', data=[ind * np.ones((5,))], labels=['trace']),
+        DataFromPlugins('data2D', data=[ind * np.ones((3, 4))], labels=['image']),
+    ])
+
+
+@pytest.fixture()
+def dblogger(tmp_path):
+    dblogger = DbLogger('test', url=f"sqlite:///{tmp_path.joinpath('test.db')}", batch_size=50,
+                        flush_period=10.)
+    assert dblogger.connect_db()
+    yield dblogger
+    dblogger.close()
+
+
+class TestDbLogger:
+    def test_module_id(self, dblogger):
+        module_id = dblogger.get_module_id('MyDet')
+        assert dblogger.get_module_id('MyDet') == module_id
+        assert dblogger.get_module_id('MyAct', 'DAQ_Move') != module_id
+        with dblogger.session_scope() as session:
+            assert session.query(ControlModule).count() == 2
+
+    def test_no_loss_on_close(self, dblogger):
+        Ndata = 10
+        for ind in range(Ndata):
+            dblogger.add_data(get_data(ind))
+        dblogger.close()
+        with dblogger.session_scope() as session:
+            assert session.query(Data0D).count() == 2 * Ndata
+            assert session.query(Data1D).count() == Ndata
+            assert session.query(Data2D).count() == 0  # save2D is False
+            values = [res[0] for res in session.query(Data0D.value).filter_by(channel='ch1')]
+            assert values == pytest.approx([2. * ind for ind in range(Ndata)])
+            assert session.query(Data1D).first().value == pytest.approx([0.] * 5)
+
+    def test_batch_size(self, dblogger):
+        for ind in range(10):  # 30 rows
+            dblogger.add_data(get_data(ind))
+        assert dblogger._writer.n_pending == 30
+        for ind in range(10):  # 60 rows > batch_size
+            dblogger.add_data(get_data(ind))
+        start = time.perf_counter()
+        while dblogger._writer.n_inserted < 60 and time.perf_counter() - start < 5:
+            time.sleep(0.01)
+        assert dblogger._writer.n_inserted == 60
+        assert dblogger._writer.n_pending == 0
+
+    def test_flush_period(self, tmp_path):
+        dblogger = DbLogger('test', url=f"sqlite:///{tmp_path.joinpath('test.db')}", flush_period=0.05)
+        dblogger.connect_db()
+        dblogger.add_data(get_data(0))
+        start = time.perf_counter()
+        while dblogger._writer.n_inserted < 3 and time.perf_counter() - start < 5:
+            time.sleep(0.01)
+        assert dblogger._writer.n_inserted == 3
+        dblogger.close()
+
+    def test_save2D(self, dblogger):
+        dblogger.save2D = True
+        dblogger.add_data(get_data(1))
+        dblogger.flush()
+        with dblogger.session_scope() as session:
+            assert session.query(Data2D).count() == 1
+            assert np.allclose(session.query(Data2D).first().value, np.ones((3, 4)))
+
+    def test_bad_row(self, dblogger):
+        module_id = dblogger.get_module_id('MyDet')
+        writer = dblogger._writer
+        rows = [dict(timestamp=ind, control_module_id=module_id, channel='ch0', value=float(ind))
+                for ind in range(5)]
+        rows.insert(2, dict(timestamp=None, control_module_id=module_id, channel='ch0', value=-1.))  # not nullable
+        writer.add_rows(Data0D, rows)
+        writer.flush()
+        assert writer.n_inserted == 5  # the batch is inserted row by row, only the bad one is kept
+        assert writer.n_pending == 1
+        for ind in range(writer.max_attempts - 1):
+            writer.flush()
+        assert writer.n_pending == 0
+        assert writer.n_dropped == 1
+        with dblogger.session_scope() as session:
+            assert session.query(Data0D).count() == 5
+
+    def test_max_pending(self, dblogger):
+        writer = DbBatchWriter(dblogger.engine, max_pending=10)
+        writer.add_rows(Data0D, [dict(timestamp=ind, channel='ch0', value=0.) for ind in range(8)])
+        writer.add_rows(Data0D, [dict(timestamp=ind, channel='ch0', value=0.) for ind in range(8)])
+        assert writer.n_pending == 10
+        assert writer.n_dropped == 6
+        writer.flush()
+        assert writer.n_inserted == 10
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+
+
+def test_adaptive_acquisition(scan_acquisition):
+    acquisition = scan_acquisition('Adaptive', scanner_settings=dict(start=0., stop=10., n_points=12))
+    modules_manager, scanner = acquisition.modules_manager, acquisition.scanner
+    assert scanner.is_adaptive
+    modules_manager.get_det_data_list()
+    data_list = modules_manager.settings['data_dimensions', 'det_data_list0D']
+    modules_manager.settings.child('data_dimensions', 'det_data_list0D').setValue(
+        dict(all_items=data_list['all_items'], selected=data_list['all_items'][:1]))
+
+    commands = []
+    acquisition.status_sig.connect(commands.append)
+    acquisition.start_acquisition()
+
+    names = [command.command for command in commands]
+    assert names[-1] == 'Scan_done'
+    data = [command.attribute for command in commands if command.command == 'add_data']
+    assert [dat['indexes'] for dat in data] == [(ind,) for ind in range(12)]
+    # each probed position is appended along the enlargeable navigation axis
+    axis_values = np.array([dat['axis_values'] for dat in data])
+    assert axis_values.shape == (12, 1)
+    assert np.all((axis_values >= -0.1) & (axis_values <= 10.1))
+    assert scanner.positions.shape == (12, 1)
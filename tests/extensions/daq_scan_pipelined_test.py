@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq.utils.scanner.profiler import STEP_EVENTS
+
+
+@pytest.fixture
+def get_acquisition(mock_modules, scan_acquisition):
+    actuator, detector = mock_modules
+    actuator.settings.child('move_settings', 'tau').setValue(50)
+    return lambda: scan_acquisition(scanner_settings=dict(start=0., stop=10., step=1.),
+                                    scan_options=dict(scan_mode='Pipelined', scan_average=2))
+
+
+def test_pipelined_acquisition(mock_modules, get_acquisition):
+    actuator, detector = mock_modules
+    assert not detector.move_during_readout
+    acquisition = get_acquisition()
+    modules_manager = acquisition.modules_manager
+
+    commands = []
+    acquisition.status_sig.connect(commands.append)
+    acquisition.start_acquisition()
+
+    names = [command.command for command in commands]
+    assert names[-1] == 'Scan_done'
+    data = [command.attribute for command in commands if command.command == 'add_data']
+    assert [dat['indexes'] for dat in data] == [(ind_average, ind) for ind_average in range(2) for ind in range(11)]
+    assert all([[dte.name for dte in dat['dtes']] == ['det'] for dat in data])
+    # each step got its own data
+    assert len(set([id(dat['dtes'][0]) for dat in data])) == 22
+    for stage in ['move', 'wait', 'exposure', 'grab', 'step']:
+        assert len(acquisition.profiler.durations(stage)) == 22
+    assert 'exposure' in acquisition.profiler.report()
+    # no move is pending at the end of the scan
+    assert modules_manager.move_done_flag
+    assert modules_manager.move_done_positions.get_data_from_name('Xaxis').value() == \
+        pytest.approx(10., abs=actuator.settings['move_settings', 'epsilon'])
+
+
+def test_exposure_timeout(get_acquisition, monkeypatch):
+    acquisition = get_acquisition()
+    wait_exposure_done = acquisition.modules_manager.wait_exposure_done
+    results = iter([True, True, False])
+    monkeypatch.setattr(acquisition.modules_manager, 'wait_exposure_done',
+                        lambda: wait_exposure_done() and next(results))
+
+    commands = []
+    acquisition.status_sig.connect(commands.append)
+    acquisition.start_acquisition()
+
+    assert acquisition.timeout_scan_flag
+    assert 'Timeout' in [command.command for command in commands]
+    assert len([command for command in commands if command.command == 'add_data']) == 2
+    # the move to the step following the exposure timeout has not been started
+    assert len(acquisition.profiler.durations('move')) == 3
+    assert np.isnan(acquisition.profiler.timestamps[3, STEP_EVENTS.index('move_start')])
+
+
+def test_move_timeout(get_acquisition):
+    acquisition = get_acquisition()
+    acquisition.modules_manager.actuator_timeout = 1  # ms, the mock actuator needs more to reach its target
+
+    commands = []
+    acquisition.status_sig.connect(commands.append)
+    acquisition.start_acquisition()
+
+    assert acquisition.timeout_scan_flag
+    assert len([command for command in commands if command.command == 'add_data']) == 0
+    assert commands[-1].command == 'Scan_done'
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import pytest
+
+
+@pytest.mark.parametrize('scan_mode', ['Stop and Go', 'Pipelined'])
+def test_resumed_acquisition(mock_modules, scan_acquisition, scan_mode):
+    actuator, detector = mock_modules
+    acquisition = scan_acquisition(scanner_settings=dict(start=0., stop=4., step=1.),
+                                   scan_options=dict(scan_mode=scan_mode, scan_average=2), start_step=3)
+    modules_manager = acquisition.modules_manager
+
+    commands = []
+    acquisition.status_sig.connect(commands.append)
+    acquisition.start_acquisition()
+
+    assert commands[-1].command == 'Scan_done'
+    data = [command.attribute for command in commands if command.command == 'add_data']
+    # the steps acquired before the interruption are skipped
+    assert [dat['indexes'] for dat in data] == [(0, 3), (0, 4)] + [(1, ind) for ind in range(5)]
+    assert [command.attribute for command in commands if command.command == 'Update_scan_index'][0] == [3, 0]
+    assert modules_manager.move_done_positions.get_data_from_name('Xaxis').value() == \
+        pytest.approx(4., abs=actuator.settings['move_settings', 'epsilon'])
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('scan_mode', ['Stop and Go', 'Pipelined'])
+@pytest.mark.parametrize('keep_repetitions', [False, True])
+def test_running_mean_acquisition(scan_acquisition, scan_mode, keep_repetitions):
+    Naverage = 3
+    acquisition = scan_acquisition(scanner_settings=dict(start=0., stop=2., step=1.),
+                                   scan_options=dict(scan_mode=scan_mode, scan_average=Naverage,
+                                                     average_mode='Running mean', keep_repetitions=keep_repetitions))
+    scanner = acquisition.scanner
+    assert acquisition.scan_shape == scanner.get_scan_shape()
+
+    commands = []
+    acquisition.status_sig.connect(commands.append)
+    acquisition.start_acquisition()
+
+    assert commands[-1].command == 'Scan_done'
+    nav_axes = [command.attribute for command in commands if command.command == 'add_nav_axes'][0]
+    assert [axis.label for axis in nav_axes] == ['Xaxis']
+    data = [command.attribute for command in commands if command.command == 'add_data']
+    means = [dat for dat in data if not dat.get('repetitions', False)]
+    repetitions = [dat for dat in data if dat.get('repetitions', False)]
+    assert [dat['indexes'] for dat in means] == [(ind,) for ind in range(3)] * Naverage
+    if keep_repetitions:
+        assert [dat['indexes'] for dat in repetitions] == [(ind_average, ind) for ind_average in range(Naverage)
+                                                           for ind in range(3)]
+    else:
+        assert len(repetitions) == 0
+    # the data saved at the last average are the means of all the repetitions, with their standard errors
+    for dte in means[-1]['dtes']:
+        for dwa in dte:
+            assert dwa.errors is not None
+            assert dwa[0].dtype == np.float64
+    assert acquisition.running_statistics.get_count(means[-1]['dtes'][0][0], (2,)) == Naverage
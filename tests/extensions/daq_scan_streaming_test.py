@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def streaming_acquisition(mock_modules, scan_acquisition):
+    actuator, detector = mock_modules
+    detector.settings.child('detector_settings', 'wait_time').setValue(10)
+
+    def run(fly_lines=True):
+        """ Run a streaming scan from 0 to 100 µm by steps of 10 and return the commands emitted by the
+        acquisition"""
+        acquisition = scan_acquisition(scanner_settings=dict(start=0., stop=100., step=10.),
+                                       scan_options=dict(scan_mode='Streaming', fly_lines=fly_lines))
+        commands = []
+
+        def thread_status(command):
+            commands.append(command)
+            if command.command == 'start_streaming':
+                detector.grab_data(grab_state=True)
+            elif command.command == 'stop_streaming':
+                detector.stop_grab()
+
+        acquisition.status_sig.connect(thread_status)
+        acquisition.start_acquisition()
+        return commands, acquisition
+
+    return run
+
+
+class TestStreaming:
+    def test_fly_line(self, qtbot, mock_modules, streaming_acquisition):
+        actuator, detector = mock_modules
+        actuator.settings.child('move_settings', 'tau').setValue(500)
+        frames = []
+        detector.grab_done_signal.connect(frames.append)
+        commands, acquisition = streaming_acquisition()
+        qtbot.wait(200)  # for the frames emitted after the end of the scan, if any
+
+        names = [command.command for command in commands]
+        assert names[0] == 'add_nav_axes'
+        assert 'start_streaming' in names and 'stop_streaming' in names
+        assert names[-1] == 'Scan_done'
+        # only the line ends have been sent as targets
+        assert [command.attribute[0] for command in commands if command.command == 'Update_scan_index'] == [0, 10]
+
+        binner = acquisition._binners['det']
+        assert binner.n_frames > binner.n_filled > 2
+        # no frame is lost at the end of the scan and the final positions of the line, slowly approached, are filled
+        assert binner.n_frames == len(frames)
+        assert np.all(binner.missing < 8)
+
+        data = [command.attribute for command in commands if command.command == 'add_data']
+        assert len(data) >= binner.n_filled
+        assert data[-1]['indexes'] == (10,)
+        tags = data[-1]['dte'].get_data_from_name('stream_tags')
+        assert tags.labels == ['timestamp', 'Xaxis']
+        assert tags.data[1][0] == pytest.approx(100., abs=actuator.settings['move_settings', 'epsilon'])
+        assert np.all(np.diff([dat['dte'].get_data_from_name('stream_tags').data[0][0] for dat in data]) > 0)
+
+    def test_waypoints(self, mock_modules, streaming_acquisition):
+        actuator, detector = mock_modules
+        actuator.settings.child('move_settings', 'tau').setValue(50)
+        commands, acquisition = streaming_acquisition(fly_lines=False)
+
+        assert [command.attribute[0] for command in commands
+                if command.command == 'Update_scan_index'] == list(range(11))
+        assert acquisition._binners['det'].n_filled == 11
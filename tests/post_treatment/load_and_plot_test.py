@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq_data.data import DataToExport, Axis
+from pymodaq_data.h5modules.saving import H5SaverLowLevel
+from pymodaq_data.h5modules.data_saving import DataToExportExtendedSaver, DataLoader
+
+from pymodaq.utils.data import DataFromPlugins
+from pymodaq.post_treatment.load_and_plot import LiveDataBuffer, interpolate_on_grid
+
+SCAN_SHAPE = (4, 3)
+
+
+def get_step_data(ind: int) -> DataToExport:
+    return DataToExport('step', data=[
+        DataFromPlugins('data0D', data=[np.array([float(ind)]), np.array([2. * ind])], origin='det0D'),
+        DataFromPlugins('data1D', data=[ind * np.ones((5, ))], origin='det1D',
+                        axes=[Axis('x', data=np.linspace(0, 1, 5), index=0)]),
+    ])
+
+
+def get_nav_axes():
+    return [Axis('act0', data=np.linspace(0, 1, SCAN_SHAPE[0]), index=0),
+            Axis('act1', data=np.linspace(-1, 1, SCAN_SHAPE[1]), index=1)]
+
+
+@pytest.fixture()
+def get_h5saver(tmp_path):
+    h5saver = H5SaverLowLevel()
+    h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'))
+    yield h5saver
+    h5saver.close_file()
+
+
+class TestLiveDataBuffer:
+    def test_errors(self):
+        buffer = LiveDataBuffer(SCAN_SHAPE)
+        with pytest.raises(IndexError):
+            buffer.add_data(get_step_data(0), (0,))
+        with pytest.raises(IndexError):
+            buffer.add_data(get_step_data(0), (SCAN_SHAPE[0], 0))
+
+    def test_nbytes(self):
+        buffer = LiveDataBuffer(SCAN_SHAPE)
+        dte = get_step_data(0)
+        assert buffer.nbytes == 0
+        assert buffer.estimate_nbytes(dte) == np.prod(SCAN_SHAPE) * (2 + 5) * 8
+        buffer.add_data(dte, (0, 0))
+        assert buffer.nbytes == buffer.estimate_nbytes(dte)
+
+    def test_same_as_h5(self, get_h5saver):
+        h5saver = get_h5saver
+        extended_saver = DataToExportExtendedSaver(h5saver, extended_shape=SCAN_SHAPE)
+        buffer = LiveDataBuffer(SCAN_SHAPE)
+
+        extended_saver.add_nav_axes(h5saver.raw_group, get_nav_axes())
+        buffer.add_nav_axes(get_nav_axes())
+        assert not buffer.new_data
+        for ind, indexes in enumerate(np.ndindex(SCAN_SHAPE)):
+            extended_saver.add_data(h5saver.raw_group, get_step_data(ind), indexes)
+            buffer.add_data(get_step_data(ind), indexes)
+        assert buffer.new_data
+
+        dte_h5 = DataToExport('All')
+        DataLoader(h5saver).load_all('/', dte_h5)
+        dte_buffer = DataToExport('All')
+        buffer.load_all('/', dte_buffer)
+        assert not buffer.new_data
+
+        assert len(dte_buffer) == len(dte_h5) == 2
+        for dwa_h5 in dte_h5:
+            dwa_buffer = dte_buffer.get_data_from_full_name(dwa_h5.get_full_name())
+            assert dwa_buffer.dim == dwa_h5.dim
+            assert dwa_buffer.shape == dwa_h5.shape
+            assert dwa_buffer.nav_indexes == dwa_h5.nav_indexes
+            assert dwa_buffer.labels == dwa_h5.labels
+            for array_buffer, array_h5 in zip(dwa_buffer, dwa_h5):
+                assert np.allclose(array_buffer, array_h5)
+            for axis_h5 in dwa_h5.axes:
+                axis_buffer = dwa_buffer.get_axis_from_index(axis_h5.index)[0]
+                assert axis_buffer.label == axis_h5.label
+                assert np.allclose(axis_buffer.get_data(), axis_h5.get_data())
+
+    def test_shared_arrays(self):
+        buffer = LiveDataBuffer(SCAN_SHAPE)
+        buffer.add_data(get_step_data(1), (0, 0))
+        dte = buffer.load_all('/', DataToExport('All'))
+        buffer.add_data(get_step_data(2), (0, 1))
+        assert dte.get_data_from_full_name('det0D/data0D')[0][0, 1] == pytest.approx(2.)
+
+    def test_nav_values(self):
+        buffer = LiveDataBuffer((10,), distribution='spread')
+        buffer.add_nav_axes([Axis('act0', units='mm', data=np.array([0.]), index=0, spread_order=0)])
+        positions = [0.5, 0.1, 0.9]
+        for ind, position in enumerate(positions):
+            buffer.add_data(get_step_data(ind), (ind,), nav_values=[position])
+        dwa = buffer.load_all('/', DataToExport('All')).get_data_from_full_name('det0D/data0D')
+        assert dwa.distribution.name == 'spread'
+        assert dwa.shape == (3,)  # only the probed points
+        assert np.allclose(dwa[0], [0, 1, 2])
+        assert dwa.get_nav_axes()[0].label == 'act0'
+        assert np.allclose(dwa.get_nav_axes()[0].get_data(), positions)
+
+    def test_grid_interpolation(self):
+        buffer = LiveDataBuffer((20,), distribution='spread', grid_shape=(11, 6))
+        buffer.add_nav_axes(get_nav_axes())
+        points = np.concatenate(([[0, -1], [0, 1], [1, -1], [1, 1]], np.random.rand(6, 2)))
+        for ind, point in enumerate(points):
+            value = 2 * point[0] - point[1]
+            dte = DataToExport('step', data=[
+                DataFromPlugins('data0D', data=[np.array([value])], origin='det0D'),
+                DataFromPlugins('data1D', data=[value * np.ones((5, ))], origin='det1D',
+                                axes=[Axis('x', data=np.linspace(0, 1, 5), index=0)])])
+            buffer.add_data(dte, (ind,), nav_values=point)
+        dte = buffer.load_all('/', DataToExport('All'))
+
+        dwa = dte.get_data_from_full_name('det0D/data0D')
+        assert dwa.distribution.name == 'uniform'
+        assert dwa.shape == (11, 6)
+        assert dwa.nav_indexes == (0, 1)
+        axis_0, axis_1 = dwa.get_axis_from_index(0)[0], dwa.get_axis_from_index(1)[0]
+        assert np.allclose(axis_0.get_data(), np.linspace(0, 1, 11))
+        assert np.allclose(axis_1.get_data(), np.linspace(-1, 1, 6))
+        # a plane is exactly interpolated
+        assert np.allclose(dwa[0], 2 * axis_0.get_data()[:, None] - axis_1.get_data()[None, :])
+
+        dwa = dte.get_data_from_full_name('det1D/data1D')
+        assert dwa.shape == (11, 6, 5)
+        assert dwa.nav_indexes == (0, 1)
+        assert dwa.get_axis_from_index(2)[0].label == 'x'
+
+
+def test_interpolate_on_grid():
+    points = np.array([[0.], [1.], [0.25], [1.]])
+    grid_axes, arrays = interpolate_on_grid(points, [np.array([0., 4., 1., 4.])], (5,))
+    assert np.allclose(grid_axes[0], np.linspace(0, 1, 5))
+    assert np.allclose(arrays[0], [0., 1., 2., 3., 4.])
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq_data.data import DataToExport, DataSource, DataRaw
+from pymodaq.utils.averaging import RunningStatistics, Accumulator, AVERAGING_MODES
+
+
+def get_dte(values: np.ndarray) -> DataToExport:
+    return DataToExport('det', data=[DataRaw('data1D', data=[values, 2 * values], origin='det')])
+
+
+class TestRunningStatistics:
+    def test_mean_and_errors(self):
+        grid_shape = (2, 3)
+        rng = np.random.default_rng(0)
+        values = rng.normal(10., 2., (5,) + grid_shape + (4,))
+        statistics = RunningStatistics(grid_shape)
+        for ind_average in range(values.shape[0]):
+            for indexes in np.ndindex(grid_shape):
+                dte_mean = statistics.add(get_dte(values[(ind_average,) + indexes]), indexes)
+                n = ind_average + 1
+                dwa = dte_mean.get_data_from_name('data1D')
+                assert dwa.source == DataSource.raw
+                assert np.allclose(dwa[0], np.mean(values[:n][(slice(None),) + indexes], 0))
+                assert np.allclose(dwa[1], 2 * np.mean(values[:n][(slice(None),) + indexes], 0))
+                expected_errors = np.std(values[:n][(slice(None),) + indexes], 0, ddof=1) / np.sqrt(n) \
+                    if n > 1 else np.zeros(4)
+                assert np.allclose(dwa.get_error(0), expected_errors)
+        assert statistics.get_count(dwa, (1, 2)) == values.shape[0]
+
+    def test_memory(self):
+        statistics = RunningStatistics((10,))
+        dte = get_dte(np.ones((100,), dtype=np.uint16))
+        statistics.add(dte, (0,))
+        nbytes = statistics.nbytes
+        assert nbytes == 2 * 2 * 10 * 100 * 8  # means and m2s of both channels, float64
+        for _ in range(20):
+            statistics.add(dte, (0,))
+        assert statistics.nbytes == nbytes
+
+    def test_reallocation(self):
+        statistics = RunningStatistics((2,))
+        statistics.add(get_dte(np.ones((5,))), (0,))
+        dwa = statistics.add(get_dte(np.ones((8,))), (0,)).get_data_from_name('data1D')
+        assert dwa.shape == (8,)
+        assert statistics.get_count(dwa, (0,)) == 1
+
+    def test_indexes_out_of_grid(self):
+        statistics = RunningStatistics((2,))
+        with pytest.raises(IndexError):
+            statistics.add(get_dte(np.ones((5,))), (2,))
+
+
+class TestAccumulator:
+    @pytest.mark.parametrize('mode', AVERAGING_MODES)
+    def test_modes(self, mode):
+        values = np.random.default_rng(0).normal(10., 2., (12, 4))
+        accumulator = Accumulator(mode, alpha=0.3, window=5)
+        ema = values[0]
+        for ind, value in enumerate(values):
+            accumulator.add(get_dte(value))
+            if ind > 0:
+                ema = 0.7 * ema + 0.3 * value
+            expected = dict(mean=np.mean(values[:ind + 1], 0), ema=ema,
+                            rolling=np.mean(values[max(0, ind - 4):ind + 1], 0))[mode]
+            dte = accumulator.get_data()
+            assert dte.name == 'det'
+            assert np.allclose(dte[0][0], expected)
+            assert np.allclose(dte[0][1], 2 * expected)
+        assert accumulator.get_count(dte[0]) == values.shape[0]
+
+    def test_in_place(self):
+        accumulator = Accumulator('rolling', window=3)
+        dte = get_dte(np.ones((100,), dtype=np.uint16))
+        accumulator.add(dte)
+        sums = accumulator._channels[('det', 'data1D')].sums
+        nbytes = accumulator.nbytes
+        for _ in range(10):
+            accumulator.add(dte)
+        assert accumulator._channels[('det', 'data1D')].sums is sums
+        assert accumulator.nbytes == nbytes
+        assert np.allclose(accumulator.get_data()[0][0], 1)
+
+    def test_reallocation_and_reset(self):
+        accumulator = Accumulator()
+        accumulator.add(get_dte(np.ones((5,))))
+        accumulator.add(get_dte(np.ones((5,), dtype=np.int32)))  # dtype changed
+        dwa = accumulator.get_data()[0]
+        assert accumulator.get_count(dwa) == 1
+        accumulator.add(get_dte(3 * np.ones((8,))))  # shape changed
+        dwa = accumulator.get_data()[0]
+        assert dwa.shape == (8,)
+        assert np.allclose(dwa[0], 3)
+        accumulator.reset()
+        assert accumulator.get_count(dwa) == 0
+        assert len(accumulator.get_data()) == 0
+
+    def test_wrong_mode(self):
+        with pytest.raises(ValueError):
+            Accumulator('median')
@@ -7,6 +7,8 @@ import re
 from pathlib import Path
 import datetime
 
+from pymodaq_utils.utils import find_dict_in_list_from_key_val
+
 from pymodaq.utils import daq_utils as utils
 
 
@@ -17,3 +19,46 @@ def test_get_plugins():  # run on local with pytest option --import-mode=importl
     assert 'Mock' in [plug['name'] for plug in utils.get_plugins('daq_1Dviewer')]
     assert 'Mock' in [plug['name'] for plug in utils.get_plugins('daq_2Dviewer')]
 
+
+
+class TestPluginIndex:
+    @pytest.fixture
+    def index_path(self, tmp_path, monkeypatch):
+        path = tmp_path.joinpath(utils.PLUGIN_INDEX_NAME)
+        monkeypatch.setattr(utils, 'get_plugin_index_path', lambda: path)
+        return path
+
+    def test_plugin_info(self):
+        plugin = find_dict_in_list_from_key_val(utils.get_plugins('daq_move'), 'name', 'Mock')
+        assert isinstance(plugin, utils.PluginInfo)
+        assert plugin.class_name == 'DAQ_Move_Mock'
+        assert plugin.get_class().__name__ == 'DAQ_Move_Mock'
+        assert hasattr(plugin['module'], 'daq_move_Mock')
+        assert plugin['parent_module'].__name__ == plugin['parent_module_name']
+        assert 'multiaxes' in [param['name'] for param in plugin['params']]
+
+        plugin = find_dict_in_list_from_key_val(utils.get_plugins('daq_2Dviewer'), 'name', 'Mock')
+        assert plugin.plugin_module_name == 'daq_2Dviewer_Mock'
+        assert plugin.get_class().__name__ == 'DAQ_2DViewer_Mock'
+
+    def test_save_load(self, index_path):
+        assert utils.load_plugin_index() is None
+        plugins = utils.build_plugin_index()
+        utils.save_plugin_index(plugins)
+        assert index_path.is_file()
+        loaded = utils.load_plugin_index()
+        assert loaded == plugins
+        assert all([isinstance(plugin, utils.PluginInfo) for plugin in loaded])
+
+    def test_key_change(self, index_path):
+        key = utils.get_plugin_index_key()
+        assert 'pymodaq_plugins_mock' in key
+        utils.save_plugin_index(utils.build_plugin_index(), key)
+        assert utils.load_plugin_index(key) is not None
+
+        key['pymodaq_plugins_mock']['version'] = '0.0.0'
+        assert utils.load_plugin_index(key) is None
+
+    def test_corrupted_index(self, index_path):
+        index_path.write_text('not a json')
+        assert utils.load_plugin_index() is None
@@ -117,3 +117,27 @@ class TestDataActuator:
         assert data == data_mod.DataActuator(data=[ARRAY])
         assert data < 2.001
         assert data <= 2
+
+
+class TestReadOnly:
+    def test_set_read_only(self):
+        dte = data_mod.DataToExport('dte', data=[init_data(data=DATA2D.copy(), Ndata=2)])
+        assert data_mod.set_read_only(dte) is dte
+        for array in dte[0].data:
+            assert not array.flags.writeable
+            with pytest.raises(ValueError):
+                array[0, 0] = 1
+
+    def test_take_ownership(self):
+        dwa = init_data(data=DATA2D.copy(), Ndata=2)
+        dte = data_mod.DataToExport('dte', data=[dwa], control_module='DAQ_Viewer')
+        dte_owned = data_mod.take_ownership(dte)
+        assert dte_owned.name == 'dte'
+        assert dte_owned.timestamp == dte.timestamp
+        assert dte_owned.control_module == 'DAQ_Viewer'
+        assert data_mod.nbytes(dte_owned) == 2 * DATA2D.nbytes
+        for array, array_owned in zip(dte[0].data, dte_owned[0].data):
+            assert array.flags.writeable
+            assert not array_owned.flags.writeable
+            assert not np.shares_memory(array, array_owned)
+            assert np.allclose(array, array_owned)
@@ -5,13 +5,24 @@ Created the 23/11/2022
 @author: Sebastien Weber
 """
 
+from unittest import mock
+from threading import Event, current_thread
+
 import numpy as np
 import pytest
 
+from pymodaq_data.data import DataToExport, Axis
 from pymodaq_data.h5modules.saving import H5SaverLowLevel
-from pymodaq.utils.h5modules.module_saving import DetectorSaver, ScanSaver
+from pymodaq_data.h5modules.data_saving import DataLoader
+from pymodaq.utils.data import DataFromPlugins
+from pymodaq.utils.scanner.profiler import StepProfiler, STEP_EVENTS
+from pymodaq.utils.h5modules.module_saving import (DetectorSaver, ScanSaver, DetectorExtendedSaver,
+                                                   DetectorEnlargeableNavSaver, H5WriterThread,
+                                                   h5_lock)
 
 from pymodaq.utils.parameter import Parameter
+from pymodaq.utils.scanner.profiler import StepProfiler, STEP_EVENTS
+from pymodaq.utils.averaging import RunningStatistics
 from pymodaq.control_modules.mocks import MockScan, MockDAQMove, MockDAQViewer
 
 @pytest.fixture()
@@ -79,3 +90,394 @@ class TestScanSaver:
         assert node3 == node2
 
 
+
+
+def get_step_data(ind: int) -> DataToExport:
+    return DataToExport('step', data=[
+        DataFromPlugins('data0D', data=[np.array([float(ind)]), np.array([-float(ind)])]),
+        DataFromPlugins('data1D', data=[ind * np.arange(5.)],
+                        axes=[Axis('x', data=np.linspace(0, 1, 5), index=0)]),
+    ])
+
+
+class TestDetectorExtendedSaver:
+    def test_add_data_block(self, get_h5saver_module):
+        h5saver = get_h5saver_module
+        scan_shape = (3, 4)
+        mock_det = MockDAQViewer(h5saver)
+        det_saver = DetectorExtendedSaver(mock_det, scan_shape)
+        det_saver.h5saver = h5saver
+        node = det_saver.get_set_node()
+
+        indexes = list(np.ndindex(scan_shape))
+        for ind_row in range(scan_shape[0]):
+            steps = [ind for ind in range(len(indexes)) if indexes[ind][0] == ind_row]
+            det_saver.add_data_block(node, [get_step_data(ind) for ind in steps], [indexes[ind] for ind in steps])
+
+        dte = DataToExport('loaded')
+        DataLoader(h5saver).load_all(node, dte)
+        assert len(dte) == 2
+        for ind, index in enumerate(indexes):
+            for dwa in dte:
+                if dwa.name == 'data0D':
+                    assert dwa[0][index] == pytest.approx(ind)
+                    assert dwa[1][index] == pytest.approx(-ind)
+                else:
+                    assert np.allclose(dwa[0][index], ind * np.arange(5.))
+
+
+class TestH5WriterThread:
+    def test_batches(self):
+        written = []
+        release = Event()
+
+        def write_batch(items):
+            release.wait()
+            written.append(items)
+
+        writer = H5WriterThread(write_batch, maxsize=100, batch_size=20)
+        writer.start()
+        assert writer.running
+        for ind in range(50):
+            writer.put(ind)
+        release.set()
+        writer.join()
+        assert [item for items in written for item in items] == list(range(50))
+        assert writer.n_written == 50
+        assert writer.n_batches < 50
+        assert all([len(items) <= 20 for items in written])
+        writer.stop()
+        assert not writer.running
+
+    def test_stop_writes_pending(self):
+        written = []
+        writer = H5WriterThread(written.extend, maxsize=2)
+        writer.start()
+        for ind in range(10):
+            writer.put(ind)
+        writer.stop()
+        assert written == list(range(10))
+
+    def test_backpressure(self):
+        written = []
+        release = Event()
+
+        def write_batch(items):
+            assert h5_lock._is_owned()
+            release.wait()
+            written.extend(items)
+
+        writer = H5WriterThread(write_batch, maxsize=2, batch_size=1)
+        writer.start()
+        for ind in range(5):
+            writer.put(ind)  # never blocks the caller
+        assert writer.full
+        assert not writer.wait_room(timeout=0.05)
+        release.set()
+        assert writer.wait_room(timeout=5.)
+        writer.stop()
+        assert written == list(range(5))
+
+    def test_exception(self):
+        def write_batch(items):
+            raise ValueError
+
+        writer = H5WriterThread(write_batch)
+        writer.start()
+        writer.put(0)
+        writer.join()
+        assert writer.running
+        writer.stop()
+
+
+class MockDAQViewerData(MockDAQViewer):
+    def __init__(self, h5saver, title, scan_shape):
+        super().__init__(h5saver, title)
+        self.module_and_data_saver = DetectorExtendedSaver(self, scan_shape)
+        self.data = None
+        self.bkg_to_save = None
+
+    def get_data_to_save(self, dte: DataToExport = None):
+        return self.data if dte is None else dte
+
+
+class TestScanSaverAsynchronous:
+    def test_add_data(self, get_h5saver_module):
+        h5saver = get_h5saver_module
+        scan_shape = (3, 4)
+        mock_scan_module = MockScan(h5saver)
+        detector = MockDAQViewerData(h5saver, 'Det', scan_shape)
+        mock_scan_module.modules_manager.modules = [detector]
+        mock_scan_module.modules_manager.modules_all = [detector]
+        mock_scan_module.modules_manager.detectors = [detector]
+        scan_saver = ScanSaver(mock_scan_module, asynchronous=True)
+        scan_saver.h5saver = h5saver
+        scan_node = scan_saver.get_set_node()
+        scan_saver.start_writer()
+
+        scan_saver.add_nav_axes([Axis('act0', data=np.linspace(0, 1, scan_shape[0]), index=0),
+                                 Axis('act1', data=np.linspace(0, 1, scan_shape[1]), index=1)])
+        indexes = list(np.ndindex(scan_shape))
+        for ind, index in enumerate(indexes):
+            detector.data = get_step_data(ind)
+            scan_saver.add_data(indexes=index)
+        scan_saver.stop_writer()
+
+        dte = DataToExport('loaded')
+        DataLoader(h5saver).load_all(scan_node, dte)
+        assert len(dte) == 2
+        for dwa in dte:
+            assert len(dwa.get_nav_axes()) == 2
+        dwa = dte.get_data_from_name('data0D')
+        for ind, index in enumerate(indexes):
+            assert dwa[0][index] == pytest.approx(ind)
+
+    def test_save_timings(self, get_h5saver_module):
+        h5saver = get_h5saver_module
+        scan_shape = (4,)
+        mock_scan_module = MockScan(h5saver)
+        detector = MockDAQViewerData(h5saver, 'Det', scan_shape)
+        mock_scan_module.modules_manager.modules = [detector]
+        mock_scan_module.modules_manager.modules_all = [detector]
+        mock_scan_module.modules_manager.detectors = [detector]
+        scan_saver = ScanSaver(mock_scan_module, asynchronous=True)
+        scan_saver.profiler = StepProfiler(scan_shape[0])
+        marking_threads = set([])
+        mark = scan_saver.profiler.mark
+
+        def mark_from(step, event):
+            marking_threads.add(current_thread().name)
+            mark(step, event)
+
+        scan_saver.profiler.mark = mark_from
+        scan_saver.h5saver = h5saver
+        scan_saver.get_set_node()
+        scan_saver.start_writer()
+        for ind in range(scan_shape[0]):
+            detector.data = get_step_data(ind)
+            scan_saver.add_data(indexes=(ind,), step=ind)
+        scan_saver.stop_writer()
+
+        assert marking_threads == {'H5WriterThread'}  # marked when actually written
+        timestamps = scan_saver.profiler.timestamps
+        assert np.all(np.isfinite(timestamps[:, STEP_EVENTS.index('save_start')]))
+        assert np.all(timestamps[:, STEP_EVENTS.index('save_done')] >=
+                      timestamps[:, STEP_EVENTS.index('save_start')])
+
+    def test_add_data_streaming(self, get_h5saver_module):
+        h5saver = get_h5saver_module
+        scan_shape = (5,)
+        mock_scan_module = MockScan(h5saver)
+        detectors = [MockDAQViewerData(h5saver, 'Det0', scan_shape), MockDAQViewerData(h5saver, 'Det1', scan_shape)]
+        mock_scan_module.modules_manager.modules = detectors
+        mock_scan_module.modules_manager.modules_all = detectors
+        mock_scan_module.modules_manager.detectors = detectors
+        scan_saver = ScanSaver(mock_scan_module, asynchronous=True)
+        scan_saver.h5saver = h5saver
+        scan_node = scan_saver.get_set_node()
+        scan_saver.start_writer()
+
+        scan_saver.add_nav_axes([Axis('act0', data=np.linspace(0, 1, scan_shape[0]), index=0)])
+        # frames of a single detector, stored in a non sequential order, the same position being written twice
+        for ind in [0, 2, 1, 4, 3, 4]:
+            dte = get_step_data(ind)
+            dte.name = 'Det1'
+            scan_saver.add_data(dte, indexes=(ind,))
+        scan_saver.stop_writer()
+
+        dte = DataToExport('loaded')
+        DataLoader(h5saver).load_all(detectors[0].module_and_data_saver.get_set_node(scan_node), dte)
+        assert len(dte) == 0  # only the detector named as the given data is saved
+        dte = DataToExport('loaded')
+        DataLoader(h5saver).load_all(detectors[1].module_and_data_saver.get_set_node(scan_node), dte)
+        dwa = dte.get_data_from_name('data0D')
+        assert np.allclose(dwa[0], np.arange(5))
+
+    def test_add_data_pipelined(self, get_h5saver_module):
+        h5saver = get_h5saver_module
+        scan_shape = (5,)
+        mock_scan_module = MockScan(h5saver)
+        detectors = [MockDAQViewerData(h5saver, 'Det0', scan_shape), MockDAQViewerData(h5saver, 'Det1', scan_shape)]
+        mock_scan_module.modules_manager.modules = detectors
+        mock_scan_module.modules_manager.modules_all = detectors
+        mock_scan_module.modules_manager.detectors = detectors
+        scan_saver = ScanSaver(mock_scan_module, asynchronous=True)
+        scan_saver.h5saver = h5saver
+        scan_node = scan_saver.get_set_node()
+        scan_saver.start_writer()
+
+        scan_saver.add_nav_axes([Axis('act0', data=np.linspace(0, 1, scan_shape[0]), index=0)])
+        for ind in range(scan_shape[0]):
+            dtes = [get_step_data(ind), get_step_data(-ind)]
+            dtes[0].name, dtes[1].name = 'Det0', 'Det1'
+            for detector in detectors:  # the detectors current data already belong to the next step
+                detector.data = get_step_data(ind + 1)
+            scan_saver.add_data(indexes=(ind,), dtes=dtes)
+        scan_saver.stop_writer()
+
+        for detector, sign in zip(detectors, [1, -1]):
+            dte = DataToExport('loaded')
+            DataLoader(h5saver).load_all(detector.module_and_data_saver.get_set_node(scan_node), dte)
+            assert np.allclose(dte.get_data_from_name('data0D')[0], sign * np.arange(5))
+
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_add_data_adaptive(get_h5saver_module, asynchronous):
+    h5saver = get_h5saver_module
+    mock_scan_module = MockScan(h5saver)
+    detector = MockDAQViewerData(h5saver, 'Det0', (1,))
+    detector.module_and_data_saver = DetectorEnlargeableNavSaver(detector, ['act0', 'act1'], ['mm', 'um'])
+    mock_scan_module.modules_manager.modules = [detector]
+    mock_scan_module.modules_manager.modules_all = [detector]
+    mock_scan_module.modules_manager.detectors = [detector]
+    scan_saver = ScanSaver(mock_scan_module, asynchronous=asynchronous)
+    scan_saver.h5saver = h5saver
+    scan_node = scan_saver.get_set_node()
+    scan_saver.start_writer()
+
+    positions = np.random.rand(7, 2)
+    for ind, position in enumerate(positions):
+        detector.data = get_step_data(ind)
+        scan_saver.add_data(indexes=(ind,), distribution='spread', axis_values=list(position))
+    scan_saver.stop_writer()
+
+    dte = DataToExport('loaded')
+    DataLoader(h5saver).load_all(detector.module_and_data_saver.get_set_node(scan_node), dte)
+    dwa = dte.get_data_from_name('data0D')
+    assert dwa.distribution.name == 'spread'
+    assert np.allclose(dwa[0], np.arange(7))
+    nav_axes = sorted(dwa.get_nav_axes(), key=lambda axis: axis.spread_order)
+    assert [axis.label for axis in nav_axes] == ['act0', 'act1']
+    assert [axis.units for axis in nav_axes] == ['mm', 'um']
+    for ind, axis in enumerate(nav_axes):
+        assert np.allclose(axis.get_data(), positions[:, ind])
+
+
+def test_add_timings(get_h5saver_module):
+    h5saver = get_h5saver_module
+    mock_scan_module = MockScan(h5saver)
+    detector = MockDAQViewerData(h5saver, 'Det0', (3,))
+    mock_scan_module.modules_manager.modules = [detector]
+    mock_scan_module.modules_manager.modules_all = [detector]
+    mock_scan_module.modules_manager.detectors = [detector]
+    scan_saver = ScanSaver(mock_scan_module)
+    scan_saver.h5saver = h5saver
+    scan_node = scan_saver.get_set_node()
+
+    profiler = StepProfiler(3)
+    for step in range(3):
+        profiler.mark(step, 'move_start')
+        profiler.mark(step, 'move_done')
+    scan_saver.add_timings(profiler.to_dte())
+
+    dte = DataToExport('loaded')
+    DataLoader(h5saver).load_all(h5saver.get_node(scan_node, 'Timings'), dte)
+    dwa = dte.get_data_from_name('step_timings')
+    assert dwa.labels == STEP_EVENTS
+    assert np.allclose(dwa[0], profiler.timestamps[:, 0])
+
+
+def test_progress(get_h5saver_module):
+    h5saver = get_h5saver_module
+    scan_shape = (2, 3)
+    mock_scan_module = MockScan(h5saver)
+    detector = MockDAQViewerData(h5saver, 'Det0', scan_shape)
+    mock_scan_module.modules_manager.modules = [detector]
+    mock_scan_module.modules_manager.modules_all = [detector]
+    mock_scan_module.modules_manager.detectors = [detector]
+    scan_saver = ScanSaver(mock_scan_module, asynchronous=True)
+    scan_saver.h5saver = h5saver
+    scan_node = scan_saver.get_set_node()
+    assert scan_saver.get_progress(scan_node)[0] is None
+    assert scan_saver.get_scan_positions(scan_node) is None
+    positions = np.array([[x, y] for x in range(scan_shape[0]) for y in range(scan_shape[1])], dtype=float)
+    scan_saver.init_progress(scan_shape, positions)
+    extended_shape, written = scan_saver.get_progress(scan_node)
+    assert extended_shape == scan_shape
+    assert not np.any(written)  # no data arrays yet
+    assert np.allclose(scan_saver.get_scan_positions(scan_node), positions)
+
+    assert scan_saver.get_nav_axes(scan_node) == []
+    scan_saver.add_nav_axes([Axis('act0', data=np.linspace(0, 1, scan_shape[0]), index=0)])
+    nav_axes = scan_saver.get_nav_axes(scan_node)
+    assert [nav_axis.label for nav_axis in nav_axes] == ['act0']
+    assert np.allclose(nav_axes[0].get_data(), np.linspace(0, 1, scan_shape[0]))
+
+    scan_saver.start_writer()
+    for ind, index in enumerate([(0, 0), (0, 1), (0, 2), (1, 1)]):
+        detector.data = get_step_data(ind)
+        scan_saver.add_data(indexes=index)
+    scan_saver.stop_writer()
+    scan_saver.stop_progress()
+
+    extended_shape, written = scan_saver.get_progress(scan_node)
+    assert np.array_equal(written, [[True, True, True], [False, True, False]])
+
+    # resuming appends to the same journal
+    scan_saver.init_progress(scan_shape)
+    scan_saver.start_writer()
+    detector.data = get_step_data(4)
+    scan_saver.add_data(indexes=(1, 0))
+    scan_saver.stop_writer()
+    assert np.array_equal(scan_saver.get_progress(scan_node)[1], [[True, True, True], [True, True, False]])
+
+    # steps whose data could not be taken are not journaled
+    scan_saver.start_writer()
+    detector.data = None
+    scan_saver.add_data(indexes=(1, 2))
+    detector.get_data_to_save = mock.Mock(side_effect=ValueError)
+    scan_saver.add_data(indexes=(1, 2))
+    scan_saver.stop_writer()
+    del detector.get_data_to_save
+    assert np.array_equal(scan_saver.get_progress(scan_node)[1], [[True, True, True], [True, True, False]])
+
+    dte = DataToExport('loaded')
+    DataLoader(h5saver).load_all(scan_node, dte)  # the journal is not taken as data
+    assert np.allclose(dte.get_data_from_name('data0D')[0][1, 0], 4)
+
+
+def test_running_mean(get_h5saver_module):
+    h5saver = get_h5saver_module
+    scan_shape = (3,)
+    Naverage = 4
+    mock_scan_module = MockScan(h5saver)
+    detector = MockDAQViewerData(h5saver, 'Det0', scan_shape)
+    mock_scan_module.modules_manager.modules = [detector]
+    mock_scan_module.modules_manager.modules_all = [detector]
+    mock_scan_module.modules_manager.detectors = [detector]
+    scan_saver = ScanSaver(mock_scan_module, asynchronous=True)
+    scan_saver.h5saver = h5saver
+    scan_node = scan_saver.get_set_node()
+    scan_saver.init_repetitions((Naverage,) + scan_shape,
+                                [Axis('act0', data=np.linspace(0, 1, scan_shape[0]), index=1),
+                                 Axis('Average', data=np.arange(Naverage, dtype=float), index=0)])
+    scan_saver.start_writer()
+    scan_saver.add_nav_axes([Axis('act0', data=np.linspace(0, 1, scan_shape[0]), index=0)])
+
+    statistics = RunningStatistics(scan_shape)
+    for ind_average in range(Naverage):
+        for ind_scan in range(scan_shape[0]):
+            dte = get_step_data(ind_average * 10 + ind_scan)
+            dte.name = 'Det0'
+            scan_saver.add_data(indexes=(ind_average, ind_scan), dtes=[dte], repetitions=True)
+            scan_saver.add_data(indexes=(ind_scan,), dtes=[statistics.add(dte, (ind_scan,))])
+    scan_saver.stop_writer()
+
+    dte = DataToExport('loaded')
+    DataLoader(h5saver).load_all(detector.module_and_data_saver.get_set_node(scan_node), dte)
+    assert len(dte) == 2
+    dwa = dte.get_data_from_name('data0D')
+    values = np.array([[ind_average * 10 + ind_scan for ind_scan in range(scan_shape[0])]
+                       for ind_average in range(Naverage)], dtype=float)
+    assert np.allclose(dwa[0], np.mean(values, 0))
+    assert np.allclose(dwa[1], -np.mean(values, 0))
+    assert dwa.errors is not None
+    assert np.allclose(dwa.get_error(0), np.std(values, 0, ddof=1) / np.sqrt(Naverage))
+
+    dte = DataToExport('loaded')
+    repetitions_group = h5saver.get_node(scan_node, 'Repetitions')
+    DataLoader(h5saver).load_all(repetitions_group, dte)
+    dwa = dte.get_data_from_name('data0D')
+    assert dwa.shape == (Naverage,) + scan_shape
+    assert np.allclose(dwa[0], values)
+    assert len(dwa.get_nav_axes()) == 2
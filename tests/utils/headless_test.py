@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from pymodaq_data.data import DataToExport
+from pymodaq_data.h5modules.saving import H5SaverLowLevel
+from pymodaq_data.h5modules.data_saving import DataLoader
+
+from pymodaq.utils.headless import HeadlessActuator, HeadlessDetector
+
+
+SCAN_SCRIPT = textwrap.dedent("""
+    import sys
+    from qtpy import QtWidgets
+    from pymodaq.utils.headless import get_headless_app, HeadlessActuator, HeadlessDetector, HeadlessScan
+
+    app = get_headless_app()
+    actuator = HeadlessActuator('Mock', 'Xaxis')
+    detector = HeadlessDetector('DAQ0D', 'Mock', 'det')
+    actuator.init()
+    detector.init()
+    scan = HeadlessScan([actuator], [detector])
+    scan.settings.child('scan_options', 'scan_average').setValue(2)
+    scan.set_scanner('Scan1D', 'Linear', start=0., stop=4., step=1.)
+    scan.run(sys.argv[1])
+    actuator.close()
+    detector.close()
+    print(type(QtWidgets.QApplication.instance()).__name__)
+""")
+
+
+def test_headless_scan(tmp_path):
+    file_path = tmp_path.joinpath('headless.h5')
+    output = subprocess.run([sys.executable, '-c', SCAN_SCRIPT, str(file_path)], capture_output=True, text=True,
+                            timeout=120).stdout
+    assert output.strip().splitlines()[-1] == 'QCoreApplication'  # no widget could have been created
+
+    h5saver = H5SaverLowLevel()
+    h5saver.init_file(file_name=file_path)
+    try:
+        scan_node = h5saver.get_last_group(h5saver.raw_group, 'scan')
+        assert scan_node.attrs['scan_done']
+        assert scan_node.attrs['scan_type'] == 'Scan1D'
+        assert sorted(h5saver.get_children(scan_node)) == \
+            ['Actuator000', 'Detector000', 'NavAxes', 'Progress', 'ScanPositions', 'Timings']
+        assert h5saver.get_node(scan_node, 'Progress').read().shape == (10, 2)
+
+        dte = DataToExport('loaded')
+        DataLoader(h5saver).load_all(h5saver.get_node(scan_node, 'Detector000'), dte)
+        dwa = dte.get_data_from_name('Mock0D')
+        assert dwa.shape == (2, 5)
+        nav_axes = sorted(dwa.get_nav_axes(), key=lambda axis: axis.index)
+        assert [axis.label for axis in nav_axes] == ['Average', 'Xaxis']
+        assert np.allclose(nav_axes[1].get_data(), np.linspace(0, 4, 5))
+    finally:
+        h5saver.close_file()
+
+
+def test_headless_modules(qtbot):
+    actuator = HeadlessActuator('Mock', 'Xaxis')
+    detector = HeadlessDetector('DAQ0D', 'Mock', 'det')
+    assert actuator.init()
+    assert detector.init()
+    try:
+        value = actuator.move(2.)
+        assert value.name == 'Xaxis'
+        assert value.value() == pytest.approx(2., abs=actuator.settings['move_settings', 'epsilon'])
+
+        dte = detector.grab()
+        assert dte.name == 'det'
+        assert all([dwa.origin == 'det' for dwa in dte])
+
+        with pytest.raises(ValueError):
+            HeadlessActuator('NotAnActuator')
+    finally:
+        actuator.close()
+        detector.close()
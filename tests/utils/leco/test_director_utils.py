@@ -2,7 +2,7 @@
 import pytest
 
 try:
-    from pyleco.test import FakeDirector
+    from pyleco.test import FakeDirector, FakeCommunicator
 
     from pymodaq.utils.leco.director_utils import ActuatorDirector, DetectorDirector
     from pymodaq.utils.leco.pymodaq_listener import MoveActorHandler, ViewerActorHandler
@@ -51,5 +51,16 @@ try:
         getattr(detector_director, m)(*args)
         # asserts that no error is raised in the "ask_rpc" method
 
+
+    def test_pipelined_requests():
+        director = ActuatorDirector(actor="actor", communicator=FakeCommunicator("director"), pipelined=True)
+        director.move_abs(5)
+        director.get_actuator_value()
+        assert director.request_tracker.pending_methods() == ["move_abs", "get_actuator_value"]
+        assert [message.data["method"] for message in director.communicator._s] == \
+            ["move_abs", "get_actuator_value"]
+        method, _ = director.request_tracker.resolve(director.communicator._s[0].conversation_id)
+        assert method == "move_abs"
+
 except ImportError as e:
     pass
\ No newline at end of file
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import time
+
+import numpy as np
+import pytest
+
+from pymodaq_utils.utils import ThreadCommand
+from pymodaq_data.data import DataToExport, DataRaw
+
+from pymodaq.control_modules.move_utility_classes import DataActuator
+from pymodaq.utils.leco.utils import FrameCounter, start_coordinator
+from pymodaq.utils.leco.pymodaq_listener import (ActorListener, PymodaqListener, LECOViewerCommands,
+                                                 LECOMoveCommands, LECOClientCommands)
+from pymodaq.utils.leco.director_utils import DetectorDirector, ActuatorDirector
+
+from pyleco.directors.director import Director
+from pymodaq_utils.serialize.serializer_legacy import DeSerializer
+
+
+def test_frame_counter():
+    counter = FrameCounter()
+    assert [counter.count(index) for index in (3, 4, 7, 8, 10)] == [0, 0, 2, 0, 1]
+    assert counter.received == 5
+    assert counter.dropped == 3
+
+    assert counter.count(0) == 0  # the publisher restarted
+    assert counter.count(2) == 1
+    assert counter.dropped == 4
+
+    counter.reset()
+    assert counter.received == counter.dropped == 0
+    assert counter.count(5) == 0
+
+
+def wait_for(predicate, timeout=5.):
+    start = time.perf_counter()
+    while not predicate():
+        if time.perf_counter() - start > timeout:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+@pytest.fixture(scope='module')
+def coordinator():
+    processes = start_coordinator()
+
+    def is_running():
+        try:
+            with Director(actor="COORDINATOR", timeout=0.2) as director:
+                return director.communicator.namespace is not None
+        except Exception:
+            return False
+
+    try:
+        if not wait_for(is_running, timeout=10.):
+            pytest.skip('Could not start a local LECO coordinator')
+        yield
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+
+class DataReceiver:
+    def __init__(self):
+        self.dtes = []
+        self.positions = []
+        self.moves_done = []
+
+    def set_data(self, data, additional_payload=None):
+        self.dtes.append(DeSerializer(additional_payload[0]).dte_deserialization())
+
+    def set_position(self, position, additional_payload=None):
+        self.positions.append(DeSerializer(additional_payload[0]).dwa_deserialization())
+
+    def set_move_done(self, position, additional_payload=None):
+        self.moves_done.append(DeSerializer(additional_payload[0]).dwa_deserialization())
+
+
+def test_streaming(qtbot, coordinator):
+    actor = ActorListener(name='streaming_actor')
+    director_listener = PymodaqListener(name='streaming_director')
+    actor.start_listen()
+    director_listener.start_listen()
+    receiver = DataReceiver()
+    director_listener.register_data_method(receiver.set_data)
+    director_listener.register_data_method(receiver.set_position)
+    director_listener.register_binary_rpc_method(receiver.set_move_done, accept_binary_input=True)
+    commands = []
+    actor.cmd_signal.connect(commands.append)
+    try:
+        communicator = director_listener.get_communicator()
+        assert wait_for(lambda: actor.communicator.namespace is not None and
+                        communicator.namespace is not None)
+        director = DetectorDirector(actor='streaming_actor', communicator=communicator)
+        director.set_remote_name(communicator.full_name)
+        topic = director.set_streaming(True)
+        assert topic == actor.communicator.full_name
+        communicator.subscribe(topic)
+
+        def frame(index: int) -> DataToExport:
+            return DataToExport('stream', data=[DataRaw('frame', data=[np.full((8, 8), index)])])
+
+        # the subscription has to reach the publisher through the proxy: nothing is received until then
+        assert wait_for(lambda: actor.queue_command(ThreadCommand(LECOViewerCommands.DATA_READY, frame(-1)))
+                        or len(receiver.dtes) > 0)
+        time.sleep(0.2)
+        receiver.dtes = []
+        n_received = director_listener.frame_counter.received
+
+        for index in range(20):
+            actor.queue_command(ThreadCommand(LECOViewerCommands.DATA_READY, frame(index)))
+        actor.queue_command(ThreadCommand(LECOMoveCommands.POSITION, [DataActuator('pos', data=1.5)]))
+        assert wait_for(lambda: len(receiver.positions) == 1)
+
+        assert [int(dte[0][0][0, 0]) for dte in receiver.dtes] == list(range(20))
+        assert director_listener.frame_counter.received == n_received + 21
+        assert director_listener.frame_counter.dropped == 0
+        assert receiver.positions[0].value() == pytest.approx(1.5)
+
+        actor.queue_command(ThreadCommand(LECOMoveCommands.MOVE_DONE, [DataActuator('pos', data=2.5)]))
+        assert len(receiver.moves_done) == 1  # sent with a RPC, not published
+        assert receiver.moves_done[0].value() == pytest.approx(2.5)
+        assert director_listener.frame_counter.received == n_received + 21
+
+        director.start_grab(grabber_type='2D')
+        director.stop_grab()
+
+        def grab_commands():
+            return [command.command for command in commands if 'grab' in command.command]
+        qtbot.waitUntil(lambda: len(grab_commands()) == 2)  # emitted from the listener thread
+        assert grab_commands() == [LECOViewerCommands.START_GRAB, LECOViewerCommands.STOP_GRAB]
+
+        director.set_streaming(False)
+        assert not actor.streaming
+    finally:
+        actor.stop_listen()
+        director_listener.stop_listen()
+
+
+def test_pipelined_requests(qtbot, coordinator):
+    actors = [ActorListener(name=f'pipelined_actor{ind}') for ind in range(2)]
+    director_listener = PymodaqListener(name='pipelined_director')
+    for listener in actors + [director_listener]:
+        listener.start_listen()
+    actor_commands = [[], []]
+    for actor, commands in zip(actors, actor_commands):
+        actor.cmd_signal.connect(commands.append)
+    replies = []
+    director_listener.cmd_signal.connect(replies.append)
+    try:
+        communicator = director_listener.get_communicator()
+        assert wait_for(lambda: all([listener.communicator.namespace is not None
+                                     for listener in actors + [director_listener]]))
+        directors = [ActuatorDirector(actor=actor.name, communicator=communicator,
+                                      request_tracker=director_listener.request_tracker, pipelined=True)
+                     for actor in actors]
+        for position in range(3):  # sent at once, without waiting for the answers
+            for director in directors:
+                director.move_abs(position)
+        directors[0].send_rpc('not_a_method')
+        assert director_listener.request_tracker.n_pending > 0
+
+        def rpc_replies(command: str):
+            return [reply for reply in replies if reply.command == command]
+        qtbot.waitUntil(lambda: len(rpc_replies(LECOClientCommands.RPC_REPLY)) == 6 and
+                        len(rpc_replies(LECOClientCommands.RPC_ERROR)) == 1)
+
+        assert director_listener.request_tracker.n_pending == 0
+        for commands in actor_commands:
+            assert [command.attribute[0] for command in commands if command.command == 'move_abs'] == [0, 1, 2]
+        assert all([reply.attribute[0] == 'move_abs' for reply in rpc_replies(LECOClientCommands.RPC_REPLY)])
+        assert rpc_replies(LECOClientCommands.RPC_ERROR)[0].attribute[0] == 'not_a_method'
+        assert director_listener.request_tracker.get_statistics()['move_abs']['count'] == 6
+        assert director_listener.request_tracker.get_latency('move_abs') > 0
+    finally:
+        for listener in actors + [director_listener]:
+            listener.stop_listen()
@@ -3,7 +3,7 @@ import pytest
 
 from pymodaq.control_modules.daq_move import DataActuator
 
-from pymodaq.utils.leco.utils import serialize_object
+from pymodaq.utils.leco.utils import serialize_object, RequestTracker
 
 
 @pytest.mark.parametrize("value", (
@@ -19,3 +19,36 @@ def test_data_actuator():
     value = DataActuator(data=10.5)
     serialized = serialize_object(value)
     assert isinstance(serialized, str)
+
+
+def test_request_tracker():
+    tracker = RequestTracker(n_latencies=2)
+    assert tracker.get_latency() is None
+    tracker.add(b'cid0', 'move_abs')
+    tracker.add(b'cid1', 'get_actuator_value')
+    assert tracker.n_pending == 2
+    assert sorted(tracker.pending_methods()) == ['get_actuator_value', 'move_abs']
+
+    method, latency = tracker.resolve(b'cid0')
+    assert method == 'move_abs'
+    assert latency >= 0
+    assert tracker.resolve(b'cid0') is None  # not tracked anymore
+    assert tracker.get_latency('move_abs') == pytest.approx(latency)
+    assert tracker.get_latency('get_actuator_value') is None
+
+    for ind in range(3):
+        tracker.add(bytes([ind]), 'move_abs')
+        tracker.resolve(bytes([ind]))
+    assert tracker.get_statistics()['move_abs']['count'] == 2  # only the last ones are kept
+
+    assert tracker.discard_older(10.) == []
+    assert tracker.discard_older(0.) == ['get_actuator_value']
+    assert tracker.n_pending == 0
+
+
+def test_request_tracker_lost_reply():
+    tracker = RequestTracker()
+    tracker.add(b'cid0', 'get_actuator_value')
+    assert tracker.pending_methods(10.) == ['get_actuator_value']
+    assert tracker.pending_methods(0.) == []  # its reply is considered lost
+    assert tracker.n_pending == 0
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import time
+
+import numpy as np
+import pytest
+from qtpy import QtCore
+
+from pymodaq_utils.utils import ThreadCommand
+from pymodaq_data.data import DataToExport, DataWithAxes, DataSource
+
+from pymodaq.utils.managers.modules_manager import ModulesDoneWaiter, ModulesInitializer, ModulesManager
+
+
+class Notifier(QtCore.QThread):
+    def __init__(self, waiter: ModulesDoneWaiter, n_notify: int, delay_ms: int = 10):
+        super().__init__()
+        self.waiter = waiter
+        self.n_notify = n_notify
+        self.delay_ms = delay_ms
+
+    def run(self):
+        for _ in range(self.n_notify):
+            QtCore.QThread.msleep(self.delay_ms)
+            self.waiter.notify()
+
+
+class TestModulesDoneWaiter:
+    def test_arm(self, qtbot):
+        waiter = ModulesDoneWaiter()
+        assert waiter.done
+        waiter.arm(2)
+        assert not waiter.done
+        assert not waiter.notify()
+        assert waiter.notify()
+        assert waiter.done
+        assert not waiter.notify()
+
+        waiter.arm(0)
+        assert waiter.done
+        assert waiter.wait(10)
+
+    def test_wait_from_timer(self, qtbot):
+        waiter = ModulesDoneWaiter()
+        waiter.arm(3)
+        for ind in range(3):
+            QtCore.QTimer.singleShot(10 * (ind + 1), waiter.notify)
+        assert waiter.wait(5000)
+
+    def test_wait_from_thread(self, qtbot):
+        waiter = ModulesDoneWaiter()
+        waiter.arm(5)
+        thread = Notifier(waiter, 5)
+        thread.start()
+        tstart = time.perf_counter()
+        assert waiter.wait(5000)
+        assert time.perf_counter() - tstart < 2
+        thread.wait()
+
+    def test_timeout(self, qtbot):
+        waiter = ModulesDoneWaiter()
+        waiter.arm(2)
+        QtCore.QTimer.singleShot(10, waiter.notify)
+        tstart = time.perf_counter()
+        assert not waiter.wait(100)
+        assert time.perf_counter() - tstart == pytest.approx(0.1, abs=0.09)
+
+    def test_release(self, qtbot):
+        waiter = ModulesDoneWaiter()
+        waiter.arm(2)
+        QtCore.QTimer.singleShot(10, waiter.release)
+        assert waiter.wait(5000)
+        assert waiter.done
+
+
+class MockInitModule(QtCore.QObject):
+    init_signal = QtCore.Signal(bool)
+
+    def __init__(self, title: str, init_ms=100, success=True):
+        super().__init__()
+        self.title = title
+        self.init_ms = init_ms
+        self.success = success
+        self.controller = None
+        self.controller_at_init = None
+
+    def init_hardware_ui(self):
+        self.controller_at_init = self.controller
+        QtCore.QTimer.singleShot(self.init_ms, self._initialized)
+
+    def _initialized(self):
+        if self.controller is None:
+            self.controller = f'{self.title}_controller'
+        self.init_signal.emit(self.success)
+
+
+class TestModulesInitializer:
+    def test_concurrent_groups(self, qtbot):
+        groups = [[(MockInitModule(f'master{ind}'), True), (MockInitModule(f'slave{ind}'), True)] for ind in range(4)]
+        initializer = ModulesInitializer(groups)
+        tstart = time.perf_counter()
+        assert initializer.run(5000)
+        # groups run concurrently, masters then slaves: 2 x 100ms instead of 8 x 100ms
+        assert time.perf_counter() - tstart < 0.6
+        for group in groups:
+            master, slave = group[0][0], group[1][0]
+            assert slave.controller_at_init == master.controller == f'{master.title}_controller'
+            assert initializer.init_states[master.title]
+            assert initializer.init_states[slave.title]
+            assert initializer.init_times[slave.title] == pytest.approx(0.1, abs=0.09)
+        assert len(initializer.report().splitlines()) == 9
+
+    def test_no_init(self, qtbot):
+        groups = [[(MockInitModule('master0'), False)], [(MockInitModule('master1'), True)]]
+        initializer = ModulesInitializer(groups)
+        assert initializer.run(5000)
+        assert list(initializer.init_states.keys()) == ['master1']
+
+    def test_master_failed(self, qtbot):
+        groups = [[(MockInitModule('master', success=False), True), (MockInitModule('slave'), True)]]
+        initializer = ModulesInitializer(groups)
+        assert initializer.run(5000)
+        assert not initializer.init_states['master']
+        assert not initializer.init_states['slave']
+        assert groups[0][1][0].controller_at_init is None
+        assert 'slave: not initialized' in initializer.report()
+
+    def test_timeout(self, qtbot):
+        slow = MockInitModule('slow', init_ms=1000)
+        groups = [[(slow, True)], [(MockInitModule('fast'), True)]]
+        initializer = ModulesInitializer(groups)
+        assert not initializer.run(300)
+        assert initializer.init_states['fast']
+        assert not initializer.init_states['slow']
+        # let the pending init of the slow module complete before it gets garbage collected
+        with qtbot.waitSignal(slow.init_signal, timeout=5000):
+            pass
+        assert not initializer.init_states['slow']
+
+
+class MockGrabModule(QtCore.QObject):
+    """Detector like object whose grab lasts exposure_ms + readout_ms"""
+    grab_done_signal = QtCore.Signal(DataToExport)
+    exposure_done_signal = QtCore.Signal(str)
+    command_hardware = QtCore.Signal(ThreadCommand)
+
+    def __init__(self, title: str, exposure_ms=10, readout_ms=300, report_exposure=True):
+        super().__init__()
+        self.title = title
+        self.Naverage = 1
+        self.exposure_ms = exposure_ms
+        self.readout_ms = readout_ms
+        self.report_exposure = report_exposure
+        self.command_hardware.connect(self._command)
+
+    def _command(self, command: ThreadCommand):
+        if command.command == 'single':
+            QtCore.QTimer.singleShot(self.exposure_ms, self._exposed)
+
+    def _exposed(self):
+        if self.report_exposure:
+            self.exposure_done_signal.emit(self.title)
+        QtCore.QTimer.singleShot(self.readout_ms, self._read)
+
+    def _read(self):
+        self.grab_done_signal.emit(DataToExport(self.title, data=[
+            DataWithAxes(self.title, source=DataSource.raw, data=[np.array([0.])])]))
+
+
+class TestModulesManagerGrab:
+    def test_exposure_reported(self, qtbot):
+        detectors = [MockGrabModule('det0'), MockGrabModule('det1', exposure_ms=50)]
+        modules_manager = ModulesManager(detectors, [], selected_detectors=detectors)
+        modules_manager.connect_detectors()
+        tstart = time.perf_counter()
+        modules_manager.start_grab()
+        assert modules_manager.wait_exposure_done()
+        assert time.perf_counter() - tstart < 0.25
+        assert not modules_manager.det_done_flag
+        dte = modules_manager.wait_grab_done()
+        assert time.perf_counter() - tstart > 0.3
+        assert len(dte) == 2
+        assert list(modules_manager.det_done_dtes.keys()) == ['det0', 'det1']
+        modules_manager.connect_detectors(False)
+
+    def test_exposure_from_data(self, qtbot):
+        detectors = [MockGrabModule('det0'), MockGrabModule('det1', readout_ms=100, report_exposure=False)]
+        modules_manager = ModulesManager(detectors, [], selected_detectors=detectors)
+        modules_manager.connect_detectors()
+        tstart = time.perf_counter()
+        modules_manager.start_grab()
+        assert modules_manager.wait_exposure_done()
+        assert time.perf_counter() - tstart > 0.1  # det1 is only exposed once its data is received
+        modules_manager.wait_grab_done()
+        assert modules_manager.det_done_flag
+
+        dte = modules_manager.grab_data()  # blocking grab
+        assert len(dte) == 2
+        modules_manager.connect_detectors(False)
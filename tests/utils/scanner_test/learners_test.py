@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq.utils.scanner.learners import Learner1D, Learner2D, LearnerCurvilinear, LossType
+
+
+def peak(x: float) -> float:
+    return np.exp(-((x - 0.3) / 0.01) ** 2)
+
+
+def peak_2d(point: np.ndarray) -> float:
+    return np.exp(-((point[0] - 0.3) ** 2 + (point[1] + 0.2) ** 2) / 0.05 ** 2)
+
+
+def run(learner, function, n_points: int):
+    while not learner.done(n_points):
+        point = learner.ask()
+        learner.tell(point, function(point))
+    return learner
+
+
+class TestLearner1D:
+    def test_bounds(self):
+        with pytest.raises(ValueError):
+            Learner1D((1., 1.))
+        learner = Learner1D((2., -1.))
+        assert learner.ask() == pytest.approx([2.])
+        assert learner.ask() == pytest.approx([-1.])
+        assert learner.loss() == np.inf
+
+    def test_pending(self):
+        learner = Learner1D((0., 1.), loss='uniform')
+        for _ in range(2):
+            point = learner.ask()
+            learner.tell(point, 0.)
+        assert learner.ask() == pytest.approx([0.5])
+        # the pending points split the intervals they lie in
+        assert learner.ask()[0] in (pytest.approx(0.25), pytest.approx(0.75))
+        # the readback may differ slightly from the asked position
+        learner.tell([0.501], 1.)
+        assert learner.n_points == 3
+        assert len(learner._pending) == 1
+
+    def test_uniform(self):
+        learner = run(Learner1D((0., 1.), loss=LossType.UNIFORM), lambda point: peak(point[0]), 17)
+        assert np.allclose(np.sort(learner.points[:, 0]), np.linspace(0, 1, 17))
+
+    @pytest.mark.parametrize('loss', ['gradient', 'curvature'])
+    def test_refinement(self, loss):
+        n_points = 60
+        learner = run(Learner1D((0., 1.), loss=loss), lambda point: peak(point[0]), n_points)
+        assert learner.n_points == n_points
+        x = np.sort(learner.points[:, 0])
+        x_fine = np.linspace(0, 1, 5001)
+        error = np.max(np.abs(np.interp(x_fine, x, peak(x)) - peak(x_fine)))
+        x_uniform = np.linspace(0, 1, n_points)
+        error_uniform = np.max(np.abs(np.interp(x_fine, x_uniform, peak(x_uniform)) - peak(x_fine)))
+        assert error < error_uniform / 5
+
+    def test_resolution(self):
+        learner = run(Learner1D((0., 1.), loss='uniform', resolution=0.1), lambda point: 0., 1000)
+        assert learner.loss() == 0.
+        assert learner.n_points == 17
+
+    def test_non_finite(self):
+        learner = Learner1D((0., 1.))
+        learner.tell(learner.ask(), np.nan)
+        assert learner.n_points == 0
+
+
+class TestLearner2D:
+    def test_initial_points(self):
+        learner = Learner2D(((0., 1.), (-1., 1.)))
+        points = [learner.ask() for _ in range(5)]
+        assert np.allclose(points, [[0, -1], [0, 1], [1, -1], [1, 1], [0.5, 0]])
+        for point in points:
+            learner.tell(point, 0.)
+        assert np.isfinite(learner.loss())
+
+    @pytest.mark.parametrize('loss', ['gradient', 'curvature'])
+    def test_refinement(self, loss):
+        learner = run(Learner2D(((0., 1.), (-1., 1.)), loss=loss), peak_2d, 300)
+        assert learner.n_points == 300
+        close = np.hypot(learner.points[:, 0] - 0.3, learner.points[:, 1] + 0.2) < 0.1
+        # the disk around the peak is about 1.6% of the scanned area
+        assert np.count_nonzero(close) > 0.1 * learner.n_points
+        assert np.all(learner.points >= [0, -1]) and np.all(learner.points <= [1, 1])
+
+
+class TestLearnerCurvilinear:
+    def test_abscissa(self):
+        learner = LearnerCurvilinear(np.array([[0., 0.], [1., 0.], [1., 2.]]))
+        assert learner.length == pytest.approx(3.)
+        assert np.allclose(learner.get_position(0.5), [0.5, 0.])
+        assert np.allclose(learner.get_position(2.), [1., 1.])
+        assert learner.get_abscissa([1.1, 1.]) == pytest.approx(2.)
+        assert learner.get_abscissa([0.5, -0.1]) == pytest.approx(0.5)
+        with pytest.raises(ValueError):
+            LearnerCurvilinear(np.array([[0., 0.], [0., 0.]]))
+
+    def test_refinement(self):
+        learner = run(LearnerCurvilinear(np.array([[0., 0.], [1., 0.], [1., 1.]])),
+                      lambda point: np.tanh((point[1] - 0.5) * 50), 40)
+        assert learner.points.shape == (40, 2)
+        # all points are on the polyline
+        assert np.all(np.isclose(learner.points[:, 1], 0.) | np.isclose(learner.points[:, 0], 1.))
+        assert np.count_nonzero(np.abs(learner.points[:, 1] - 0.5) < 0.1) > 10
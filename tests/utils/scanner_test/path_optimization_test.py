@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq.control_modules.mocks import MockDAQMove
+from pymodaq.utils.scanner.scanner import Scanner
+from pymodaq.utils.scanner.path_optimization import (PathMethod, get_travel_time, is_grid, get_serpentine_order,
+                                                     get_nearest_neighbour_order, improve_order_2opt,
+                                                     get_optimized_order)
+
+
+def get_grid(n_by_axis: int, n_axes: int):
+    axis = np.linspace(0, 1, n_by_axis)
+    indexes = np.stack([grid.ravel() for grid in np.meshgrid(*[np.arange(n_by_axis)] * n_axes, indexing='ij')],
+                       axis=1)
+    return axis[indexes], indexes, [axis] * n_axes
+
+
+def test_travel_time():
+    positions = np.array([[0., 0.], [1., 2.], [1., 0.]])
+    assert get_travel_time(positions) == pytest.approx(4.)
+    assert get_travel_time(positions, [2., 4.]) == pytest.approx(1.)
+    assert get_travel_time(positions[:1]) == 0.
+    with pytest.raises(ValueError):
+        get_travel_time(positions, [1., 0.])
+
+
+def test_is_grid():
+    positions, indexes, axes_unique = get_grid(4, 2)
+    assert is_grid(indexes, axes_unique)
+    assert not is_grid(indexes[:-1], axes_unique)
+    assert not is_grid(np.concatenate((indexes[:-1], indexes[:1])), axes_unique)
+
+
+@pytest.mark.parametrize('n_axes', [1, 2, 3])
+def test_serpentine(n_axes):
+    positions, indexes, axes_unique = get_grid(5, n_axes)
+    order = get_serpentine_order(indexes[np.random.permutation(len(indexes))])
+    assert sorted(order) == list(range(len(indexes)))
+    permuted = indexes[np.random.permutation(len(indexes))]
+    path = permuted[get_serpentine_order(permuted)]
+    # each move is a single step along a single axis
+    assert np.all(np.sum(np.abs(np.diff(path, axis=0)), axis=1) == 1)
+    assert tuple(path[0]) == (0,) * n_axes
+
+
+def test_nearest_neighbour():
+    positions = np.array([[0.], [3.], [1.], [2.]])
+    assert np.array_equal(get_nearest_neighbour_order(positions), [0, 2, 3, 1])
+    # velocities favour the moves along the fast axis
+    positions = np.array([[0., 0.], [1., 0.], [0., 1.]])
+    assert np.array_equal(get_nearest_neighbour_order(positions, [1., 10.]), [0, 2, 1])
+
+
+def test_2opt():
+    positions = np.random.rand(200, 2)
+    order = get_nearest_neighbour_order(positions)
+    improved = improve_order_2opt(positions, order)
+    assert improved[0] == 0
+    assert sorted(improved) == list(range(200))
+    assert get_travel_time(positions[improved]) <= get_travel_time(positions[order])
+
+    crossed = np.array([[0.], [2.], [1.], [3.]])
+    assert np.array_equal(improve_order_2opt(crossed, np.arange(4)), [0, 2, 1, 3])
+
+
+def test_optimized_order():
+    positions, indexes, axes_unique = get_grid(10, 2)
+    permutation = np.random.permutation(len(positions))
+    order = get_optimized_order(positions[permutation], indexes[permutation], axes_unique)
+    assert get_travel_time(positions[permutation][order]) == pytest.approx(99 * 1 / 9)
+
+    order = get_optimized_order(positions, indexes, axes_unique, method=PathMethod.NONE)
+    assert np.array_equal(order, np.arange(len(positions)))
+
+    # a serpentine is already optimal, the order is kept
+    serpentine = get_serpentine_order(indexes)
+    order = get_optimized_order(positions[serpentine], indexes[serpentine], axes_unique,
+                                method=PathMethod.NEAREST)
+    assert np.array_equal(order, np.arange(len(positions)))
+
+
+class TestScannerPath:
+    def test_random_2D(self, qtbot):
+        scanner = Scanner(actuators=[MockDAQMove(title='act0'), MockDAQMove(title='act1')])
+        scanner.set_scan_type_and_subtypes('Scan2D', 'Random')
+        scanner.settings.child('path_optimization', 'path_method').setValue(PathMethod.AUTO.value)
+        scanner.settings.child('path_optimization', 'velocities', 'velocity_1').setValue(10.)
+        scanner.set_scan()
+        before, after = scanner.travel_times
+        assert after < before
+        assert '->' in scanner.settings['path_optimization', 'travel_time']
+        for positions, indexes in zip(scanner.positions, scanner.axes_indexes):
+            assert scanner.axes_unique[0][indexes[0]] == positions[0]
+            assert scanner.axes_unique[1][indexes[1]] == positions[1]
+        assert get_travel_time(scanner.positions, [1., 10.]) == pytest.approx(after)
+
+    def test_tabular(self, qtbot):
+        scanner = Scanner(actuators=[MockDAQMove(title='act0'), MockDAQMove(title='act1')])
+        scanner.set_scan_type_and_subtypes('Tabular', 'Linear')
+        positions = np.random.rand(50, 2)
+        scanner.scanner.update_model(init_data=positions)
+        scanner.settings.child('path_optimization', 'path_method').setValue(PathMethod.NEAREST.value)
+        scanner.set_scan()
+        assert scanner.travel_times[1] < scanner.travel_times[0]
+        assert np.allclose(np.sort(scanner.positions, axis=0), np.sort(positions, axis=0))
+        assert np.allclose(scanner.axes_unique[1][scanner.axes_indexes[:, 1]], scanner.positions[:, 1])
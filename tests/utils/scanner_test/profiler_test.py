@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import time
+
+import numpy as np
+import pytest
+
+from pymodaq.utils.scanner.profiler import StepProfiler, STEP_EVENTS, STEP_STAGES
+
+
+def test_mark():
+    profiler = StepProfiler(3)
+    assert profiler.n_steps == 3
+    assert np.all(np.isnan(profiler.timestamps))
+    for step in range(2):
+        profiler.mark(step, 'move_start')
+        time.sleep(0.01)
+        profiler.mark(step, 'move_done')
+    profiler.mark(5, 'move_start')  # out of range, ignored
+
+    durations = profiler.durations('move')
+    assert len(durations) == 2
+    assert np.all(durations >= 0.01)
+    assert len(profiler.durations('grab')) == 0
+
+
+def test_stats():
+    profiler = StepProfiler(100)
+    profiler.timestamps[:, STEP_EVENTS.index('grab_start')] = 0.
+    profiler.timestamps[:, STEP_EVENTS.index('grab_done')] = np.linspace(0.001, 0.1, 100)
+    stats = profiler.stats()
+    assert list(stats.keys()) == ['grab']
+    mean, p95 = stats['grab']
+    assert mean == pytest.approx(0.0505)
+    assert p95 == pytest.approx(np.percentile(np.linspace(0.001, 0.1, 100), 95))
+    assert profiler.report() == f'grab: {1000 * mean:.1f}/{1000 * p95:.1f}'
+
+
+def test_to_dte():
+    profiler = StepProfiler(4)
+    profiler.mark(1, 'save_start')
+    dte = profiler.to_dte()
+    dwa = dte.get_data_from_name('step_timings')
+    assert dwa.labels == STEP_EVENTS
+    assert dwa.units == 's'
+    assert dwa.size == 4
+    assert np.isfinite(dwa[STEP_EVENTS.index('save_start')][1])
+    assert set(event for stage in STEP_STAGES.values() for event in stage).issubset(STEP_EVENTS)
@@ -4,6 +4,7 @@ Created the 05/12/2022
 
 @author: Sebastien Weber
 """
+import numpy as np
 import pytest
 from qtpy import QtWidgets, QtCore
 from pymodaq_gui.managers.parameter_manager import ParameterManager, Parameter, ParameterTree
@@ -36,7 +37,35 @@ class TestSettings:
                 else:
                     assert scanner.n_axes == len(config_scanner['actuators'])
 
-                if scan_type == 'Tabular':
+                if scan_sub_type == 'Adaptive':
+                    # positions are only known once probed
+                    assert scanner.n_steps == 0
+                elif scan_type == 'Tabular':
                     assert scanner.n_steps == 1
 
 
+
+
+class TestInfoFromPositions:
+    def test_unique(self, qtbot):
+        scanner = scanner_factory.get('Tabular', 'Linear', **config_scanner)
+        positions = np.random.randint(0, 5, (100, 3)).astype(float)
+        scanner.get_info_from_positions(positions)
+        assert scanner.n_steps == 100
+        assert scanner.n_axes == 3
+        for ind_ax in range(3):
+            assert np.array_equal(scanner.axes_unique[ind_ax], np.unique(positions[:, ind_ax]))
+            assert np.array_equal(scanner.axes_unique[ind_ax][scanner.axes_indexes[:, ind_ax]], positions[:, ind_ax])
+
+    def test_known_axes(self, qtbot):
+        scanner = scanner_factory.get('Tabular', 'Linear', **config_scanner)
+        axis = np.linspace(-1, 1, 21)
+        positions = np.random.choice(axis, (100, 2))
+        scanner.get_info_from_positions(positions, axes_unique=[axis, axis])
+        assert np.array_equal(axis[scanner.axes_indexes], positions)
+
+    def test_1D(self, qtbot):
+        scanner = scanner_factory.get('Tabular', 'Linear', **config_scanner)
+        scanner.get_info_from_positions(np.array([2., 0., 1., 0.]))
+        assert scanner.positions.shape == (4, 1)
+        assert np.array_equal(scanner.axes_indexes[:, 0], np.array([2, 0, 1, 0]))
@@ -4,7 +4,37 @@ Created the 04/11/2023
 
 @author: Sebastien Weber
 """
+import numpy as np
+
+from pymodaq.utils.scanner.scan_factory import ScannerFactory, AdaptiveScanner
+from pymodaq.control_modules.mocks import MockDAQMove
+
+scanner_factory = ScannerFactory()
 
 
 class TestScanner1D:
-    pass
\ No newline at end of file
+    def test_adaptive(self, qtbot):
+        actuator = MockDAQMove(title='act')
+        actuator.units = 'mm'
+        scanner = scanner_factory.get('Scan1D', 'Adaptive', actuators=[actuator])
+        assert isinstance(scanner, AdaptiveScanner)
+        assert scanner.distribution.name == 'spread'
+        scanner.settings.child('start').setValue(-1.)
+        scanner.settings.child('stop').setValue(1.)
+        scanner.settings.child('n_points').setValue(20)
+        scanner.set_scan()
+        assert scanner.evaluate_steps() == 20
+        assert scanner.get_scan_shape() == (20,)
+        assert scanner.positions.shape == (0, 1)
+
+        while not scanner.is_done():
+            position = scanner.ask()
+            scanner.tell(position, np.tanh(10 * position[0]))
+        assert scanner.positions.shape == (20, 1)
+        assert np.all(np.abs(scanner.positions) <= 1.)
+        assert scanner.get_indexes_from_scan_index(5) == (5,)
+        nav_axes = scanner.get_nav_axes()
+        assert len(nav_axes) == 1
+        assert nav_axes[0].label == 'act'
+        assert nav_axes[0].units == 'mm'
+        assert np.allclose(nav_axes[0].get_data(), scanner.positions[:, 0])
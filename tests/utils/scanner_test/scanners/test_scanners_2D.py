@@ -4,7 +4,78 @@ Created the 04/11/2023
 
 @author: Sebastien Weber
 """
+import numpy as np
+
+from pymodaq.utils.scanner.scan_factory import ScannerFactory
+from pymodaq.utils.scanner.scanners._2d_scanners import get_grid_positions, get_spiral_indexes
+from pymodaq.control_modules.mocks import MockDAQMove
+
+scanner_factory = ScannerFactory()
+
+
+def get_scanner(scan_sub_type: str):
+    return scanner_factory.get('Scan2D', scan_sub_type, actuators=[MockDAQMove(title='act1'),
+                                                                     MockDAQMove(title='act2')])
 
 
 class TestScanner2D:
-    pass
\ No newline at end of file
+    def test_grid_positions(self):
+        positions = get_grid_positions(np.array([0., 1.]), np.array([10., 20., 30.]))
+        assert np.array_equal(positions, np.array([[0, 10], [0, 20], [0, 30], [1, 10], [1, 20], [1, 30]]))
+
+        positions = get_grid_positions(np.array([0., 1., 2.]), np.array([10., 20.]), back_and_forth=True)
+        assert np.array_equal(positions, np.array([[0, 10], [0, 20], [1, 20], [1, 10], [2, 10], [2, 20]]))
+
+    def test_spiral_indexes(self):
+        axis_1_indexes, axis_2_indexes = get_spiral_indexes(9)
+        assert np.array_equal(axis_1_indexes, np.array([0, 1, 1, 0, -1, -1, -1, 0, 1]))
+        assert np.array_equal(axis_2_indexes, np.array([0, 0, 1, 1, 1, 0, -1, -1, -1]))
+        # a square spiral visits each point of the square once
+        axis_1_indexes, axis_2_indexes = get_spiral_indexes(11 ** 2)
+        assert len(set(zip(axis_1_indexes, axis_2_indexes))) == 11 ** 2
+
+    def test_linear(self, qtbot):
+        scanner = get_scanner('Linear')
+        scanner.settings.child('axis1', 'start_axis1').setValue(1.)
+        scanner.settings.child('axis1', 'stop_axis1').setValue(-1.)
+        scanner.settings.child('axis1', 'step_axis1').setValue(-0.5)
+        scanner.set_scan()
+
+        assert scanner.n_steps == scanner.evaluate_steps() == 5 * 11
+        assert np.allclose(scanner.axes_unique[0], np.linspace(-1, 1, 5))
+        assert np.allclose(scanner.axes_unique[1], np.linspace(0, 1, 11))
+        assert scanner.get_scan_shape() == (5, 11)
+        for positions, indexes in zip(scanner.positions, scanner.axes_indexes):
+            assert scanner.axes_unique[0][indexes[0]] == positions[0]
+            assert scanner.axes_unique[1][indexes[1]] == positions[1]
+        assert tuple(scanner.axes_indexes[0]) == (4, 0)  # start of the scan at the highest value of axis1
+
+    def test_back_and_forth(self, qtbot):
+        scanner = get_scanner('LinearBackForce')
+        scanner.set_scan()
+        assert np.array_equal(scanner.axes_indexes[:13, 1], np.concatenate((np.arange(11), [10, 9])))
+
+    def test_spiral(self, qtbot):
+        scanner = get_scanner('Spiral')
+        scanner.settings.child('npts_by_axis').setValue(4)
+        scanner.set_scan()
+        assert scanner.n_steps == scanner.evaluate_steps() == 25
+        assert scanner.get_scan_shape() == (5, 5)
+        assert np.allclose(scanner.axes_unique[0], np.linspace(-5, 5, 5))
+        for positions, indexes in zip(scanner.positions, scanner.axes_indexes):
+            assert scanner.axes_unique[0][indexes[0]] == positions[0]
+            assert scanner.axes_unique[1][indexes[1]] == positions[1]
+
+    def test_adaptive(self, qtbot):
+        scanner = get_scanner('Adaptive')
+        scanner.settings.child('n_points').setValue(50)
+        scanner.settings.child('axis1', 'start_axis1').setValue(-1.)
+        scanner.set_scan()
+        assert scanner.get_scan_shape() == (50,)
+
+        while not scanner.is_done():
+            position = scanner.ask()
+            scanner.tell(position, np.exp(-np.sum(position ** 2) / 0.1))
+        assert scanner.positions.shape == (50, 2)
+        assert np.all(scanner.positions[:, 0] >= -1.) and np.all(scanner.positions[:, 0] <= 1.)
+        assert np.all(scanner.positions[:, 1] >= 0.) and np.all(scanner.positions[:, 1] <= 1.)
@@ -4,7 +4,38 @@ Created the 04/11/2023
 
 @author: Sebastien Weber
 """
+import numpy as np
+
+from pymodaq.utils.scanner.scan_factory import ScannerFactory
+from pymodaq.control_modules.mocks import MockDAQMove
+
+
+def get_scanner(rows: list):
+    actuators = [MockDAQMove(title=f'act{ind}') for ind in range(len(rows))]
+    scanner = ScannerFactory().get('Sequential', 'Linear', actuators=actuators)
+    scanner.update_model(init_data=[[act.title] + row for act, row in zip(actuators, rows)])
+    return scanner
 
 
 class TestScannerSequential:
-    pass
\ No newline at end of file
+    def test_set_scan(self, qtbot):
+        scanner = get_scanner([[0., 1., 0.5], [2., 1., -0.25], [0., 0.3, 0.1]])
+        scanner.set_scan()
+        assert scanner.n_steps == scanner.evaluate_steps() == 3 * 5 * 4
+        assert scanner.get_scan_shape() == (3, 5, 4)
+        assert np.allclose(scanner.positions[:5], np.array([[0., 2., 0.], [0., 2., 0.1], [0., 2., 0.2],
+                                                            [0., 2., 0.3], [0., 1.75, 0.]]))
+        assert np.allclose(scanner.axes_unique[1], np.linspace(1, 2, 5))
+        for positions, indexes in zip(scanner.positions, scanner.axes_indexes):
+            for ind_ax in range(3):
+                assert scanner.axes_unique[ind_ax][indexes[ind_ax]] == positions[ind_ax]
+
+    def test_invalid(self, qtbot):
+        scanner = get_scanner([[0., 1., 0.5], [2., 1., 0.5]])
+        scanner.set_scan()
+        assert scanner.n_steps == 1
+        assert np.array_equal(scanner.positions, np.array([[0., 2.]]))
+
+        scanner = get_scanner([[0., 1., 0.5], [1., 1., 0.]])
+        scanner.set_scan()
+        assert scanner.get_scan_shape() == (3, 1)
@@ -4,7 +4,29 @@ Created the 04/11/2023
 
 @author: Sebastien Weber
 """
+import numpy as np
+
+from pymodaq.utils.scanner.scan_factory import ScannerFactory
+from pymodaq.control_modules.mocks import MockDAQMove
+
+scanner_factory = ScannerFactory()
 
 
 class TestScannerSequential:
-    pass
\ No newline at end of file
+    pass
+
+
+class TestScannerTabular:
+    def test_adaptive(self, qtbot):
+        scanner = scanner_factory.get('Tabular', 'Adaptive', actuators=[MockDAQMove(title='act1'),
+                                                                        MockDAQMove(title='act2')])
+        scanner.settings.child('n_points').setValue(30)
+        scanner.set_scan()
+        assert np.isclose(scanner.learner.length, np.sqrt(2))
+
+        while not scanner.is_done():
+            position = scanner.ask()
+            scanner.tell(position, np.tanh(20 * (position[0] - 0.5)))
+        assert scanner.positions.shape == (30, 2)
+        # probed along the default segment from (0, 0) to (1, 1)
+        assert np.allclose(scanner.positions[:, 0], scanner.positions[:, 1])
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq.utils.scanner.streaming import StreamBinner, ReadbackInterpolator, get_stream_waypoints
+
+
+def raster_positions(n_lines=4, n_points=5):
+    return np.array([[line, point] for line in range(n_lines) for point in range(n_points)], dtype=float)
+
+
+class TestWaypoints:
+    def test_1D(self):
+        positions = np.linspace(0, 10, 11)
+        assert np.all(get_stream_waypoints(positions) == np.array([0, 10]))
+        assert np.all(get_stream_waypoints(positions, fly_lines=False) == np.arange(11))
+
+    def test_raster(self):
+        waypoints = get_stream_waypoints(raster_positions())
+        assert np.all(waypoints == np.array([0, 4, 5, 9, 10, 14, 15, 19]))
+
+    def test_serpentine(self):
+        positions = np.array([[0, 0], [0, 1], [0, 2], [1, 2], [1, 1], [1, 0]], dtype=float)
+        assert np.all(get_stream_waypoints(positions) == np.array([0, 2, 3, 5]))
+
+    def test_non_aligned(self):
+        angles = np.linspace(0, np.pi, 7)
+        positions = np.stack((np.cos(angles), np.sin(angles)), axis=1)
+        assert np.all(get_stream_waypoints(positions) == np.arange(7))
+
+    def test_small(self):
+        assert np.all(get_stream_waypoints(np.array([[0., 1.]])) == np.array([0]))
+
+
+class TestStreamBinner:
+    def test_nearest(self):
+        binner = StreamBinner(raster_positions())
+        assert binner.n_steps == 20
+        assert binner.n_filled == 0
+
+        assert binner.add(np.array([0.1, 0.2])) == 0
+        assert binner.add(np.array([0.3, 0.3])) is None  # further than the first one
+        assert binner.add(np.array([0., 0.])) == 0  # closer
+        assert binner.add(np.array([3.1, 3.8])) == 19
+        assert binner.add(np.array([np.nan, 3.8])) is None
+
+        assert binner.n_frames == 5
+        assert binner.n_filled == 2
+        assert np.all(binner.missing == np.arange(1, 19))
+
+        binner.reset()
+        assert binner.n_filled == binner.n_frames == 0
+
+    def test_normalization(self):
+        # axes with very different extents are compared on their normalized values
+        positions = np.array([[x, y] for x in np.linspace(0, 1e-3, 3) for y in np.linspace(0, 1000, 3)])
+        binner = StreamBinner(positions)
+        assert binner.add(np.array([1e-3, 10.])) == 6
+
+    def test_1D(self):
+        binner = StreamBinner(np.linspace(0, 10, 11))
+        assert binner.add(np.array([4.4])) == 4
+        assert binner.add(4.6) == 5
+
+
+class TestReadbackInterpolator:
+    def test_interpolation(self):
+        interpolator = ReadbackInterpolator()
+        assert np.isnan(interpolator.at(0.))
+        interpolator.add(1., 10.)
+        assert interpolator.at(2.) == pytest.approx(10.)
+        interpolator.add(2., 20.)
+        interpolator.add(1.5, 0.)  # older than the last readback: ignored
+        interpolator.add(3., 40.)
+        assert interpolator.at(0.) == pytest.approx(10.)
+        assert interpolator.at(1.5) == pytest.approx(15.)
+        assert interpolator.at(2.25) == pytest.approx(25.)
+
+    def test_extrapolation(self):
+        interpolator = ReadbackInterpolator()
+        interpolator.add(1., 10.)
+        interpolator.add(2., 20.)
+        assert interpolator.at(2.5) == pytest.approx(25.)
+        assert interpolator.at(10.) == pytest.approx(30.)  # over one readback interval at most
+        interpolator.reset()
+        assert np.isnan(interpolator.at(2.))
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import gc
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from pymodaq_data.data import DataToExport, Axis
+from pymodaq.utils.data import DataFromPlugins
+from pymodaq.utils.shared_memory import SharedMemoryRing
+
+
+def get_dte(ind: int, shape=(20, 10)) -> DataToExport:
+    return DataToExport('det', data=[
+        DataFromPlugins('data2D', data=[np.full(shape, float(ind))], errors=[np.ones(shape)]),
+        DataFromPlugins('data1D', data=[ind * np.arange(5, dtype=np.uint16)],
+                        axes=[Axis('x', data=np.linspace(0, 1, 5), index=0)])])
+
+
+@pytest.fixture
+def rings():
+    consumer = SharedMemoryRing(n_slots=3, slot_size=4096)
+    producer = SharedMemoryRing(n_slots=3, slot_size=4096, name=consumer.name)
+    yield producer, consumer
+    producer.close()
+    consumer.close()
+
+
+class TestSharedMemoryRing:
+    def test_put_get(self, rings):
+        producer, consumer = rings
+        assert consumer.slot_size % 64 == 0
+        frame = producer.put(get_dte(3))
+        assert frame[1] == 0
+        assert all([offset % 64 == 0 for offset, size in frame[2]])
+        dte = consumer.get(frame)
+        assert dte[0][0][0, 0] == 3.
+        assert np.allclose(dte[0].get_error(0), 1.)
+        assert np.allclose(dte[1][0], 3 * np.arange(5))
+        assert dte[1][0].dtype == np.uint16
+        assert dte[1].axes[0].label == 'x'
+        assert not dte[0][0].flags.writeable  # a view on the slot
+        assert not dte[0][0].flags.owndata
+        del dte
+        consumer.release(frame)
+        assert producer.n_free == 3
+
+    def test_full(self, rings):
+        producer, consumer = rings
+        frames = [producer.put(get_dte(ind)) for ind in range(3)]
+        assert [frame[1] for frame in frames] == [0, 1, 2]
+        assert producer.put(get_dte(3)) is None  # dropped
+        for ind, frame in enumerate(frames):
+            assert consumer.get(frame)[0][0][0, 0] == ind
+            consumer.release(frame)
+        frame = producer.put(get_dte(4))
+        assert frame[1] == 0
+        assert consumer.get(frame)[0][0][0, 0] == 4
+
+    def test_oversized(self, rings):
+        producer, consumer = rings
+        frame = producer.put(get_dte(5, shape=(100, 100)))
+        assert frame[1] is None
+        assert consumer.get(frame)[0].shape == (100, 100)
+        consumer.release(frame)
+        assert producer.n_written == 0
+
+    def test_close(self):
+        consumer = SharedMemoryRing(n_slots=3, slot_size=4096)
+        producer = SharedMemoryRing(n_slots=3, slot_size=4096, name=consumer.name)
+        frames = [producer.put(get_dte(ind)) for ind in range(2)]
+        dte = consumer.get(frames[0])
+        consumer.get(frames[1])  # not released but not used anymore
+        producer.close()
+        with mock.patch('pymodaq.utils.shared_memory.logger') as logger:
+            consumer.close()
+            logger.warning.assert_called_once()  # the arrays of dte are still in use
+        assert dte[0][0][0, 0] == 0.
+        del dte
+        gc.collect()
+        consumer._shm.close()  # can now be unmapped
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq_utils.serialize.serializer_legacy import Serializer, DeSerializer
+from pymodaq_data.data import DataToExport, DataRaw
+
+from pymodaq.utils.tcp_ip.encoding import (FrameCodec, available_encodings, choose_encoding, format_encoding,
+                                           parse_encoding)
+
+
+def frames(n_frames=5, shape=(64, 128)):
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 4000, shape, dtype=np.uint16)
+    for ind in range(n_frames):
+        frame = background.copy()
+        frame[ind, :] += 10  # slowly varying
+        yield DataToExport('camera', data=[DataRaw('frame', data=[frame])])
+
+
+def test_encoding_strings():
+    assert 'none' in available_encodings()
+    assert 'zlib' in available_encodings()
+    assert format_encoding('zlib', True) == 'zlib+delta'
+    assert parse_encoding('zlib+delta') == ('zlib', True)
+    assert parse_encoding('none') == ('none', False)
+    with pytest.raises(ValueError):
+        parse_encoding('gzip')
+
+    assert choose_encoding(['gzip', 'zlib+delta', 'none']) == 'zlib+delta'
+    assert choose_encoding([]) == 'none'
+
+
+@pytest.mark.parametrize('encoding', available_encodings())
+@pytest.mark.parametrize('delta', [False, True])
+def test_codec_round_trip(encoding, delta):
+    encoder = FrameCodec(format_encoding(encoding, delta))
+    decoder = FrameCodec(format_encoding(encoding, delta))
+    for dte in frames():
+        raw = Serializer(dte).to_bytes()
+        decoded = decoder.decode(encoder.encode(raw))
+        assert decoded == raw
+        assert DeSerializer(decoded).dte_deserialization()[0] == dte[0]
+
+    small = Serializer(DataToExport('small', data=[DataRaw('frame', data=[np.zeros((3,))])])).to_bytes()
+    assert decoder.decode(encoder.encode(small)) == small  # the frame length changed: a key frame is sent
+
+    assert decoder.n_frames == encoder.n_frames == 6
+    assert decoder.raw_bytes == encoder.raw_bytes
+    assert decoder.encoded_bytes == encoder.encoded_bytes
+    assert decoder.mean_encode_time == pytest.approx(encoder.mean_encode_time, rel=1e-3)
+    if encoding != 'none':
+        assert decoder.compression_ratio > 1
+
+
+def test_delta_compresses_slowly_varying_frames():
+    ratios = []
+    for delta in (False, True):
+        codec = FrameCodec(format_encoding('zlib', delta))
+        for dte in frames():
+            codec.encode(Serializer(dte).to_bytes())
+        ratios.append(codec.compression_ratio)
+    assert ratios[1] > 2 * ratios[0]
+
+
+def test_delta_needs_the_previous_frame():
+    encoder = FrameCodec('zlib+delta')
+    encoded = [encoder.encode(Serializer(dte).to_bytes()) for dte in frames(2)]
+    with pytest.raises(ValueError):
+        FrameCodec('zlib+delta').decode(encoded[1])
@@ -1,14 +1,18 @@
+import socket
+import threading
+import time
+
 import pytest
 import numpy as np
 
 from unittest import mock
 from pymodaq.utils.daq_utils import ThreadCommand
-from pymodaq.utils.tcp_ip.tcp_server_client import MockServer, TCPClient, TCPServer
+from pymodaq.utils.tcp_ip.tcp_server_client import MockServer, SendQueue, TCPClient, TCPServer
 from pymodaq_utils.serialize.mysocket import Socket
 from pymodaq_utils.serialize.serializer_legacy import DeSerializer
 from pyqtgraph.parametertree import Parameter
 from pymodaq.utils.exceptions import Expected_1, Expected_2
-from pymodaq.utils.data import DataActuator, DataToExport
+from pymodaq.utils.data import DataActuator, DataToExport, DataRaw
 
 
 class MockPythonSocket:  # pragma: no cover
@@ -173,6 +177,105 @@ class TestTCPClient:
         assert not test_TCP_Client.socket.socket._send
 
 
+class SlowLink:
+    """A send function waiting to be released, as a congested network"""
+    def __init__(self):
+        self.sent = []
+        self.release = threading.Event()
+
+    def send(self, item):
+        self.release.wait(2)
+        if item == 'fail':
+            raise ConnectionError('link down')
+        self.sent.append(item)
+
+
+class TestSendQueue:
+    def test_policy(self):
+        with pytest.raises(ValueError):
+            SendQueue(SlowLink().send, policy='drop_some')
+
+    @pytest.mark.parametrize('policy, sent', [('drop_oldest', [0, 3, 4]), ('drop_newest', [0, 1, 2])])
+    def test_drop(self, policy, sent):
+        link = SlowLink()
+        queue = SendQueue(link.send, maxsize=2, policy=policy)
+        queue.start()
+        assert queue.put(0) == 0
+        time.sleep(0.1)  # 0 is being sent, the link is congested
+        assert [queue.put(item) for item in range(1, 5)] == [0, 0, 1, 1]
+        assert len(queue) == 2
+        link.release.set()
+        assert queue.join(2)
+        assert link.sent == sent
+        assert (queue.n_queued, queue.n_sent, queue.n_dropped) == (5 - 2 * (policy == 'drop_newest'), 3, 2)
+        queue.stop()
+        assert not queue.running
+
+    def test_block(self):
+        link = SlowLink()
+        queue = SendQueue(link.send, maxsize=1, policy='block')
+        queue.start()
+        queue.put(0)
+        queue.put(1)
+        tstart = time.perf_counter()
+        threading.Timer(0.2, link.release.set).start()
+        assert queue.put(2) == 0  # waits for a free slot
+        assert time.perf_counter() - tstart > 0.15
+        queue.stop()
+        assert link.sent == [0, 1, 2]
+        assert (queue.n_queued, queue.n_sent, queue.n_dropped) == (3, 3, 0)
+
+    def test_failed_send(self):
+        link = SlowLink()
+        link.release.set()
+        queue = SendQueue(link.send)
+        queue.start()
+        for item in (0, 'fail', 1):
+            queue.put(item)
+        queue.stop()
+        assert link.sent == [0, 1]
+        assert (queue.n_sent, queue.n_dropped) == (2, 1)
+        assert queue.put(2) == 1  # stopped
+        queue.start()
+        assert queue.put(3) == 0
+        assert queue.join(2)
+        assert link.sent == [0, 1, 3]
+        queue.stop()
+
+    def test_report_dropped(self):
+        link = SlowLink()
+        reports = []
+        queue = SendQueue(link.send, maxsize=1, policy='drop_newest', report_period=0.1,
+                          on_dropped=lambda n_dropped: reports.append((n_dropped, threading.current_thread().name)))
+        queue.start()
+        queue.put(0)
+        time.sleep(0.05)  # 0 is being sent, the link is congested
+        for item in range(1, 10):
+            queue.put(item)  # 1 is queued, the others dropped
+        link.release.set()
+        assert queue.join(2)
+        time.sleep(0.3)
+        assert reports == [(8, 'TCPSendQueue')]  # reported by the sending thread once the link is free
+
+        for item in ('fail', 10, 'fail'):  # failed sends
+            queue.put(item)
+            assert queue.join(2)
+        time.sleep(0.3)
+        assert reports[-1][0] == 10
+        assert len(reports) <= 3  # rate limited
+
+        link.release.clear()
+        for item in range(2):
+            queue.put(item)
+        time.sleep(0.05)
+        queue.stop(timeout=0)  # 0 is being sent, 1 is cleared
+        assert queue.n_dropped == 11
+        link.release.set()
+        time.sleep(0.1)
+        assert reports[-1][0] == 11
+        assert all([thread == 'TCPSendQueue' for _, thread in reports])
+
+
 class TestTCPServer:
     def test_init(self):
         test_TCP_Server = TCPServer()
@@ -208,3 +311,133 @@ class TestMockServer:
     def test_init(self):
         test_MockServer = MockServer()
         assert isinstance(test_MockServer, MockServer)
+
+
+class LoopbackServer(MockServer):
+    message_list = ['Quit', 'Done', 'Info', 'Infos', 'Info_xml']
+    socket_types = ['GRABBER']
+
+    def __init__(self):
+        super().__init__()
+        self.received = []
+
+    def emit_status(self, status):
+        pass
+
+    def command_done(self, command_sock):
+        sock = self.find_socket_within_connected_clients(self.client_type)
+        self.received.append(self.read_dte(sock))
+
+
+class TestTCPServerNotifiers:
+    def test_stream_without_polling(self, qtbot):
+        server = LoopbackServer()
+        server.settings.child('socket_ip').setValue('127.0.0.1')
+        server.settings.child('port_id').setValue(0)
+        server.init_server()
+        port = server.serversocket.getsockname()[1]
+
+        client = Socket(socket.socket(socket.AF_INET, socket.SOCK_STREAM))
+        client.connect(('127.0.0.1', port))
+        client.check_sended_with_serializer('GRABBER')
+        qtbot.waitUntil(lambda: server.find_socket_within_connected_clients('GRABBER') is not None,
+                        timeout=2000)
+
+        n_frames = 20
+        dte = DataToExport('mydata', data=[DataActuator('mock', data=[np.array([10, 20, 30])])])
+        tstart = time.perf_counter()
+        for _ in range(n_frames):
+            client.check_sended_with_serializer('Done')
+            client.check_sended_with_serializer(dte)
+        qtbot.waitUntil(lambda: len(server.received) == n_frames, timeout=2000)
+        # previously each frame costed at least 100 ms
+        assert time.perf_counter() - tstart < n_frames * 0.1
+        assert server.received[-1][0] == dte[0]
+
+        client.close()
+        qtbot.waitUntil(lambda: server.find_socket_within_connected_clients('GRABBER') is None,
+                        timeout=2000)
+        server.close_server()
+        assert len(server._socket_notifiers) == 0
+
+    def test_negotiated_encoding(self, qtbot):
+        server = LoopbackServer()
+        server.settings.child('socket_ip').setValue('127.0.0.1')
+        server.settings.child('port_id').setValue(0)
+        server.init_server()
+        port = server.serversocket.getsockname()[1]
+
+        client = TCPClient('127.0.0.1', port, encoding='zlib+delta')
+        client._connect_socket()
+        client.post_init()
+        qtbot.waitUntil(lambda: server.settings['encoding', 'negotiated'] == 'zlib+delta', timeout=2000)
+        assert client.codec is None  # the frames are sent as is until the reply is read
+        client.ready_to_read()
+        assert client.codec.encoding == 'zlib+delta'
+
+        n_frames = 10
+        for ind in range(n_frames):
+            data = np.zeros((256, 256), dtype=np.uint16)
+            data[ind, :] = ind
+            client.send_data(DataToExport('mydata', data=[DataRaw('mock', data=[data])]))
+        qtbot.waitUntil(lambda: len(server.received) == n_frames, timeout=2000)
+        assert np.all(server.received[-1][0][0][n_frames - 1, :] == n_frames - 1)
+        assert server.settings['encoding', 'compression_ratio'] > 10
+        assert server.settings['encoding', 'decode_time'] > 0
+
+        client.close()
+        qtbot.waitUntil(lambda: server.find_socket_within_connected_clients('GRABBER') is None,
+                        timeout=2000)
+        assert server.settings['encoding', 'negotiated'] == 'none'
+        server.close_server()
+
+    def test_queued_frames(self, qtbot):
+        server = LoopbackServer()
+        server.settings.child('socket_ip').setValue('127.0.0.1')
+        server.settings.child('port_id').setValue(0)
+        server.init_server()
+        port = server.serversocket.getsockname()[1]
+
+        client = TCPClient('127.0.0.1', port, send_policy='drop_oldest', send_queue_size=2)
+        client._connect_socket()
+        client.post_init()
+        assert client.send_queue.running
+
+        n_frames = 10
+        for ind in range(n_frames):
+            client.send_data(DataToExport('mydata', data=[DataRaw('mock', data=[np.full((256, 256), ind)])]))
+            client.send_info_string('an_info', ind)  # not interleaved with the frames sent from the queue
+        client.send_queue.join(2)
+        queue = client.send_queue
+        assert queue.n_queued + queue.n_dropped >= n_frames
+        assert queue.n_sent + queue.n_dropped == n_frames
+        qtbot.waitUntil(lambda: len(server.received) == queue.n_sent, timeout=2000)
+        assert int(server.received[-1][0][0][0, 0]) == n_frames - 1  # the freshest frame is always sent
+
+        client.close()
+        assert not client.send_queue.running
+        qtbot.waitUntil(lambda: server.find_socket_within_connected_clients('GRABBER') is None,
+                        timeout=2000)
+        server.close_server()
+
+    def test_server_without_negotiation(self, qtbot):
+        """A server not knowing the negotiation ignores the request: the frames are sent as is"""
+        server = LoopbackServer()
+        server.negotiate_encoding = lambda sock, requested: None
+        server.settings.child('socket_ip').setValue('127.0.0.1')
+        server.settings.child('port_id').setValue(0)
+        server.init_server()
+        port = server.serversocket.getsockname()[1]
+
+        client = TCPClient('127.0.0.1', port, encoding='zlib')
+        client._connect_socket()
+        client.post_init()
+        client.send_data(DataToExport('mydata', data=[DataActuator('mock', data=[np.array([10, 20, 30])])]))
+        qtbot.waitUntil(lambda: len(server.received) == 1, timeout=2000)
+        assert client.codec is None
+        assert server.received[0][0] == DataActuator('mock', data=[np.array([10, 20, 30])])
+
+        client.close()
+        qtbot.waitUntil(lambda: server.find_socket_within_connected_clients('GRABBER') is None,
+                        timeout=2000)
+        server.close_server()